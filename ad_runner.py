@@ -5,9 +5,16 @@ from __future__ import annotations
 # autonomous_driving 모듈 기반 단독 자율주행 실행 스크립트
 # 제어 명령: TCP ManualControlById (0x1302)
 #
+# trajectory_mode=True 시:
+#   - PathManager 경로/속도 profile 을 SetTrajectory (0x1304) 로 업로드하고
+#     계획 변경·경로 이탈·window 소진 때만 재업로드 (매 tick ManualControl 없음)
+#   - 업로드 전 Douglas-Peucker 단순화 (수평 오차 trajectory_max_error 이내, 0 → 끔)
+#   - chaser 는 target 이 움직이므로 항상 ManualControl
+#
 # 충돌 모드(is_chaser=True) 시:
 #   - AutonomousDriving 대신 target 방향 추적 + 고정 스로틀
-#   - target 위치는 모듈 수준 _shared_positions 레지스트리 경유
+#   - target 위치는 공유 메모리 차량 상태 표 (utils.vehicle_table) 경유 — target 이 다른 프로세스여도 됨
+#     각 runner 의 VI 수신 callback 이 자기 행을 쓰고, chaser 는 lock 없이 읽는다
 
 import argparse
 import itertools
@@ -18,8 +25,11 @@ import numpy as np
 
 import transport.tcp_transport as tcp
 import transport.protocol_defs as proto
-from receivers.vehicle_info_receiver import parse_vehicle_info_payload
+from receivers.udp_reactor import default_reactor
+from receivers.vehicle_info_receiver import VehicleInfo
+from utils.vehicle_table import default_table
 from autonomous_driving.autonomous_driving import AutonomousDriving
+from autonomous_driving.planning.trajectory_planner import TrajectoryPlanner
 from autonomous_driving.vehicle_state import VehicleState
 
 
@@ -49,15 +59,15 @@ _CHASE_LFD_MIN = 3.0
 _CHASE_LFD_MAX = 15.0
 _CHASE_STEER_GAIN = 1.35
 
-def _calc_chase_steer_norm(parsed: dict, target_x: float, target_y: float, wheelbase: float) -> float:
+def _calc_chase_steer_norm(vi: VehicleInfo, target_x: float, target_y: float, wheelbase: float) -> float:
     """타겟 현재 위치를 직접 look-ahead point 로 두고 공격적으로 조향한다."""
-    dx = target_x - parsed["location"]["x"]
-    dy = target_y - parsed["location"]["y"]
+    dx = target_x - vi.x
+    dy = target_y - vi.y
     distance = float(np.hypot(dx, dy))
     if distance < 1e-3:
         return 0.0
 
-    yaw = np.deg2rad(parsed["rotation"]["z"])
+    yaw = np.deg2rad(vi.yaw)
     local_x = np.cos(-yaw) * dx - np.sin(-yaw) * dy
     local_y = np.sin(-yaw) * dx + np.cos(-yaw) * dy
     theta = float(np.arctan2(local_y, local_x))
@@ -66,21 +76,13 @@ def _calc_chase_steer_norm(parsed: dict, target_x: float, target_y: float, wheel
     return float(np.clip(steer_rad / MAX_STEER_RAD, -1.0, 1.0))
 
 
-# ─── 공유 위치 레지스트리 (충돌 모드: runner 간 위치 공유) ─────────
-_shared_positions: dict = {}   # entity_id → {"x": float, "y": float, "speed_kph": float}
-_shared_pos_lock  = threading.Lock()
-
-def _update_shared_pos(entity_id: str, x: float, y: float, speed_kph: float) -> None:
-    with _shared_pos_lock:
-        _shared_positions[entity_id] = {"x": x, "y": y, "speed_kph": speed_kph}
-
-def _get_shared_pos(entity_id: str) -> dict:
-    with _shared_pos_lock:
-        return dict(_shared_positions.get(entity_id, {}))
-
+# ─── 공유 차량 상태 표 (충돌 모드: runner 간 위치 공유) ─────────
 def clear_shared_positions() -> None:
-    with _shared_pos_lock:
-        _shared_positions.clear()
+    """새 세션 시작 전 이전 실행의 행 비우기 (표를 공유하는 모든 프로세스에 적용).
+    표를 만든 프로세스에서만 — attach 한 runner 프로세스의 세션은 owner 가 관리한다."""
+    table = default_table()
+    if table.owner:
+        table.clear()
 
 
 # ─── Runner ─────────────────────────────────────────────────────
@@ -102,14 +104,26 @@ class AdRunner:
         speed_kph:            float = 60.0,   # target 정속 / chaser = ×1.2
         trigger_kph:          float = 5.0,
         max_speed_kph:        float = None,
+        control_bus=None,                     # ControlBus — 있으면 latest-wins 로 합쳐서 전송
+        # trajectory offload 파라미터
+        trajectory_mode:      bool  = False,
+        trajectory_window:    int   = 0,      # 0 → 경로 전체 (closed path 는 한 바퀴)
+        trajectory_deviation_m: float = 3.0,
+        trajectory_follow_mode: int = 2,
+        trajectory_max_error: float = 0.1,    # m, 0 → 단순화 안 함
+        reactor=None,                         # UdpReactor — None 이면 공용 default_reactor()
+        vehicle_table=None,                   # VehicleStateTable — None 이면 공용 default_table()
     ):
-        # UDP 수신 소켓
+        # UDP 수신 소켓 — start() 때 reactor 에 등록 (차량별 수신 스레드 없음)
         self._recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._recv_sock.settimeout(2.0)
         self._recv_sock.bind((vi_ip, vi_port))
+        self._reactor = reactor or default_reactor()
+        self._table   = vehicle_table or default_table()
+        self._table.add(entity_id)
 
         self._tcp_sock              = tcp_sock
+        self._control_bus           = control_bus
         self._entity_id             = entity_id
         self._is_chaser             = is_chaser
         self._is_collision_target   = is_collision_target
@@ -120,23 +134,38 @@ class AdRunner:
 
         self._ad = AutonomousDriving(path_file, map_name=map_name, max_speed_kph=max_speed_kph)
 
+        self._planner = None
+        self._trajectory_follow_mode = trajectory_follow_mode
+        if trajectory_mode and not is_chaser:
+            self._planner = TrajectoryPlanner(
+                self._ad.path_manager,
+                window_points = trajectory_window,
+                deviation_m   = trajectory_deviation_m,
+                speed_cap     = self._target_speed_kph / 3.6 if is_collision_target else None,
+                max_error     = trajectory_max_error,
+            )
+
         self._running   = False
         self._lock      = threading.Lock()
-        self._latest    = None
+        self._vi        = VehicleInfo()   # reactor 스레드가 _lock 안에서 in-place 갱신
+        self._vi_valid  = False
+        self._tick_vi   = VehicleInfo()   # 제어 루프용 snapshot
         self._log       = log_fn or (lambda msg, level="INFO": print(f"[AD] {msg}"))
         self._status_cb = status_cb or (lambda *a: None)
 
-        role = "Chaser" if is_chaser else "PathFollow"
+        role = "Chaser" if is_chaser else ("Trajectory" if self._planner else "PathFollow")
         self._log(f"Vehicle Info 수신 : {vi_ip}:{vi_port}")
         self._log(f"TCP 제어          : entity_id={entity_id} ({role})")
 
     def start(self) -> None:
         self._running = True
-        threading.Thread(target=self._recv_loop,    daemon=True).start()
+        self._reactor.register(self._recv_sock, self._on_vi_packet,
+                               stream=f"vehicle_info:{self._entity_id}", copy=False)
         threading.Thread(target=self._control_loop, daemon=True).start()
 
     def stop(self) -> None:
         self._running = False
+        self._reactor.unregister(self._recv_sock)
         try:
             self._recv_sock.close()
         except Exception:
@@ -146,19 +175,27 @@ class AdRunner:
         self._max_speed_kph = float(max_speed_kph)
         self._ad.set_max_speed_kph(self._max_speed_kph)
 
-    # ── UDP 수신 ────────────────────────────────────────────────
-    def _recv_loop(self) -> None:
-        while self._running:
-            try:
-                data, _ = self._recv_sock.recvfrom(65535)
-                parsed = parse_vehicle_info_payload(data)
-                if parsed:
-                    with self._lock:
-                        self._latest = parsed
-            except socket.timeout:
-                continue
-            except OSError:
-                break
+    def _send_control(self, throttle: float, brake: float, steer_angle: float) -> None:
+        if self._control_bus is not None:
+            self._control_bus.submit(self._entity_id, throttle, brake, steer_angle)
+            return
+        tcp.send_manual_control_by_id(
+            self._tcp_sock, _next_rid(),
+            entity_id   = self._entity_id,
+            throttle    = throttle,
+            brake       = brake,
+            steer_angle = steer_angle,
+        )
+
+    # ── UDP 수신 (reactor 스레드) ──────────────────────────────
+    def _on_vi_packet(self, data) -> bool:
+        with self._lock:
+            if not self._vi.update_from(data):
+                return False
+            self._vi_valid = True
+        # 공유 표 기록 — 이 행의 writer 는 이 callback 하나 (_vi 도 이 스레드만 갱신하므로 lock 밖)
+        self._table.publish(self._entity_id, self._vi)
+        return True
 
     # ── 제어 루프 (30Hz) ────────────────────────────────────────
     def _control_loop(self) -> None:
@@ -169,21 +206,15 @@ class AdRunner:
             t_start = time.perf_counter()
 
             with self._lock:
-                parsed = self._latest
-
-            if parsed:
-                # 항상 공유 레지스트리에 현재 위치/속도 기록
-                speed_kph = abs(parsed["local_velocity"]["x"]) * 3.6
-                _update_shared_pos(
-                    self._entity_id,
-                    parsed["location"]["x"],
-                    parsed["location"]["y"],
-                    speed_kph,
-                )
+                vi = self._tick_vi.copy_from(self._vi) if self._vi_valid else None
+
+            if vi is not None:
                 if self._is_chaser:
-                    self._run_chaser(parsed)
+                    self._run_chaser(vi)
+                elif self._planner is not None:
+                    self._run_trajectory(vi)
                 else:
-                    self._run_path_follow(parsed)
+                    self._run_path_follow(vi)
             else:
                 self._log("차량 상태 대기 중...", "INFO")
 
@@ -195,12 +226,12 @@ class AdRunner:
         self._log("주행 종료")
 
     # ── 경로 추종 ────────────────────────────────────────────────
-    def _run_path_follow(self, parsed: dict) -> None:
+    def _run_path_follow(self, vi: VehicleInfo) -> None:
         vs = VehicleState(
-            x        = parsed["location"]["x"],
-            y        = parsed["location"]["y"],
-            yaw      = np.deg2rad(parsed["rotation"]["z"]),
-            velocity = parsed["local_velocity"]["x"],
+            x        = vi.x,
+            y        = vi.y,
+            yaw      = np.deg2rad(vi.yaw),
+            velocity = vi.vx,
         )
         try:
             ctrl, _ = self._ad.execute(vs)
@@ -209,18 +240,12 @@ class AdRunner:
             if self._is_collision_target or self._is_chaser:
                 # 충돌 모드: 조향은 Pure Pursuit, 속도는 설정값으로 고정
                 # (target = speed_kph, chaser = speed_kph × 1.2)
-                current_kph = abs(parsed["local_velocity"]["x"]) * 3.6
+                current_kph = vi.speed_kph
                 throttle, brake = _speed_ctrl(current_kph, self._target_speed_kph)
             else:
                 throttle, brake = ctrl.accel, ctrl.brake
 
-            tcp.send_manual_control_by_id(
-                self._tcp_sock, _next_rid(),
-                entity_id   = self._entity_id,
-                throttle    = throttle,
-                brake       = brake,
-                steer_angle = steer_norm,
-            )
+            self._send_control(throttle, brake, steer_norm)
             self._status_cb(
                 self._entity_id,
                 vs.position.x, vs.position.y,
@@ -230,39 +255,63 @@ class AdRunner:
         except Exception as e:
             self._log(f"ERROR: {e}", "ERROR")
 
+    # ── trajectory offload ──────────────────────────────────────
+    def _run_trajectory(self, vi: VehicleInfo) -> None:
+        """계획 변경·이탈·window 소진 시에만 SetTrajectory 업로드."""
+        vs = VehicleState(
+            x        = vi.x,
+            y        = vi.y,
+            yaw      = np.deg2rad(vi.yaw),
+            velocity = vi.vx,
+        )
+        try:
+            planned = self._planner.update(vs, z=vi.z)
+            if planned is not None:
+                points, reason = planned
+                tcp.send_set_trajectory(
+                    self._tcp_sock, _next_rid(),
+                    entity_id       = self._entity_id,
+                    follow_mode     = self._trajectory_follow_mode,
+                    trajectory_name = f"{self._entity_id}_path",
+                    points          = points,
+                )
+                report = self._planner.last_report
+                self._log(f"SetTrajectory 업로드 ({reason}, {report or f'{len(points)} pts'}, "
+                          f"{points[-1, 3]:.1f}s, 누적 {self._planner.uploads}회)")
+            self._status_cb(
+                self._entity_id,
+                vs.position.x, vs.position.y,
+                vs.velocity * 3.6,
+                0.0, 0.0, 0.0,
+            )
+        except Exception as e:
+            self._log(f"ERROR: {e}", "ERROR")
+
     # ── 충돌 추적 ────────────────────────────────────────────────
-    def _run_chaser(self, parsed: dict) -> None:
+    def _run_chaser(self, vi: VehicleInfo) -> None:
         """Trigger 이후 target 현재 위치를 직접 추적해 추돌을 유도한다."""
-        target = _get_shared_pos(self._target_entity_id)
-        if not target:
+        target = self._table.read(self._target_entity_id)
+        if target is None:
             return   # target 위치 아직 미수신
 
         # trigger: target 속도가 기준 이상이어야 출발
-        if target["speed_kph"] < self._trigger_kph:
-            tcp.send_manual_control_by_id(
-                self._tcp_sock, _next_rid(),
-                entity_id=self._entity_id,
-                throttle=0.0, brake=0.5, steer_angle=0.0,
-            )
+        if target.speed_kph < self._trigger_kph:
+            self._send_control(0.0, 0.5, 0.0)
             return
 
-        current_kph = abs(parsed["local_velocity"]["x"]) * 3.6
+        current_kph = vi.speed_kph
         throttle, brake = _speed_ctrl(current_kph, self._target_speed_kph)
         steer_norm = _calc_chase_steer_norm(
-            parsed,
-            target_x=target["x"],
-            target_y=target["y"],
+            vi,
+            target_x=target.x,
+            target_y=target.y,
             wheelbase=float(self._ad.pure_pursuit.wheelbase),
         )
-        tcp.send_manual_control_by_id(
-            self._tcp_sock, _next_rid(),
-            entity_id=self._entity_id,
-            throttle=throttle, brake=brake, steer_angle=steer_norm,
-        )
+        self._send_control(throttle, brake, steer_norm)
         self._status_cb(
             self._entity_id,
-            parsed["location"]["x"], parsed["location"]["y"],
-            abs(parsed["local_velocity"]["x"]) * 3.6,
+            vi.x, vi.y,
+            vi.speed_kph,
             throttle, brake, steer_norm,
         )
 
@@ -275,6 +324,12 @@ def main():
     parser.add_argument("--ego-ip",    default="127.0.0.1")
     parser.add_argument("--ego-port",  type=int, default=9091)
     parser.add_argument("--entity-id", default="Car_1")
+    parser.add_argument("--trajectory", action="store_true",
+                        help="SetTrajectory 로 경로를 업로드 (매 tick ManualControl 대신)")
+    parser.add_argument("--trajectory-window", type=int, default=0,
+                        help="rolling window point 수 (0 = 경로 전체)")
+    parser.add_argument("--trajectory-max-error", type=float, default=0.1,
+                        help="업로드 전 경로 단순화 허용 수평 오차 [m] (0 = 단순화 안 함)")
     args = parser.parse_args()
 
     print(f"[AD] TCP 연결 중 → {args.tcp_ip}:{args.tcp_port} ...")
@@ -292,6 +347,9 @@ def main():
         entity_id = args.entity_id,
         vi_ip     = args.ego_ip,
         vi_port   = args.ego_port,
+        trajectory_mode   = args.trajectory,
+        trajectory_window = args.trajectory_window,
+        trajectory_max_error = args.trajectory_max_error,
     )
     try:
         runner.start()
@@ -11,12 +11,17 @@ import dearpygui.dearpygui as dpg
 from transport.protocol_defs import *
 import transport.tcp_transport as tcp
 import transport.tcp_thread as tcp_thread_mod
+from transport.pending import PendingTable
+from transport.control_bus import ControlBus
 import automation.automation as ac
+from automation.file_playback import FilePlayback
 import ad_runner as AdRunner_mod
 from ad_runner import AdRunner
 from step_ad_runner import StepAdRunner
 from lane_runner import LaneRunner
 import utils.ui_queue as ui_queue
+import utils.event_log as elog
+import utils.metrics as metrics
 import panels.log               as log_panel
 import panels.monitor            as monitor_panel
 import panels.commands           as cmd_panel
@@ -36,6 +41,8 @@ LOG_H      = 280        # 로그 패널 높이 (고정)
 TITLEBAR_H = 38         # 타이틀바 + separator 높이
 PAD        = 12         # 좌우/하단 여백
 
+CONTROL_BUS_RATE_HZ = 60.0   # ManualControlById coalescer 주기 flush (AD 30Hz / LC 20Hz 보다 빠르게)
+
 # 동적 크기 헬퍼 — 리사이즈 시 뷰포트 실제 크기 반환
 def _vp_w():  return dpg.get_viewport_width()
 def _vp_h():  return dpg.get_viewport_height()
@@ -58,20 +65,6 @@ class RequestIdCounter:
         return rid
 
 
-# ============================================================
-# Pending helpers
-# ============================================================
-def pending_add(pending, lock, request_id, msg_type):
-    ev = threading.Event()
-    with lock:
-        pending[(request_id, msg_type)] = {"t": time.time(), "ev": ev}
-    return ev
-
-def pending_pop(pending, lock, request_id, msg_type):
-    with lock:
-        pending.pop((request_id, msg_type), None)
-
-
 # ============================================================
 # TCP helpers
 # ============================================================
@@ -100,10 +93,11 @@ def _set_conn_status(connected: bool):
 # ============================================================
 class AppState:
     def __init__(self):
-        self.pending     = {}
-        self.lock        = threading.Lock()
+        self.pending     = PendingTable()     # (rid, msg_type) 동기화 + RTT 히스토그램
         self.rid         = RequestIdCounter()
         self.tcp_sock    = None
+        self.writer      = None     # tcp_sock 의 단일 송신 스레드 — 모든 send_* 는 이쪽으로
+        self.control_bus = None     # ManualControlById latest-wins coalescer (writer 위에서 동작)
         self.receiver    = None
         self.auto_caller = None
         self.fp_caller   = None
@@ -115,32 +109,32 @@ class AppState:
         self._conn_lock  = threading.Lock()
 
     def dispatch(self, msg_type: int, send_fn):
-        if self.tcp_sock is None:
+        if self.writer is None:
             log_panel.append("Not connected.", "WARN")
             return
-        def _send():
-            try:
-                rid = self.rid.next()
-                pending_add(self.pending, self.lock, rid, msg_type)
-                send_fn(rid)
-            except OSError as e:
-                log_panel.append(f"Send error: {e}", "ERROR")
-        threading.Thread(target=_send, daemon=True).start()
-
-    def toggle_auto(self, max_calls: int = MAX_CALL_NUM) -> bool:
+        # Writer.sendall 은 큐잉만 하므로 UI 스레드에서 바로 호출해도 블로킹 없음
+        try:
+            rid = self.rid.next()
+            self.pending.add(rid, msg_type)
+            send_fn(rid)
+        except OSError as e:
+            log_panel.append(f"Send error: {e}", "ERROR")
+
+    def toggle_auto(self, max_calls: int = MAX_CALL_NUM,
+                    pipeline_depth: int = AUTO_PIPELINE_DEPTH, step_dt_sec: float = 0.0,
+                    step_count: int = 1) -> bool:
         if self.auto_caller is None or not self.auto_caller.is_alive():
             self.auto_caller = ac.AutoCaller(
-                tcp_sock=self.tcp_sock,
+                tcp_sock=self.writer,
                 pending=self.pending,
-                lock=self.lock,
                 request_id_ref=self.rid,
                 max_calls=max_calls,
-                pending_add_fn=pending_add,
-                pending_pop_fn=pending_pop,
-                step_count=1,
+                step_count=step_count,
                 timeout_sec=AUTO_TIMEOUT_SEC,
                 delay_sec=AUTO_DELAY_BETWEEN_CMDS_SEC,
                 progress_every=50,
+                pipeline_depth=pipeline_depth,
+                step_dt_sec=step_dt_sec,
             )
             def _on_done(s=self):
                 s.auto_caller = None
@@ -157,22 +151,24 @@ class AppState:
         if self.fp_caller is not None and self.fp_caller.is_alive():
             log_panel.append("[FP] 이미 재생 중입니다.", "WARN")
             return
-        self.fp_caller = ac.AutoCaller(
-            tcp_sock=self.tcp_sock,
+        def _on_done(stopped, s=self):
+            fp_panel.reset_ui(stopped=stopped)
+            s.fp_caller = None
+        self.fp_caller = FilePlayback(
+            tcp_sock=self.writer,
             pending=self.pending,
-            lock=self.lock,
             request_id_ref=self.rid,
-            max_calls=len(rows),
-            pending_add_fn=pending_add,
-            pending_pop_fn=pending_pop,
-            step_count=1,
+            rows=rows,
+            entity_id=entity_id,
+            pipeline_depth=FP_PIPELINE_DEPTH,
             timeout_sec=AUTO_TIMEOUT_SEC,
             delay_sec=AUTO_DELAY_BETWEEN_CMDS_SEC,
-            progress_every=1,
+            progress_every=max(1, len(rows) // 200),
+            log_fn=lambda msg, level="INFO": log_panel.append(f"[FP] {msg}", level),
+            on_progress=lambda done, total, line: fp_panel.update_progress(done, total),
+            on_done=_on_done,
+            control_bus=self.control_bus,
         )
-        def _on_done(s=self):
-            s.fp_caller = None
-        _patch_fp_caller(self.fp_caller, rows, entity_id, on_done=_on_done)
         self.fp_caller.start()
 
     def stop_fp(self) -> None:
@@ -189,13 +185,10 @@ class AppState:
             log_panel.append("[TFP] 재생할 행이 없습니다.", "WARN")
             return
         self.tfp_caller = ac.AutoCaller(
-            tcp_sock=self.tcp_sock,
+            tcp_sock=self.writer,
             pending=self.pending,
-            lock=self.lock,
             request_id_ref=self.rid,
             max_calls=total_rows,
-            pending_add_fn=pending_add,
-            pending_pop_fn=pending_pop,
             step_count=1,
             timeout_sec=AUTO_TIMEOUT_SEC,
             delay_sec=AUTO_DELAY_BETWEEN_CMDS_SEC,
@@ -224,7 +217,7 @@ class AppState:
             is_target = bool(collision_cfg) and (v["entity_id"] == target_id)
             try:
                 runner = AdRunner(
-                    tcp_sock              = self.tcp_sock,
+                    tcp_sock              = self.writer,
                     entity_id             = v["entity_id"],
                     vi_ip                 = "0.0.0.0",
                     vi_port               = v["vi_port"],
@@ -239,6 +232,8 @@ class AppState:
                     speed_kph             = speed_kph,
                     trigger_kph           = (collision_cfg or {}).get("trigger_kph", 5.0),
                     max_speed_kph         = v.get("max_speed_kph"),
+                    control_bus           = self.control_bus,
+                    trajectory_mode       = v.get("trajectory_mode", False),
                 )
                 runner.start()
                 self.ad_runners.append(runner)
@@ -272,7 +267,8 @@ class AppState:
             log_panel.append(f"[AD:{entity_id}] max speed 업데이트 -> {max_speed_kph:.0f} km/h", "INFO")
 
     def start_step_ad(self, vehicles: list, save_data: bool = False,
-                      collision_cfg: dict = None) -> None:
+                      collision_cfg: dict = None, decimation: int = 1,
+                      adaptive_decimation: bool = False) -> None:
         if self.step_ad_runners:
             log_panel.append("[StepAD] 이미 실행 중입니다.", "WARN")
             return
@@ -281,19 +277,20 @@ class AppState:
                 s.step_ad_runners.clear()
                 au_panel.reset_ui()
             runner = StepAdRunner(
-                tcp_sock       = self.tcp_sock,
+                tcp_sock       = self.writer,
                 vehicles       = vehicles,
                 pending        = self.pending,
-                lock           = self.lock,
                 request_id_ref = self.rid,
-                pending_add_fn = pending_add,
-                pending_pop_fn = pending_pop,
                 timeout_sec    = AUTO_TIMEOUT_SEC,
                 save_data      = save_data,
                 log_fn         = lambda msg, level="INFO": log_panel.append(f"[StepAD] {msg}", level),
                 status_cb      = au_panel.update_status,
                 on_done        = _on_done,
                 collision_cfg  = collision_cfg,
+                control_bus    = self.control_bus,
+                decimation     = decimation,
+                adaptive_decimation = adaptive_decimation,
+                trace_path     = os.environ.get("MORAI_TRACE"),   # Chrome trace JSON (Perfetto)
             )
             runner.start()
             self.step_ad_runners.append(runner)
@@ -324,7 +321,7 @@ class AppState:
             return
         try:
             self.lc_runner = LaneRunner(
-                tcp_sock     = self.tcp_sock,
+                tcp_sock     = self.writer,
                 entity_id    = entity_id,
                 cam_ip       = "0.0.0.0",
                 cam_port     = cam_port,
@@ -338,6 +335,7 @@ class AppState:
                 frame_cb     = lc_panel.update_frame,
                 vi_cb        = lc_panel.update_vehicle_info,
                 debug_cb     = lc_panel.update_debug_frame,
+                control_bus  = self.control_bus,
             )
             self.lc_runner.start()
             lc_panel.set_runner(self.lc_runner)
@@ -363,6 +361,12 @@ class AppState:
             if self.receiver:
                 self.receiver.stop()
                 self.receiver = None
+            if self.control_bus:
+                self.control_bus.stop()
+                self.control_bus = None
+            if self.writer:
+                self.writer.stop()
+                self.writer = None
             if self.tcp_sock:
                 _close_socket(self.tcp_sock)
                 self.tcp_sock = None
@@ -376,12 +380,24 @@ class AppState:
                     self.tcp_sock = sock
                     _set_conn_status(True)
                     self.receiver = tcp_thread_mod.Receiver(
-                        sock, self.pending, self.lock,
+                        sock, self.pending,
                         on_disconnect=self._on_disconnect,
                     )
                     self.receiver.start()
+                    self.writer = tcp.SocketWriter(
+                        sock,
+                        on_error=lambda e: log_panel.append(f"Send error: {e}", "ERROR"),
+                    )
+                    self.writer.start()
+                    self.control_bus = ControlBus(
+                        self.writer,
+                        rate_hz=CONTROL_BUS_RATE_HZ,
+                        request_id_ref=self.rid,
+                        on_error=lambda e: log_panel.append(f"ManualControl send error: {e}", "ERROR"),
+                    )
+                    self.control_bus.start()
                     cmd_panel.init(
-                        tcp_sock=self.tcp_sock,
+                        tcp_sock=self.writer,
                         dispatch_fn=self.dispatch,
                         toggle_auto_fn=self.toggle_auto,
                     )
@@ -418,12 +434,15 @@ class AppState:
         threading.Thread(target=_run, daemon=True).start()
 
     def _on_disconnect(self):
-        self.tcp_sock = None                                    # 즉시 null → dispatch null guard 히트
+        self.tcp_sock = None
+        if self.control_bus:
+            self.control_bus.stop()
+            self.control_bus = None
+        if self.writer:
+            self.writer.stop()
+            self.writer = None                                  # 즉시 null → dispatch null guard 히트
         # 대기 중인 ev.wait() 즉시 해제 — StepAdRunner 등이 timeout까지 기다리지 않도록
-        with self.lock:
-            for item in self.pending.values():
-                item["ev"].set()
-            self.pending.clear()
+        self.pending.fail_all()
         if self.auto_caller and self.auto_caller.is_alive():
             self.auto_caller.stop()
         if self.fp_caller and self.fp_caller.is_alive():
@@ -441,111 +460,20 @@ class AppState:
 # AutoCaller patch
 # ============================================================
 def _patch_auto_caller(caller: ac.AutoCaller, on_done=None):
-    def patched_run():
-        for i in range(caller.max_calls):
-            if caller._stop.is_set():
-                break
-
-            rid = caller._next_rid()
-            ev  = caller.pending_add(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-            tcp.send_fixed_step(caller.tcp_sock, rid, step_count=caller.step_count)
-            if not caller._wait_or_stop(ev):
-                caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-                log_panel.append(f"[AUTO][TIMEOUT] FixedStep i={i} rid={rid}", "WARN")
-                break
-            caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-            if caller.delay_sec > 0:
-                time.sleep(caller.delay_sec)
-            if caller._stop.is_set():
-                break
-
-            rid = caller._next_rid()
-            ev  = caller.pending_add(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-            tcp.send_save_data(caller.tcp_sock, rid)
-            if not caller._wait_or_stop(ev):
-                caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-                log_panel.append(f"[AUTO][TIMEOUT] SaveData i={i} rid={rid}", "WARN")
-                break
-            caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-            if caller.delay_sec > 0:
-                time.sleep(caller.delay_sec)
-
-            if caller.progress_every > 0 and (i + 1) % caller.progress_every == 0:
-                cmd_panel.update_auto_progress(i + 1, caller.max_calls)
-                log_panel.append(f"progress {i+1}/{caller.max_calls}", "AUTO")
-
-        cmd_panel.reset_auto_ui()
-        log_panel.append("AutoCaller finished.", "AUTO")
-        if on_done:
-            on_done()
-
-    caller.run = patched_run
+    def _log(msg, level="INFO"):
+        log_panel.append(f"[AUTO] {msg}", "AUTO" if level == "INFO" else level)
 
+    def _progress(done, total, line):
+        cmd_panel.update_auto_progress(done, total)
+        log_panel.append(line, "AUTO")
 
-# ============================================================
-# FileCaller patch
-# ============================================================
-def _patch_fp_caller(caller: ac.AutoCaller, rows: list, entity_id: str, on_done=None):
-    """
-    AutoCaller.run 을 CSV 파일 재생 루프로 교체한다.
-    각 행마다:
-      1. ManualControlById 전송 (fire-and-forget)
-      2. FixedStep 전송 → ACK 대기
-      3. SaveData 전송 → ACK 대기
-    """
     def patched_run():
-        total = len(rows)
-        log_panel.append(f"[FP] 시작: {total}행, entity={entity_id}", "INFO")
-
-        for i, row in enumerate(rows):
-            if caller._stop.is_set():
-                break
-
-            # ── 1. ManualControlById (no ACK) ─────────────────
-            rid = caller._next_rid()
-            tcp.send_manual_control_by_id(
-                caller.tcp_sock, rid,
-                entity_id=entity_id,
-                throttle=row['throttle'],
-                brake=row['brake'],
-                steer_angle=row['swa'],
-            )
-
-            if caller._stop.is_set():
-                break
-
-            # ── 2. FixedStep (ACK 대기) ────────────────────────
-            rid = caller._next_rid()
-            ev  = caller.pending_add(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-            tcp.send_fixed_step(caller.tcp_sock, rid, step_count=caller.step_count)
-            if not caller._wait_or_stop(ev):
-                caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-                log_panel.append(f"[FP][TIMEOUT] FixedStep i={i} rid={rid}", "WARN")
-                break
-            caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_FIXED_STEP)
-
-            if caller._stop.is_set():
-                break
-
-            # ── 3. SaveData (ACK 대기) ─────────────────────────
-            rid = caller._next_rid()
-            ev  = caller.pending_add(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-            tcp.send_save_data(caller.tcp_sock, rid)
-            if not caller._wait_or_stop(ev):
-                caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-                log_panel.append(f"[FP][TIMEOUT] SaveData i={i} rid={rid}", "WARN")
-                break
-            caller.pending_pop(caller.pending, caller.lock, rid, MSG_TYPE_SAVE_DATA)
-
-            if caller.delay_sec > 0:
-                time.sleep(caller.delay_sec)
+        caller.log_fn      = _log
+        caller.on_progress = _progress
+        caller.run_steps()
 
-            # ── Progress ───────────────────────────────────────
-            fp_panel.update_progress(i + 1, total)
-
-        stopped = caller._stop.is_set()
-        fp_panel.reset_ui(stopped=stopped)
-        log_panel.append(f"[FP] {'중단됨' if stopped else '재생 완료'} ({total}행)", "INFO")
+        cmd_panel.reset_auto_ui()
+        log_panel.append(f"AutoCaller finished. {caller.report_line()}", "AUTO")
         if on_done:
             on_done()
 
@@ -574,7 +502,7 @@ def _patch_tfp_caller(caller: ac.AutoCaller, vehicles: list, on_done=None):
             return None
 
         for i in range(total):
-            if caller._stop.is_set():
+            if caller._stop_event.is_set():
                 break
 
             for vehicle in vehicles:
@@ -591,7 +519,7 @@ def _patch_tfp_caller(caller: ac.AutoCaller, vehicles: list, on_done=None):
                     speed=row["speed"],
                 )
 
-            if caller._stop.is_set():
+            if caller._stop_event.is_set():
                 break
 
             tfp_panel.update_progress(i + 1, total)
@@ -603,10 +531,10 @@ def _patch_tfp_caller(caller: ac.AutoCaller, vehicles: list, on_done=None):
                     sleep_sec = max(0.0, min(t_next - t_cur, 0.2))
                 else:
                     sleep_sec = max(caller.delay_sec, 0.02)
-                if sleep_sec > 0 and caller._stop.wait(timeout=sleep_sec):
+                if sleep_sec > 0 and caller._stop_event.wait(timeout=sleep_sec):
                     break
 
-        stopped = caller._stop.is_set()
+        stopped = caller._stop_event.is_set()
         tfp_panel.reset_ui(stopped=stopped)
         log_panel.append(f"[TFP] {'중단됨' if stopped else '재생 완료'} ({total}행)", "INFO")
         if on_done:
@@ -702,6 +630,23 @@ def build_ui(state: AppState):
                 )
             with dpg.menu(label="Settings"):
                 dpg.add_menu_item(label="Preferences (Coming Soon)", enabled=False)
+            with dpg.menu(label="Diagnostics"):
+                dpg.add_menu_item(
+                    label="TCP Latency (p50/p95/p99)",
+                    callback=lambda: [log_panel.append(line, "INFO")
+                                      for line in state.pending.report_lines()],
+                )
+                dpg.add_menu_item(
+                    label="Event Log (recorded/dropped)",
+                    callback=lambda: log_panel.append(
+                        "Event log: " + " ".join(f"{k}={v}" for k, v in elog.stats().items()), "INFO"),
+                )
+                dpg.add_menu_item(
+                    label="ManualControl Bus (dropped/deduplicated)",
+                    callback=lambda: [log_panel.append(line, "INFO")
+                                      for line in (state.control_bus.report_lines()
+                                                   if state.control_bus else ["ManualControl bus: not connected"])],
+                )
 
         with dpg.group(horizontal=True):
             if _logo_tag:
@@ -839,6 +784,26 @@ def build_ui(state: AppState):
 # ============================================================
 def main():
     state = AppState()
+    state.pending.start_reaper()
+    if os.environ.get("MORAI_CAPTURE"):                 # wire capture (tools/replay_capture.py 로 재생)
+        tcp.enable_capture(os.environ["MORAI_CAPTURE"])
+    # hot path event_log: WARN 이상은 GUI 로그 패널에도 (console sink 는 기본 설치)
+    #   tcp.recv (transport/tcp_thread 응답 로그) 는 INFO 부터 — 레벨 조정은 elog.set_level(..., "tcp.recv")
+    elog.add_sink(elog.CallbackSink(log_panel.append, min_level=elog.WARN,
+                                    category_levels={"tcp.recv": elog.INFO}))
+    if os.environ.get("MORAI_EVENT_LOG"):
+        elog.add_sink(elog.FileSink(os.environ["MORAI_EVENT_LOG"]))
+    # metrics exporter: MORAI_METRICS_PORT → http://127.0.0.1:<port>/metrics, MORAI_METRICS_JSONL → 10초마다 1줄
+    metrics.gauge("morai_tcp_pending_in_flight", "ACK 대기 중인 요청 수").set_function(lambda: len(state.pending))
+    metrics.gauge("morai_tcp_writer_queue_depth", "SocketWriter 송신 대기 frame 수").set_function(
+        lambda: state.writer.queue_depth if state.writer is not None else 0)
+    if os.environ.get("MORAI_METRICS_PORT") or os.environ.get("MORAI_METRICS_JSONL"):
+        try:
+            port = os.environ.get("MORAI_METRICS_PORT")
+            metrics.start_exporters(port=int(port) if port else None,
+                                    jsonl_path=os.environ.get("MORAI_METRICS_JSONL"))
+        except (OSError, ValueError) as e:
+            print(f"[metrics] exporter 시작 실패: {e}")
 
     dpg.create_context()
 
@@ -925,6 +890,11 @@ def main():
     _stat_render_ms = 0.0
     _stat_drain_n   = 0
     _stat_frames    = 0
+    _m_frames  = metrics.counter("morai_gui_frames_total", "GUI 메인 루프 프레임 수")
+    _m_slow    = metrics.counter("morai_gui_slow_frames_total", f"render/drain 이 {_FRAME_WARN_MS:.0f}ms 넘은 프레임 수")
+    _m_render  = metrics.histogram("morai_gui_render_seconds", "render_dearpygui_frame 소요")
+    _m_drain   = metrics.histogram("morai_gui_drain_seconds", "ui_queue.drain 소요")
+    _m_fps     = metrics.gauge("morai_gui_fps", f"최근 {_STAT_INTERVAL:.0f}초 평균 fps")
 
     # viewport 위치/크기 추적 (window drag 진단)
     _last_vp_pos  = list(dpg.get_viewport_pos())
@@ -964,6 +934,12 @@ def main():
         vp_moved   = (post_pos  != pre_pos)
         vp_resized = (post_size != pre_size)
 
+        _m_frames.inc()
+        _m_drain.record(t1 - t0)
+        _m_render.record(t2 - t1)
+        if render_ms > _FRAME_WARN_MS or drain_ms > _FRAME_WARN_MS:
+            _m_slow.inc()
+
         if render_ms > _FRAME_WARN_MS:
             diag = []
             if vp_moved:
@@ -995,6 +971,7 @@ def main():
         now = time.monotonic()
         if now - _stat_t >= _STAT_INTERVAL:
             f = max(_stat_frames, 1)
+            _m_fps.set(_stat_frames / _STAT_INTERVAL)
             print(
                 f"[STAT] frames={_stat_frames}"
                 f"  fps={_stat_frames/_STAT_INTERVAL:.1f}"
@@ -1020,6 +997,15 @@ def main():
         state.lc_runner.stop()
     if state.receiver:
         state.receiver.stop()
+    state.pending.stop_reaper()
+    metrics.stop_exporters()
+    tcp.disable_capture()
+    elog.get().stop()
+    if state.control_bus:
+        state.control_bus.stop()
+    if state.writer:
+        state.writer.stop()
+        state.writer.join(timeout=1.0)
     if state.tcp_sock:
         _close_socket(state.tcp_sock)
     dpg.destroy_context()
@@ -1,3 +1,4 @@
+import os
 import socket
 import threading
 import time
@@ -5,8 +6,10 @@ import time
 from transport.protocol_defs import *
 import transport.tcp_transport as tcp
 import transport.tcp_thread as tcp_thread
+from transport.pending import PendingTable
 import automation.automation as ac
 import utils.key_input as key_input
+import utils.metrics as metrics
 import transport.commands as commands
 import utils.input_helper as prompt
 
@@ -28,22 +31,6 @@ class RequestIdCounter:
         return rid
 
 
-# ============================================================
-# Pending (request sync)
-# key: (request_id, msg_type) -> {"t": float, "ev": Event}
-# ============================================================
-
-def pending_add(pending: dict, lock: threading.Lock, request_id: int, msg_type: int) -> threading.Event:
-    ev = threading.Event()
-    with lock:
-        pending[(request_id, msg_type)] = {"t": time.time(), "ev": ev}
-    return ev
-
-def pending_pop(pending: dict, lock: threading.Lock, request_id: int, msg_type: int):
-    with lock:
-        pending.pop((request_id, msg_type), None)
-
-
 # ============================================================
 # Connection helpers
 # ============================================================
@@ -65,16 +52,19 @@ def _make_tcp_socket() -> socket.socket:
     return s
 
 
-def connect_and_start_receiver(pending: dict, lock: threading.Lock):
+def connect_and_start_receiver(pending: PendingTable):
+    """연결 후 (sock, writer, receiver) 반환. 송신은 모두 writer 를 거친다."""
     sock = _make_tcp_socket()
     while True:
         try:
             print("[INFO] Attempting to connect...")
             sock.connect((TCP_SERVER_IP, TCP_SERVER_PORT))
             print(f"[INFO] Connected. IP: {TCP_SERVER_IP}, Port: {TCP_SERVER_PORT}")
-            receiver = tcp_thread.Receiver(sock, pending, lock)
+            receiver = tcp_thread.Receiver(sock, pending)
             receiver.start()
-            return sock, receiver
+            writer = tcp.SocketWriter(sock, on_error=lambda e: print(f"[ERROR] Send failed: {e}"))
+            writer.start()
+            return sock, writer, receiver
         except Exception as e:
             print(f"[ERROR] IP: {TCP_SERVER_IP}, Port: {TCP_SERVER_PORT} Connect failed: {e}. Retrying in 5 seconds...")
             _close_socket(sock)
@@ -106,6 +96,7 @@ def print_key_bindings():
     print("  [d] LoadSuite                    (TCP 0x1402)")
     print("---- ETC ---------------------")
     print(f" [W] Toggle AutoCall (FixedStep <-> SaveData) x {MAX_CALL_NUM}")
+    print("  [L] Show TCP latency (p50/p95/p99)")
     print("  [Q] Quit\n")
 
 
@@ -114,19 +105,25 @@ def print_key_bindings():
 # ============================================================
 
 def main():
-    pending      = {}
-    lock         = threading.Lock()
+    pending      = PendingTable()
     rid_counter  = RequestIdCounter()
     receiver     = None
     auto_caller  = None
 
-    tcp_sock, receiver = connect_and_start_receiver(pending, lock)
+    pending.start_reaper()
+    if os.environ.get("MORAI_CAPTURE"):                 # wire capture (tools/replay_capture.py 로 재생)
+        tcp.enable_capture(os.environ["MORAI_CAPTURE"])
+    if os.environ.get("MORAI_METRICS_PORT") or os.environ.get("MORAI_METRICS_JSONL"):   # utils/metrics.py
+        port = os.environ.get("MORAI_METRICS_PORT")
+        metrics.start_exporters(port=int(port) if port else None,
+                                jsonl_path=os.environ.get("MORAI_METRICS_JSONL"))
+    raw_sock, tcp_sock, receiver = connect_and_start_receiver(pending)
     print_key_bindings()
 
     def dispatch(msg_type: int, send_fn):
         """rid 발급 → pending 등록 → send_fn(rid) 호출."""
         rid = rid_counter.next()
-        pending_add(pending, lock, rid, msg_type)
+        pending.add(rid, msg_type)
         send_fn(rid)
 
     def toggle_auto_caller():
@@ -135,14 +132,12 @@ def main():
             auto_caller = ac.AutoCaller(
                 tcp_sock=tcp_sock,
                 pending=pending,
-                lock=lock,
                 request_id_ref=rid_counter,
                 max_calls=MAX_CALL_NUM,
-                pending_add_fn=pending_add,
-                pending_pop_fn=pending_pop,
                 step_count=1,
                 timeout_sec=AUTO_TIMEOUT_SEC,
                 delay_sec=AUTO_DELAY_BETWEEN_CMDS_SEC,
+                pipeline_depth=AUTO_PIPELINE_DEPTH,
             )
             auto_caller.start()
         else:
@@ -156,7 +151,7 @@ def main():
             auto_caller = None
 
     def reconnect():
-        nonlocal tcp_sock, receiver
+        nonlocal raw_sock, tcp_sock, receiver
         stop_auto_caller()
         if receiver is not None:
             try:
@@ -164,8 +159,10 @@ def main():
             except Exception:
                 pass
             receiver = None
-        _close_socket(tcp_sock)
-        tcp_sock, receiver = connect_and_start_receiver(pending, lock)
+        tcp_sock.stop()
+        _close_socket(raw_sock)
+        pending.fail_all()
+        raw_sock, tcp_sock, receiver = connect_and_start_receiver(pending)
         print_key_bindings()
 
     try:
@@ -249,6 +246,9 @@ def main():
                 elif key in ("w", "W"):
                     toggle_auto_caller()
 
+                elif key in ("l", "L"):
+                    print("\n".join(pending.report_lines()))
+
             except (ConnectionError, OSError) as e:
                 print(f"[ERROR] Connection lost: {e}")
                 reconnect()
@@ -257,12 +257,17 @@ def main():
 
     finally:
         stop_auto_caller()
+        pending.stop_reaper()
+        metrics.stop_exporters()
+        tcp.disable_capture()
         if receiver is not None:
             try:
                 receiver.stop()
             except Exception:
                 pass
-        _close_socket(tcp_sock)
+        tcp_sock.stop()
+        tcp_sock.join(timeout=1.0)
+        _close_socket(raw_sock)
         print("Disconnected.")
 
 
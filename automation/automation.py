@@ -1,103 +1,254 @@
 # autocaller.py
 import threading
 import time
+from collections import deque
 
 import transport.protocol_defs as proto
 import transport.tcp_transport as tcp
+from transport.pending import LatencyHistogram
+from transport.retry_policy import StepRetryPolicy
+from automation.step_schedule import StepSchedule
+import utils.metrics as metrics
+
+
 class AutoCaller(threading.Thread):
     """
     FixedStep <-> SaveData를 max_calls 만큼 반복 호출.
-    - pending dict의 (request_id, msg_type) 이벤트를 기다려서 동기화
+    - PendingTable 의 (request_id, msg_type) 이벤트를 기다려서 동기화
+    - pipeline_depth=1 : FixedStep → ACK → SaveData → ACK 순서 엄수 (기존 동작)
+    - pipeline_depth=K : FixedStep+SaveData 쌍을 최대 K 개까지 ACK 없이 먼저 송신하고
+                         가장 오래된 쌍의 ACK 부터 request_id 로 확인 (왕복 대기 겹치기)
+                         서버가 TCP 도착 순서대로 처리한다는 전제 (PendingStepQueue)
+    - step_dt_sec 을 주면 progress 때 RTF (sim 시간 / 실경과 시간) 도 보고
+    - schedule (StepSchedule) 을 주면 FixedStep 마다 step_count 를 schedule 이 결정
+      (없으면 고정 step_count). max_calls 는 FixedStep 호출 수, 진행 틱 수는 ticks_done
+    - ACK 대기는 StepRetryPolicy: 관측 RTT 기반 timeout (timeout_sec 는 상한), 무응답 시
+      GetSimulationTimeStatus step_index 로 ACK 유실 / 요청 유실을 구분해 유실된 FixedStep 만
+      같은 request_id 로 재전송 (최대 max_retries 번). max_retries=0 이면 timeout_sec 고정 대기 후 중단
+      · ACK 유실 판정 기준은 확인 시점까지 송신한 FixedStep 틱 총합 — 확인 요청이 뒤에 보낸
+        FixedStep 보다 늦게 처리되므로, 앞선 FixedStep 이 유실돼도 뒤의 틱만으로 이 FixedStep 의
+        송신 시점 누적값은 넘어설 수 있다
+      · pipeline_depth>1 이면 재전송하지 않음 — 재전송이 뒤에 보낸 FixedStep/SaveData 보다 늦게
+        도착해 순서가 깨진다. ACK 유실 확인만 하고, 그 외에는 max_retries 동안 기다린 뒤 중단
+      · SaveData 는 재전송하지 않음 — ACK 유실과 구분할 수 없어 중복 저장이 될 수 있다
     """
 
     def __init__(
         self,
         tcp_sock,
-        pending: dict,
-        lock: threading.Lock,
-        request_id_ref: dict,
+        pending,
+        request_id_ref,
         max_calls: int,
-        pending_add_fn,
-        pending_pop_fn,
         step_count: int = 1,
         timeout_sec: float = 3.0,
         delay_sec: float = 0.0,
         progress_every: int = 50,
+        pipeline_depth: int = 1,
+        step_dt_sec: float = 0.0,     # FixedStep 1 tick 의 sim 시간 (Sim DT). 0 → RTF 생략
+        log_fn=None,
+        on_progress=None,             # on_progress(done, total, report_line)
+        schedule: StepSchedule = None,
+        max_retries: int = proto.AUTO_MAX_RETRIES,
+        min_timeout_sec: float = proto.AUTO_MIN_TIMEOUT_SEC,
     ):
         super().__init__(daemon=True)
         self.tcp_sock = tcp_sock
-        self.pending = pending
-        self.lock = lock
-        self.request_id_ref = request_id_ref  # {"value": int}
+        self.pending = pending                # transport.pending.PendingTable
+        self.request_id_ref = request_id_ref  # RequestIdCounter
         self.max_calls = max_calls
 
-        # 외부 함수 주입(메인에 pending_*가 남아 있어도 분리 가능)
-        self.pending_add = pending_add_fn
-        self.pending_pop = pending_pop_fn
-
         self.step_count = step_count
         self.timeout_sec = timeout_sec
         self.delay_sec = delay_sec
         self.progress_every = progress_every
-
-        self._stop = threading.Event()
+        self.pipeline_depth = max(1, int(pipeline_depth))
+        self.step_dt_sec = step_dt_sec
+        self.schedule = schedule if schedule is not None else StepSchedule(decimation=step_count)
+
+        self.log_fn = log_fn or (lambda msg, level="INFO": print(f"[AUTO] {msg}"))
+        self.on_progress = on_progress
+        self.retry = StepRetryPolicy(
+            tcp_sock, pending, request_id_ref,
+            initial_timeout_sec=timeout_sec,
+            min_timeout_sec=min_timeout_sec,
+            max_timeout_sec=timeout_sec,
+            max_retries=max_retries,
+            log_fn=self.log_fn,
+        )
+
+        self._stop_event = threading.Event()
+
+        self.steps_done = 0
+        self.ticks_done = 0
+        self._step_ticks = {}         # FixedStep rid -> step_count (ACK 시 ticks_done 에 반영)
+        self._base_step_index = None  # 시작 시 서버 step_index (재전송 판단용, 모르면 None)
+        self._sent_ticks = 0          # 송신한 FixedStep step_count 합
+        self._t_start = None
+        self._latency = {
+            proto.MSG_TYPE_FIXED_STEP: LatencyHistogram(),
+            proto.MSG_TYPE_SAVE_DATA:  LatencyHistogram(),
+        }
+        labels = {"runner": type(self).__name__}
+        self._m_steps = metrics.counter("morai_auto_steps_total", "AutoCaller 완료 FixedStep/SaveData 쌍 수", labels)
+        self._m_ticks = metrics.counter("morai_auto_ticks_total", "AutoCaller 진행 sim 틱 수", labels)
+        self._m_timeouts = metrics.counter("morai_auto_timeouts_total", "AutoCaller ACK timeout/중단 수", labels)
 
     def stop(self):
-        self._stop.set()
+        self._stop_event.set()
 
     def _next_rid(self) -> int:
         return self.request_id_ref.next()
 
-    # def _next_rid(self) -> int:
-    #     with self.lock:
-    #         rid = self.request_id_ref["value"]
-    #         self.request_id_ref["value"] += 1
-    #     return rid
-
-    def _wait_or_stop(self, ev: threading.Event) -> bool:
-        if self._stop.is_set():
+    # ── 송신 / ACK ─────────────────────────────────────────────
+
+    def _send(self, msg_type: int):
+        rid = self._next_rid()
+        ev = self.pending.add(rid, msg_type)
+        if msg_type == proto.MSG_TYPE_FIXED_STEP:
+            k = self._step_ticks[rid] = self.schedule.next_step_count()
+            self._sent_ticks += k
+            tcp.send_fixed_step(self.tcp_sock, rid, step_count=k)
+        else:
+            tcp.send_save_data(self.tcp_sock, rid)
+        return rid, ev
+
+    def _await(self, i: int, rid: int, msg_type: int, ev) -> bool:
+        expected = None
+        if rid in self._step_ticks and self._base_step_index is not None:
+            # GetStatus 확인은 뒤에 보낸 FixedStep 들보다도 늦게 도착하므로, 이 FixedStep 이 최신이
+            # 아니면 뒤의 틱까지 더한 값 (송신 총합) 에 도달해야 이 요청도 처리됐다고 볼 수 있다
+            # (이 요청이 유실돼도 뒤의 FixedStep 만으로 '이 FixedStep 까지' 값은 넘어선다).
+            expected = self._base_step_index + self._sent_ticks
+        ok = self.retry.wait(rid, msg_type, ev, step_count=self._step_ticks.get(rid, 1),
+                             expected_step_index=expected, stop_event=self._stop_event,
+                             resend=self.pipeline_depth == 1)
+        self.pending.pop(rid, msg_type)
+        ticks = self._step_ticks.pop(rid, 0) if msg_type == proto.MSG_TYPE_FIXED_STEP else 0
+        latency = getattr(ev, "latency", 0.0)
+        if not ok:                      # timeout / stop / fail_all (연결 끊김)
+            name = "FixedStep" if msg_type == proto.MSG_TYPE_FIXED_STEP else "SaveData"
+            self.log_fn(f"[TIMEOUT/STOP] {name} i={i} rid={rid}", "WARN")
+            if not self._stop_event.is_set():
+                self._m_timeouts.inc()
             return False
-        return ev.wait(self.timeout_sec)
+        if latency is not None:         # None → ACK 유실을 step_index 로 확인한 경우
+            self._latency[msg_type].record(latency)
+        self.ticks_done += ticks
+        if ticks:
+            self._m_ticks.inc(ticks)
+        return True
+
+    def _before_step(self, i: int) -> None:
+        """FixedStep(i) 송신 직전 hook (FilePlayback 은 여기서 ManualControlById 송신)."""
+
+    def _step_done(self) -> None:
+        self.steps_done += 1
+        self._m_steps.inc()
+        if self.delay_sec > 0.0:
+            time.sleep(self.delay_sec)
+        if self.progress_every > 0 and self.steps_done % self.progress_every == 0:
+            line = self.report_line()
+            if self.on_progress is not None:
+                self.on_progress(self.steps_done, self.max_calls, line)
+            else:
+                self.log_fn(line)
+
+    # ── 실행 ──────────────────────────────────────────────────
 
     def run(self):
-        print(f"[AUTO] started. target_steps={self.max_calls}")
-
+        self.log_fn(f"started. target_steps={self.max_calls} depth={self.pipeline_depth}")
+        self.run_steps()
+        self.log_fn(f"stopped. {self.report_line()}")
+
+    def run_steps(self) -> int:
+        """FixedStep/SaveData 반복. 완료한 step 수 반환."""
+        self.steps_done = 0
+        self.ticks_done = 0
+        self._step_ticks.clear()
+        self._sent_ticks = 0
+        self._base_step_index = None
+        if self.retry.max_retries > 0 and self.max_calls > 0:
+            self._base_step_index = self.retry.query_step_index(self.timeout_sec)
+        self._t_start = time.perf_counter()
+        if self.pipeline_depth == 1:
+            self._run_strict()
+        else:
+            self._run_pipelined()
+        return self.steps_done
+
+    def _run_strict(self) -> None:
+        FS, SD = proto.MSG_TYPE_FIXED_STEP, proto.MSG_TYPE_SAVE_DATA
         for i in range(self.max_calls):
-            if self._stop.is_set():
+            if self._stop_event.is_set():
                 break
 
             # ---- FixedStep ----
-            rid_step = self._next_rid()
-            ev_step = self.pending_add(self.pending, self.lock, rid_step, proto.MSG_TYPE_FIXED_STEP)
-            tcp.send_fixed_step(self.tcp_sock, rid_step, step_count=self.step_count)
-
-            if not self._wait_or_stop(ev_step):
-                self.pending_pop(self.pending, self.lock, rid_step, proto.MSG_TYPE_FIXED_STEP)
-                print(f"[AUTO][TIMEOUT/STOP] FixedStep. i={i} rid={rid_step}")
+            self._before_step(i)
+            rid, ev = self._send(FS)
+            if not self._await(i, rid, FS, ev):
                 break
-            self.pending_pop(self.pending, self.lock, rid_step, proto.MSG_TYPE_FIXED_STEP)
-
             if self.delay_sec > 0.0:
                 time.sleep(self.delay_sec)
-
-            if self._stop.is_set():
+            if self._stop_event.is_set():
                 break
 
             # ---- SaveData ----
-            rid_save = self._next_rid()
-            ev_save = self.pending_add(self.pending, self.lock, rid_save, proto.MSG_TYPE_SAVE_DATA)
-            tcp.send_save_data(self.tcp_sock, rid_save)
-
-            if not self._wait_or_stop(ev_save):
-                self.pending_pop(self.pending, self.lock, rid_save, proto.MSG_TYPE_SAVE_DATA)
-                print(f"[AUTO][TIMEOUT/STOP] SaveData. i={i} rid={rid_save}")
+            rid, ev = self._send(SD)
+            if not self._await(i, rid, SD, ev):
                 break
-            self.pending_pop(self.pending, self.lock, rid_save, proto.MSG_TYPE_SAVE_DATA)
-
-            if self.delay_sec > 0.0:
-                time.sleep(self.delay_sec)
-
-            if self.progress_every > 0 and (i + 1) % self.progress_every == 0:
-                print(f"[AUTO] progress: {i+1}/{self.max_calls}")
-
-        print("[AUTO] stopped.")
\ No newline at end of file
+            self._step_done()
+
+    def _run_pipelined(self) -> None:
+        FS, SD = proto.MSG_TYPE_FIXED_STEP, proto.MSG_TYPE_SAVE_DATA
+        in_flight = deque()   # (i, rid_step, ev_step, rid_save, ev_save) — 송신 순서
+        sent = 0
+        try:
+            while self.steps_done < self.max_calls:
+                while (sent < self.max_calls and len(in_flight) < self.pipeline_depth
+                       and not self._stop_event.is_set()):
+                    self._before_step(sent)
+                    in_flight.append((sent, *self._send(FS), *self._send(SD)))
+                    sent += 1
+                if not in_flight:
+                    break
+                # 두 ACK 를 모두 받을 때까지 in_flight[0] 에 남겨 둠 — 중단 시 finally 가 정리
+                i, rid_step, ev_step, rid_save, ev_save = in_flight[0]
+                if not (self._await(i, rid_step, FS, ev_step) and self._await(i, rid_save, SD, ev_save)):
+                    break
+                in_flight.popleft()
+                self._step_done()
+        finally:
+            # 중단 시 남은 요청 정리 — 이후 도착하는 ACK 는 PendingTable 이 late 로 집계
+            for _, rid_step, _, rid_save, _ in in_flight:
+                self.pending.pop(rid_step, FS)
+                self.pending.pop(rid_save, SD)
+
+    # ── 통계 ──────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self._t_start if self._t_start is not None else 0.0
+        sim_sec = self.ticks_done * self.step_dt_sec
+        return {
+            "steps":         self.steps_done,
+            "ticks":         self.ticks_done,
+            "depth":         self.pipeline_depth,
+            "elapsed_sec":   elapsed,
+            "steps_per_sec": self.steps_done / elapsed if elapsed > 0.0 else 0.0,
+            "rtf":           sim_sec / elapsed if elapsed > 0.0 and sim_sec > 0.0 else None,
+            "fixed_step_ms": self._latency[proto.MSG_TYPE_FIXED_STEP].summary(),
+            "save_data_ms":  self._latency[proto.MSG_TYPE_SAVE_DATA].summary(),
+            "retry":         self.retry.stats(),
+        }
+
+    def report_line(self) -> str:
+        st = self.stats()
+        rtf = f" RTF={st['rtf']:.2f}" if st["rtf"] is not None else ""
+        fs, sd = st["fixed_step_ms"], st["save_data_ms"]
+        ticks = f" ticks={st['ticks']}" if st["ticks"] != st["steps"] else ""
+        rt = st["retry"]
+        retry = (f" | resend={rt['resends']} lost_ack={rt['lost_acks']} "
+                 f"timeout={rt['fixed_step']['timeout_ms']:.0f}ms") if rt["timeouts"] else ""
+        return (f"progress {st['steps']}/{self.max_calls}{ticks} depth={st['depth']} "
+                f"{st['steps_per_sec']:.1f} step/s{rtf} | ACK p50/p95 "
+                f"FixedStep {fs['p50']:.1f}/{fs['p95']:.1f} ms "
+                f"SaveData {sd['p50']:.1f}/{sd['p95']:.1f} ms{retry}")
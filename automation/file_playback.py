@@ -0,0 +1,140 @@
+# file_playback.py
+#
+# Driver-command CSV (throttle / brake / swa) fixed-step 재생.
+# 행마다 ManualControlById → FixedStep → SaveData 를 보내되, 한 행씩 ACK 두 번을 기다리는 대신
+#   - 모든 ManualControlById frame 을 시작 전에 미리 만들어 두고 (행당 pack 없음)
+#   - 최대 pipeline_depth 개의 (control, step, save) 묶음을 ACK 없이 송신한다.
+#
+# 순서 보장 (control_gate=True, 기본):
+#   control(i) 는 FixedStep(i-1) ACK 를 받은 뒤에만 송신 → 서버가 ManualControl 을 수신 즉시
+#   적용하더라도 step(i-1) 에는 row(i-1) 값만, step(i) 에는 row(i) 값만 쓰인다.
+#   SaveData ACK 대기만 다음 행과 겹치므로 행당 왕복 2회 → 약 1회.
+# control_gate=False 면 서버가 도착 순서대로 처리한다는 전제로 묶음 전체를 pipelining.
+import time
+from collections import deque
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from automation.automation import AutoCaller
+
+
+class FilePlayback(AutoCaller):
+    """rows: [{"throttle", "brake", "swa"}, ...] (panels.file_playback_panel._load_csv 형식)."""
+
+    def __init__(
+        self,
+        tcp_sock,
+        pending,
+        request_id_ref,
+        rows: list,
+        entity_id: str,
+        pipeline_depth: int = 1,
+        control_gate: bool = True,
+        timeout_sec: float = 3.0,
+        delay_sec: float = 0.0,
+        progress_every: int = 1,
+        step_dt_sec: float = 0.0,
+        log_fn=None,
+        on_progress=None,             # on_progress(done, total, report_line)
+        on_done=None,                 # on_done(stopped: bool)
+        control_bus=None,             # ControlBus — 재생 후 entity 의 dedup 기억 초기화
+        max_retries: int = proto.AUTO_MAX_RETRIES,
+    ):
+        super().__init__(
+            tcp_sock, pending, request_id_ref,
+            max_calls=len(rows),
+            step_count=1,
+            timeout_sec=timeout_sec,
+            delay_sec=delay_sec,
+            progress_every=progress_every,
+            pipeline_depth=pipeline_depth,
+            step_dt_sec=step_dt_sec,
+            log_fn=log_fn or (lambda msg, level="INFO": print(f"[FP] {msg}")),
+            on_progress=on_progress,
+            max_retries=max_retries,
+        )
+        self.rows = rows
+        self.entity_id = entity_id
+        self.control_gate = control_gate
+        self.on_done = on_done
+        self.control_bus = control_bus
+        self._frames = []
+
+    def _prebuild(self) -> list:
+        """[(rid, ManualControlById frame), ...] — rid 는 fire-and-forget 이라 미리 발급해도 무방."""
+        entity_id = self.entity_id
+        frames = []
+        for row in self.rows:
+            rid = self._next_rid()
+            frames.append((rid, tcp.build_manual_control_by_id_frame(
+                rid, entity_id, row["throttle"], row["brake"], row["swa"])))
+        return frames
+
+    # ── 실행 ──────────────────────────────────────────────────
+
+    def run(self):
+        total = len(self.rows)
+        self.log_fn(f"시작: {total}행, entity={self.entity_id}, depth={self.pipeline_depth}")
+        try:
+            self.run_steps()
+        finally:
+            if self.control_bus is not None:
+                self.control_bus.forget(self.entity_id)
+        stopped = self._stop_event.is_set() or self.steps_done < total
+        self.log_fn(f"{'중단됨' if stopped else '재생 완료'} ({self.steps_done}/{total}행) {self.report_line()}")
+        if self.on_done:
+            self.on_done(stopped)
+
+    def _before_step(self, i: int) -> None:
+        rid, frame = self._frames[i]
+        tcp.send_frame(self.tcp_sock, frame, rid)
+
+    def run_steps(self) -> int:
+        t0 = time.perf_counter()
+        self._frames = self._prebuild()
+        self.log_fn(f"ManualControlById frame {len(self._frames)}개 준비 "
+                    f"({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        try:
+            return super().run_steps()   # depth 1 → _run_strict (기존 순서 그대로)
+        finally:
+            self._frames = []
+
+    def _run_pipelined(self) -> None:
+        FS, SD = proto.MSG_TYPE_FIXED_STEP, proto.MSG_TYPE_SAVE_DATA
+        in_flight = deque()   # [i, rid_step, ev_step, rid_save, ev_save, step_acked] — 송신 순서
+        sent = 0
+        try:
+            while self.steps_done < self.max_calls:
+                # ── 송신: window 와 control gate 가 허용하는 만큼 ──────
+                while (sent < self.max_calls and len(in_flight) < self.pipeline_depth
+                       and not self._stop_event.is_set()):
+                    if self.control_gate and in_flight and not in_flight[-1][5]:
+                        break
+                    self._before_step(sent)
+                    in_flight.append([sent, *self._send(FS), *self._send(SD), False])
+                    sent += 1
+                if not in_flight:
+                    break
+
+                # ── 대기: gate 에 막혔으면 최신 FixedStep, 아니면 가장 오래된 묶음 ──
+                newest = in_flight[-1]
+                if (self.control_gate and not newest[5] and sent < self.max_calls
+                        and len(in_flight) < self.pipeline_depth):
+                    if not self._await(newest[0], newest[1], FS, newest[2]):
+                        break
+                    newest[5] = True
+                    continue
+
+                i, rid_step, ev_step, rid_save, ev_save, step_acked = in_flight[0]
+                if not step_acked:
+                    if not self._await(i, rid_step, FS, ev_step):
+                        break
+                    in_flight[0][5] = True
+                if not self._await(i, rid_save, SD, ev_save):
+                    break
+                in_flight.popleft()
+                self._step_done()
+        finally:
+            for _, rid_step, _, rid_save, _, _ in in_flight:
+                self.pending.pop(rid_step, FS)
+                self.pending.pop(rid_save, SD)
@@ -0,0 +1,88 @@
+# step_schedule.py
+#
+# Fixed-step multi-rate 스케줄: control 갱신 1회당 FixedStep(step_count=k) 1회.
+#   k 틱 동안 직전 control 이 유지되고, 왕복 1회로 k 틱을 진행한다 → RTF 는 최대 k 배,
+#   control / SaveData / VI 갱신 빈도는 1/k.
+#
+# adaptive=True 면 k 를 control 변화량으로 조절 (AIMD):
+#   - 한 갱신 동안 가장 크게 바뀐 control 값 |Δ| > busy_delta → k 절반 (급조향·급제동 구간)
+#   - |Δ| < calm_delta 가 patience 회 연속                → k + 1 (직진·정속 구간)
+#   observe() 가 한 번도 안 불리면 (AutoCaller 처럼 control 이 없으면) k 는 고정.
+from collections import Counter
+
+
+class StepSchedule:
+    def __init__(
+        self,
+        decimation: int = 1,
+        adaptive: bool = False,
+        min_decimation: int = 1,
+        max_decimation: int = 8,
+        calm_delta: float = 0.05,
+        busy_delta: float = 0.2,
+        patience: int = 3,
+    ):
+        self.min_decimation = max(1, int(min_decimation))
+        self.max_decimation = max(self.min_decimation, int(max_decimation))
+        self.adaptive = adaptive
+        self.calm_delta = calm_delta
+        self.busy_delta = busy_delta
+        self.patience = patience
+
+        self.k = min(max(int(decimation), self.min_decimation), self.max_decimation) if adaptive \
+            else max(1, int(decimation))
+
+        self._last = {}          # key -> 직전 control tuple
+        self._delta = 0.0        # 이번 갱신 동안 최대 |Δ|
+        self._observed = False
+        self._calm = 0
+
+        self.updates = 0
+        self.ticks = 0
+        self.k_counts = Counter()
+
+    def observe(self, key, *values) -> None:
+        """이번 갱신에서 key (entity) 로 보낸 control 값 기록."""
+        prev = self._last.get(key)
+        if prev is not None:
+            delta = max(abs(a - b) for a, b in zip(values, prev))
+            if delta > self._delta:
+                self._delta = delta
+        self._last[key] = values
+        self._observed = True
+
+    def next_step_count(self) -> int:
+        """FixedStep 송신 직전에 호출 — 이번 step_count 반환."""
+        if self.adaptive and self._observed:
+            if self._delta > self.busy_delta:
+                self.k = max(self.min_decimation, self.k // 2)
+                self._calm = 0
+            elif self._delta < self.calm_delta:
+                self._calm += 1
+                if self._calm >= self.patience:
+                    self.k = min(self.max_decimation, self.k + 1)
+                    self._calm = 0
+            else:
+                self._calm = 0
+        self._delta = 0.0
+        self._observed = False
+
+        self.updates += 1
+        self.ticks += self.k
+        self.k_counts[self.k] += 1
+        return self.k
+
+    def reset(self) -> None:
+        self._last.clear()
+        self._delta = 0.0
+        self._observed = False
+        self._calm = 0
+
+    def stats(self) -> dict:
+        return {
+            "k":       self.k,
+            "updates": self.updates,
+            "ticks":   self.ticks,
+            "mean_k":  self.ticks / self.updates if self.updates else 0.0,
+            "k_counts": dict(sorted(self.k_counts.items())),
+        }
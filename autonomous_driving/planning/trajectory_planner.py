@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# PathManager 경로 + velocity profile → SetTrajectory (0x1304) points
+#
+# 매 tick ManualControlById 를 보내는 대신, 경로를 시간 파라미터화해서 한 번 (또는 rolling window 로)
+# 업로드하고 아래 경우에만 다시 업로드한다.
+#   - "initial"   : 첫 업로드
+#   - "plan"      : velocity profile 교체 (max speed 변경 등) 또는 speed cap 변경
+#   - "deviation" : 차량이 경로에서 deviation_m 이상 벗어남 (deviation_m/2 안으로 돌아와야 재무장)
+#   - "window"    : rolling window 의 (1 - refresh_margin) 지점을 지남 / closed path 한 바퀴 완료
+#
+# max_error > 0 이면 업로드 직전 Douglas-Peucker 로 점 수를 줄인다 (trajectory_simplify.py).
+# window 진행도는 단순화 전 경로 index 기준이라 단순화 여부와 무관하다.
+from __future__ import annotations
+
+from collections import Counter
+
+import numpy as np
+
+from .trajectory_simplify import simplify_trajectory
+
+
+def time_parameterize(xy, velocity, min_velocity=0.5):
+    """호 길이를 따라 구간 평균 속도로 누적 시간 계산 (t[0] = 0).
+
+    xy: (N, 2), velocity: (N,) m/s. 정지 구간은 min_velocity 로 하한을 둔다.
+    """
+    seg = np.hypot(*np.diff(xy, axis=0).T)
+    v   = np.maximum(0.5 * (velocity[:-1] + velocity[1:]), min_velocity)
+    return np.concatenate(([0.0], np.cumsum(seg / v)))
+
+
+class TrajectoryPlanner:
+    _SEARCH_BACK, _SEARCH_FRONT = 5, 100     # PathManager.get_local_path 와 같은 탐색 창
+
+    def __init__(self, path_manager, window_points=0, deviation_m=3.0,
+                 refresh_margin=0.25, min_velocity=0.5, speed_cap=None,
+                 max_error=0.0, max_time_error=0.1):
+        self.path_manager   = path_manager
+        self.window_points  = int(window_points)        # 0 → 경로 전체 (closed path 는 한 바퀴)
+        self.deviation_m    = float(deviation_m)
+        self.refresh_margin = float(refresh_margin)
+        self.min_velocity   = float(min_velocity)
+        self.speed_cap      = speed_cap                 # m/s, None → profile 그대로
+        self.max_error      = float(max_error)          # m, 0 → 단순화 안 함
+        self.max_time_error = max_time_error            # s, None → 시간 오차 무시
+
+        self._xy       = np.asarray(path_manager.path, dtype=np.float64).reshape(-1, 2)
+        self._closed   = bool(path_manager.is_closed_path)
+        self._index    = 0
+        self._profile  = None      # 마지막 업로드에 쓴 velocity_profile 객체
+        self._cap_used = None
+        self._start    = None      # 업로드한 window 시작 index
+        self._length   = 0         # 업로드한 point 수
+        self._deviated = False     # deviation 재업로드 후 복귀 전까지 반복 업로드 방지
+
+        self.uploads = 0
+        self.reasons = Counter()
+        self.last_report = None    # 마지막 업로드의 SimplifyReport (단순화 안 하면 None)
+
+    def set_speed_cap(self, speed_cap):
+        self.speed_cap = speed_cap
+
+    # ── 위치 ────────────────────────────────────────────────
+    def _nearest(self, x, y, full=False):
+        n = len(self._xy)
+        if full:   # 첫 호출: 차량이 경로 중간에서 시작할 수 있으므로 전체 탐색
+            idx = np.arange(n)
+        else:
+            idx = np.arange(self._index - self._SEARCH_BACK, self._index + self._SEARCH_FRONT + 1)
+            idx = idx % n if self._closed else idx[(idx >= 0) & (idx < n)]
+        d2  = (self._xy[idx, 0] - x) ** 2 + (self._xy[idx, 1] - y) ** 2
+        k   = int(np.argmin(d2))
+        self._index = int(idx[k])
+        return self._index, float(np.sqrt(d2[k]))
+
+    def _progress(self, index):
+        """업로드한 window 시작점으로부터 진행한 point 수."""
+        delta = index - self._start
+        return delta % len(self._xy) if self._closed else delta
+
+    # ── 계획 ────────────────────────────────────────────────
+    def plan(self, start_index, z=0.0):
+        """start_index 부터 window 만큼의 (M, 4) [x, y, z, time] float64 배열."""
+        n = len(self._xy)
+        length = self.window_points or n
+        if self._closed:
+            idx = (start_index + np.arange(min(length, n))) % n
+        else:
+            idx = np.arange(start_index, min(start_index + length, n))
+        velocity = np.asarray(self.path_manager.velocity_profile, dtype=np.float64)[idx]
+        if self.speed_cap is not None:
+            velocity = np.minimum(velocity, self.speed_cap)
+        xy = self._xy[idx]
+        points = np.empty((len(idx), 4), dtype=np.float64)
+        points[:, :2] = xy
+        points[:, 2]  = z
+        points[:, 3]  = time_parameterize(xy, velocity, self.min_velocity)
+        return points
+
+    def update(self, vehicle_state, z=0.0):
+        """업로드가 필요하면 (points, reason), 아니면 None."""
+        index, dist = self._nearest(vehicle_state.position.x, vehicle_state.position.y,
+                                    full=self._start is None)
+
+        reason = None
+        if self._start is None:
+            reason = "initial"
+        elif (self.path_manager.velocity_profile is not self._profile
+                or self.speed_cap != self._cap_used):
+            reason = "plan"
+        elif dist > self.deviation_m and not self._deviated:
+            reason = "deviation"
+        elif self._closed or self.window_points:
+            refresh_at = self._length * (1.0 - self.refresh_margin)
+            if self._progress(index) >= refresh_at and (self._closed or self._start + self._length < len(self._xy)):
+                reason = "window"
+        if dist < 0.5 * self.deviation_m:
+            self._deviated = False
+        if reason is None:
+            return None
+        if dist > self.deviation_m:
+            self._deviated = True
+
+        points = self.plan(index, z)
+        self._profile  = self.path_manager.velocity_profile
+        self._cap_used = self.speed_cap
+        self._start    = index
+        self._length   = len(points)
+        if self.max_error > 0.0:
+            points, self.last_report = simplify_trajectory(points, self.max_error, self.max_time_error)
+        self.uploads  += 1
+        self.reasons[reason] += 1
+        return points, reason
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SetTrajectory (0x1304) 업로드 전 (N, 4) [x, y, z, time] 배열 단순화
+#
+# path_link.csv / MGeo point_path 는 직선 구간에 점이 촘촘해서 payload 대부분이 중복이다.
+# Douglas-Peucker 로 남길 점만 고르되, 재귀 대신 "레벨 단위" 로 모든 구간을 한꺼번에 처리한다.
+#   1) 현재 남긴 점 (anchor) 사이 구간마다 내부 점의 chord 까지 수평 거리 (x, y) 계산
+#   2) 허용 오차를 넘는 구간마다 가장 먼 점 하나를 anchor 로 추가
+#   3) 추가할 점이 없으면 종료  → 반복 횟수 ≈ log2(N), 각 반복은 numpy 연산 몇 번
+#
+# 시간 축: 남긴 점의 time 은 그대로 유지된다. 직선이어도 감속 구간 (open path 끝 등) 을
+# 지우면 시뮬레이터가 평균 속도로 보간하므로, chord 위 선형 보간 시간과의 차이가
+# max_time_error 를 넘는 점도 남긴다 (None → 시간 오차 무시).
+from __future__ import annotations
+
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class SimplifyReport(NamedTuple):
+    input_points:  int
+    output_points: int
+    max_error:     float     # 남긴 chord 까지의 최대 수평 거리 [m]
+    max_time_error: float    # chord 위 선형 보간 시간과의 최대 차이 [s]
+
+    @property
+    def ratio(self) -> float:
+        """압축률 (input / output). payload 크기도 거의 같은 비율로 줄어든다."""
+        return self.input_points / self.output_points if self.output_points else 1.0
+
+    def __str__(self) -> str:
+        return (f"{self.input_points}→{self.output_points} pts (x{self.ratio:.1f}, "
+                f"max err {self.max_error:.3f} m / {self.max_time_error:.3f} s)")
+
+
+def _chord_errors(points, anchors):
+    """각 점 → 자신이 속한 anchor 구간 chord 까지 (수평 거리, 보간 시간 차이, 구간 번호)."""
+    n   = len(points)
+    seg = np.searchsorted(anchors, np.arange(n), side="right") - 1
+    seg = np.minimum(seg, len(anchors) - 2)
+    a, b = points[anchors[seg]], points[anchors[seg + 1]]
+
+    ab = b[:, :2] - a[:, :2]
+    ap = points[:, :2] - a[:, :2]
+    ab2 = np.einsum("ij,ij->i", ab, ab)
+    s   = np.clip(np.einsum("ij,ij->i", ap, ab) / np.where(ab2 > 0.0, ab2, 1.0), 0.0, 1.0)
+    lateral  = np.hypot(*(ap - s[:, None] * ab).T)
+    time_err = np.abs(points[:, 3] - (a[:, 3] + s * (b[:, 3] - a[:, 3])))
+    return lateral, time_err, seg
+
+
+def simplify_trajectory(
+    points,
+    max_error: float = 0.1,
+    max_time_error: Optional[float] = 0.1,
+) -> Tuple[np.ndarray, SimplifyReport]:
+    """Douglas-Peucker (수평 오차 max_error [m] 이내) — (단순화된 C-contiguous 배열, report).
+
+    첫 점과 마지막 점은 항상 남는다. 입력 배열은 수정하지 않는다.
+    """
+    pts = np.ascontiguousarray(points, dtype=np.float64)
+    if pts.ndim != 2 or pts.shape[1] != 4:
+        raise ValueError(f"trajectory points must be (N, 4) [x, y, z, time], got {pts.shape}")
+    if max_error <= 0.0:
+        raise ValueError(f"max_error must be > 0, got {max_error}")
+    n = len(pts)
+    if n <= 2:
+        return pts, SimplifyReport(n, n, 0.0, 0.0)
+
+    # 오차를 허용치로 나눈 값으로 비교 → 둘 중 더 심한 쪽이 기준
+    t_scale = 1.0 / max_time_error if max_time_error else 0.0
+    d_scale = 1.0 / max_error
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    while True:
+        anchors = np.flatnonzero(keep)
+        lateral, time_err, seg = _chord_errors(pts, anchors)
+        score = np.maximum(lateral * d_scale, time_err * t_scale)
+        score[anchors] = 0.0
+        over = score > 1.0
+        if not over.any():
+            break
+        # 초과한 구간마다 score 최대인 점 하나씩 추가
+        cand  = np.flatnonzero(over)
+        order = np.lexsort((-score[cand], seg[cand]))
+        cand  = cand[order]
+        first = np.concatenate(([True], seg[cand][1:] != seg[cand][:-1]))
+        keep[cand[first]] = True
+
+    lateral[anchors] = 0.0
+    time_err[anchors] = 0.0
+    out = pts[anchors]
+    return out, SimplifyReport(n, len(out), float(lateral.max()), float(time_err.max()))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+# benchmarks/bench_io.py
+#
+# I/O benchmark
+#   - recv_packet / StreamReader 수신 처리량 (socketpair, 미리 채운 stream)
+#   - FixedStep round-trip rate (tools/sim_stub loopback, 직렬 / pipelined)
+
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from tools.sim_stub import SimStub
+
+
+def _ack_stream(count: int) -> bytes:
+    ack = struct.pack(proto.RESULT_FMT, 0, 0)
+    return b"".join(
+        tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), rid) + ack
+        for rid in range(count)
+    )
+
+
+def _recv_rate(read_one: Callable[[socket.socket], Callable[[], object]], count: int) -> float:
+    """별도 스레드가 count 개 ACK frame 을 흘려보내고, 수신 측 packets/sec 반환."""
+    client, server = socket.socketpair()
+    data = _ack_stream(count)
+    feeder = threading.Thread(target=server.sendall, args=(data,), daemon=True)
+    try:
+        read = read_one(client)
+        t0 = time.perf_counter()
+        feeder.start()
+        for _ in range(count):
+            read()
+        dt = time.perf_counter() - t0
+    finally:
+        feeder.join(timeout=5.0)
+        client.close()
+        server.close()
+    return count / dt
+
+
+def recv_packet_rate(count: int) -> float:
+    return _recv_rate(lambda sock: (lambda: tcp.recv_packet(sock)), count)
+
+
+def stream_reader_rate(count: int) -> float:
+    return _recv_rate(lambda sock: tcp.StreamReader(sock).read_packet, count)
+
+
+def fixed_step_rate(steps: int, window: int = 1) -> float:
+    """SimStub 에 FixedStep 을 window 개씩 in-flight 로 보내고 ACK/sec 반환."""
+    with SimStub() as stub:
+        sock = socket.create_connection(stub.address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = tcp.StreamReader(sock)
+        try:
+            t0 = time.perf_counter()
+            sent = acked = 0
+            while acked < steps:
+                while sent < steps and sent - acked < window:
+                    sent += 1
+                    tcp.send_fixed_step(sock, sent, step_count=1)
+                reader.read_packet()
+                acked += 1
+            dt = time.perf_counter() - t0
+        finally:
+            sock.close()
+    return steps / dt
+
+
+def cases(quick: bool = False) -> List[Tuple[str, Callable[[], float]]]:
+    """(name, fn) — fn() 이 ops/sec 를 직접 반환."""
+    n_recv  = 20_000 if quick else 200_000
+    n_steps = 500 if quick else 5_000
+    return [
+        ("io.recv_packet",         lambda: recv_packet_rate(n_recv)),
+        ("io.stream_reader",       lambda: stream_reader_rate(n_recv)),
+        ("e2e.fixed_step_serial",  lambda: fixed_step_rate(n_steps, window=1)),
+        ("e2e.fixed_step_window4", lambda: fixed_step_rate(n_steps, window=4)),
+    ]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+# benchmarks/bench_payloads.py
+#
+# micro benchmark — payload build / pack / unpack / parse 의 ops/sec.
+# 각 case 는 (name, fn) 이며 fn() 1회 = 1 op.
+
+import array
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from transport.message_schema import get_codec, pack_message_payload, unpack_message_payload
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def _points(n: int) -> List[Tuple[float, float, float, float]]:
+    return [(float(i), float(i) * 0.5, 0.0, i * 0.1) for i in range(n)]
+
+
+def build_cases() -> List[Case]:
+    points = _points(100)
+    flat   = array.array("d", [v for p in points for v in p])
+    return [
+        ("build.fixed_step",            lambda: tcp.build_fixed_step_payload(1)),
+        ("build.simulation_time_mode",  lambda: tcp.build_simulation_time_mode_payload(
+            proto.TIME_MODE_FIXED, simulation_delta_time=20, rtf=1, user_control=1)),
+        ("build.create_object",         lambda: tcp.build_create_object_payload(
+            1, 1.0, 2.0, 0.0, 0.0, 0.0, 90.0, 1, 1)),
+        ("build.manual_control_by_id",  lambda: tcp.build_manual_control_by_id_payload("Car_1", 0.4, 0.0, 0.1)),
+        ("build.transform_control_by_id", lambda: tcp.build_transform_control_by_id_payload(
+            "Car_1", 1.0, 2.0, 3.0, 0.0, 0.0, 90.0, 0.1, 10.0)),
+        ("build.set_trajectory_100",    lambda: tcp.build_set_trajectory_payload("Car_1", 1, "Route_1", points)),
+        ("build.set_trajectory_100_buffer", lambda: tcp.build_set_trajectory_payload("Car_1", 1, "Route_1", flat)),
+        ("build.set_trajectory_100_iter", lambda: tcp.build_set_trajectory_payload_from_iter(
+            "Car_1", 1, "Route_1", iter(points), len(points))),
+        ("build.load_suite",            lambda: tcp.build_load_suite_payload(r"C:\Suites\TotalTest.msuite")),
+        ("build.scenario_control",      lambda: tcp.build_scenario_control_payload(1, "Scenario_1")),
+        ("build.request_packet",        lambda: tcp.build_request_packet(1, proto.MSG_TYPE_FIXED_STEP, b"\x01\x00\x00\x00")),
+    ]
+
+
+def pack_cases() -> List[Case]:
+    manual = {"entity_id": "Car_1", "throttle": 0.4, "brake": 0.0, "steer_angle": 0.1}
+    fixed  = {"mode": proto.TIME_MODE_FIXED, "simulation_delta_time": 20, "physics_delta_time": 10,
+              "rtf": 1, "user_control": 1}
+    traj_values = {"entity_id": "Car_1", "follow_mode": 1, "trajectory_name": "Route_1", "point_count": 100}
+    traj_items  = [{"points[].x": x, "points[].y": y, "points[].z": z, "points[].time": t}
+                   for x, y, z, t in _points(100)]
+    manual_payload = pack_message_payload(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual)
+    traj_payload   = pack_message_payload(proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, traj_values, traj_items)
+    return [
+        ("pack.manual_control_by_id",   lambda: pack_message_payload(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual)),
+        ("pack.simulation_time_mode",   lambda: pack_message_payload(proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND, fixed)),
+        ("pack.set_trajectory_100",     lambda: pack_message_payload(
+            proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, traj_values, traj_items)),
+        ("unpack.manual_control_by_id", lambda: unpack_message_payload(
+            proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual_payload)),
+        ("unpack.set_trajectory_100",   lambda: unpack_message_payload(
+            proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, traj_payload, repeated_count_field="point_count")),
+    ]
+
+
+def parse_cases() -> List[Case]:
+    result = struct.pack(proto.RESULT_FMT, 0, 0)
+    status = get_codec(proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS, "response").pack({
+        "result_code": 0, "detail_code": 0, "mode": proto.TIME_MODE_FIXED,
+        "simulation_delta_time": 20, "physics_delta_time": 10, "rtf": 1, "user_control": 1,
+        "step_index": 12345, "seconds": 246, "nanos": 900_000_000,
+    })
+    time_mode = get_codec(proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND, "response").pack({
+        "result_code": 0, "detail_code": 0, "mode": proto.TIME_MODE_FIXED,
+        "fixed_delta": 0.02, "simulation_speed": 1.0,
+    })
+    created = get_codec(proto.MSG_TYPE_CREATE_OBJECT, "response").pack(
+        {"result_code": 0, "detail_code": 0, "object_id": "Object_1"})
+    names = [f"Scenario_{i}" for i in range(20)]
+    suite = get_codec(proto.MSG_TYPE_ACTIVE_SUITE_STATUS, "response").pack(
+        {"result_code": 0, "detail_code": 0, "active_suite_name": "TotalTest",
+         "active_scenario_name": names[0], "scenario_list_size": len(names)},
+        [{"scenario_list[].name": n} for n in names],
+    )
+    scenario = get_codec(proto.MSG_TYPE_SCENARIO_STATUS, "response").pack(
+        {"result_code": 0, "detail_code": 0, "state": 1})
+    return [
+        ("parse.result_code",           lambda: tcp.parse_result_code(result)),
+        ("parse.get_status",            lambda: tcp.parse_get_status_payload(status)),
+        ("parse.set_simulation_time_mode", lambda: tcp.parse_set_simulation_time_mode_payload(time_mode)),
+        ("parse.create_object",         lambda: tcp.parse_create_object_payload(created)),
+        ("parse.active_suite_status_20", lambda: tcp.parse_active_suite_status_payload(suite)),
+        ("parse.scenario_status",       lambda: tcp.parse_scenario_status_payload(scenario)),
+    ]
+
+
+def all_cases() -> List[Case]:
+    return build_cases() + pack_cases() + parse_cases()
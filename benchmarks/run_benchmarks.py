@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+# benchmarks/run_benchmarks.py
+#
+# transport benchmark suite — micro (payload build/pack/unpack/parse) + I/O (recv, FixedStep RTT).
+#
+#   run     : 모든 case 를 측정해 JSON 으로 저장
+#   compare : baseline 대비 tolerance 이상 느려진 metric 이 있으면 exit 1
+#
+# 사용:
+#   python benchmarks/run_benchmarks.py run --output baseline.json
+#   python benchmarks/run_benchmarks.py run --output current.json --quick --filter "parse.*"
+#   python benchmarks/run_benchmarks.py compare baseline.json current.json
+#
+# JSON:
+#   {"meta": {...}, "metrics": {name: {"value": float, "unit": "ops/s", "higher_is_better": true}}}
+#
+# tolerance 는 benchmarks/thresholds.json 의 {glob pattern: 허용 하락 비율} 중 처음 일치하는 값,
+# 없으면 --tolerance 기본값.
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+HERE = Path(__file__).resolve().parent
+if str(HERE) not in sys.path:
+    sys.path.insert(0, str(HERE))
+
+import bench_io
+import bench_payloads
+
+DEFAULT_THRESHOLDS = HERE / "thresholds.json"
+DEFAULT_TOLERANCE  = 0.20
+
+
+# ============================================================
+# Measure
+# ============================================================
+
+def measure_ops(fn, min_time: float, repeat: int) -> float:
+    """timeit autorange 로 loop 수를 정한 뒤 repeat 회 중 최고 ops/sec."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def _metric(value: float, unit: str = "ops/s", higher_is_better: bool = True) -> Dict[str, object]:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def run_suite(quick: bool = False, pattern: Optional[str] = None) -> Dict[str, object]:
+    min_time = 0.05 if quick else 0.2
+    repeat   = 3 if quick else 5
+    metrics: Dict[str, Dict[str, object]] = {}
+
+    for name, fn in bench_payloads.all_cases():
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        metrics[name] = _metric(measure_ops(fn, min_time, repeat))
+        print(f"  {name:<36} {metrics[name]['value']:>14,.0f} ops/s")
+
+    for name, fn in bench_io.cases(quick=quick):
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        metrics[name] = _metric(fn())
+        print(f"  {name:<36} {metrics[name]['value']:>14,.0f} ops/s")
+
+    return {
+        "meta": {
+            "created":  time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "platform": platform.platform(),
+            "quick":    quick,
+        },
+        "metrics": metrics,
+    }
+
+
+# ============================================================
+# Compare
+# ============================================================
+
+def load_thresholds(path: Optional[Path]) -> Dict[str, float]:
+    if path is None or not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {k: float(v) for k, v in json.load(f).items()}
+
+
+def tolerance_for(name: str, thresholds: Dict[str, float], default: float) -> float:
+    for pattern, tol in thresholds.items():
+        if fnmatch.fnmatch(name, pattern):
+            return tol
+    return default
+
+
+def compare(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    thresholds: Optional[Dict[str, float]] = None,
+    default_tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, object]]:
+    """baseline 과 current 양쪽에 있는 metric 별 변화율. regressed=True 이면 tolerance 초과 하락."""
+    thresholds = thresholds or {}
+    base_metrics = baseline.get("metrics", {})
+    rows = []
+    for name, cur in sorted(current.get("metrics", {}).items()):
+        base = base_metrics.get(name)
+        if base is None or not base["value"]:
+            continue
+        ratio = cur["value"] / base["value"]
+        if not cur.get("higher_is_better", True):
+            ratio = 1.0 / ratio if ratio else float("inf")
+        tol = tolerance_for(name, thresholds, default_tolerance)
+        rows.append({
+            "name":      name,
+            "baseline":  base["value"],
+            "current":   cur["value"],
+            "change":    ratio - 1.0,
+            "tolerance": tol,
+            "regressed": ratio < 1.0 - tol,
+        })
+    return rows
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _load(path: str) -> Dict[str, object]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="MORAI transport benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="measure and write JSON")
+    p_run.add_argument("--output", "-o", help="JSON output path (default: stdout only)")
+    p_run.add_argument("--quick", action="store_true", help="short runs for smoke testing")
+    p_run.add_argument("--filter", help="glob on metric name, e.g. 'parse.*'")
+
+    p_cmp = sub.add_parser("compare", help="fail if current regressed against baseline")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                       help="allowed slowdown ratio when no threshold pattern matches")
+    p_cmp.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS))
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = run_suite(quick=args.quick, pattern=args.filter)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, sort_keys=True)
+            print(f"wrote {len(result['metrics'])} metrics → {args.output}")
+        return 0
+
+    rows = compare(_load(args.baseline), _load(args.current),
+                   load_thresholds(Path(args.thresholds)), args.tolerance)
+    failed = [r for r in rows if r["regressed"]]
+    print(f"{'metric':<36} {'baseline':>14} {'current':>14} {'change':>8} {'tol':>6}")
+    for r in rows:
+        mark = "  REGRESSED" if r["regressed"] else ""
+        print(f"{r['name']:<36} {r['baseline']:>14,.0f} {r['current']:>14,.0f} "
+              f"{r['change']:>+7.1%} {r['tolerance']:>6.0%}{mark}")
+    print(f"{len(failed)} regression(s) in {len(rows)} metrics")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,11 +15,12 @@ import numpy as np
 
 import transport.tcp_transport as tcp
 import transport.protocol_defs as proto
+import utils.event_log as elog
 from receivers.camera_receiver import CameraReceiver
 from lane_control.lane_preprocessor import LanePreprocessor
 from lane_control.lane_detector import LaneDetector
 from lane_control.controllers   import EMAFilter, PDController, SpeedPIController
-from lane_control.vehicle_info  import VehicleInfoThread
+from lane_control.vehicle_info  import VehicleInfoListener
 from lane_control.tune_panel    import TunePanel
 
 
@@ -64,8 +65,11 @@ class LaneController:
         vi_data_cb = None,
         # 디버그 합성 이미지 콜백 fn(frame: np.ndarray BGR 1280×480)
         debug_cb = None,
+        # ControlBus — 있으면 latest-wins 로 합쳐서 전송
+        control_bus = None,
     ):
         self._sock         = tcp_sock
+        self._control_bus  = control_bus
         self._log          = log_fn or (lambda msg, level="INFO": print(f"[LC] {msg}"))
         self._entity_id    = entity_id
         self._throttle     = throttle
@@ -81,10 +85,10 @@ class LaneController:
         self._pd           = PDController(kp=kp, kd=kd, steer_max=steer_max)
 
         # 속도 피드백
-        self._vi_thread: VehicleInfoThread | None = None
+        self._vi_listener: VehicleInfoListener | None = None
         self._speed_pi:  SpeedPIController  | None = None
         if speed_ctrl:
-            self._vi_thread = VehicleInfoThread(
+            self._vi_listener = VehicleInfoListener(
                 ip=vi_ip, port=vi_port,
                 log_fn=self._log, data_cb=vi_data_cb,
             )
@@ -142,8 +146,8 @@ class LaneController:
 
     # ── 시작 / 종료 ──────────────────────────────────────────────
     def start(self) -> threading.Thread:
-        if self._vi_thread is not None:
-            self._vi_thread.start()
+        if self._vi_listener is not None:
+            self._vi_listener.start()
         if self._tuning:
             self._tune_panel = TunePanel(self)
             self._log("[Tuner] 실시간 튜닝 창 활성화 — S: 값 출력  R: 초기화")
@@ -154,8 +158,8 @@ class LaneController:
 
     def stop(self):
         self._running = False
-        if self._vi_thread is not None:
-            self._vi_thread.stop()
+        if self._vi_listener is not None:
+            self._vi_listener.stop()
         if self._writer is not None:
             self._writer.release()
             self._writer = None
@@ -245,8 +249,8 @@ class LaneController:
 
         # 5. 스로틀 / 브레이크 결정
         current_mps = 0.0
-        if self._speed_ctrl and self._vi_thread is not None:
-            current_mps = self._vi_thread.get_speed_mps()
+        if self._speed_ctrl and self._vi_listener is not None:
+            current_mps = self._vi_listener.get_speed_mps()
 
         if self._ready:
             if self._speed_ctrl and self._speed_pi is not None:
@@ -261,35 +265,35 @@ class LaneController:
             steer_out    = 0.0
             status       = f"WAIT({self._det_streak}/{self._min_det_go})"
 
-        # 6. TCP 전송
+        # 6. TCP 전송 (bus 가 있으면 최신값만 남기고 sender 스레드가 전송)
         try:
-            tcp.send_manual_control_by_id(
-                self._sock,
-                _next_rid(),
-                self._entity_id,
-                throttle    = throttle_cmd,
-                brake       = brake_cmd,
-                steer_angle = steer_out,
-            )
+            if self._control_bus is not None:
+                self._control_bus.submit(self._entity_id, throttle_cmd, brake_cmd, steer_out)
+            else:
+                tcp.send_manual_control_by_id(
+                    self._sock,
+                    _next_rid(),
+                    self._entity_id,
+                    throttle    = throttle_cmd,
+                    brake       = brake_cmd,
+                    steer_angle = steer_out,
+                )
         except OSError as e:
             self._log(f"TCP 오류: {e}", "ERROR")
             self._running = False
             return
 
-        # 7. 터미널 출력 (per-frame — GUI 로그 패널에는 보내지 않음)
-        side    = "L" if smooth_off > 0 else "R"
-        r_str   = f"{result.curve_radius_m:.0f}m" if result.curve_radius_m < 5000 else "STRAIGHT"
-        spd_str = f"{current_mps*3.6:.1f}km/h" if self._speed_ctrl else f"thr={throttle_cmd:.2f}"
-        print(
-            f"[{status:^12s}] "
-            f"spd={spd_str}  "
-            f"offset={smooth_off:+.3f}m({side})  "
-            f"radius={r_str:>10s}  "
-            f"steer={steer_out:+.4f}  "
-            f"thr={throttle_cmd:.2f}  "
-            f"lane={'L' if result.left_detected else '-'}"
-                 f"{'R' if result.right_detected else '-'}"
-        )
+        # 7. 터미널 출력 (per-frame — event_log 스레드가 포맷/출력, GUI 로그 패널에는 보내지 않음)
+        if elog.enabled(elog.INFO, "lane.step"):
+            r_str   = "%.0fm" % result.curve_radius_m if result.curve_radius_m < 5000 else "STRAIGHT"
+            spd_str = "%.1fkm/h" % (current_mps * 3.6) if self._speed_ctrl else "thr=%.2f" % throttle_cmd
+            elog.log(
+                elog.INFO, "lane.step",
+                "[%s] spd=%s  offset=%+.3fm(%s)  radius=%10s  steer=%+.4f  thr=%.2f  lane=%s%s",
+                format(status, "^12s"), spd_str, smooth_off, "L" if smooth_off > 0 else "R",
+                r_str, steer_out, throttle_cmd,
+                "L" if result.left_detected else "-", "R" if result.right_detected else "-",
+            )
 
         # 8. OpenCV 시각화 / 디버그 콜백
         _need_composite = self._show or self._debug_cb or self._record_path
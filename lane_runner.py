@@ -39,6 +39,7 @@ class LaneRunner:
     target_kmh  : 목표 속도 km/h (speed_ctrl=True 시 사용)
     throttle    : 고정 스로틀 (speed_ctrl=False 시 사용)
     log_fn      : 로그 콜백 fn(msg, level="INFO") — None 이면 print
+    control_bus : ControlBus — 지정 시 제어 명령을 entity 별 최신값만 전송
     """
 
     def __init__(
@@ -57,8 +58,10 @@ class LaneRunner:
         frame_cb=None,   # fn(frame: np.ndarray BGR)          — 원본 카메라 프레임 콜백
         vi_cb=None,      # fn(parsed: dict)                  — Vehicle Info 파싱 콜백
         debug_cb=None,   # fn(composite: np.ndarray BGR 1280×480) — 디버그 합성 이미지 콜백
+        control_bus=None,  # ControlBus — 있으면 제어 명령을 latest-wins 로 합쳐서 전송
     ):
         self._tcp_sock  = tcp_sock
+        self._control_bus = control_bus
         self._entity_id = entity_id
         self._log       = log_fn or (lambda msg, level="INFO": print(f"[LC] {msg}"))
 
@@ -76,6 +79,7 @@ class LaneRunner:
             log_fn       = self._log,
             vi_data_cb   = vi_cb,
             debug_cb     = debug_cb,
+            control_bus  = control_bus,
         )
 
         # 카메라 on_frame: 제어 루프 + 표시 콜백 동시 호출
@@ -115,10 +119,15 @@ class LaneRunner:
         self._controller.stop()
         self._receiver.stop()
         try:
-            tcp.send_manual_control_by_id(
-                self._tcp_sock, _next_rid(), self._entity_id,
-                throttle=0.0, brake=1.0, steer_angle=0.0,
-            )
+            if self._control_bus is not None:
+                # 컨트롤러 루프가 남긴 명령을 덮어쓰고 즉시 전송
+                self._control_bus.submit(self._entity_id, 0.0, 1.0, 0.0, force=True)
+                self._control_bus.flush()
+            else:
+                tcp.send_manual_control_by_id(
+                    self._tcp_sock, _next_rid(), self._entity_id,
+                    throttle=0.0, brake=1.0, steer_angle=0.0,
+                )
             self._log("정지 명령 전송 (brake=1.0)")
         except OSError:
             pass
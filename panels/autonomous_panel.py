@@ -75,6 +75,27 @@ def build(parent) -> None:
             dpg.add_spacer(width=16)
             dpg.add_checkbox(tag="au_save_data", label="Save Data",
                              default_value=False, show=False)
+            dpg.add_spacer(width=16)
+            dpg.add_checkbox(tag="au_trajectory", label="Trajectory",
+                             default_value=False,
+                             callback=lambda: _save_state())
+            with dpg.tooltip("au_trajectory"):
+                dpg.add_text("경로를 SetTrajectory 로 업로드하고 변경/이탈 시에만 재전송\n"
+                             "(매 tick ManualControl 대신, chaser 제외)")
+
+        with dpg.group(horizontal=True, tag="au_decimation_group", show=False):
+            dpg.add_text("Ticks/Ctrl :", color=(180, 180, 180, 255))
+            dpg.add_input_int(tag="au_decimation", default_value=1,
+                              min_value=1, max_value=16, step=0, width=40,
+                              callback=lambda: _save_state())
+            dpg.add_checkbox(tag="au_adaptive_decimation", label="Adaptive",
+                             default_value=False,
+                             callback=lambda: _save_state())
+            with dpg.tooltip("au_decimation"):
+                dpg.add_text("control 갱신 1회당 FixedStep 틱 수 (step_count=k)\n"
+                             "k 가 클수록 RTF ↑, control / SaveData 주기 ↓")
+            with dpg.tooltip("au_adaptive_decimation"):
+                dpg.add_text("control 변화가 작으면 k 증가, 급변하면 절반 (최대 8)")
 
         dpg.add_spacer(height=6)
         with dpg.group(horizontal=True):
@@ -281,6 +302,7 @@ def reset_ui() -> None:
 
 def _on_fixed_step_toggle(sender, app_data) -> None:
     dpg.configure_item("au_save_data", show=app_data)
+    dpg.configure_item("au_decimation_group", show=app_data)
     if app_data:
         dpg.set_value("au_save_data", True)
 
@@ -327,6 +349,7 @@ def _on_start() -> None:
             "entity_id":     eid,
             "vi_port":       dpg.get_value(f"au_vi_port_{i}"),
             "max_speed_kph": dpg.get_value(f"au_max_speed_kph_{i}"),
+            "trajectory_mode": dpg.get_value("au_trajectory"),
         })
 
     if not vehicles:
@@ -353,7 +376,9 @@ def _on_start() -> None:
         if _start_step_ad_fn is None:
             log.append("[AD] 초기화되지 않았습니다.", level="ERROR")
             return
-        _start_step_ad_fn(vehicles, dpg.get_value("au_save_data"), collision_cfg)
+        _start_step_ad_fn(vehicles, dpg.get_value("au_save_data"), collision_cfg,
+                          decimation=max(1, dpg.get_value("au_decimation")),
+                          adaptive_decimation=dpg.get_value("au_adaptive_decimation"))
     else:
         if _start_ad_fn is None:
             log.append("[AD] 초기화되지 않았습니다.", level="ERROR")
@@ -377,6 +402,9 @@ def _save_state() -> None:
             "au_map_combo":            dpg.get_value("au_map_combo"),
             "au_vehicle_count":        dpg.get_value("au_vehicle_count"),
             "au_collision_enable":     dpg.get_value("au_collision_enable"),
+            "au_trajectory":           dpg.get_value("au_trajectory"),
+            "au_decimation":           dpg.get_value("au_decimation"),
+            "au_adaptive_decimation":  dpg.get_value("au_adaptive_decimation"),
             "au_collision_chaser":     dpg.get_value("au_collision_chaser"),
             "au_collision_target":     dpg.get_value("au_collision_target"),
             "au_collision_speed_kph":   dpg.get_value("au_collision_speed_kph"),
@@ -408,6 +436,9 @@ def _load_state() -> None:
         _apply_vehicle_state(data.get("vehicles", []))
 
         _bool("au_collision_enable",     data, False)
+        _bool("au_trajectory",           data, False)
+        _int ("au_decimation",            data, 1)
+        _bool("au_adaptive_decimation",  data, False)
         _int ("au_collision_chaser",      data, 2)
         _int ("au_collision_target",      data, 1)
         _float("au_collision_speed_kph",   data, 60.0)
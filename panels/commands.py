@@ -269,6 +269,17 @@ def build(parent: int | str) -> None:
                               default_value=proto.MAX_CALL_NUM,
                               min_value=1, max_value=999999,
                               step=0, width=80)
+            dpg.add_text("x", color=(180, 180, 180, 255))
+            dpg.add_input_int(tag="auto_step_count", default_value=1,
+                              min_value=1, max_value=100,
+                              step=0, width=40)
+            with dpg.tooltip("auto_step_count"):
+                dpg.add_text("FixedStep 1회당 틱 수 (step_count). SaveData 도 k 틱마다 1회")
+            dpg.add_text("Depth", color=(180, 180, 180, 255))
+            dpg.add_input_int(tag="auto_pipeline_depth",
+                              default_value=proto.AUTO_PIPELINE_DEPTH,
+                              min_value=1, max_value=32,
+                              step=0, width=40)
             dpg.add_button(label="▶▶ AutoCaller", tag="btn_auto",
                            callback=_on_auto_toggle)
 
@@ -313,7 +324,12 @@ def _on_auto_toggle() -> None:
         return
     max_calls = dpg.get_value("auto_max_calls")
     dpg.set_value("auto_total_text", str(max_calls))
-    running = _toggle_auto(max_calls)
+    # Depth > 1 이면 FixedStep+SaveData 쌍을 ACK 없이 미리 송신 / Sim DT 는 RTF 계산용
+    is_variable = dpg.get_value("sim_mode_combo") == "Variable"
+    running = _toggle_auto(max_calls,
+                           pipeline_depth=max(1, dpg.get_value("auto_pipeline_depth")),
+                           step_dt_sec=0.0 if is_variable else dpg.get_value("sim_delta_ms") / 1000.0,
+                           step_count=max(1, dpg.get_value("auto_step_count")))
     label = "■ Stop" if running else "▶▶ AutoCaller"
     dpg.configure_item("btn_auto", label=label)
 
@@ -482,6 +498,8 @@ def _save_state() -> None:
             "sim_physics_dt_fixed": dpg.get_value("sim_physics_dt_fixed"),
             "sim_rtf":           dpg.get_value("sim_rtf"),
             "sim_user_control":  dpg.get_value("sim_user_control"),
+            "auto_pipeline_depth": dpg.get_value("auto_pipeline_depth"),
+            "auto_step_count":   dpg.get_value("auto_step_count"),
             "sc_timer_enabled":  dpg.get_value("sc_timer_enabled"),
             "sc_timer_min":      dpg.get_value("sc_timer_min"),
             "sc_timer_sec":      dpg.get_value("sc_timer_sec"),
@@ -510,6 +528,8 @@ def _load_state() -> None:
             ("sim_delta_ms", 16),
             ("sim_physics_dt_fixed", 10),
             ("sim_rtf", 1),
+            ("auto_pipeline_depth", proto.AUTO_PIPELINE_DEPTH),
+            ("auto_step_count", 1),
         ]:
             if dpg.does_item_exist(tag):
                 dpg.set_value(tag, data.get(tag, default))
@@ -12,7 +12,7 @@ import utils.ui_queue as ui_queue
 from receivers.template_parser import TemplateParser
 from panels.monitor_utils import (get_templates, tab_label, make_groups,
                                   fmt, format_repeat_rows)
-from panels.monitor_receiver import UDPThread
+from panels.monitor_receiver import UDPReceiver
 
 _BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _TMPL_DIR   = os.path.join(_BASE_DIR, "templates")
@@ -134,7 +134,7 @@ def _open_monitor(filename: str,
         "repeat_text_tag": 0,
         "running":         False,
         "sock":            None,
-        "thread":          None,
+        "receiver":        None,
         "last_update_t":   0.0,
     }
     _monitors[tab_tag] = st
@@ -289,14 +289,15 @@ def _on_start(sender, app_data, user_data) -> None:
 
     st["sock"]    = sock
     st["running"] = True
-    st["thread"]  = UDPThread(
+    st["receiver"] = UDPReceiver(
         sock     = sock,
-        parse_fn = st["parser"].parse,
+        parse_fn = st["parser"].parse,    # TemplateRecord — decode 는 _apply_data 에서 접근할 때
         on_data  = lambda p, tt=tab_tag: _on_data(tt, p),
         on_error = lambda tt=tab_tag: ui_queue.post(
-                       lambda: _on_thread_error(tt)),
+                       lambda: _on_receiver_error(tt)),
+        stream   = f"monitor:{port}",
     )
-    st["thread"].start()
+    st["receiver"].start()
     _refresh_status(tab_tag)
     # IP/Port 변경사항 영구 저장
     _save_state()
@@ -313,9 +314,9 @@ def _on_stop(sender, app_data, user_data) -> None:
 
 def _stop_receiver(st: dict) -> None:
     st["running"] = False
-    if st.get("thread"):
-        st["thread"].stop()
-        st["thread"] = None
+    if st.get("receiver"):
+        st["receiver"].stop()
+        st["receiver"] = None
     if st.get("sock"):
         try:
             st["sock"].close()
@@ -324,12 +325,12 @@ def _stop_receiver(st: dict) -> None:
         st["sock"] = None
 
 
-def _on_thread_error(tab_tag: str) -> None:
+def _on_receiver_error(tab_tag: str) -> None:
     st = _monitors.get(tab_tag)
     if st:
         st["running"] = False
-        st["thread"]  = None
-        st["sock"]    = None
+        st["receiver"] = None
+        st["sock"]     = None
         _refresh_status(tab_tag)
 
 
@@ -337,7 +338,7 @@ def _on_thread_error(tab_tag: str) -> None:
 #  Data routing & display update
 # ═══════════════════════════════════════════════════════════════════════
 
-def _on_data(tab_tag: str, parsed: dict) -> None:
+def _on_data(tab_tag: str, parsed) -> None:
     st = _monitors.get(tab_tag)
     if not st:
         return
@@ -1,32 +1,48 @@
 from __future__ import annotations
 # panels/monitor_receiver.py
-# UDP 수신 스레드 (monitor.py 에서 분리)
+# UDP 수신 (monitor.py 에서 분리) — receivers/udp_reactor 공용 스레드에 등록
 
-import threading
+from receivers.udp_reactor import UdpReactor, default_reactor
 
 
-class UDPThread(threading.Thread):
-    """UDP 소켓에서 패킷을 수신하고 파싱 결과를 콜백으로 전달하는 데몬 스레드."""
+class UDPReceiver:
+    """UDP 소켓을 reactor 에 등록하고 파싱 결과를 콜백으로 전달.
 
-    def __init__(self, sock, parse_fn, on_data, on_error):
-        super().__init__(daemon=True)
+    parse_fn / on_data 는 reactor 스레드에서 불린다. parse_fn 결과가 data 를 참조할 수 있으므로
+    (TemplateRecord) 패킷은 bytes 로 복사해 넘긴다.
+    """
+
+    def __init__(self, sock, parse_fn, on_data, on_error, stream: str = "monitor",
+                 reactor: UdpReactor | None = None):
         self.sock     = sock
         self.parse_fn = parse_fn
         self.on_data  = on_data
         self.on_error = on_error
-        self.running  = True
+        self.stream   = stream
+        self.running  = False
+        self._reactor = reactor or default_reactor()
+        self._reg     = None
+
+    def start(self) -> None:
+        self.running = True
+        self._reg = self._reactor.register(self.sock, self._on_packet, stream=self.stream,
+                                           copy=True, on_error=self._on_socket_error)
 
     def stop(self) -> None:
         self.running = False
+        self._reactor.unregister(self.sock)
+
+    def stats(self) -> dict:
+        return self._reg.stats() if self._reg is not None else {}
+
+    def _on_packet(self, data: bytes) -> bool:
+        parsed = self.parse_fn(data)
+        if parsed is None:
+            return False
+        self.on_data(parsed)
+        return True
 
-    def run(self) -> None:
-        while self.running:
-            try:
-                data, _ = self.sock.recvfrom(65535)
-                parsed  = self.parse_fn(data)
-                if parsed is not None:
-                    self.on_data(parsed)
-            except OSError:
-                if self.running:
-                    self.on_error()
-                break
+    def _on_socket_error(self) -> None:
+        if self.running:
+            self.running = False
+            self.on_error()
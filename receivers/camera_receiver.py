@@ -7,9 +7,10 @@
 #   ② Headerless: [size:4B][JPEG bytes]
 # - on_frame(numpy_bgr) 콜백으로 프레임 전달 → 제어 파이프라인 연결용
 # - show=True 시 OpenCV 창으로 실시간 확인 가능
+# - 수신은 receivers/udp_reactor — 기본은 카메라 전용 UdpReactor (조립 / decode / on_frame 도 그 스레드)
+#   JPEG decode 와 on_frame 이 공용 reactor 의 Vehicle Info 수신을 지연시키지 않도록 분리
 
 import socket
-import select
 import struct
 import threading
 import time
@@ -18,10 +19,11 @@ from typing import Callable, Optional
 import numpy as np
 import cv2
 
+from receivers.udp_reactor import UdpReactor
+
 # ─── 패킷 상수 ──────────────────────────────────────────────────
 _HEADER_FMT  = "<IHH"   # PacketID(4), ChunkIdx(2), TotalChunks(2)
 _HEADER_SIZE = struct.calcsize(_HEADER_FMT)  # 8 bytes
-_RECV_BUF    = 65535
 _ASSEMBLY_TIMEOUT = 5.0  # 청크 조립 대기 최대 시간 (초)
 
 
@@ -41,9 +43,9 @@ class _AssemblyState:
 
 
 # ─── CameraReceiver ─────────────────────────────────────────────
-class CameraReceiver(threading.Thread):
+class CameraReceiver:
     """
-    UDP 카메라 이미지 수신 스레드
+    UDP 카메라 이미지 수신기 (UdpReactor 등록 — 전용 수신 스레드 없음)
 
     Parameters
     ----------
@@ -51,8 +53,10 @@ class CameraReceiver(threading.Thread):
     port     : 수신 포트
     on_frame : 프레임 콜백 fn(frame: np.ndarray) — BGR uint8
                None 이면 콜백 없이 show 전용으로만 동작
-    show     : True 시 OpenCV 창에 실시간 렌더링
+    show     : True 시 OpenCV 창에 실시간 렌더링 (imshow / waitKey 용 표시 스레드 1개)
     window_name : OpenCV 창 이름 (None 이면 자동 생성)
+    reactor  : UdpReactor — None 이면 이 수신기 전용 인스턴스 (stop() 때 함께 종료).
+               JPEG decode / on_frame 이 reactor 스레드에서 돌므로 공용 default_reactor() 는 넘기지 않는다
     """
 
     def __init__(
@@ -62,8 +66,8 @@ class CameraReceiver(threading.Thread):
         on_frame: Optional[Callable[[np.ndarray], None]] = None,
         show: bool = True,
         window_name: Optional[str] = None,
+        reactor: Optional[UdpReactor] = None,
     ):
-        super().__init__(daemon=True)
         self.ip          = ip
         self.port        = port
         self.on_frame    = on_frame
@@ -80,17 +84,14 @@ class CameraReceiver(threading.Thread):
 
         self._asm = _AssemblyState()
 
-    # ── 공개 API ─────────────────────────────────────────────────
-    def stop(self):
-        self.running = False
-
-    def get_latest_frame(self) -> Optional[np.ndarray]:
-        """최신 프레임을 스레드 안전하게 반환 (없으면 None)"""
-        with self._lock:
-            return self.last_frame.copy() if self.last_frame is not None else None
+        self._own_reactor = reactor is None
+        self._reactor = reactor or UdpReactor(name=f"camera-{port}")
+        self._sock: Optional[socket.socket] = None
+        self._show_thread: Optional[threading.Thread] = None
+        self._frame_ready = threading.Event()   # show 스레드에 새 프레임 알림
 
-    # ── 내부 ─────────────────────────────────────────────────────
-    def run(self):
+    # ── 공개 API ─────────────────────────────────────────────────
+    def start(self):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
@@ -98,50 +99,70 @@ class CameraReceiver(threading.Thread):
         except OSError:
             pass
         sock.bind((self.ip, self.port))
-        sock.setblocking(False)
-
+        self._sock   = sock
         self.running = True
+        # chunk 는 _handle_chunked 에서 bytes 로 복사하므로 버퍼 view 로 받는다
+        self._reactor.register(sock, self._handle, stream=f"camera:{self.port}", copy=False,
+                               on_error=self.stop)
         print(f"[CameraReceiver] Listening on {self.ip}:{self.port}")
 
+        if self.show:
+            self._show_thread = threading.Thread(target=self._show_loop, daemon=True,
+                                                 name=f"camera-show-{self.port}")
+            self._show_thread.start()
+
+    def stop(self):
+        self.running = False
+        sock, self._sock = self._sock, None
+        if sock is None:
+            return
+        self._reactor.unregister(sock)
+        sock.close()
+        if self._own_reactor:
+            self._reactor.stop()
+        self._frame_ready.set()
+        print(f"[CameraReceiver] Stopped ({self.ip}:{self.port})")
+
+    def is_alive(self) -> bool:
+        return self.running or (self._show_thread is not None and self._show_thread.is_alive())
+
+    def join(self, timeout: Optional[float] = None):
+        if self._show_thread is not None and self._show_thread is not threading.current_thread():
+            self._show_thread.join(timeout)
+
+    def get_latest_frame(self) -> Optional[np.ndarray]:
+        """최신 프레임을 스레드 안전하게 반환 (없으면 None)"""
+        with self._lock:
+            return self.last_frame.copy() if self.last_frame is not None else None
+
+    # ── 표시 (show=True) ─────────────────────────────────────────
+    def _show_loop(self):
+        """OpenCV 창은 imshow / waitKey 를 같은 스레드에서 불러야 한다."""
         try:
             while self.running:
-                readable, _, _ = select.select([sock], [], [], 0.5)
-                if not readable:
-                    if self.show:
-                        cv2.waitKey(1)
-                    continue
-
-                try:
-                    while True:
-                        try:
-                            data, addr = sock.recvfrom(_RECV_BUF)
-                        except BlockingIOError:
-                            break
-                        self._handle(data)
-                except Exception as e:
-                    if self.running:
-                        print(f"[CameraReceiver] recv error: {e}")
-
-                if self.show:
-                    key = cv2.waitKey(1) & 0xFF
-                    if key in (ord("q"), 27):   # q / ESC → 종료
-                        self.running = False
-                        break
+                if self._frame_ready.wait(0.03):
+                    self._frame_ready.clear()
+                    with self._lock:
+                        frame = self.last_frame
+                    if frame is not None and self.running:
+                        cv2.imshow(self.window_name, frame)
+                        cv2.setWindowTitle(self.window_name, f"{self.window_name}  FPS: {self.fps:.1f}")
+                key = cv2.waitKey(1) & 0xFF
+                if key in (ord("q"), 27):   # q / ESC → 종료
+                    self.stop()
+                    break
         finally:
-            sock.close()
-            if self.show:
-                cv2.destroyWindow(self.window_name)
-            print(f"[CameraReceiver] Stopped ({self.ip}:{self.port})")
+            cv2.destroyWindow(self.window_name)
 
-    # ── 패킷 처리 ────────────────────────────────────────────────
-    def _handle(self, data: bytes):
+    # ── 패킷 처리 (reactor 스레드, data 는 수신 버퍼 view) ─────────
+    def _handle(self, data):
         if self._is_chunked(data):
             self._handle_chunked(data)
         else:
             self._handle_headerless(data)
 
     @staticmethod
-    def _is_chunked(data: bytes) -> bool:
+    def _is_chunked(data) -> bool:
         if len(data) < _HEADER_SIZE:
             return False
         try:
@@ -150,7 +171,7 @@ class CameraReceiver(threading.Thread):
             return False
         return pid != 0 and 0 < total <= 10000 and cidx < total
 
-    def _handle_headerless(self, data: bytes):
+    def _handle_headerless(self, data):
         """[uint32 size][JPEG bytes]"""
         if len(data) < 4:
             return
@@ -159,10 +180,10 @@ class CameraReceiver(threading.Thread):
             return
         self._deliver(data[4: 4 + img_size])
 
-    def _handle_chunked(self, data: bytes):
+    def _handle_chunked(self, data):
         """청크 조립 후 [uint32 size][JPEG bytes] 로 전달"""
         pid, cidx, total = struct.unpack(_HEADER_FMT, data[:_HEADER_SIZE])
-        payload = data[_HEADER_SIZE:]
+        payload = bytes(data[_HEADER_SIZE:])   # 수신 버퍼는 다음 패킷에 재사용
         asm = self._asm
 
         # 새 패킷 시작
@@ -198,7 +219,7 @@ class CameraReceiver(threading.Thread):
             return
         self._deliver(full[4: 4 + img_size])
 
-    def _deliver(self, img_bytes: bytes):
+    def _deliver(self, img_bytes):
         """디코딩 → 콜백 + 표시 + 통계"""
         np_buf = np.frombuffer(img_bytes, dtype=np.uint8)
         frame  = cv2.imdecode(np_buf, cv2.IMREAD_COLOR)
@@ -218,11 +239,9 @@ class CameraReceiver(threading.Thread):
             self._frame_count = 0
             self._fps_ts  = now
 
-        # OpenCV 창 렌더링
+        # OpenCV 창 렌더링은 show 스레드에서
         if self.show:
-            title = f"{self.window_name}  FPS: {self.fps:.1f}"
-            cv2.imshow(self.window_name, frame)
-            cv2.setWindowTitle(self.window_name, title)
+            self._frame_ready.set()
 
         # 콜백
         if self.on_frame is not None:
@@ -3,10 +3,28 @@
 Generic binary parser driven by MORAI .tmpl JSON files.
 Supports FIELDS and REPEAT (case-insensitive) segments.
 Types: FLOAT, DOUBLE, INT32, INT64, UINT32, ENUM(→UINT32), STRING(fixed length)
+
+.tmpl 은 생성 시 ParsePlan 으로 한 번 컴파일된다:
+  - FIELDS : 미리 만든 struct.Struct — 패킷당 unpack_from 1회
+  - REPEAT : NumPy structured dtype — 패킷당 np.frombuffer 1회 (numpy 없으면 struct.iter_unpack)
+  - repeat count 필드 위치도 컴파일 시점에 결정
+unpack() 은 (values, rows, raw_size) 만 돌려주고, 기존 dict 형태는 to_dict() 가 만든다.
+
+parse() 는 TemplateRecord 를 돌려준다 — raw bytes 만 참조하고, 필드 / repeat 행 / STRING 은
+접근할 때 decode (수신 스레드는 길이 확인만). 기존 dict 키로도 접근 가능:
+    rec = parser.parse(data)
+    rec.field("wheel_count"), len(rec.rows), rec.rows[0].field("x")
+    rec["field_list"], rec["fields"], rec["repeat_rows"]       # 접근 시 생성
 """
 import json
 import struct
-from typing import Any, Dict, List, Optional
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:   # requirements.txt 에 있지만 최소 환경에서는 없을 수 있음 → struct.iter_unpack
+    np = None
 
 # struct format character + byte size per type
 _TYPE_MAP: Dict[str, tuple] = {
@@ -18,6 +36,16 @@ _TYPE_MAP: Dict[str, tuple] = {
     "ENUM":   ("I", 4),  # treated as UINT32
 }
 
+# NumPy dtype per type (little-endian, REPEAT rows)
+_DTYPE_MAP: Dict[str, str] = {
+    "FLOAT":  "<f4",
+    "DOUBLE": "<f8",
+    "INT32":  "<i4",
+    "INT64":  "<i8",
+    "UINT32": "<u4",
+    "ENUM":   "<u4",
+}
+
 MAX_REPEAT_COUNT = 256  # safety cap against corrupt count fields
 
 
@@ -70,6 +98,151 @@ class SegmentDef:
         return sum(f.byte_size for f in self.fields)
 
 
+# ── Compiled parse plan ───────────────────────────────────────────────
+
+Unpacked = Tuple[tuple, Any, int]   # (FIELDS values, REPEAT rows, raw_size)
+
+
+def _segment_struct(fields: List[FieldDef]) -> Tuple[struct.Struct, Tuple[int, ...]]:
+    """FIELDS/REPEAT 한 행의 Struct 와, 알 수 없는 타입(값 없음, 0 byte)을 뺀 field index."""
+    chars, present = [], []
+    for i, fld in enumerate(fields):
+        if fld.is_string or fld.var_type in _TYPE_MAP:
+            chars.append(fld.struct_char)
+            present.append(i)
+    return struct.Struct("<" + "".join(chars)), tuple(present)
+
+
+def _segment_dtype(fields: List[FieldDef], present: Tuple[int, ...]):
+    if np is None or not present:
+        return None
+    # 같은 이름(x/y/z 등)이 반복되므로 dtype field 이름은 위치로
+    return np.dtype([(f"f{i}", f"S{fields[i].length}" if fields[i].is_string else _DTYPE_MAP[fields[i].var_type])
+                     for i in present])
+
+
+def _field_slots(fields: List[FieldDef]) -> List[Optional[Tuple[struct.Struct, int]]]:
+    """field 별 (단일 값 Struct, 행 내 offset) — 필드 하나만 decode 할 때. 알 수 없는 타입은 None."""
+    slots, offset = [], 0
+    for fld in fields:
+        if fld.is_string or fld.var_type in _TYPE_MAP:
+            st = struct.Struct("<" + fld.struct_char)
+            slots.append((st, offset))
+            offset += st.size
+        else:
+            slots.append(None)
+    return slots
+
+
+def _field_keys(fields: List[FieldDef]) -> Dict[str, int]:
+    """variable_name / name → field index. 같은 key 는 뒤 field 가 이김 (dict 의 fields 와 같은 규칙)."""
+    keys: Dict[str, int] = {}
+    for i, fld in enumerate(fields):
+        keys[fld.variable_name] = i
+        keys[fld.name] = i
+    return keys
+
+
+def _count_field_index(fields: List[FieldDef], repeat_field_name: str) -> Optional[int]:
+    """repeat count 가 들어 있는 FIELDS index (없으면 None).
+
+    패킷마다 dict 를 검색하던 기존 규칙을 field 이름만으로 미리 적용:
+      1. variable_name / name 중 'count' 를 포함하는 key
+      2. repeatFieldName 의 base 단어 (예: wheel_attributes → 'wheel') 를 포함하는 key 우선
+      3. 없으면 마지막 key
+    같은 key 가 여러 field 에 있으면 마지막 field 값이 쓰였으므로 그 index.
+    """
+    candidates = [(k, i) for k, i in _field_keys(fields).items() if "count" in k.lower()]
+    if not candidates:
+        return None
+
+    rfn_last = repeat_field_name.split(".")[-1]
+    base = (rfn_last
+            .replace("_attributes", "")
+            .replace("_datas", "")
+            .rstrip("s"))
+    for k, i in candidates:
+        if base and base in k.lower():
+            return i
+    return candidates[-1][1]
+
+
+class ParsePlan:
+    """TemplateParser 의 컴파일 결과. 패킷마다 format 문자열 / dict 를 만들지 않는다."""
+
+    def __init__(self, fields_seg: Optional[SegmentDef], repeat_seg: Optional[SegmentDef]):
+        self.fields = fields_seg.fields if fields_seg else []
+        self.fields_struct, self.fields_present = _segment_struct(self.fields)
+        self.fields_size = self.fields_struct.size
+
+        self.row_fields = repeat_seg.fields if repeat_seg else []
+        self.has_repeat = repeat_seg is not None
+        self.row_struct, self.row_present = _segment_struct(self.row_fields)
+        self.row_size  = self.row_struct.size
+        self.row_dtype = _segment_dtype(self.row_fields, self.row_present)
+
+        # TemplateRecord 용 — 필드 하나씩 decode
+        self.field_slots = _field_slots(self.fields)
+        self.field_keys  = _field_keys(self.fields)
+        self.row_slots   = _field_slots(self.row_fields)
+        self.row_keys    = _field_keys(self.row_fields)
+
+        self.count_index: Optional[int] = None
+        self.count_slot:  Optional[Tuple[struct.Struct, int]] = None
+        if repeat_seg is not None:
+            idx = _count_field_index(self.fields, repeat_seg.repeat_field_name)
+            if idx is not None and idx in self.fields_present:
+                self.count_index = self.fields_present.index(idx)   # unpack 결과 tuple 기준
+                self.count_slot  = self.field_slots[idx]
+
+    @staticmethod
+    def _as_count(raw: Any) -> int:
+        try:
+            return max(0, int(raw))
+        except (TypeError, ValueError):   # count 필드가 STRING 인 경우 등
+            return 0
+
+    def row_count(self, data, values: Optional[tuple] = None) -> int:
+        """실제로 읽을 수 있는 REPEAT 행 수 (count 필드, MAX_REPEAT_COUNT, 남은 길이로 제한)."""
+        if not self.has_repeat:
+            return 0
+        if self.count_index is None:
+            count = 0
+        elif values is not None:
+            count = self._as_count(values[self.count_index])
+        else:
+            st, off = self.count_slot
+            count = self._as_count(st.unpack_from(data, off)[0])
+        count = min(count, MAX_REPEAT_COUNT)
+        if self.row_size:
+            count = min(count, (len(data) - self.fields_size) // self.row_size)   # 잘린 행은 버림
+        return count
+
+    def unpack(self, data) -> Optional[Unpacked]:
+        """FIELDS unpack_from 1회 + REPEAT frombuffer 1회. FIELDS 보다 짧으면 None.
+
+        rows: numpy structured array (numpy 없으면 tuple list). STRING 은 NUL 포함 raw bytes.
+        """
+        size = len(data)
+        if size < self.fields_size:
+            return None
+        values = self.fields_struct.unpack_from(data, 0)
+
+        rows: Any = None
+        if self.has_repeat:
+            count = self.row_count(data, values)
+            offset = self.fields_size
+            if self.row_size == 0:
+                rows = [()] * count
+            else:
+                if self.row_dtype is not None:
+                    rows = np.frombuffer(data, dtype=self.row_dtype, count=count, offset=offset)
+                else:
+                    rows = list(self.row_struct.iter_unpack(
+                        memoryview(data)[offset:offset + count * self.row_size]))
+        return values, rows, size
+
+
 # ── Parser ────────────────────────────────────────────────────────────
 
 class TemplateParser:
@@ -100,6 +273,8 @@ class TemplateParser:
             elif seg_type == "REPEAT" and self._repeat_seg is None:
                 self._repeat_seg = SegmentDef("REPEAT", fields, rfn)
 
+        self.plan = ParsePlan(self._fields_seg, self._repeat_seg)
+
     # ── Properties ───────────────────────────────────────────────────
 
     @property
@@ -126,51 +301,54 @@ class TemplateParser:
             return raw.split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
         return raw
 
-    def _find_count(self, fields_dict: Dict[str, Any]) -> int:
-        """
-        Locate the repeat-count value in the already-parsed FIELDS dict.
-        Strategy:
-          1. Collect all keys that contain 'count' (case-insensitive).
-          2. Try to match the key that also contains the base word from
-             repeatFieldName (e.g. 'wheel' from 'wheel_attributes').
-          3. Fall back to the last matching key.
-        """
-        if not self._repeat_seg:
-            return 0
-
-        rfn_last = self._repeat_seg.repeat_field_name.split(".")[-1]
-        base = (rfn_last
-                .replace("_attributes", "")
-                .replace("_datas", "")
-                .rstrip("s"))
-
-        candidates = {k: v for k, v in fields_dict.items()
-                      if "count" in k.lower()}
-        if not candidates:
-            return 0
-
-        # prefer key that also contains the base word
-        for k, v in candidates.items():
-            if base and base in k.lower():
-                try:
-                    return max(0, int(v))
-                except (TypeError, ValueError):
-                    return 0
-
-        # fallback: last candidate
-        v = list(candidates.values())[-1]
-        try:
-            return max(0, int(v))
-        except (TypeError, ValueError):
-            return 0
+    @classmethod
+    def _build(cls, fields: List[FieldDef], present: Tuple[int, ...], values) -> Tuple[List[Dict], Dict[str, Any]]:
+        field_list: List[Dict] = []
+        fields_d:   Dict[str, Any] = {}
+        by_index = dict(zip(present, values))
+        for i, fld in enumerate(fields):
+            val = cls._decode(fld, by_index[i]) if i in by_index else None
+            field_list.append({
+                "name":          fld.name,
+                "variable_name": fld.variable_name,
+                "value":         val,
+                "type":          fld.var_type,
+            })
+            fields_d[fld.variable_name] = val
+            fields_d[fld.name]          = val   # short name alias
+        return field_list, fields_d
 
     # ── Public parse ─────────────────────────────────────────────────
 
-    def parse(self, data: bytes) -> Optional[Dict[str, Any]]:
+    def unpack(self, data) -> Optional[Unpacked]:
+        """REPEAT 을 한 번에 읽는 eager path — ParsePlan.unpack 참고."""
+        return self.plan.unpack(data)
+
+    def to_dict(self, unpacked: Unpacked) -> Dict[str, Any]:
+        """unpack() 결과를 기존 parse() dict 형태로 변환."""
+        values, rows, raw_size = unpacked
+        plan = self.plan
+        field_list, fields_d = self._build(plan.fields, plan.fields_present, values)
+        repeat_rows = []
+        if rows is not None:
+            if np is not None and isinstance(rows, np.ndarray):
+                rows = rows.tolist()   # numpy scalar → Python int / float / bytes
+            for row in rows:
+                row_fl, row_d = self._build(plan.row_fields, plan.row_present, row)
+                repeat_rows.append({"field_list": row_fl, "fields": row_d})
+        return {
+            "template_name": self._name,
+            "field_list":    field_list,
+            "fields":        fields_d,
+            "repeat_rows":   repeat_rows,
+            "raw_size":      raw_size,
+        }
+
+    def parse(self, data: bytes) -> Optional["TemplateRecord"]:
         """
-        Parse raw UDP bytes according to the template.
+        Wrap raw UDP bytes in a lazy TemplateRecord (data is referenced, not copied).
 
-        Returns a dict:
+        The record reads like the legacy dict:
           {
             "template_name": str,
             "field_list":    [ {name, variable_name, value, type}, ... ],
@@ -178,67 +356,170 @@ class TemplateParser:
             "repeat_rows":   [ {"field_list": [...], "fields": {...}}, ... ],
             "raw_size":      int,
           }
-        or None if data is too short for the FIELDS segment.
+        but nothing is decoded until accessed.
+        Returns None if data is too short for the FIELDS segment.
         """
-        offset = 0
-        result: Dict[str, Any] = {
-            "template_name": self._name,
-            "field_list":    [],
-            "fields":        {},
-            "repeat_rows":   [],
-            "raw_size":      len(data),
-        }
+        if len(data) < self.plan.fields_size:
+            return None
+        return TemplateRecord(self, data)
+
+
+# ── Lazy record ───────────────────────────────────────────────────────
+
+def _decode_one(fields: List[FieldDef], slots, keys: Dict[str, int], data, base: int, key: str) -> Any:
+    i = keys[key]                     # 없는 이름이면 KeyError
+    slot = slots[i]
+    if slot is None:
+        return None
+    st, off = slot
+    return TemplateParser._decode(fields[i], st.unpack_from(data, base + off)[0])
+
+
+_RECORD_KEYS = ("template_name", "field_list", "fields", "repeat_rows", "raw_size")
+_ROW_KEYS    = ("field_list", "fields")
 
-        # ── FIELDS segment ───────────────────────────────────────────
-        if self._fields_seg:
-            seg  = self._fields_seg
-            size = seg.byte_size()
-            if len(data) < offset + size:
-                return None
-
-            values = struct.unpack_from(seg.build_fmt(), data, offset)
-            offset += size
-
-            for i, fld in enumerate(seg.fields):
-                val = self._decode(fld, values[i])
-                result["field_list"].append({
-                    "name":          fld.name,
-                    "variable_name": fld.variable_name,
-                    "value":         val,
-                    "type":          fld.var_type,
-                })
-                result["fields"][fld.variable_name] = val
-                result["fields"][fld.name]          = val   # short name alias
-
-        # ── REPEAT segment ───────────────────────────────────────────
-        if self._repeat_seg:
-            count    = min(self._find_count(result["fields"]), MAX_REPEAT_COUNT)
-            seg      = self._repeat_seg
-            row_size = seg.byte_size()
-            row_fmt  = seg.build_fmt()
-
-            for _ in range(count):
-                if len(data) < offset + row_size:
-                    break
-                values = struct.unpack_from(row_fmt, data, offset)
-                offset += row_size
-
-                row_fl: List[Dict] = []
-                row_d:  Dict[str, Any] = {}
-                for i, fld in enumerate(seg.fields):
-                    val = self._decode(fld, values[i])
-                    row_fl.append({
-                        "name":          fld.name,
-                        "variable_name": fld.variable_name,
-                        "value":         val,
-                        "type":          fld.var_type,
-                    })
-                    row_d[fld.variable_name] = val
-                    row_d[fld.name]          = val
-
-                result["repeat_rows"].append({
-                    "field_list": row_fl,
-                    "fields":     row_d,
-                })
-
-        return result
+
+class RepeatRow(Mapping):
+    """REPEAT 한 행의 view. {"field_list", "fields"} 는 접근할 때 생성."""
+
+    __slots__ = ("_plan", "_data", "_offset", "_values")
+
+    def __init__(self, plan: ParsePlan, data, offset: int):
+        self._plan   = plan
+        self._data   = data
+        self._offset = offset
+        self._values: Optional[tuple] = None
+
+    def field(self, key: str) -> Any:
+        """이 행의 필드 하나만 decode (variable_name 또는 name)."""
+        p = self._plan
+        return _decode_one(p.row_fields, p.row_slots, p.row_keys, self._data, self._offset, key)
+
+    @property
+    def values(self) -> tuple:
+        """행 전체 raw 값 (STRING 은 bytes). 한 번 unpack 후 캐시."""
+        if self._values is None:
+            self._values = self._plan.row_struct.unpack_from(self._data, self._offset)
+        return self._values
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _ROW_KEYS:
+            raise KeyError(key)
+        p = self._plan
+        field_list, fields_d = TemplateParser._build(p.row_fields, p.row_present, self.values)
+        return field_list if key == "field_list" else fields_d
+
+    def __iter__(self):
+        return iter(_ROW_KEYS)
+
+    def __len__(self) -> int:
+        return len(_ROW_KEYS)
+
+
+class RepeatRows(Sequence):
+    """TemplateRecord.rows — 길이만 알고, 행은 index 접근 시 RepeatRow 로 만든다."""
+
+    __slots__ = ("_plan", "_data", "_count")
+
+    def __init__(self, plan: ParsePlan, data, count: int):
+        self._plan  = plan
+        self._data  = data
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("repeat row index out of range")
+        p = self._plan
+        return RepeatRow(p, self._data, p.fields_size + index * p.row_size)
+
+
+class TemplateRecord(Mapping):
+    """TemplateParser.parse() 결과. raw bytes 만 들고 있다가 접근할 때 decode."""
+
+    __slots__ = ("_parser", "_data", "_values", "_row_count", "_cache")
+
+    def __init__(self, parser: TemplateParser, data):
+        self._parser = parser
+        self._data   = data
+        self._values: Optional[tuple] = None
+        self._row_count: Optional[int] = None
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def raw(self):
+        return self._data
+
+    @property
+    def raw_size(self) -> int:
+        return len(self._data)
+
+    @property
+    def template_name(self) -> str:
+        return self._parser.template_name
+
+    def field(self, key: str) -> Any:
+        """FIELDS 의 필드 하나만 decode (variable_name 또는 name)."""
+        p = self._parser.plan
+        return _decode_one(p.fields, p.field_slots, p.field_keys, self._data, 0, key)
+
+    @property
+    def values(self) -> tuple:
+        """FIELDS 전체 raw 값 (STRING 은 bytes). 한 번 unpack 후 캐시."""
+        if self._values is None:
+            self._values = self._parser.plan.fields_struct.unpack_from(self._data, 0)
+        return self._values
+
+    @property
+    def row_count(self) -> int:
+        if self._row_count is None:
+            self._row_count = self._parser.plan.row_count(self._data, self._values)
+        return self._row_count
+
+    @property
+    def rows(self) -> RepeatRows:
+        return RepeatRows(self._parser.plan, self._data, self.row_count)
+
+    def unpack(self) -> Unpacked:
+        """TemplateParser.unpack() 과 같은 결과 (REPEAT 을 한 번에 읽을 때)."""
+        return self._parser.plan.unpack(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 parse() 와 같은 순수 dict."""
+        d = {k: self[k] for k in _RECORD_KEYS}
+        d["repeat_rows"] = [dict(row) for row in d["repeat_rows"]]
+        return d
+
+    # ── Mapping (기존 dict 키) ─────────────────────────────────────
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "template_name":
+            return self.template_name
+        if key == "raw_size":
+            return self.raw_size
+        if key not in _RECORD_KEYS:
+            raise KeyError(key)
+        if key not in self._cache:
+            if key == "repeat_rows":
+                self._cache[key] = list(self.rows)
+            else:
+                p = self._parser.plan
+                field_list, fields_d = TemplateParser._build(p.fields, p.fields_present, self.values)
+                self._cache["field_list"] = field_list
+                self._cache["fields"]     = fields_d
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(_RECORD_KEYS)
+
+    def __len__(self) -> int:
+        return len(_RECORD_KEYS)
+
+    def __repr__(self) -> str:
+        return f"<TemplateRecord {self.template_name!r} {self.raw_size}B rows={self.row_count}>"
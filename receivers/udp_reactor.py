@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+# receivers/udp_reactor.py
+#
+# UdpReactor — 모든 UDP 수신 소켓을 스레드 하나로 처리 (selectors: Linux epoll / Windows select).
+#   소켓마다 recvfrom 블로킹 스레드를 두면 차량 6대 + monitor 탭만으로 스레드 10여 개가 GIL 을 두고 경쟁한다.
+#
+#   register(sock, handler, stream=..., copy=...) : 소켓을 non-blocking 으로 바꾸고 등록
+#     - 읽기 가능해지면 EAGAIN 까지 (한 번에 최대 max_batch) 미리 할당한 버퍼로 recv_into → handler(data)
+#     - copy=False : data 는 버퍼의 memoryview — handler 안에서만 유효 (struct.unpack 후 버리는 parser 용)
+#       copy=True  : data 는 bytes (TemplateRecord, 카메라 chunk 조립처럼 data 를 계속 참조하는 경우)
+#     - handler 가 False 를 반환하면 invalid 로 집계, 예외는 dropped 로 집계
+#     - 소켓 오류 (닫힘 등) 시 자동 해제 후 on_error()
+#   unregister(sock) : 반환 후 sock.close() 해도 안전 (이미 꺼낸 batch 의 handler 가 한 번 더 불릴 수는 있음)
+#
+#   소켓별 packets / bytes / invalid / dropped 카운터 (Registration, + utils.metrics {stream} label)
+#     dropped = handler 예외 + 잘린 datagram + (Linux) SO_RXQ_OVFL 로 본 커널 수신 버퍼 overflow
+#
+#   handler 는 reactor 스레드에서 불리므로 짧아야 한다 — 오래 걸리는 작업 (JPEG decode 등) 은
+#   다른 소켓의 지연이 되므로 필요하면 별도 UdpReactor 인스턴스를 쓴다.
+#
+# 모듈 수준 기본 인스턴스: default_reactor() — 첫 register 때 스레드 시작.
+
+import selectors
+import socket
+import struct
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+import utils.event_log as elog
+import utils.metrics as metrics
+
+Packet  = Union[bytes, memoryview]
+Handler = Callable[[Packet], Optional[bool]]
+
+_RECV_BUF  = 65535
+_MAX_BATCH = 256     # 한 소켓을 연속으로 읽는 최대 패킷 수 (나머지는 다음 select 에서 — level-triggered)
+_POLL_SEC  = 0.5
+
+# Linux: 수신 큐 overflow 누적 drop 수를 ancillary data 로 받는다 (socket 모듈에 상수 없음)
+_SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+
+class Registration:
+    """register() 결과 — 소켓 하나의 버퍼와 카운터. 카운터는 reactor 스레드만 갱신."""
+
+    __slots__ = ("sock", "handler", "stream", "copy", "on_error", "buf", "view", "ancsize",
+                 "packets", "bytes", "invalid", "dropped", "errors", "_kernel_drops",
+                 "_m_packets", "_m_bytes", "_m_invalid", "_m_dropped")
+
+    def __init__(self, sock: socket.socket, handler: Handler, stream: str, copy: bool,
+                 on_error: Optional[Callable[[], None]], buf_size: int):
+        self.sock     = sock
+        self.handler  = handler
+        self.stream   = stream
+        self.copy     = copy
+        self.on_error = on_error
+        self.buf      = bytearray(buf_size)
+        self.view     = memoryview(self.buf)
+        self.ancsize  = 0            # > 0 이면 recvmsg_into + SO_RXQ_OVFL
+
+        self.packets = 0
+        self.bytes   = 0
+        self.invalid = 0
+        self.dropped = 0
+        self.errors  = 0             # handler 예외 (dropped 에도 포함)
+        self._kernel_drops = 0       # 커널이 알려준 누적 drop 수 (uint32)
+
+        labels = {"stream": stream}
+        self._m_packets = metrics.counter("morai_udp_rx_packets_total", "수신 UDP 패킷 수", labels)
+        self._m_bytes   = metrics.counter("morai_udp_rx_bytes_total", "수신 UDP 바이트", labels)
+        self._m_invalid = metrics.counter("morai_udp_rx_invalid_total", "파싱 실패 UDP 패킷 수", labels)
+        self._m_dropped = metrics.counter("morai_udp_rx_dropped_total",
+                                          "버려진 UDP 패킷 수 (커널 overflow / 잘림 / handler 예외)", labels)
+
+    def _enable_drop_counter(self) -> None:
+        if _SO_RXQ_OVFL is None or not hasattr(self.sock, "recvmsg_into"):
+            return
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, _SO_RXQ_OVFL, 1)
+        except OSError:
+            return
+        self.ancsize = socket.CMSG_SPACE(4)
+
+    def _add_dropped(self, n: int) -> None:
+        self.dropped += n
+        self._m_dropped.inc(n)
+
+    def _kernel_drop_update(self, ancdata) -> None:
+        for level, kind, payload in ancdata:
+            if level == socket.SOL_SOCKET and kind == _SO_RXQ_OVFL and len(payload) >= 4:
+                (total,) = struct.unpack_from("=I", payload)
+                delta = (total - self._kernel_drops) & 0xFFFFFFFF
+                if delta:
+                    self._kernel_drops = total
+                    self._add_dropped(delta)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "stream":  self.stream,
+            "packets": self.packets,
+            "bytes":   self.bytes,
+            "invalid": self.invalid,
+            "dropped": self.dropped,
+        }
+
+
+class UdpReactor:
+    def __init__(self, name: str = "udp-reactor", buf_size: int = _RECV_BUF,
+                 max_batch: int = _MAX_BATCH, poll_sec: float = _POLL_SEC):
+        self.name      = name
+        self.buf_size  = buf_size
+        self.max_batch = max_batch
+        self.poll_sec  = poll_sec
+
+        self._selector = selectors.DefaultSelector()
+        self._lock     = threading.Lock()     # register / unregister / start / stop
+        self._thread: Optional[threading.Thread] = None
+        self._running  = False
+
+        # 다른 스레드의 register / unregister / stop 을 select 에 즉시 반영하기 위한 wakeup 소켓
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    # ── 등록 ──────────────────────────────────────────────────
+
+    def register(
+        self,
+        sock: socket.socket,
+        handler: Handler,
+        stream: str = "udp",
+        copy: bool = True,
+        on_error: Optional[Callable[[], None]] = None,
+    ) -> Registration:
+        sock.setblocking(False)
+        reg = Registration(sock, handler, stream, copy, on_error, self.buf_size)
+        reg._enable_drop_counter()
+        with self._lock:
+            self._selector.register(sock, selectors.EVENT_READ, reg)
+            self._start_locked()
+        self._wake()
+        return reg
+
+    def unregister(self, sock: socket.socket) -> Optional[Registration]:
+        with self._lock:
+            try:
+                key = self._selector.unregister(sock)
+            except (KeyError, ValueError):
+                return None
+        self._wake()
+        return key.data
+
+    def registrations(self) -> List[Registration]:
+        with self._lock:
+            return [k.data for k in self._selector.get_map().values() if k.data is not None]
+
+    def stats(self) -> List[Dict[str, object]]:
+        return [reg.stats() for reg in self.registrations()]
+
+    # ── 스레드 ────────────────────────────────────────────────
+
+    def start(self) -> "UdpReactor":
+        with self._lock:
+            self._start_locked()
+        return self
+
+    def _start_locked(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """스레드 종료. 등록된 소켓은 닫지 않는다 (소유자가 닫음)."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            thread, self._thread = self._thread, None
+        self._wake()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\x00")
+        except OSError:          # 버퍼가 가득 찼으면 이미 깨어날 예정
+            pass
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while self._running:
+            try:
+                events = self._selector.select(self.poll_sec)
+            except OSError:
+                # Windows select: unregister 없이 닫힌 소켓이 섞여 있으면 전체가 실패
+                self._purge_closed()
+                continue
+            for key, _ in events:
+                reg = key.data
+                if reg is None:
+                    self._drain_wake()
+                else:
+                    self._drain(reg)
+
+    def _purge_closed(self) -> None:
+        for reg in self.registrations():
+            if reg.sock.fileno() == -1:
+                self._fail(reg)
+
+    def _fail(self, reg: Registration) -> None:
+        if self.unregister(reg.sock) is not None and reg.on_error is not None:
+            try:
+                reg.on_error()
+            except Exception as e:
+                elog.log(elog.WARN, "udp.reactor", "[UdpReactor] %s on_error 예외: %r", reg.stream, e)
+
+    # ── 수신 ──────────────────────────────────────────────────
+
+    def _drain(self, reg: Registration) -> None:
+        sock, buf, view = reg.sock, reg.buf, reg.view
+        for _ in range(self.max_batch):
+            try:
+                if reg.ancsize:
+                    n, ancdata, flags, _ = sock.recvmsg_into([buf], reg.ancsize)
+                    if ancdata:
+                        reg._kernel_drop_update(ancdata)
+                    if flags & socket.MSG_TRUNC:
+                        reg._add_dropped(1)
+                        continue
+                else:
+                    n = sock.recv_into(buf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue             # Windows: 이전 sendto 의 ICMP port unreachable
+            except OSError:
+                if self._running:
+                    self._fail(reg)  # 닫힌 소켓 등 — unregister 경합이면 이미 해제돼 on_error 안 불림
+                return
+
+            reg.packets += 1
+            reg.bytes   += n
+            reg._m_packets.inc()
+            reg._m_bytes.inc(n)
+            try:
+                ok = reg.handler(bytes(view[:n]) if reg.copy else view[:n])
+            except Exception as e:
+                reg.errors += 1
+                if reg.errors == 1:
+                    elog.log(elog.WARN, "udp.reactor", "[UdpReactor] %s handler 예외: %r", reg.stream, e)
+                reg._add_dropped(1)
+                continue
+            if ok is False:
+                reg.invalid += 1
+                reg._m_invalid.inc()
+
+
+# ── 기본 인스턴스 ─────────────────────────────────────────────
+
+_default: Optional[UdpReactor] = None
+_default_lock = threading.Lock()
+
+
+def default_reactor() -> UdpReactor:
+    """프로세스 공용 reactor (스레드는 첫 register 때 시작)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = UdpReactor()
+        return _default
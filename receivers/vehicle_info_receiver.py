@@ -20,38 +20,120 @@ VEHICLE_INFO_SIZE = struct.calcsize(VEHICLE_INFO_FMT)  # 108 bytes
 PRINT_INTERVAL_SEC = 0.2  # 출력 rate-limit (0이면 매 패킷 출력)
 
 
+_VEHICLE_INFO_STRUCT = struct.Struct(VEHICLE_INFO_FMT)
+
+
 def _decode_cstr24(raw: bytes) -> str:
     return raw.split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
 
 
+class VehicleInfo:
+    """
+    Vehicle Info 한 패킷 — 중첩 dict 대신 평탄한 slot 속성.
+
+    update_from(data) 가 미리 컴파일한 Struct.unpack_from 으로 같은 객체를 덮어쓰므로
+    차량마다 하나를 만들어 재사용한다 (id 문자열은 바뀔 때만 decode).
+    다른 스레드가 읽는 객체는 lock 안에서 갱신하고, 읽는 쪽은 copy_from() 으로 snapshot 을 떠서 쓴다.
+
+    기존 dict API: vi["location"]["x"] (접근 시 생성), to_dict(), parse_vehicle_info_payload().
+    """
+
+    __slots__ = (
+        "seconds", "nanos", "id",
+        "x", "y", "z",                         # location (m)
+        "roll", "pitch", "yaw",                # rotation (deg)
+        "vx", "vy", "vz",                      # local velocity (m/s)
+        "ax", "ay", "az",                      # local acceleration
+        "wx", "wy", "wz",                      # angular velocity
+        "throttle", "brake", "steer_angle",    # control
+        "raw_size", "_raw_id",
+    )
+
+    def __init__(self):
+        self.seconds = self.nanos = self.raw_size = 0
+        self.id = ""
+        self._raw_id = b""
+        self.x = self.y = self.z = 0.0
+        self.roll = self.pitch = self.yaw = 0.0
+        self.vx = self.vy = self.vz = 0.0
+        self.ax = self.ay = self.az = 0.0
+        self.wx = self.wy = self.wz = 0.0
+        self.throttle = self.brake = self.steer_angle = 0.0
+
+    @classmethod
+    def from_bytes(cls, data) -> VehicleInfo | None:
+        vi = cls()
+        return vi if vi.update_from(data) else None
+
+    def update_from(self, data) -> bool:
+        """data (bytes / memoryview) 로 in-place 갱신. 길이가 모자라면 False (값은 그대로)."""
+        if len(data) < VEHICLE_INFO_SIZE:
+            return False
+        (self.seconds, self.nanos, raw_id,
+         self.x, self.y, self.z,
+         self.roll, self.pitch, self.yaw,
+         self.vx, self.vy, self.vz,
+         self.ax, self.ay, self.az,
+         self.wx, self.wy, self.wz,
+         self.throttle, self.brake, self.steer_angle) = _VEHICLE_INFO_STRUCT.unpack_from(data)
+        if raw_id != self._raw_id:
+            self._raw_id = raw_id
+            self.id = _decode_cstr24(raw_id)
+        self.raw_size = len(data)
+        return True
+
+    def copy_from(self, other: VehicleInfo) -> VehicleInfo:
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+        return self
+
+    @property
+    def speed_kph(self) -> float:
+        """종방향 속도 크기 (km/h)."""
+        return abs(self.vx) * 3.6
+
+    # ── 기존 dict API ─────────────────────────────────────────
+
+    def __getitem__(self, key: str):
+        if key == "location":
+            return {"x": self.x, "y": self.y, "z": self.z}
+        if key == "rotation":
+            return {"x": self.roll, "y": self.pitch, "z": self.yaw}
+        if key == "local_velocity":
+            return {"x": self.vx, "y": self.vy, "z": self.vz}
+        if key == "local_acceleration":
+            return {"x": self.ax, "y": self.ay, "z": self.az}
+        if key == "angular_velocity":
+            return {"x": self.wx, "y": self.wy, "z": self.wz}
+        if key == "control":
+            return {"throttle": self.throttle, "brake": self.brake, "steer_angle": self.steer_angle}
+        if key in ("seconds", "nanos", "id", "raw_size"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_dict(self) -> dict:
+        return {
+            "seconds": self.seconds,
+            "nanos": self.nanos,
+            "id": self.id,
+            "location": self["location"],
+            "rotation": self["rotation"],
+            "local_velocity": self["local_velocity"],
+            "local_acceleration": self["local_acceleration"],
+            "angular_velocity": self["angular_velocity"],
+            "control": self["control"],
+            "raw_size": self.raw_size,
+        }
+
+    def __repr__(self) -> str:
+        return (f"VehicleInfo(id={self.id!r}, t={self.seconds}.{self.nanos:09d}, "
+                f"loc=({self.x:.3f}, {self.y:.3f}, {self.z:.3f}), yaw={self.yaw:.2f}, vx={self.vx:.3f})")
+
+
 def parse_vehicle_info_payload(data: bytes):
-    if len(data) < VEHICLE_INFO_SIZE:
-        return None
-
-    seconds, nanos, raw_id, *floats = struct.unpack(VEHICLE_INFO_FMT, data[:VEHICLE_INFO_SIZE])
-    vehicle_id = _decode_cstr24(raw_id)
-
-    # floats mapping (원본 example.py 기준)
-    # [0:3] location, [3:6] rotation, [6:9] vel, [9:12] accel, [12:15] ang_vel, [15:18] control
-    loc = floats[0:3]
-    rot = floats[3:6]
-    vel = floats[6:9]
-    acc = floats[9:12]
-    ang = floats[12:15]
-    ctrl = floats[15:18]
-
-    return {
-        "seconds": seconds,
-        "nanos": nanos,
-        "id": vehicle_id,
-        "location": {"x": loc[0], "y": loc[1], "z": loc[2]},
-        "rotation": {"x": rot[0], "y": rot[1], "z": rot[2]},
-        "local_velocity": {"x": vel[0], "y": vel[1], "z": vel[2]},
-        "local_acceleration": {"x": acc[0], "y": acc[1], "z": acc[2]},
-        "angular_velocity": {"x": ang[0], "y": ang[1], "z": ang[2]},
-        "control": {"throttle": ctrl[0], "brake": ctrl[1], "steer_angle": ctrl[2]},
-        "raw_size": len(data),
-    }
+    """기존 dict API (compat) — hot path 는 VehicleInfo.update_from 사용."""
+    vi = VehicleInfo.from_bytes(data)
+    return vi.to_dict() if vi is not None else None
 
 
 class VehicleInfoReceiver(threading.Thread):
@@ -8,12 +8,28 @@ from __future__ import annotations
 #   ② 모든 차량 ManualControl 전송 (fire-and-forget)
 #   ③ FixedStep 전송 → ACK 대기  (시뮬레이터 1틱 진행 + VI 전송)
 #
+# decimation=k 이면 ③ 을 step_count=k 로 보내 control 갱신 1회당 k 틱 진행 (왕복 1/k).
+# adaptive_decimation=True 면 control 변화량에 따라 k 를 1~max_decimation 사이에서 조절
+# (automation/step_schedule.py).
+#
+# FixedStep ACK 대기는 transport/retry_policy.StepRetryPolicy — 관측 RTT 기반 timeout
+# (timeout_sec 는 상한), 무응답 시 GetSimulationTimeStatus step_index 로 ACK 유실 / 요청 유실을
+# 구분해 같은 request_id 로 최대 max_retries 번 재전송한 뒤에야 중단.
+#
+# trace_path 를 주면 실행 동안 utils/tracer 를 켜고, 종료 시 Chrome trace JSON 으로 저장
+# (FixedStep 송신 / ACK / VI 도착 / 차량별 control 계산 / 커맨드 송신, step 번호 포함).
+#
+# trajectory_mode 차량은 ② 에서 ManualControl 대신 필요할 때만 SetTrajectory 업로드
+# (autonomous_driving/planning/trajectory_planner.py).
+#
 # collision_cfg = {
 #   "chaser_entity_id": str,   # 이 차량은 path 대신 target을 추적
 #   "target_entity_id": str,   # 추적 대상
 #   "throttle": float,         # chaser 고정 스로틀
 #   "trigger_kph": float,      # target 이 이 속도 이상이면 chaser 출발
 # }
+# target 이 이 runner 에 없으면 (다른 프로세스의 runner) 공유 차량 상태 표 (utils.vehicle_table) 에서 읽는다.
+# VI 수신 callback 은 모든 차량의 상태를 그 표에 기록.
 
 import itertools
 import socket
@@ -24,8 +40,15 @@ import numpy as np
 
 import transport.tcp_transport as tcp
 import transport.protocol_defs as proto
-from receivers.vehicle_info_receiver import parse_vehicle_info_payload
+from automation.step_schedule import StepSchedule
+from transport.retry_policy import StepRetryPolicy
+from receivers.udp_reactor import default_reactor
+from receivers.vehicle_info_receiver import VehicleInfo
+import utils.metrics as metrics
+import utils.tracer as tracer
+from utils.vehicle_table import default_table
 from autonomous_driving.autonomous_driving import AutonomousDriving
+from autonomous_driving.planning.trajectory_planner import TrajectoryPlanner
 from autonomous_driving.vehicle_state import VehicleState
 
 MAX_STEER_RAD = 0.5
@@ -36,6 +59,17 @@ def _next_rid() -> int:
     return next(_rid_iter)
 
 
+# ── metrics (utils/metrics.py) ────────────────────────────────
+_PHASES = ("ack_wait", "vi_wait", "cmd", "total")
+_M_PHASE = {
+    phase: metrics.histogram("morai_step_ad_phase_seconds", "StepAdRunner 루프 구간별 소요", {"phase": phase})
+    for phase in _PHASES
+}
+_M_STEPS       = metrics.counter("morai_step_ad_steps_total", "StepAdRunner 완료 루프 수")
+_M_VI_TIMEOUTS = metrics.counter("morai_step_ad_vi_timeouts_total", "StepAdRunner VI 대기 timeout 수")
+_M_DECIMATION  = metrics.gauge("morai_step_ad_decimation", "현재 FixedStep step_count (k)")
+
+
 # ── 속도 비례 제어 ────────────────────────────────────────────
 _SPEED_GAIN = 0.1   # throttle·brake per kph error
 
@@ -52,15 +86,15 @@ _CHASE_LFD_MIN = 3.0
 _CHASE_LFD_MAX = 15.0
 _CHASE_STEER_GAIN = 1.35
 
-def _calc_chase_steer_norm(parsed: dict, target_x: float, target_y: float, wheelbase: float) -> float:
+def _calc_chase_steer_norm(vi: VehicleInfo, target_x: float, target_y: float, wheelbase: float) -> float:
     """타겟 현재 위치를 직접 look-ahead point 로 두고 공격적으로 조향한다."""
-    dx = target_x - parsed["location"]["x"]
-    dy = target_y - parsed["location"]["y"]
+    dx = target_x - vi.x
+    dy = target_y - vi.y
     distance = float(np.hypot(dx, dy))
     if distance < 1e-3:
         return 0.0
 
-    yaw = np.deg2rad(parsed["rotation"]["z"])
+    yaw = np.deg2rad(vi.yaw)
     local_x = np.cos(-yaw) * dx - np.sin(-yaw) * dy
     local_y = np.sin(-yaw) * dx + np.cos(-yaw) * dy
     theta = float(np.arctan2(local_y, local_x))
@@ -78,7 +112,11 @@ class _VehicleCtx:
                  is_collision_target: bool = False,
                  speed_kph: float = 60.0,
                  trigger_kph: float = 5.0,
-                 max_speed_kph: float = None):
+                 max_speed_kph: float = None,
+                 trajectory_mode: bool = False,
+                 trajectory_window: int = 0,
+                 trajectory_deviation_m: float = 3.0,
+                 trajectory_max_error: float = 0.1):
         self.entity_id           = entity_id
         self.is_chaser           = is_chaser
         self.is_collision_target = is_collision_target
@@ -86,13 +124,23 @@ class _VehicleCtx:
         self.target_speed_kph    = speed_kph if not is_chaser else speed_kph * 1.2
         self.trigger_kph         = trigger_kph
         self.ad                  = AutonomousDriving(path_file, map_name=map_name, max_speed_kph=max_speed_kph)
-        self.latest         = None
+        self.planner             = None
+        if trajectory_mode and not is_chaser:
+            self.planner = TrajectoryPlanner(
+                self.ad.path_manager,
+                window_points = trajectory_window,
+                deviation_m   = trajectory_deviation_m,
+                speed_cap     = self.target_speed_kph / 3.6 if is_collision_target else None,
+                max_error     = trajectory_max_error,
+            )
+        self.vi             = VehicleInfo()   # reactor 스레드가 lock 안에서 in-place 갱신
+        self.vi_valid       = False
+        self.tick_vi        = VehicleInfo()   # 제어 루프용 snapshot
         self.lock           = threading.Lock()
         self.vi_event       = threading.Event()   # FixedStep 후 VI 도착 신호
 
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)   # StepAdRunner.start() 때 reactor 에 등록
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock.settimeout(2.0)
         self.sock.bind((vi_ip, vi_port))
 
 
@@ -103,32 +151,56 @@ class StepAdRunner:
         self,
         tcp_sock:      socket.socket,
         vehicles:      list,           # [{ entity_id, vi_ip, vi_port, path }, ...]
-        pending:       dict,
-        lock:          threading.Lock,
+        pending,                       # PendingTable (app.py 공유)
         request_id_ref,                # RequestIdCounter (app.py 공유)
-        pending_add_fn,
-        pending_pop_fn,
         timeout_sec:   float = 3.0,
         log_fn=None,
         status_cb=None,
         on_done=None,
         collision_cfg: dict = None,    # 충돌 모드 설정 (없으면 일반 path follow)
         save_data:     bool = False,
+        control_bus=None,              # ControlBus — 있으면 FixedStep 직전에 flush
+        trajectory_mode: bool = False, # 기본값 — 차량 dict 의 "trajectory_mode" 가 우선
+        trajectory_follow_mode: int = 2,
+        decimation: int = 1,           # FixedStep 1회당 틱 수 (control 갱신 주기)
+        adaptive_decimation: bool = False,
+        max_decimation: int = 8,
+        trace_path: str = None,        # Chrome trace JSON 출력 경로 (None → tracing 끔)
+        max_retries: int = proto.AUTO_MAX_RETRIES,   # FixedStep 무응답 시 재전송 횟수 (0 → 첫 timeout 에 중단)
+        reactor=None,                  # UdpReactor — None 이면 공용 default_reactor()
+        vehicle_table=None,            # VehicleStateTable — None 이면 공용 default_table()
         **kwargs,
     ):
         self._tcp_sock      = tcp_sock
+        self._control_bus   = control_bus
+        self._trajectory_follow_mode = trajectory_follow_mode
+        self._schedule      = StepSchedule(decimation, adaptive=adaptive_decimation,
+                                           max_decimation=max_decimation)
         self._pending       = pending
-        self._lock          = lock
+        self._reactor       = reactor or default_reactor()
+        self._table         = vehicle_table or default_table()
         self._rid           = request_id_ref
-        self._pending_add   = pending_add_fn
-        self._pending_pop   = pending_pop_fn
         self._timeout_sec   = timeout_sec
         self._log           = log_fn or (lambda msg, level="INFO": print(f"[StepAD] {msg}"))
+        self._retry         = StepRetryPolicy(
+            tcp_sock, pending, request_id_ref,
+            initial_timeout_sec=timeout_sec,
+            min_timeout_sec=proto.AUTO_MIN_TIMEOUT_SEC,
+            max_timeout_sec=timeout_sec,
+            max_retries=max_retries,
+            log_fn=self._log,
+        )
+        self._base_step_index = None   # 시작 시 서버 step_index (재전송 판단용)
+        self._sent_ticks    = 0        # 송신한 FixedStep step_count 합
+        self._last_k        = 1        # 마지막 FixedStep step_count (재전송 시 그대로)
         self._status_cb     = status_cb or (lambda *a: None)
         self._on_done       = on_done
         self._running       = False
         self._collision_cfg = collision_cfg
         self._save_data     = save_data
+        self._trace_path    = trace_path
+        self._step          = 0        # 현재 진행 중인 FixedStep 번호 (trace 용)
+        self._vi_step       = 0        # VI 를 기다리는 FixedStep 번호 (vi.recv trace 용 — 선제 전송으로 _step 보다 1 작을 수 있음)
         self._ctxs: list[_VehicleCtx] = []
 
         chaser_id = (collision_cfg or {}).get("chaser_entity_id")
@@ -148,10 +220,17 @@ class StepAdRunner:
                 speed_kph           = speed_kph,
                 trigger_kph         = (collision_cfg or {}).get("trigger_kph", 5.0),
                 max_speed_kph       = v.get("max_speed_kph"),
+                trajectory_mode     = v.get("trajectory_mode", trajectory_mode),
+                trajectory_window   = v.get("trajectory_window", 0),
+                trajectory_deviation_m = v.get("trajectory_deviation_m", 3.0),
+                trajectory_max_error = v.get("trajectory_max_error", 0.1),
             )
             self._ctxs.append(ctx)
+            self._table.add(ctx.entity_id)
             if is_chaser:
                 role = f"Chaser ({speed_kph * 1.2:.0f} km/h)"
+            elif ctx.planner is not None:
+                role = "Trajectory"
             elif is_target:
                 role = f"Target ({speed_kph:.0f} km/h)"
             else:
@@ -170,43 +249,67 @@ class StepAdRunner:
     def start(self) -> None:
         self._running = True
         for ctx in self._ctxs:
-            threading.Thread(target=self._recv_loop, args=(ctx,), daemon=True).start()
-        threading.Thread(target=self._control_loop, daemon=True).start()
+            self._reactor.register(ctx.sock, lambda data, c=ctx: self._on_vi_packet(c, data),
+                                   stream=f"vehicle_info:{ctx.entity_id}", copy=False)
+        threading.Thread(target=self._control_loop, daemon=True, name="StepAD-control").start()
 
     def stop(self) -> None:
         self._running = False
         for ctx in self._ctxs:
+            self._reactor.unregister(ctx.sock)
             try:
                 ctx.sock.close()
             except Exception:
                 pass
 
-    # ── UDP 수신 스레드 (차량별) ───────────────────────────────
-
-    def _recv_loop(self, ctx: _VehicleCtx) -> None:
-        while self._running:
-            try:
-                data, _ = ctx.sock.recvfrom(65535)
-                parsed = parse_vehicle_info_payload(data)
-                if parsed:
-                    with ctx.lock:
-                        ctx.latest = parsed
-                    ctx.vi_event.set()   # VI 도착 신호
-            except socket.timeout:
-                continue
-            except OSError:
-                break
+    def _export_trace(self) -> None:
+        tr = tracer.uninstall()
+        if tr is None:
+            return
+        try:
+            n = tr.export_chrome(self._trace_path)
+            st = tr.stats()
+            self._log(f"trace 저장: {self._trace_path} ({n} events, dropped={st['dropped']}) "
+                      "— Perfetto / chrome://tracing 에서 열기")
+        except OSError as e:
+            self._log(f"trace 저장 실패: {e}", "ERROR")
+
+    # ── UDP 수신 (reactor 스레드, 차량별 소켓) ─────────────────
+
+    def _on_vi_packet(self, ctx: _VehicleCtx, data) -> bool:
+        with ctx.lock:
+            if not ctx.vi.update_from(data):
+                return False
+            ctx.vi_valid = True
+        self._table.publish(ctx.entity_id, ctx.vi)   # 이 행의 writer — ctx.vi 는 이 스레드만 갱신
+        ctx.vi_event.set()   # VI 도착 신호
+        tracer.instant("vi.recv", "udp", step=self._vi_step, entity=ctx.entity_id)
+        return True
 
     # ── 차량별 제어 ───────────────────────────────────────────
 
-    def _send_path_follow(self, ctx: _VehicleCtx, parsed: dict) -> None:
+    def _send_control(self, entity_id: str, throttle: float, brake: float, steer_angle: float) -> None:
+        self._schedule.observe(entity_id, throttle, brake, steer_angle)
+        with tracer.span("cmd.send", "cmd", step=self._step, entity=entity_id):
+            if self._control_bus is not None:
+                self._control_bus.submit(entity_id, throttle, brake, steer_angle)
+                return
+            tcp.send_manual_control_by_id(
+                self._tcp_sock, _next_rid(),
+                entity_id   = entity_id,
+                throttle    = throttle,
+                brake       = brake,
+                steer_angle = steer_angle,
+            )
+
+    def _send_path_follow(self, ctx: _VehicleCtx, vi: VehicleInfo) -> None:
         """경로 추종 제어 (Pure Pursuit).
         충돌 모드 target 차량은 Pure Pursuit 조향을 유지하되 속도를 speed_kph로 제어."""
         vs = VehicleState(
-            x        = parsed["location"]["x"],
-            y        = parsed["location"]["y"],
-            yaw      = np.deg2rad(parsed["rotation"]["z"]),
-            velocity = parsed["local_velocity"]["x"],
+            x        = vi.x,
+            y        = vi.y,
+            yaw      = np.deg2rad(vi.yaw),
+            velocity = vi.vx,
         )
         try:
             ctrl, _ = ctx.ad.execute(vs)
@@ -215,18 +318,12 @@ class StepAdRunner:
             if ctx.is_collision_target or ctx.is_chaser:
                 # 충돌 모드: 조향은 Pure Pursuit, 속도는 설정값으로 고정
                 # (target = speed_kph, chaser = speed_kph × 1.2)
-                current_kph = abs(parsed["local_velocity"]["x"]) * 3.6
+                current_kph = vi.speed_kph
                 throttle, brake = _speed_ctrl(current_kph, ctx.target_speed_kph)
             else:
                 throttle, brake = ctrl.accel, ctrl.brake
 
-            tcp.send_manual_control_by_id(
-                self._tcp_sock, _next_rid(),
-                entity_id   = ctx.entity_id,
-                throttle    = throttle,
-                brake       = brake,
-                steer_angle = steer_n,
-            )
+            self._send_control(ctx.entity_id, throttle, brake, steer_n)
             self._status_cb(
                 ctx.entity_id,
                 vs.position.x, vs.position.y,
@@ -236,45 +333,71 @@ class StepAdRunner:
         except Exception as e:
             self._log(f"[{ctx.entity_id}] 제어 오류: {e}", "ERROR")
 
-    def _send_chaser(self, ctx: _VehicleCtx, parsed: dict) -> None:
+    def _send_trajectory(self, ctx: _VehicleCtx, vi: VehicleInfo) -> None:
+        """계획 변경·이탈·window 소진 시에만 SetTrajectory 업로드 (ACK 는 기다리지 않음)."""
+        vs = VehicleState(
+            x        = vi.x,
+            y        = vi.y,
+            yaw      = np.deg2rad(vi.yaw),
+            velocity = vi.vx,
+        )
+        try:
+            planned = ctx.planner.update(vs, z=vi.z)
+            if planned is not None:
+                points, reason = planned
+                tcp.send_set_trajectory(
+                    self._tcp_sock, _next_rid(),
+                    entity_id       = ctx.entity_id,
+                    follow_mode     = self._trajectory_follow_mode,
+                    trajectory_name = f"{ctx.entity_id}_path",
+                    points          = points,
+                )
+                report = ctx.planner.last_report
+                self._log(f"[{ctx.entity_id}] SetTrajectory 업로드 ({reason}, {report or f'{len(points)} pts'}, "
+                          f"누적 {ctx.planner.uploads}회)")
+            self._status_cb(
+                ctx.entity_id,
+                vs.position.x, vs.position.y,
+                vs.velocity * 3.6,
+                0.0, 0.0, 0.0,
+            )
+        except Exception as e:
+            self._log(f"[{ctx.entity_id}] trajectory 오류: {e}", "ERROR")
+
+    def _send_chaser(self, ctx: _VehicleCtx, vi: VehicleInfo) -> None:
         """Trigger 이후 target 현재 위치를 직접 추적해 추돌을 유도한다."""
         target_id = self._collision_cfg["target_entity_id"]
         target_ctx = next((c for c in self._ctxs if c.entity_id == target_id), None)
-        if target_ctx is None:
-            return
-
-        with target_ctx.lock:
-            target_parsed = target_ctx.latest
-        if target_parsed is None:
-            return
+        if target_ctx is not None:
+            with target_ctx.lock:
+                if not target_ctx.vi_valid:
+                    return
+                target_x, target_y = target_ctx.vi.x, target_ctx.vi.y
+                target_kph = target_ctx.vi.speed_kph
+        else:
+            target = self._table.read(target_id)   # 다른 프로세스의 runner 가 기록
+            if target is None:
+                return
+            target_x, target_y, target_kph = target.x, target.y, target.speed_kph
 
         # trigger: target 속도가 기준 이상이어야 출발
-        target_kph = abs(target_parsed["local_velocity"]["x"]) * 3.6
         if target_kph < ctx.trigger_kph:
-            tcp.send_manual_control_by_id(
-                self._tcp_sock, _next_rid(),
-                entity_id=ctx.entity_id,
-                throttle=0.0, brake=0.5, steer_angle=0.0,
-            )
+            self._send_control(ctx.entity_id, 0.0, 0.5, 0.0)
             return
 
-        current_kph = abs(parsed["local_velocity"]["x"]) * 3.6
+        current_kph = vi.speed_kph
         throttle, brake = _speed_ctrl(current_kph, ctx.target_speed_kph)
         steer_n = _calc_chase_steer_norm(
-            parsed,
-            target_x=target_parsed["location"]["x"],
-            target_y=target_parsed["location"]["y"],
+            vi,
+            target_x=target_x,
+            target_y=target_y,
             wheelbase=float(ctx.ad.pure_pursuit.wheelbase),
         )
-        tcp.send_manual_control_by_id(
-            self._tcp_sock, _next_rid(),
-            entity_id=ctx.entity_id,
-            throttle=throttle, brake=brake, steer_angle=steer_n,
-        )
+        self._send_control(ctx.entity_id, throttle, brake, steer_n)
         self._status_cb(
             ctx.entity_id,
-            parsed["location"]["x"], parsed["location"]["y"],
-            abs(parsed["local_velocity"]["x"]) * 3.6,
+            vi.x, vi.y,
+            vi.speed_kph,
             throttle, brake, steer_n,
         )
 
@@ -284,44 +407,71 @@ class StepAdRunner:
 
     def _control_loop(self) -> None:
         self._log("주행 시작")
+        if self._trace_path:
+            tracer.install(tracer.Tracer())
 
-        _t_ack   = []   # FixedStep ACK 대기 (이전 루프에서 선제 전송된 스텝)
-        _t_vi    = []   # VI 도착 대기
-        _t_cmd   = []   # 제어 커맨드 전송 소요
-        _t_total = []   # 전체 루프 소요
+        # 구간별 소요 (초) — _TIMING_INTERVAL 스텝마다 로그 후 reset. 전역 registry 에는 누적
+        #   ack_wait: FixedStep ACK 대기 (이전 루프에서 선제 전송된 스텝)
+        #   vi_wait : VI 도착 대기
+        #   cmd     : 제어 커맨드 전송 소요
+        #   total   : 전체 루프 소요
+        _timing = {phase: metrics.Histogram() for phase in _PHASES}
 
         def _send_all_cmds() -> None:
             for ctx in self._ctxs:
                 with ctx.lock:
-                    parsed = ctx.latest
-                if parsed is None:
+                    vi = ctx.tick_vi.copy_from(ctx.vi) if ctx.vi_valid else None
+                if vi is None:
                     continue
-                if ctx.is_chaser:
-                    self._send_chaser(ctx, parsed)
-                else:
-                    self._send_path_follow(ctx, parsed)
+                with tracer.span("control", "control", step=self._step, entity=ctx.entity_id):
+                    if ctx.is_chaser:
+                        self._send_chaser(ctx, vi)
+                    elif ctx.planner is not None:
+                        self._send_trajectory(ctx, vi)
+                    else:
+                        self._send_path_follow(ctx, vi)
 
         def _presend_step():
             """다음 FixedStep을 선제 전송하고 (ev, rid) 반환."""
-            r = self._rid.next()
-            e = self._pending_add(self._pending, self._lock, r,
-                                  proto.MSG_TYPE_FIXED_STEP)
-            tcp.send_fixed_step(self._tcp_sock, r, step_count=1)
+            self._step += 1
+            with tracer.span("fixed_step.send", "step", step=self._step):
+                if self._control_bus is not None:
+                    self._control_bus.flush()   # 이번 스텝에 반영될 최신 제어값 먼저
+                r = self._rid.next()
+                e = self._pending.add(r, proto.MSG_TYPE_FIXED_STEP)
+                k = self._schedule.next_step_count()
+                _M_DECIMATION.set(k)
+                tcp.send_fixed_step(self._tcp_sock, r, step_count=k)
+                self._sent_ticks += k
+                self._last_k = k
             return e, r
 
-        try:
-            # ── 프라이밍: 초기 커맨드 없이 첫 스텝 전송 → save → 초기 VI 수신 ──
+        def _expect_vi(step: int) -> None:
+            """FixedStep_step 의 VI 를 기다리기 시작 — 도착 이벤트 초기화."""
+            self._vi_step = step
             for ctx in self._ctxs:
                 ctx.vi_event.clear()
 
+        def _wait_step(e, r) -> bool:
+            """FixedStep ACK 대기 (적응형 timeout + 재전송). 끝나면 pending 정리."""
+            expected = None
+            if self._base_step_index is not None:
+                expected = self._base_step_index + self._sent_ticks
+            ok = self._retry.wait(r, proto.MSG_TYPE_FIXED_STEP, e, step_count=self._last_k,
+                                  expected_step_index=expected)
+            self._pending.pop(r, proto.MSG_TYPE_FIXED_STEP)
+            return ok
+
+        try:
+            # ── 프라이밍: 초기 커맨드 없이 첫 스텝 전송 → save → 초기 VI 수신 ──
+            _expect_vi(self._step + 1)
+
+            if self._retry.max_retries > 0:
+                self._base_step_index = self._retry.query_step_index(self._timeout_sec)
             ev, rid = _presend_step()
-            if not ev.wait(self._timeout_sec):
-                self._pending_pop(self._pending, self._lock, rid,
-                                  proto.MSG_TYPE_FIXED_STEP)
+            if not _wait_step(ev, rid):
                 self._log("초기 FixedStep ACK timeout — 중단", "ERROR")
                 return
-            self._pending_pop(self._pending, self._lock, rid,
-                               proto.MSG_TYPE_FIXED_STEP)
             if self._save_data:
                 tcp.send_save_data(self._tcp_sock, _next_rid())
                 for ctx in self._ctxs:
@@ -331,8 +481,7 @@ class StepAdRunner:
 
             # 초기 커맨드 전송 후 첫 파이프라인 스텝 선제 전송
             _send_all_cmds()
-            for ctx in self._ctxs:
-                ctx.vi_event.clear()
+            _expect_vi(self._step + 1)
             ev, rid = _presend_step()
 
             # ── 메인 파이프라인 루프 ──────────────────────────────
@@ -350,31 +499,27 @@ class StepAdRunner:
                 t0 = time.perf_counter()
 
                 # ① ACK 대기
-                if not ev.wait(self._timeout_sec):
-                    self._pending_pop(self._pending, self._lock, rid,
-                                      proto.MSG_TYPE_FIXED_STEP)
+                if not _wait_step(ev, rid):
                     self._log(
-                        f"FixedStep ACK timeout ({self._timeout_sec}s) — 중단. "
+                        f"FixedStep ACK timeout (재전송 {self._retry.max_retries}회 후) — 중단. "
                         "시나리오가 Fixed Step 모드인지 확인하세요.",
                         "ERROR"
                     )
                     break
-                self._pending_pop(self._pending, self._lock, rid,
-                                   proto.MSG_TYPE_FIXED_STEP)
 
                 t1 = time.perf_counter()
 
                 # ② SaveData 전송
                 if self._save_data:
                     try:
+                        tracer.instant("save_data.send", "step", step=self._step)
                         tcp.send_save_data(self._tcp_sock, _next_rid())
                     except OSError as e:
                         self._log(f"SaveData 전송 오류: {e}", "ERROR")
                         break
 
-                # ③ 다음 FixedStep 선제 전송 (VI 대기 동안 RTT 진행)
-                for ctx in self._ctxs:
-                    ctx.vi_event.clear()
+                # ③ 다음 FixedStep 선제 전송 (VI 대기 동안 RTT 진행) — 기다리는 VI 는 여전히 N
+                _expect_vi(self._step)
                 try:
                     ev, rid = _presend_step()
                 except OSError as e:
@@ -387,6 +532,7 @@ class StepAdRunner:
                 if self._save_data:
                     for ctx in self._ctxs:
                         if not ctx.vi_event.wait(self._timeout_sec):
+                            _M_VI_TIMEOUTS.inc()
                             self._log(
                                 f"[{ctx.entity_id}] VI timeout ({self._timeout_sec}s) — 이전 상태로 계속",
                                 "WARN"
@@ -399,31 +545,41 @@ class StepAdRunner:
 
                 t4 = time.perf_counter()
 
-                _t_ack.append((t1 - t0) * 1000)
-                _t_vi.append((t3 - t2) * 1000)
-                _t_cmd.append((t4 - t3) * 1000)
-                _t_total.append((t4 - t0) * 1000)
-
-                if len(_t_total) >= self._TIMING_INTERVAL:
-                    def _stats(s):
-                        return sum(s) / len(s), min(s), max(s)
-                    aa, an, ax = _stats(_t_ack)
-                    va, vn, vx = _stats(_t_vi)
-                    ca, cn, cx = _stats(_t_cmd)
-                    ta, tn, tx = _stats(_t_total)
+                for phase, dt in zip(_PHASES, (t1 - t0, t3 - t2, t4 - t3, t4 - t0)):
+                    _timing[phase].record(dt)
+                    _M_PHASE[phase].record(dt)
+                _M_STEPS.inc()
+
+                # trace: ACK_N 대기 / VI_N 대기 / 전체 — step 번호는 이번 루프가 끝낸 FixedStep_N
+                if tracer.active() is not None:
+                    n = self._step - 1
+                    tracer.complete("ack_wait", "wait", int(t0 * 1e9), int(t1 * 1e9), step=n)
+                    tracer.complete("vi_wait",  "wait", int(t2 * 1e9), int(t3 * 1e9), step=n)
+                    tracer.complete("step",     "step", int(t0 * 1e9), int(t4 * 1e9), step=n)
+
+                if _timing["total"].count >= self._TIMING_INTERVAL:
+                    def _fmt(phase):
+                        st = _timing[phase].summary()   # ms
+                        return f"{phase}={st['mean']:.1f}({st['min']:.1f}~{st['max']:.1f})"
+                    tot = _timing["total"].summary()
+                    sched = self._schedule.stats()
+                    rt = self._retry.stats()
                     self._log(
                         f"[Timing/{self._TIMING_INTERVAL}스텝] "
-                        f"total={ta:.1f}ms({tn:.1f}~{tx:.1f})  "
-                        f"ack_wait={aa:.1f}({an:.1f}~{ax:.1f})  "
-                        f"vi_wait={va:.1f}({vn:.1f}~{vx:.1f})  "
-                        f"cmd={ca:.1f}({cn:.1f}~{cx:.1f})",
+                        f"total={tot['mean']:.1f}ms({tot['min']:.1f}~{tot['max']:.1f}, p95 {tot['p95']:.1f})  "
+                        f"{_fmt('ack_wait')}  {_fmt('vi_wait')}  {_fmt('cmd')}  "
+                        f"k={sched['k']} (평균 {sched['mean_k']:.2f}, 누적 {sched['ticks']}틱)  "
+                        f"ack_timeout={rt['fixed_step']['timeout_ms']:.0f}ms"
+                        + (f" resend={rt['resends']} lost_ack={rt['lost_acks']}" if rt["timeouts"] else ""),
                         "INFO"
                     )
-                    _t_ack.clear(); _t_vi.clear()
-                    _t_cmd.clear(); _t_total.clear()
+                    for h in _timing.values():
+                        h.reset()
 
         finally:
             self._running = False
+            if self._trace_path:
+                self._export_trace()
             self._log("주행 종료")
             if self._on_done:
                 self._on_done()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+import unittest
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+import utils.event_log as elog
+from transport.async_client import AsyncMoraiClient
+
+_HEADER = struct.Struct(proto.HEADER_FMT)
+
+
+async def _responder(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """FixedStep 은 역순으로 모아서 ACK, GetStatus 는 즉시 응답, SaveData 는 무응답."""
+    held = []
+    try:
+        while True:
+            header = await reader.readexactly(proto.HEADER_SIZE)
+            _, _, msg_type, size, rid, _ = _HEADER.unpack(header)
+            if size:
+                await reader.readexactly(size)
+            if msg_type == proto.MSG_TYPE_FIXED_STEP:
+                held.append(rid)
+                if len(held) == 3:
+                    for r in reversed(held):
+                        ack = struct.pack(proto.RESULT_FMT, 0, 0)
+                        writer.write(tcp.build_header(proto.MSG_CLASS_RESP, msg_type, len(ack), r) + ack)
+                    held.clear()
+            elif msg_type == proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS:
+                body = struct.pack(proto.GET_STATUS_FIXED_FMT, 0, 0, proto.TIME_MODE_FIXED, 33, 10, 1, 1, 42, 1, 0)
+                writer.write(tcp.build_header(proto.MSG_CLASS_RESP, msg_type, len(body), rid) + body)
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        writer.close()
+
+
+class _NullWriter:
+    def write(self, data: bytes) -> None:
+        pass
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+class AsyncMoraiClientTests(unittest.TestCase):
+    def _run(self, scenario) -> None:
+        async def main() -> None:
+            server = await asyncio.start_server(_responder, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                client = await AsyncMoraiClient.connect("127.0.0.1", port, default_timeout=1.0)
+                async with client:
+                    await scenario(client)
+            finally:
+                server.close()
+                await server.wait_closed()
+        asyncio.run(main())
+
+    def test_out_of_order_acks_resolve_matching_futures(self) -> None:
+        async def scenario(client: AsyncMoraiClient) -> None:
+            results = await asyncio.gather(*(client.fixed_step(1) for _ in range(3)))
+            self.assertEqual(results, [(0, 0)] * 3)
+            self.assertEqual(client.in_flight, 0)
+        self._run(scenario)
+
+    def test_get_status_returns_parsed_response(self) -> None:
+        async def scenario(client: AsyncMoraiClient) -> None:
+            status = await client.get_status()
+            self.assertEqual(status["mode"], proto.TIME_MODE_FIXED)
+            self.assertEqual(status["step_index"], 42)
+        self._run(scenario)
+
+    def test_request_timeout_cleans_pending(self) -> None:
+        async def scenario(client: AsyncMoraiClient) -> None:
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.save_data(timeout=0.05)
+            self.assertEqual(client.in_flight, 0)
+        self._run(scenario)
+
+    def test_reader_failure_fails_pending_requests(self) -> None:
+        async def main() -> None:
+            reader = asyncio.StreamReader(limit=64)
+            client = AsyncMoraiClient(reader, _NullWriter(), default_timeout=5.0)
+            fut = asyncio.ensure_future(client.get_status())
+            await asyncio.sleep(0)
+            reader.feed_data(b"\x00" * 256)            # MAGIC 없는 limit 초과 → LimitOverrunError
+            with self.assertRaises(ConnectionError):
+                await asyncio.wait_for(fut, 1.0)
+            with self.assertRaises(ConnectionError):
+                await client.get_status()
+            await client.close()
+        asyncio.run(main())
+
+    def test_on_unmatched_error_keeps_reader_alive(self) -> None:
+        async def main() -> None:
+            def on_unmatched(*args) -> None:
+                raise ValueError("boom")
+
+            reader = asyncio.StreamReader()
+            client = AsyncMoraiClient(reader, _NullWriter(), on_unmatched=on_unmatched)
+            ack = struct.pack(proto.RESULT_FMT, 0, 0)
+            reader.feed_data(tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), 99) + ack)
+            fut = asyncio.ensure_future(client.fixed_step(1, timeout=1.0))
+            await asyncio.sleep(0.01)
+            reader.feed_data(tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), 1) + ack)
+            self.assertEqual(await fut, (0, 0))
+            self.assertEqual(client.orphan_responses, 1)
+            await client.close()
+
+        logged = []
+        sink = lambda t, level, category, message: logged.append((level, category, message))
+        elog.add_sink(sink)
+        self.addCleanup(elog.remove_sink, sink)
+        asyncio.run(main())
+        elog.get().drain()
+        self.assertTrue(any(level == elog.WARN and "boom" in message for level, _, message in logged))
+
+
+if __name__ == "__main__":
+    unittest.main()
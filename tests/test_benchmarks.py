@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import unittest
+
+from benchmarks.bench_payloads import all_cases
+from benchmarks.run_benchmarks import compare, tolerance_for
+
+
+def _result(**values: float) -> dict:
+    return {"metrics": {k: {"value": v, "unit": "ops/s", "higher_is_better": True} for k, v in values.items()}}
+
+
+class BenchmarkCompareTests(unittest.TestCase):
+    def test_regression_beyond_tolerance_is_flagged(self) -> None:
+        rows = compare(
+            _result(**{"parse.a": 1000.0, "io.b": 1000.0, "gone": 5.0}),
+            _result(**{"parse.a": 800.0, "io.b": 800.0, "new": 5.0}),
+            thresholds={"parse.*": 0.15, "io.*": 0.30},
+        )
+        by_name = {r["name"]: r for r in rows}
+        self.assertEqual(set(by_name), {"parse.a", "io.b"})
+        self.assertTrue(by_name["parse.a"]["regressed"])
+        self.assertFalse(by_name["io.b"]["regressed"])
+
+    def test_lower_is_better_metric_inverts_ratio(self) -> None:
+        base = {"metrics": {"rtt": {"value": 1.0, "higher_is_better": False}}}
+        cur  = {"metrics": {"rtt": {"value": 2.0, "higher_is_better": False}}}
+        (row,) = compare(base, cur, default_tolerance=0.2)
+        self.assertTrue(row["regressed"])
+        self.assertEqual(tolerance_for("x.y", {"z.*": 0.5}, 0.2), 0.2)
+
+    def test_payload_cases_produce_results(self) -> None:
+        for name, fn in all_cases():
+            with self.subTest(name=name):
+                self.assertIsNotNone(fn())
+
+
+if __name__ == "__main__":
+    unittest.main()
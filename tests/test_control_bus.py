@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import struct
+import threading
+import unittest
+
+import transport.protocol_defs as proto
+from transport.control_bus import ControlBus
+from transport.message_schema import unpack_message_payload
+
+_HEADER = struct.Struct(proto.HEADER_FMT)
+
+
+class _FrameSink:
+    """sendall() 만 있는 tcp_sock 대역 — 전송된 ManualControl 값을 기록."""
+
+    def __init__(self) -> None:
+        self.commands = []
+        self.sent = threading.Event()
+
+    def sendall(self, frame: bytes) -> None:
+        _, _, msg_type, _, _, _ = _HEADER.unpack_from(frame)
+        values, _, _ = unpack_message_payload(msg_type, frame[_HEADER.size:])
+        self.commands.append((values["entity_id"], values["throttle"], values["brake"], values["steer_angle"]))
+        self.sent.set()
+
+
+class ControlBusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sink = _FrameSink()
+
+    def test_flush_sends_only_latest_command_per_entity(self) -> None:
+        bus = ControlBus(self.sink, rate_hz=0)
+        bus.submit("Car_1", 0.1, 0.0, 0.0)
+        bus.submit("Car_2", 0.2, 0.0, 0.0)
+        bus.submit("Car_1", 0.5, 0.0, 0.25)
+
+        self.assertEqual(bus.flush(), 2)
+        self.assertEqual(sorted(self.sink.commands), [("Car_1", 0.5, 0.0, 0.25), ("Car_2", 0.2, 0.0, 0.0)])
+        stats = bus.stats()
+        self.assertEqual((stats["submitted"], stats["sent"], stats["superseded"]), (3, 2, 1))
+
+    def test_unchanged_values_are_deduplicated_unless_forced(self) -> None:
+        bus = ControlBus(self.sink, rate_hz=0, epsilon=1e-3)
+        bus.submit("Car_1", 0.5, 0.0, 0.1)
+        bus.flush()
+        bus.submit("Car_1", 0.5004, 0.0, 0.1)
+        self.assertEqual(bus.flush(), 0)
+        bus.submit("Car_1", 0.5, 0.0, 0.1, force=True)
+        self.assertEqual(bus.flush(), 1)
+        bus.submit("Car_1", 0.6, 0.0, 0.1)
+        self.assertEqual(bus.flush(), 1)
+
+        self.assertEqual(len(self.sink.commands), 3)
+        self.assertEqual(bus.stats()["deduplicated"], 1)
+
+    def test_sender_thread_flushes_on_request_and_on_stop(self) -> None:
+        bus = ControlBus(self.sink, rate_hz=0)
+        bus.start()
+        bus.submit("Car_1", 0.3, 0.0, 0.0)
+        bus.request_flush()
+        self.assertTrue(self.sink.sent.wait(2.0))
+
+        bus.submit("Car_1", 0.0, 1.0, 0.0)
+        bus.stop()
+        self.assertFalse(bus.is_alive())
+        self.assertEqual(self.sink.commands[-1], ("Car_1", 0.0, 1.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import unittest
+
+import utils.event_log as elog
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.lines = []
+
+    def __call__(self, t, level, category, message) -> None:
+        self.lines.append((level, category, message))
+
+
+class _Exploding:
+    def __str__(self) -> str:
+        raise AssertionError("formatted before drain / despite filter")
+
+
+class EventLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sink = _Recorder()
+        self.log = elog.EventLog(capacity=4, level=elog.INFO, sinks=[self.sink], autostart=False)
+
+    def test_filtered_events_are_never_formatted(self) -> None:
+        self.log.set_level(elog.WARN, "udp.send")
+        self.log.log(elog.DEBUG, "tcp.send", "%s", _Exploding())
+        self.log.log(elog.INFO, "udp.send", "%s", _Exploding())
+        self.assertFalse(self.log.enabled(elog.INFO, "udp.send"))
+        self.assertTrue(self.log.enabled(elog.INFO, "tcp.send"))
+        self.assertEqual(self.log.stats()["recorded"], 0)
+
+    def test_formatting_happens_on_drain(self) -> None:
+        self.log.log(elog.INFO, "tcp.send", "[SEND][TCP] %s rid=%d", "FixedStep", 7)
+        self.assertEqual(self.sink.lines, [])
+        self.assertEqual(self.log.drain(), 1)
+        self.assertEqual(self.sink.lines, [(elog.INFO, "tcp.send", "[SEND][TCP] FixedStep rid=7")])
+
+    def test_overflow_drops_oldest_and_reports_once(self) -> None:
+        for i in range(6):
+            self.log.log(elog.INFO, "lane.step", "step %d", i)
+        self.log.drain()
+        messages = [m for _, _, m in self.sink.lines]
+        self.assertIn("dropped 2 events", messages[0])
+        self.assertEqual(messages[1:], ["step 2", "step 3", "step 4", "step 5"])
+        self.assertEqual(self.log.stats()["dropped"], 2)
+
+        self.log.log(elog.INFO, "lane.step", "step %d", 6)
+        self.log.drain()
+        self.assertEqual(self.sink.lines[-1][2], "step 6")
+        self.assertEqual(sum("dropped" in m for _, _, m in self.sink.lines), 1)
+
+    def test_callback_sink_category_levels(self) -> None:
+        got = []
+        sink = elog.CallbackSink(lambda msg, level: got.append((level, msg)), min_level=elog.WARN,
+                                 category_levels={"tcp.recv": elog.INFO})
+        sink(0.0, elog.INFO, "tcp.recv", "GetStatus rid=1")
+        sink(0.0, elog.INFO, "udp.send", "skipped")
+        sink(0.0, elog.WARN, "udp.send", "kept")
+        self.assertEqual(got, [("INFO", "GetStatus rid=1"), ("WARN", "kept")])
+
+    def test_background_thread_flushes_on_stop(self) -> None:
+        log = elog.EventLog(level=elog.DEBUG, sinks=[self.sink], interval_sec=10.0)
+        log.log(elog.DEBUG, "udp.send", "thr=%.3f", 0.25)
+        log.stop()
+        self.assertEqual(self.sink.lines, [(elog.DEBUG, "udp.send", "thr=0.250")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import struct
+import unittest
+
+from transport.message_schema import (
+    get_codec,
+    get_message,
+    pack_fields,
+    pack_message_payload,
+    pack_message_payload_into,
+    unpack_message_payload,
+)
+import transport.protocol_defs as proto
+
+
+class MessageCodecTests(unittest.TestCase):
+    def test_fixed_layout_compiles_to_single_struct(self) -> None:
+        codec = get_codec(proto.MSG_TYPE_CREATE_OBJECT).fields
+        self.assertTrue(codec.is_fixed)
+        self.assertEqual(codec.fixed_size, 36)
+
+    def test_string_field_splits_runs(self) -> None:
+        codec = get_codec(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND).fields
+        self.assertFalse(codec.is_fixed)
+        self.assertEqual(codec.fixed_size, 24)
+
+    def test_compiled_pack_matches_field_walk(self) -> None:
+        values = {
+            "entity_id": "Car_1",
+            "pos_x": 1.0, "pos_y": 2.0, "pos_z": 3.0,
+            "rot_x": 0.0, "rot_y": 0.0, "rot_z": 90.0,
+            "steer_angle": 0.25,
+            "speed": 12.5,
+        }
+        message = get_message(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND)
+        self.assertEqual(
+            pack_message_payload(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND, values),
+            pack_fields(message.fields, values),
+        )
+
+    def test_pack_into_caller_buffer(self) -> None:
+        values = {"entity_id": "Car_1", "throttle": 0.5, "brake": 0.0, "steer_angle": -0.1}
+        expected = pack_message_payload(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, values)
+        buf = bytearray(64)
+        end = pack_message_payload_into(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, buf, 8, values)
+        self.assertEqual(end, 8 + len(expected))
+        self.assertEqual(bytes(buf[8:end]), expected)
+
+    def test_pack_into_rejects_short_buffer(self) -> None:
+        with self.assertRaises(ValueError):
+            pack_message_payload_into(proto.MSG_TYPE_FIXED_STEP, bytearray(2), 0, {"step_count": 1})
+
+    def test_pack_missing_field_raises_key_error(self) -> None:
+        with self.assertRaises(KeyError):
+            pack_message_payload(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, {"entity_id": "Car_1"})
+
+    def test_repeated_items_round_trip(self) -> None:
+        values = {"entity_id": "Car_1", "follow_mode": 1, "trajectory_name": "t", "point_count": 2}
+        items = [
+            {"points[].x": 1.0, "points[].y": 2.0, "points[].z": 3.0, "points[].time": 0.0},
+            {"points[].x": 4.0, "points[].y": 5.0, "points[].z": 6.0, "points[].time": 0.5},
+        ]
+        payload = pack_message_payload(proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, values, items)
+        decoded, decoded_items, offset = unpack_message_payload(
+            proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, payload, repeated_count_field="point_count",
+        )
+        self.assertEqual(decoded, values)
+        self.assertEqual(decoded_items, items)
+        self.assertEqual(offset, len(payload))
+
+    def test_unpack_memoryview_payload(self) -> None:
+        payload = struct.pack("<II", 0, 0) + struct.pack("<I", 5) + b"Car_9"
+        values, _, offset = unpack_message_payload(
+            proto.MSG_TYPE_CREATE_OBJECT, memoryview(payload), direction="response",
+        )
+        self.assertEqual(values["object_id"], "Car_9")
+        self.assertEqual(offset, len(payload))
+
+    def test_unknown_variant_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            pack_message_payload(proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND, {"mode": 99})
+
+    def test_truncated_payload_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            unpack_message_payload(proto.MSG_TYPE_SCENARIO_STATUS, b"\x00" * 6, direction="response")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+import utils.metrics as metrics
+from transport.pending import LatencyHistogram, PendingTable
+
+
+class HistogramTests(unittest.TestCase):
+    def test_custom_range_and_reset(self) -> None:
+        hist = metrics.Histogram(lo_exp=0, hi_exp=3)
+        for n in range(1, 1001):
+            hist.record(n)
+        self.assertEqual(hist.count, 1000)
+        self.assertAlmostEqual(hist.percentile(50), 500, delta=60)
+        self.assertEqual(hist.percentile(100), 1000)
+        self.assertEqual(hist.cumulative_buckets()[-1], (1000.0, 1000))
+        self.assertEqual(len(hist.cumulative_buckets()), 31)
+        hist.reset()
+        self.assertEqual((hist.count, hist.percentile(99)), (0, 0.0))
+
+    def test_concurrent_updates_are_not_lost(self) -> None:
+        hist, counter = metrics.Histogram(), metrics.Counter()
+
+        def work() -> None:
+            for _ in range(5000):
+                hist.record(0.001)
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual((hist.count, counter.value), (20000, 20000))
+
+    def test_latency_histogram_alias(self) -> None:
+        self.assertIs(LatencyHistogram, metrics.Histogram)
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reg = metrics.Registry()
+
+    def test_get_or_create_by_name_and_labels(self) -> None:
+        a = self.reg.counter("rx_total", "help", {"stream": "vi"})
+        self.assertIs(a, self.reg.counter("rx_total", labels={"stream": "vi"}))
+        self.assertIsNot(a, self.reg.counter("rx_total", labels={"stream": "cam"}))
+        with self.assertRaises(ValueError):
+            self.reg.gauge("rx_total")
+
+    def test_prometheus_text(self) -> None:
+        self.reg.counter("rx_total", "received", {"stream": 'a"b'}).inc(3)
+        self.reg.gauge("depth").set_function(lambda: 7)
+        hist = self.reg.histogram("ack_seconds", "ack", {"msg": "FixedStep"})
+        hist.record(0.002)
+        hist.record(0.5)
+        text = self.reg.render_prometheus()
+        self.assertIn("# TYPE rx_total counter", text)
+        self.assertIn('rx_total{stream="a\\"b"} 3', text)
+        self.assertIn("depth 7", text)
+        self.assertIn('ack_seconds_bucket{msg="FixedStep",le="0.00199526"} 0', text)
+        self.assertIn('ack_seconds_bucket{msg="FixedStep",le="0.00251189"} 1', text)   # decade 사이 경계도 노출
+        self.assertIn('ack_seconds_bucket{msg="FixedStep",le="0.01"} 1', text)
+        self.assertIn('ack_seconds_bucket{msg="FixedStep",le="1"} 2', text)
+        self.assertIn('ack_seconds_bucket{msg="FixedStep",le="+Inf"} 2', text)
+        self.assertIn('ack_seconds_count{msg="FixedStep"} 2', text)
+
+    def test_http_and_jsonl_exporters(self) -> None:
+        self.reg.counter("frames_total").inc(5)
+        server = metrics.PrometheusServer(self.reg, port=0).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+        finally:
+            server.stop()
+        self.assertIn("frames_total 5", body)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.jsonl")
+            dumper = metrics.JsonlDumper(path, self.reg, interval_sec=60.0)
+            dumper.dump_once()
+            dumper.stop()
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["metrics"]["frames_total"], 5)
+
+
+class PublisherTests(unittest.TestCase):
+    def test_pending_table_publishes_ack_latency(self) -> None:
+        shared = metrics.histogram("morai_tcp_ack_latency_seconds", labels={"msg": "FixedStep"})
+        before = shared.count
+        table = PendingTable()
+        table.add(1, 0x1201)
+        self.assertTrue(table.resolve(1, 0x1201))
+        self.assertEqual(shared.count, before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+import transport.protocol_defs as proto
+from transport.pending import LatencyHistogram, PendingTable
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_follow_distribution(self) -> None:
+        hist = LatencyHistogram()
+        for ms in range(1, 101):
+            hist.record(ms / 1000.0)
+        summary = hist.summary()
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["p50"], 50.0, delta=6.0)
+        self.assertAlmostEqual(summary["p95"], 95.0, delta=10.0)
+        self.assertLessEqual(summary["p99"], summary["max"])
+        self.assertAlmostEqual(summary["max"], 100.0)
+
+    def test_empty_histogram_reports_zero(self) -> None:
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+
+class PendingTableTests(unittest.TestCase):
+    def test_resolve_sets_event_and_records_latency(self) -> None:
+        table = PendingTable()
+        ev = table.add(1, proto.MSG_TYPE_FIXED_STEP)
+        self.assertTrue(table.resolve(1, proto.MSG_TYPE_FIXED_STEP))
+        self.assertTrue(ev.is_set())
+        table.pop(1, proto.MSG_TYPE_FIXED_STEP)   # 응답 후 pop 은 no-op
+
+        st = table.stats()
+        self.assertEqual((st["in_flight"], st["matched"], st["timeouts"]), (0, 1, 0))
+        self.assertEqual(table.histogram(proto.MSG_TYPE_FIXED_STEP).count, 1)
+
+    def test_late_and_orphan_responses_are_counted_separately(self) -> None:
+        table = PendingTable()
+        table.add(1, proto.MSG_TYPE_SAVE_DATA)
+        table.pop(1, proto.MSG_TYPE_SAVE_DATA)          # 대기 측 timeout
+        self.assertFalse(table.resolve(1, proto.MSG_TYPE_SAVE_DATA))
+        self.assertFalse(table.resolve(99, proto.MSG_TYPE_SAVE_DATA))
+
+        st = table.stats()
+        self.assertEqual((st["timeouts"], st["late"], st["orphans"]), (1, 1, 1))
+
+    def test_reap_expires_stale_entries(self) -> None:
+        table = PendingTable(ttl_sec=10.0)
+        table.add(1, proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND)
+        self.assertEqual(table.reap(time.perf_counter() + 5.0), 0)
+        self.assertEqual(table.reap(time.perf_counter() + 11.0), 1)
+        self.assertEqual(len(table), 0)
+        self.assertFalse(table.resolve(1, proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND))
+        self.assertEqual(table.late, 1)
+
+    def test_fail_all_releases_waiters(self) -> None:
+        table = PendingTable()
+        events = [table.add(rid, proto.MSG_TYPE_FIXED_STEP) for rid in range(3)]
+        self.assertEqual(table.fail_all(), 3)
+        self.assertTrue(all(ev.is_set() for ev in events))
+        self.assertEqual(len(table), 0)
+
+    def test_report_lines_name_message_types(self) -> None:
+        table = PendingTable()
+        table.add(1, proto.MSG_TYPE_FIXED_STEP)
+        table.resolve(1, proto.MSG_TYPE_FIXED_STEP)
+        report = "\n".join(table.report_lines())
+        self.assertIn("0x1201 FixedStep", report)
+        self.assertIn("p99", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import unittest
+
+from transport.retry_policy import RttEstimator
+
+
+class RttEstimatorTests(unittest.TestCase):
+    def test_initial_timeout_until_first_sample(self) -> None:
+        est = RttEstimator(initial_timeout_sec=2.0, min_timeout_sec=0.01, max_timeout_sec=3.0)
+        self.assertEqual(est.timeout(), 2.0)
+        est.observe(0.1)                       # srtt=0.1, rttvar=0.05 → 0.1 + 4*0.05
+        self.assertAlmostEqual(est.timeout(), 0.3)
+
+    def test_steady_rtt_converges_and_clamps_to_min(self) -> None:
+        est = RttEstimator(initial_timeout_sec=3.0, min_timeout_sec=0.05, max_timeout_sec=3.0)
+        for _ in range(100):
+            est.observe(0.002)
+        self.assertAlmostEqual(est.srtt, 0.002)
+        self.assertEqual(est.timeout(), 0.05)
+
+    def test_jitter_widens_timeout(self) -> None:
+        calm, noisy = RttEstimator(min_timeout_sec=0.0), RttEstimator(min_timeout_sec=0.0)
+        for i in range(200):
+            calm.observe(0.010)
+            noisy.observe(0.005 if i % 2 else 0.015)
+        self.assertGreater(noisy.timeout(), calm.timeout() * 2)
+
+    def test_backoff_doubles_up_to_max_and_resets(self) -> None:
+        est = RttEstimator(min_timeout_sec=0.1, max_timeout_sec=1.0)
+        est.observe(0.05)                      # rto = 0.05 + 4*0.025 = 0.15
+        est.backoff()
+        self.assertAlmostEqual(est.timeout(), 0.3)
+        est.backoff()
+        est.backoff()
+        self.assertEqual(est.timeout(), 1.0)
+        est.reset_backoff()
+        self.assertAlmostEqual(est.timeout(), 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import socket
+import threading
+import unittest
+
+import automation.automation as ac
+from automation.file_playback import FilePlayback
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from receivers.vehicle_info_receiver import parse_vehicle_info_payload
+from tools.sim_stub import SimStub
+from transport.pending import PendingTable
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+def _resolve_loop(sock: socket.socket, pending: PendingTable, responses: dict) -> None:
+    reader = tcp.StreamReader(sock)
+    try:
+        while True:
+            msg_class, msg_type, _, rid, _, payload = reader.read_packet()
+            responses[(rid, msg_type)] = bytes(payload)
+            pending.resolve(rid, msg_type, bytes(payload))
+    except (ConnectionError, OSError):
+        pass
+
+
+class SimStubTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.vi_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.vi_sock.bind(("127.0.0.1", 0))
+        self.vi_sock.settimeout(2.0)
+        self.addCleanup(self.vi_sock.close)
+
+        self.stub = SimStub(entities={"Car_1": self.vi_sock.getsockname()}, step_ms=50, seed=1).start()
+        self.addCleanup(self.stub.stop)
+
+        self.sock = socket.create_connection(self.stub.address)
+        self.addCleanup(self.sock.close)
+        self.pending = PendingTable()
+        self.responses: dict = {}
+        threading.Thread(target=_resolve_loop, args=(self.sock, self.pending, self.responses), daemon=True).start()
+
+    def _request(self, rid: int, msg_type: int, send) -> bytes:
+        ev = self.pending.add(rid, msg_type)
+        send()
+        self.assertTrue(ev.wait(2.0))
+        return self.responses[(rid, msg_type)]
+
+    def test_auto_caller_runs_against_stub(self) -> None:
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=5, timeout_sec=2.0, progress_every=0,
+        )
+        caller.start()
+        caller.join(timeout=5.0)
+
+        self.assertEqual(self.stub.step_index, 5)
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_SAVE_DATA], 5)
+        self.assertEqual(self.pending.histogram(proto.MSG_TYPE_FIXED_STEP).count, 5)
+
+    def test_pipelined_auto_caller_keeps_pairs_in_flight(self) -> None:
+        self.stub.service_s = 0.01
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=12, timeout_sec=2.0, progress_every=0,
+            pipeline_depth=4, step_dt_sec=0.05, log_fn=lambda *a: None,
+        )
+        caller.start()
+        caller.join(timeout=5.0)
+
+        self.assertEqual(caller.steps_done, 12)
+        self.assertEqual(self.stub.step_index, 12)
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_SAVE_DATA], 12)
+        self.assertEqual(len(self.pending), 0)
+        stats = caller.stats()
+        self.assertEqual(stats["fixed_step_ms"]["count"], 12)
+        self.assertGreater(stats["rtf"], 0.0)
+        self.assertIn("RTF=", caller.report_line())
+
+    def test_auto_caller_step_count_advances_k_ticks_per_call(self) -> None:
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=4, step_count=3, timeout_sec=2.0, progress_every=0,
+            pipeline_depth=2, step_dt_sec=0.05, log_fn=lambda *a: None,
+        )
+        self.assertEqual(caller.run_steps(), 4)
+        self.assertEqual(self.stub.step_index, 12)
+        self.assertEqual(caller.stats()["ticks"], 12)
+        self.assertIn("ticks=12", caller.report_line())
+
+    def test_auto_caller_resends_lost_request_with_same_rid(self) -> None:
+        self.stub.drop_request(proto.MSG_TYPE_FIXED_STEP)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=3, timeout_sec=0.5, progress_every=0, log_fn=lambda *a: None,
+        )
+        self.assertEqual(caller.run_steps(), 3)
+        self.assertEqual(self.stub.step_index, 3)
+        self.assertEqual(self.stub.dropped["request"], 1)
+        retry = caller.stats()["retry"]
+        self.assertEqual((retry["resends"], retry["lost_acks"]), (1, 0))
+        self.assertIn("resend=1", caller.report_line())
+
+    def test_auto_caller_lost_ack_is_confirmed_by_step_index(self) -> None:
+        self.stub.drop_response(proto.MSG_TYPE_FIXED_STEP)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=3, timeout_sec=0.5, progress_every=0, log_fn=lambda *a: None,
+        )
+        self.assertEqual(caller.run_steps(), 3)
+        self.assertEqual(self.stub.step_index, 3)            # 재전송했다면 4
+        self.assertEqual(caller.stats()["ticks"], 3)
+        retry = caller.stats()["retry"]
+        self.assertEqual((retry["resends"], retry["lost_acks"]), (0, 1))
+
+    def test_pipelined_lost_ack_is_checked_against_its_own_step(self) -> None:
+        self.stub.drop_response(proto.MSG_TYPE_FIXED_STEP)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=8, timeout_sec=0.5, progress_every=0, log_fn=lambda *a: None, pipeline_depth=4,
+        )
+        self.assertEqual(caller.run_steps(), 8)
+        self.assertEqual(self.stub.step_index, 8)
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_SAVE_DATA], 8)
+        retry = caller.stats()["retry"]
+        self.assertEqual((retry["resends"], retry["lost_acks"]), (0, 1))
+
+    def test_pipelined_lost_request_is_not_taken_for_lost_ack(self) -> None:
+        self.stub.drop_request(proto.MSG_TYPE_FIXED_STEP)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=8, timeout_sec=0.3, progress_every=0, log_fn=lambda *a: None, pipeline_depth=4,
+        )
+        self.assertEqual(caller.run_steps(), 0)               # 뒤 FixedStep 3 개로 step_index 가 넘어서도 중단
+        self.assertEqual(self.stub.step_index, 3)
+        self.assertEqual(caller.stats()["ticks"], 0)
+        retry = caller.stats()["retry"]
+        self.assertEqual((retry["resends"], retry["lost_acks"]), (0, 0))
+
+    def test_lost_save_data_ack_is_not_resent(self) -> None:
+        self.stub.drop_response(proto.MSG_TYPE_SAVE_DATA)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=3, timeout_sec=0.3, progress_every=0, log_fn=lambda *a: None, max_retries=1,
+        )
+        self.assertEqual(caller.run_steps(), 0)
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_SAVE_DATA], 1)   # 중복 저장 없음
+        self.assertEqual(caller.stats()["retry"]["resends"], 0)
+
+    def test_auto_caller_waits_out_server_stall_without_resending(self) -> None:
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=10, timeout_sec=2.0, progress_every=0, log_fn=lambda *a: None,
+        )
+        self.assertEqual(caller.run_steps(), 10)               # RTT warm-up → timeout 이 하한 근처
+        self.stub.stall_request(proto.MSG_TYPE_FIXED_STEP, 0.7)  # GetStatus 확인도 timeout
+        self.assertEqual(caller.run_steps(), 10)
+        self.assertEqual(self.stub.step_index, 20)            # 재전송했다면 21
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_FIXED_STEP], 20)
+        self.assertEqual(caller.stats()["retry"]["resends"], 0)
+
+    def test_auto_caller_without_retries_stops_on_first_timeout(self) -> None:
+        self.stub.drop_request(proto.MSG_TYPE_SAVE_DATA)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=3, timeout_sec=0.3, progress_every=0, log_fn=lambda *a: None, max_retries=0,
+        )
+        self.assertEqual(caller.run_steps(), 0)
+        self.assertNotIn(proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS, self.stub.requests)
+
+    def test_pipelined_abort_releases_unawaited_save_data(self) -> None:
+        self.stub.drop_request(proto.MSG_TYPE_FIXED_STEP)
+        self.stub.drop_response(proto.MSG_TYPE_SAVE_DATA)
+        caller = ac.AutoCaller(
+            tcp_sock=self.sock, pending=self.pending, request_id_ref=_Counter(),
+            max_calls=8, timeout_sec=0.2, progress_every=0, log_fn=lambda *a: None,
+            pipeline_depth=4, max_retries=0,
+        )
+        self.assertEqual(caller.run_steps(), 0)
+        self.assertEqual(len(self.pending), 0)                # 첫 쌍의 SaveData 도 정리
+
+    def test_file_playback_applies_each_row_to_its_own_step(self) -> None:
+        rows = [{"throttle": i / 20.0, "brake": 0.0, "swa": 0.0} for i in range(1, 11)]
+        done = []
+        player = FilePlayback(
+            self.sock, self.pending, _Counter(), rows, "Car_1",
+            pipeline_depth=4, timeout_sec=2.0, progress_every=0,
+            log_fn=lambda *a: None, on_done=done.append,
+        )
+        player.start()
+        player.join(timeout=5.0)
+
+        self.assertEqual(done, [False])
+        self.assertEqual(self.stub.step_index, 10)
+        self.assertEqual(self.stub.requests[proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND], 10)
+        throttles = [parse_vehicle_info_payload(self.vi_sock.recvfrom(65535)[0])["control"]["throttle"]
+                     for _ in rows]
+        for got, row in zip(throttles, rows):
+            self.assertAlmostEqual(got, row["throttle"], places=5)
+        self.assertGreater(player.stats()["steps_per_sec"], 0.0)
+
+    def test_fixed_step_advances_vehicle_and_emits_vehicle_info(self) -> None:
+        tcp.send_manual_control_by_id(self.sock, 1, "Car_1", throttle=1.0, brake=0.0, steer_angle=0.0)
+        self._request(2, proto.MSG_TYPE_FIXED_STEP, lambda: tcp.send_fixed_step(self.sock, 2, step_count=4))
+
+        data, _ = self.vi_sock.recvfrom(65535)
+        parsed = parse_vehicle_info_payload(data)
+        self.assertEqual(parsed["id"], "Car_1")
+        self.assertEqual((parsed["seconds"], parsed["nanos"]), (0, 200_000_000))
+        self.assertGreater(parsed["local_velocity"]["x"], 0.0)
+        self.assertGreater(parsed["location"]["x"], 0.0)
+        self.assertAlmostEqual(parsed["control"]["throttle"], 1.0)
+
+    def test_status_and_suite_responses_parse(self) -> None:
+        status = tcp.parse_get_status_payload(
+            self._request(1, proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS, lambda: tcp.send_get_status(self.sock, 1)))
+        self.assertEqual((status["mode"], status["simulation_delta_time"]), (proto.TIME_MODE_FIXED, 50))
+
+        suite = tcp.parse_active_suite_status_payload(
+            self._request(2, proto.MSG_TYPE_ACTIVE_SUITE_STATUS, lambda: tcp.send_active_suite_status(self.sock, 2)))
+        self.assertEqual(suite["scenario_list"], ["Scenario_1", "Scenario_2"])
+
+        created = tcp.parse_create_object_payload(self._request(
+            3, proto.MSG_TYPE_CREATE_OBJECT,
+            lambda: tcp.send_create_object(self.sock, 3, 1, 1.0, 2.0, 0.0, 0.0, 0.0, 90.0, 1, 1)))
+        self.assertEqual(created["object_id"], "Object_1")
+        self.assertIn("Object_1", self.stub.entities)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import socket
+import threading
+import unittest
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    sock.settimeout(2.0)
+    return tcp.recv_exact(sock, n)
+
+
+class SocketWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def test_frames_queued_before_wakeup_go_out_as_one_batch(self) -> None:
+        writer = tcp.SocketWriter(self.client)
+        frames = [
+            tcp.build_request_packet(rid, proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND,
+                                     tcp.build_manual_control_by_id_payload(f"Car_{rid}", 0.5, 0.0, 0.1))
+            for rid in range(1, 5)
+        ]
+        frames.append(tcp.build_request_packet(5, proto.MSG_TYPE_FIXED_STEP, tcp.build_fixed_step_payload(1)))
+        for frame in frames:
+            writer.sendall(frame)
+        self.assertEqual(writer.queue_depth, len(frames))
+
+        writer.start()
+        self.assertEqual(_recv_exact(self.server, sum(map(len, frames))), b"".join(frames))
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        stats = writer.stats()
+        self.assertEqual(stats["batches_sent"], 1)
+        self.assertEqual(stats["frames_sent"], len(frames))
+        self.assertEqual(stats["max_batch"], len(frames))
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_send_helpers_accept_writer_in_place_of_socket(self) -> None:
+        writer = tcp.SocketWriter(self.client)
+        writer.start()
+        self.addCleanup(writer.stop)
+        tcp.send_fixed_step(writer, 7, step_count=1)
+
+        sock_reader = tcp.StreamReader(self.server)
+        self.server.settimeout(2.0)
+        msg_class, msg_type, _, rid, _, payload = sock_reader.read_packet()
+        self.assertEqual((msg_class, msg_type, rid), (proto.MSG_CLASS_REQ, proto.MSG_TYPE_FIXED_STEP, 7))
+        self.assertEqual(bytes(payload), tcp.build_fixed_step_payload(1))
+
+    def test_frames_accepted_around_stop_are_all_sent(self) -> None:
+        writer = tcp.SocketWriter(self.client)
+        writer.start()
+        accepted = []
+
+        def produce() -> None:
+            while True:
+                try:
+                    writer.sendall(b"x")
+                except ConnectionError:
+                    return
+                accepted.append(1)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while not accepted:
+            pass
+        writer.stop()                                          # sendall 과 경쟁
+        producer.join(timeout=2.0)
+        self.assertEqual(_recv_exact(self.server, len(accepted)), b"x" * len(accepted))
+        writer.join(timeout=2.0)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(writer.queue_depth, 0)
+
+    def test_send_failure_reports_error_and_rejects_new_frames(self) -> None:
+        failed = threading.Event()
+        writer = tcp.SocketWriter(self.client, on_error=lambda e: failed.set())
+        writer.start()
+        self.server.close()
+        for _ in range(50):
+            try:
+                writer.sendall(b"\x00" * 65536)
+            except ConnectionError:
+                break
+            failed.wait(0.01)
+        self.assertTrue(failed.wait(2.0))
+        self.assertIsNotNone(writer.error)
+        with self.assertRaises(ConnectionError):
+            writer.sendall(b"x")
+
+
+if __name__ == "__main__":
+    unittest.main()
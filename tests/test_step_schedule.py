@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import unittest
+
+from automation.step_schedule import StepSchedule
+
+
+class StepScheduleTests(unittest.TestCase):
+    def test_fixed_decimation_ignores_control_changes(self) -> None:
+        sched = StepSchedule(decimation=3)
+        for throttle in (0.0, 1.0, 0.0):
+            sched.observe("Car_1", throttle, 0.0, 0.0)
+            self.assertEqual(sched.next_step_count(), 3)
+        self.assertEqual(sched.stats()["ticks"], 9)
+
+    def test_adaptive_grows_when_calm_and_halves_on_large_change(self) -> None:
+        sched = StepSchedule(decimation=1, adaptive=True, max_decimation=4, patience=2)
+        ks = []
+        for _ in range(8):
+            sched.observe("Car_1", 0.5, 0.0, 0.01)
+            ks.append(sched.next_step_count())
+        self.assertEqual(ks, [1, 2, 2, 3, 3, 4, 4, 4])
+
+        sched.observe("Car_1", 0.5, 0.0, 0.6)     # 급조향
+        self.assertEqual(sched.next_step_count(), 2)
+        sched.observe("Car_2", 0.0, 1.0, 0.0)     # 새 entity 첫 값은 변화량 없음
+        self.assertEqual(sched.next_step_count(), 2)
+
+    def test_adaptive_without_observations_keeps_k(self) -> None:
+        sched = StepSchedule(decimation=2, adaptive=True)
+        self.assertEqual([sched.next_step_count() for _ in range(5)], [2] * 5)
+        self.assertEqual(sched.stats()["mean_k"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
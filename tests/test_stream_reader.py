@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import socket
+import struct
+import unittest
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+
+
+def _resp(msg_type: int, request_id: int, payload: bytes) -> bytes:
+    return tcp.build_header(proto.MSG_CLASS_RESP, msg_type, len(payload), request_id) + payload
+
+
+class StreamReaderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def test_reads_back_to_back_packets(self) -> None:
+        ack = struct.pack(proto.RESULT_FMT, 0, 0)
+        self.server.sendall(_resp(proto.MSG_TYPE_FIXED_STEP, 1, ack) + _resp(proto.MSG_TYPE_SAVE_DATA, 2, ack))
+        reader = tcp.StreamReader(self.client)
+
+        msg_class, msg_type, size, rid, _, payload = reader.read_packet()
+        self.assertEqual((msg_class, msg_type, size, rid), (proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, 8, 1))
+        self.assertIsInstance(payload, memoryview)
+        self.assertEqual(tcp.parse_result_code(payload), (0, 0))
+
+        _, msg_type, _, rid, _, _ = reader.read_packet()
+        self.assertEqual((msg_type, rid), (proto.MSG_TYPE_SAVE_DATA, 2))
+        self.assertEqual(reader.packets, 2)
+
+    def test_resyncs_on_garbage_and_false_magic(self) -> None:
+        garbage = b"\x00\x01" + bytes([proto.MAGIC]) + b"\xff" * 20
+        self.server.sendall(garbage + _resp(proto.MSG_TYPE_SCENARIO_STATUS, 7, struct.pack("<III", 0, 0, 1)))
+        reader = tcp.StreamReader(self.client)
+
+        _, msg_type, _, rid, _, payload = reader.read_packet()
+        self.assertEqual((msg_type, rid), (proto.MSG_TYPE_SCENARIO_STATUS, 7))
+        self.assertEqual(tcp.parse_scenario_status_payload(payload)["state"], 1)
+        self.assertEqual(reader.discarded_bytes, len(garbage))
+
+    def test_keeps_partial_packet_across_timeout(self) -> None:
+        packet = _resp(proto.MSG_TYPE_FIXED_STEP, 3, struct.pack(proto.RESULT_FMT, 0, 0))
+        self.client.settimeout(0.05)
+        reader = tcp.StreamReader(self.client)
+
+        self.server.sendall(packet[:10])
+        with self.assertRaises(socket.timeout):
+            reader.read_packet()
+        self.server.sendall(packet[10:])
+        _, _, _, rid, _, _ = reader.read_packet()
+        self.assertEqual(rid, 3)
+
+    def test_grows_for_payload_larger_than_capacity(self) -> None:
+        name = "S" * 5000
+        payload = struct.pack(proto.RESULT_FMT, 0, 0) + struct.pack("<I", len(name)) + name.encode()
+        self.server.sendall(_resp(proto.MSG_TYPE_CREATE_OBJECT, 4, payload))
+        reader = tcp.StreamReader(self.client, capacity=64)
+
+        _, _, size, _, _, data = reader.read_packet()
+        self.assertEqual(size, len(payload))
+        self.assertEqual(tcp.parse_create_object_payload(data)["object_id"], name)
+
+    def test_raises_connection_error_on_close(self) -> None:
+        self.server.close()
+        with self.assertRaises(ConnectionError):
+            tcp.StreamReader(self.client).read_packet()
+
+
+if __name__ == "__main__":
+    unittest.main()
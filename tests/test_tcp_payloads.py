@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import array
+import socket
 import struct
 import unittest
 
@@ -90,6 +92,39 @@ class TcpPayloadGoldenTests(unittest.TestCase):
         )
         self.assertEqual(actual, expected)
 
+    def test_set_trajectory_buffer_and_stream_match_tuple_payload(self) -> None:
+        points = [(float(i), i * 0.5, 0.25, i * 0.1) for i in range(2500)]
+        expected = tcp.build_set_trajectory_payload("Car_1", 1, "route", points)
+        flat = array.array("d", [v for point in points for v in point])
+        shaped = memoryview(flat).cast("B").cast("d", (len(points), 4))
+
+        self.assertEqual(tcp.build_set_trajectory_payload("Car_1", 1, "route", flat), expected)
+        self.assertEqual(tcp.build_set_trajectory_payload("Car_1", 1, "route", shaped), expected)
+        self.assertEqual(
+            bytes(tcp.build_set_trajectory_payload_from_iter("Car_1", 1, "route", iter(points), len(points))),
+            expected,
+        )
+        with self.assertRaises(ValueError):
+            tcp.build_set_trajectory_payload_from_iter("Car_1", 1, "route", iter(points), len(points) + 1)
+        with self.assertRaises(ValueError):
+            tcp.build_set_trajectory_payload("Car_1", 1, "route", array.array("d", [0.0] * 6))
+
+    def test_send_set_trajectory_frames_are_identical(self) -> None:
+        points = [(float(i), 0.0, 0.0, i * 0.05) for i in range(100)]
+        flat = array.array("d", [v for point in points for v in point])
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        self.addCleanup(server.close)
+        server.settimeout(2.0)
+
+        tcp.send_set_trajectory(client, 7, "Car_1", 1, "route", points)
+        tcp.send_set_trajectory(client, 7, "Car_1", 1, "route", flat)
+        tcp.send_set_trajectory_stream(client, 7, "Car_1", 1, "route", (p for p in points), len(points))
+        frames = [tcp.recv_packet(server) for _ in range(3)]
+        self.assertEqual(frames[0], frames[1])
+        self.assertEqual(frames[0], frames[2])
+        self.assertEqual(frames[0][5], tcp.build_set_trajectory_payload("Car_1", 1, "route", points))
+
     def test_load_suite_payload(self) -> None:
         suite_path = "C:/Suite/Test.suite"
         expected = struct.pack("<I", len(suite_path.encode("utf-8"))) + suite_path.encode("utf-8")
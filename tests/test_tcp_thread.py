@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+import unittest
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+import utils.event_log as elog
+from transport.pending import PendingTable
+from transport.tcp_thread import Receiver
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.lines = []
+
+    def __call__(self, t, level, category, message) -> None:
+        self.lines.append((level, category, message))
+
+
+class ReceiverTests(unittest.TestCase):
+    def test_deferred_overflow_is_counted_and_reported(self) -> None:
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        rx = Receiver(b, PendingTable())
+        rx._DEFERRED_MAX = 3
+
+        ack = struct.pack(proto.RESULT_FMT, 0, 0)
+        for rid in range(1, 6):
+            a.sendall(tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_SAVE_DATA, len(ack), rid) + ack)
+        a.close()
+        reader = threading.Thread(target=rx.run)   # 후처리 스레드 없이 수신만
+        reader.start()
+        reader.join(2.0)
+
+        self.assertEqual(rx.deferred_dropped, 2)
+        self.assertEqual([item[2] for item in rx._deferred], [3, 4, 5])   # 오래된 것부터 버림
+
+        sink = _Recorder()
+        elog.add_sink(sink)
+        self.addCleanup(elog.remove_sink, sink)
+        rx._deferred_loop()
+        elog.get().drain()
+        self.assertTrue(any(level == elog.WARN and "2 건" in message for level, _, message in sink.lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import struct
+import unittest
+
+from receivers.template_parser import TemplateParser
+
+_TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+
+def _wheel_packet(wheel_count: int, rows: int) -> bytes:
+    head = struct.pack("<qi24s18fi", 7, 500, b"Car_1", *[float(i) for i in range(18)], wheel_count)
+    return head + b"".join(struct.pack("<3f", w, w + 0.5, -w) for w in range(rows))
+
+
+class TemplateParserTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wheel = TemplateParser(os.path.join(_TEMPLATES, "Vehicle Info with wheel.tmpl"))
+
+    def test_fields_and_repeat_rows(self) -> None:
+        parsed = self.wheel.parse(_wheel_packet(4, 4))
+        self.assertEqual(parsed["template_name"], "Vehicle Info with wheel")
+        self.assertEqual(parsed["fields"]["seconds"], 7)
+        self.assertEqual(parsed["fields"]["id"], "Car_1")
+        self.assertEqual(parsed["field_list"][3]["value"], 0.0)
+        self.assertEqual(parsed["fields"]["wheel_count"], 4)
+        self.assertEqual(len(parsed["repeat_rows"]), 4)
+        self.assertEqual([r["field_list"][1]["value"] for r in parsed["repeat_rows"]], [0.5, 1.5, 2.5, 3.5])
+        self.assertEqual(parsed["raw_size"], len(_wheel_packet(4, 4)))
+
+    def test_truncated_repeat_keeps_complete_rows_only(self) -> None:
+        data = _wheel_packet(4, 3) + b"\x00" * 5
+        self.assertEqual(len(self.wheel.parse(data)["repeat_rows"]), 3)
+
+    def test_too_short_for_fields_returns_none(self) -> None:
+        self.assertIsNone(self.wheel.parse(b"\x00" * 10))
+        self.assertIsNone(self.wheel.unpack(b""))
+
+    def test_unpack_defers_dict_building(self) -> None:
+        unpacked = self.wheel.unpack(_wheel_packet(2, 2))
+        values, rows, _ = unpacked
+        self.assertEqual(values[-1], 2)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(self.wheel.to_dict(unpacked), self.wheel.parse(_wheel_packet(2, 2)))
+
+    def test_record_decodes_single_fields_and_rows_on_access(self) -> None:
+        rec = self.wheel.parse(_wheel_packet(4, 4))
+        self.assertEqual(rec.field("id"), "Car_1")
+        self.assertEqual(rec.field("wheel_count"), 4)
+        self.assertEqual(len(rec.rows), 4)
+        self.assertEqual(rec.rows[-1].field("y"), 3.5)
+        self.assertIsNone(rec._values)            # FIELDS 전체 unpack 없이
+        with self.assertRaises(KeyError):
+            rec.field("no_such_field")
+        with self.assertRaises(IndexError):
+            rec.rows[4]
+
+    def test_count_field_resolved_at_compile_time(self) -> None:
+        collision = TemplateParser(os.path.join(_TEMPLATES, "Collision Event Data.tmpl"))
+        self.assertEqual(collision.plan.count_index, 1)   # collision_object_count
+        row = struct.pack("<24sIqi18f", b"Obj_9", 2, 1, 2, *([0.0] * 18))
+        parsed = collision.parse(struct.pack("<24sI", b"Car_1", 1) + row)
+        self.assertEqual(parsed["repeat_rows"][0]["fields"]["collision_object_id"], "Obj_9")
+        self.assertEqual(parsed["repeat_rows"][0]["fields"]["object_type"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import utils.tracer as tracer
+
+
+class TracerTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        tracer.uninstall()
+
+    def test_calls_are_noops_until_installed(self) -> None:
+        with tracer.span("fixed_step.send", "step", step=1):
+            tracer.instant("vi.recv", "udp", step=1)
+        tr = tracer.install(tracer.Tracer())
+        self.assertEqual(tr.stats()["recorded"], 0)
+
+    def test_events_keep_thread_and_step_and_export_as_chrome_json(self) -> None:
+        tr = tracer.install(tracer.Tracer())
+        with tracer.span("fixed_step.send", "step", step=3):
+            pass
+        t0 = tracer.now_ns()
+        tracer.complete("ack_wait", "wait", t0, t0 + 2_000_000, step=3)
+
+        worker = threading.Thread(target=lambda: tracer.instant("vi.recv", "udp", step=3, entity="Car_1"),
+                                  name="StepAD-VI-Car_1")
+        worker.start()
+        worker.join()
+
+        path = os.path.join(tempfile.mkdtemp(), "run.trace.json")
+        self.addCleanup(os.remove, path)
+        self.assertEqual(tr.export_chrome(path), 3)
+        with open(path, encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+
+        by_name = {e["name"]: e for e in events if e["ph"] != "M"}
+        self.assertEqual(by_name["ack_wait"]["ph"], "X")
+        self.assertAlmostEqual(by_name["ack_wait"]["dur"], 2000.0)
+        self.assertEqual(by_name["fixed_step.send"]["args"], {"step": 3})
+        self.assertEqual(by_name["vi.recv"]["args"], {"step": 3, "entity": "Car_1"})
+        self.assertNotEqual(by_name["vi.recv"]["tid"], by_name["ack_wait"]["tid"])
+        names = {e["args"]["name"] for e in events if e["name"] == "thread_name"}
+        self.assertIn("StepAD-VI-Car_1", names)
+
+    def test_full_thread_buffer_drops_oldest(self) -> None:
+        tr = tracer.install(tracer.Tracer(capacity_per_thread=4))
+        for i in range(10):
+            tracer.instant("tick", step=i)
+        steps = [e["args"]["step"] for e in tr.chrome_events() if e["ph"] == "i"]
+        self.assertEqual(steps, [6, 7, 8, 9])
+        self.assertEqual(tr.stats()["dropped"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
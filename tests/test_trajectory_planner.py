@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:   # requirements.txt 에 있지만 최소 환경에서는 없을 수 있음
+    np = None
+
+if np is not None:
+    from autonomous_driving.localization.path_manager import PathManager
+    from autonomous_driving.planning.trajectory_planner import TrajectoryPlanner, time_parameterize
+    from autonomous_driving.planning.trajectory_simplify import simplify_trajectory
+    from autonomous_driving.vehicle_state import VehicleState
+
+
+def _straight_path_manager(n: int = 200, closed: bool = False):
+    from autonomous_driving.localization.point import Point
+    pm = PathManager([Point(float(i), 0.0) for i in range(n)], closed, 50)
+    pm.set_velocity_profile(max_velocity=36.0, road_friction=1.0, window_size=5)   # 10 m/s
+    return pm
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TrajectoryPlannerTests(unittest.TestCase):
+    def test_time_parameterize_uses_segment_average_velocity(self) -> None:
+        xy = np.array([[0.0, 0.0], [10.0, 0.0], [20.0, 0.0]])
+        t = time_parameterize(xy, np.array([10.0, 10.0, 0.0]), min_velocity=1.0)
+        np.testing.assert_allclose(t, [0.0, 1.0, 3.0])
+
+    def test_uploads_only_on_initial_plan_change_and_deviation(self) -> None:
+        pm = _straight_path_manager()
+        planner = TrajectoryPlanner(pm, deviation_m=2.0)
+
+        points, reason = planner.update(VehicleState(x=20.2, y=0.1), z=1.5)
+        self.assertEqual(reason, "initial")
+        self.assertEqual(points.shape, (180, 4))
+        self.assertTrue(points.flags.c_contiguous)
+        np.testing.assert_allclose(points[:2, :3], [[20.0, 0.0, 1.5], [21.0, 0.0, 1.5]])
+        self.assertTrue(np.all(np.diff(points[:, 3]) > 0))
+
+        for x in (21.0, 25.0, 30.0):
+            self.assertIsNone(planner.update(VehicleState(x=x, y=0.5)))
+
+        self.assertEqual(planner.update(VehicleState(x=31.0, y=3.0))[1], "deviation")
+        self.assertIsNone(planner.update(VehicleState(x=32.0, y=3.0)))     # 복귀 전 반복 없음
+
+        pm.set_velocity_profile(max_velocity=18.0, road_friction=1.0, window_size=5)
+        self.assertEqual(planner.update(VehicleState(x=33.0, y=0.0))[1], "plan")
+        self.assertEqual(dict(planner.reasons), {"initial": 1, "deviation": 1, "plan": 1})
+
+    def test_rolling_window_reuploads_near_end(self) -> None:
+        planner = TrajectoryPlanner(_straight_path_manager(), window_points=40, refresh_margin=0.25)
+        self.assertEqual(len(planner.update(VehicleState(x=0.0, y=0.0))[0]), 40)
+        self.assertIsNone(planner.update(VehicleState(x=29.0, y=0.0)))
+        points, reason = planner.update(VehicleState(x=30.0, y=0.0))
+        self.assertEqual(reason, "window")
+        self.assertEqual(points[0, 0], 30.0)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class SimplifyTrajectoryTests(unittest.TestCase):
+    @staticmethod
+    def _route():
+        # 200 m 직선 + 반지름 20 m 사분원 + 200 m 직선, 0.5 m 간격, 10 m/s
+        s1 = np.stack([np.arange(0.0, 200.0, 0.5), np.zeros(400)], axis=1)
+        a  = np.linspace(0.0, np.pi / 2, 64)
+        arc = np.stack([200.0 + 20.0 * np.sin(a), 20.0 - 20.0 * np.cos(a)], axis=1)
+        s2 = np.stack([np.full(400, 220.0), 20.0 + np.arange(0.5, 200.5, 0.5)], axis=1)
+        xy = np.concatenate([s1, arc, s2])
+        points = np.zeros((len(xy), 4))
+        points[:, :2] = xy
+        points[:, 3]  = time_parameterize(xy, np.full(len(xy), 10.0))
+        return points
+
+    def test_long_route_compresses_within_error_bound(self) -> None:
+        points = self._route()
+        out, report = simplify_trajectory(points, max_error=0.05)
+        self.assertGreater(report.ratio, 10.0)
+        self.assertLessEqual(report.max_error, 0.05)
+        np.testing.assert_array_equal(out[[0, -1]], points[[0, -1]])
+        self.assertTrue(np.all(np.diff(out[:, 3]) > 0))
+
+        # 원래 각 점 → 단순화 polyline 까지 거리로 독립 검증
+        a, b = out[:-1, None, :2], out[1:, None, :2]
+        ab = b - a
+        s  = np.clip(np.sum((points[None, :, :2] - a) * ab, axis=2) / np.sum(ab * ab, axis=2), 0.0, 1.0)
+        d  = np.linalg.norm(points[None, :, :2] - (a + s[..., None] * ab), axis=2).min(axis=0)
+        self.assertLessEqual(d.max(), 0.05 + 1e-9)
+
+    def test_deceleration_on_straight_keeps_time_shape(self) -> None:
+        xy = np.stack([np.arange(100.0), np.zeros(100)], axis=1)
+        v  = np.concatenate([np.full(80, 10.0), np.linspace(10.0, 1.0, 20)])
+        points = np.zeros((100, 4))
+        points[:, :2] = xy
+        points[:, 3]  = time_parameterize(xy, v)
+
+        spatial, _ = simplify_trajectory(points, max_error=0.1, max_time_error=None)
+        timed, report = simplify_trajectory(points, max_error=0.1, max_time_error=0.1)
+        self.assertEqual(len(spatial), 2)
+        self.assertGreater(len(timed), 2)
+        self.assertLessEqual(report.max_time_error, 0.1)
+
+    def test_planner_simplifies_but_tracks_raw_window(self) -> None:
+        planner = TrajectoryPlanner(_straight_path_manager(), window_points=40, max_error=0.1)
+        points, _ = planner.update(VehicleState(x=0.0, y=0.0))
+        self.assertLess(len(points), 40)
+        self.assertEqual(planner.last_report.input_points, 40)
+        self.assertIsNone(planner.update(VehicleState(x=29.0, y=0.0)))
+        self.assertEqual(planner.update(VehicleState(x=30.0, y=0.0))[1], "window")
+
+
+if __name__ == "__main__":
+    unittest.main()
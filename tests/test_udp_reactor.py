@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+import unittest
+
+import utils.event_log as elog
+from panels.monitor_receiver import UDPReceiver
+from receivers.udp_reactor import UdpReactor
+
+
+def _udp_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def _wait_for(cond, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return cond()
+
+
+class UdpReactorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reactor = UdpReactor(name="test-reactor")
+        self.addCleanup(self.reactor.stop)
+        self.tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(self.tx.close)
+
+    def _bound(self) -> socket.socket:
+        sock = _udp_socket()
+        self.addCleanup(sock.close)
+        return sock
+
+    def test_one_thread_dispatches_every_socket(self) -> None:
+        got = {"a": [], "b": []}
+        socks = {name: self._bound() for name in got}
+        regs = {name: self.reactor.register(sock, lambda d, n=name: got[n].append(bytes(d)),
+                                            stream=f"test:{name}", copy=False)
+                for name, sock in socks.items()}
+        threads_before = threading.active_count()
+
+        for i in range(50):
+            self.tx.sendto(b"a%d" % i, socks["a"].getsockname())
+            self.tx.sendto(b"b%d" % i, socks["b"].getsockname())
+        self.assertTrue(_wait_for(lambda: len(got["a"]) == 50 and len(got["b"]) == 50))
+
+        self.assertEqual(got["a"][:3], [b"a0", b"a1", b"a2"])
+        self.assertEqual(regs["b"].stats()["packets"], 50)
+        self.assertEqual(regs["b"].stats()["bytes"], sum(len(p) for p in got["b"]))
+        self.assertEqual(threading.active_count(), threads_before)
+
+    def test_invalid_and_handler_errors_are_counted(self) -> None:
+        def handler(data) -> bool:
+            if data[0] == 0xFF:
+                raise ValueError("boom")
+            return data[0] == 1
+
+        logged = []
+        sink = lambda t, level, category, message: logged.append((level, category, message))
+        elog.add_sink(sink)
+        self.addCleanup(elog.remove_sink, sink)
+        sock = self._bound()
+        reg = self.reactor.register(sock, handler, stream="test:errors")
+        for payload in (b"\x01", b"\x00", b"\xff", b"\x01"):
+            self.tx.sendto(payload, sock.getsockname())
+        self.assertTrue(_wait_for(lambda: reg.packets == 4))
+        self.assertEqual((reg.invalid, reg.errors), (1, 1))
+        self.assertGreaterEqual(reg.dropped, 1)
+        elog.get().drain()
+        self.assertIn((elog.WARN, "udp.reactor"), [(level, cat) for level, cat, msg in logged if "test:errors" in msg])
+
+    def test_unregister_stops_delivery(self) -> None:
+        got = []
+        sock = self._bound()
+        self.reactor.register(sock, got.append)
+        self.tx.sendto(b"x", sock.getsockname())
+        self.assertTrue(_wait_for(lambda: got == [b"x"]))
+
+        self.assertIsNotNone(self.reactor.unregister(sock))
+        self.assertIsNone(self.reactor.unregister(sock))
+        self.tx.sendto(b"y", sock.getsockname())
+        time.sleep(0.1)
+        self.assertEqual(got, [b"x"])
+        self.assertEqual(self.reactor.stats(), [])
+
+    def test_udp_receiver_counts_unparsed_packets_as_invalid(self) -> None:
+        sock = self._bound()
+        parsed = []
+        receiver = UDPReceiver(sock, parse_fn=lambda d: d if len(d) > 1 else None,
+                               on_data=parsed.append, on_error=lambda: None,
+                               stream="test:monitor", reactor=self.reactor)
+        receiver.start()
+        self.addCleanup(receiver.stop)
+        for payload in (b"ok", b"?", b"fine"):
+            self.tx.sendto(payload, sock.getsockname())
+        self.assertTrue(_wait_for(lambda: receiver.stats()["packets"] == 3))
+        self.assertEqual(parsed, [b"ok", b"fine"])
+        self.assertEqual(receiver.stats()["invalid"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import struct
+import unittest
+
+from receivers.vehicle_info_receiver import VEHICLE_INFO_FMT, VehicleInfo, parse_vehicle_info_payload
+
+
+def _packet(entity: bytes = b"Car_1", base: float = 0.0) -> bytes:
+    return struct.pack(VEHICLE_INFO_FMT, 3, 250, entity, *[base + i for i in range(18)])
+
+
+class VehicleInfoTests(unittest.TestCase):
+    def test_slots_follow_payload_layout(self) -> None:
+        vi = VehicleInfo.from_bytes(_packet())
+        self.assertEqual((vi.seconds, vi.nanos, vi.id), (3, 250, "Car_1"))
+        self.assertEqual((vi.x, vi.y, vi.z, vi.yaw, vi.vx), (0.0, 1.0, 2.0, 5.0, 6.0))
+        self.assertEqual((vi.throttle, vi.brake, vi.steer_angle), (15.0, 16.0, 17.0))
+        self.assertAlmostEqual(vi.speed_kph, 6.0 * 3.6, places=5)
+        with self.assertRaises(AttributeError):
+            vi.extra = 1
+
+    def test_update_in_place_reuses_object(self) -> None:
+        vi = VehicleInfo()
+        self.assertTrue(vi.update_from(memoryview(_packet(base=10.0))))
+        entity_id = vi.id
+        self.assertTrue(vi.update_from(_packet(base=20.0)))
+        self.assertEqual(vi.x, 20.0)
+        self.assertIs(vi.id, entity_id)                    # 같은 id 는 다시 decode 하지 않음
+
+        self.assertFalse(vi.update_from(b"\x00" * 10))
+        self.assertEqual(vi.x, 20.0)
+
+    def test_copy_from_makes_independent_snapshot(self) -> None:
+        live, snap = VehicleInfo.from_bytes(_packet(base=1.0)), VehicleInfo()
+        snap.copy_from(live)
+        live.update_from(_packet(b"Car_2", base=5.0))
+        self.assertEqual((snap.id, snap.x), ("Car_1", 1.0))
+
+    def test_dict_api_is_kept(self) -> None:
+        data = _packet()
+        parsed = parse_vehicle_info_payload(data)
+        self.assertEqual(parsed["location"], {"x": 0.0, "y": 1.0, "z": 2.0})
+        self.assertEqual(parsed["control"]["steer_angle"], 17.0)
+        self.assertEqual(parsed["raw_size"], len(data))
+        vi = VehicleInfo.from_bytes(data)
+        self.assertEqual(vi["rotation"]["z"], parsed["rotation"]["z"])
+        self.assertEqual(vi.to_dict(), parsed)
+        self.assertIsNone(parse_vehicle_info_payload(data[:-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import multiprocessing
+import types
+import unittest
+
+from utils.vehicle_table import VehicleStateTable
+
+
+def _vi(x: float, seconds: int = 1) -> types.SimpleNamespace:
+    # 모든 값을 x 에서 유도 — 찢어진 (torn) 읽기면 불일치가 보인다
+    return types.SimpleNamespace(seconds=seconds, nanos=seconds * 10, x=x, y=x + 1, z=0.0,
+                                 roll=0.0, pitch=0.0, yaw=-x, vx=x / 2, vy=0.0, vz=0.0)
+
+
+def _writer(name: str, count: int) -> None:
+    table = VehicleStateTable.attach(name)
+    for i in range(count):
+        table.publish("Car_1", _vi(float(i), i))
+    table.close()
+
+
+class VehicleStateTableTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = VehicleStateTable.create(capacity=4)
+        self.addCleanup(self.table.close)
+
+    def test_publish_then_read_from_second_handle(self) -> None:
+        self.assertIsNone(self.table.read("Car_1"))
+        self.table.add("Car_1")
+        self.assertIsNone(self.table.read("Car_1"))          # 행만 배정, 아직 publish 전
+        self.table.publish("Car_1", _vi(12.0, 3))
+
+        other = VehicleStateTable.attach(self.table.name)
+        self.addCleanup(other.close)
+        row = other.read("Car_1")
+        self.assertEqual((row.entity_id, row.seconds, row.nanos), ("Car_1", 3, 30))
+        self.assertEqual((row.x, row.y, row.yaw), (12.0, 13.0, -12.0))
+        self.assertAlmostEqual(row.speed_kph, 6.0 * 3.6)
+        self.assertGreater(row.updated, 0.0)
+
+    def test_clear_invalidates_cached_rows(self) -> None:
+        other = VehicleStateTable.attach(self.table.name)
+        self.addCleanup(other.close)
+        self.table.publish("Car_1", _vi(1.0))
+        other.publish("Car_1", _vi(1.5))                     # 배정된 행은 attach 한 쪽도 기록
+        self.assertEqual(self.table.read("Car_1").x, 1.5)
+
+        with self.assertRaises(RuntimeError):
+            other.clear()
+        self.table.clear()
+        self.assertIsNone(other.read("Car_1"))
+        self.table.publish("Car_2", _vi(2.0))                # clear 뒤 첫 빈 행 재사용
+        self.table.publish("Car_1", _vi(5.0))
+        self.assertEqual(other.read("Car_1").x, 5.0)
+        self.assertEqual([r.entity_id for r in other.rows()], ["Car_2", "Car_1"])
+
+    def test_only_owner_assigns_rows(self) -> None:
+        table = VehicleStateTable.create(capacity=2, entities=["Car_1", "Car_2"])
+        self.addCleanup(table.close)
+        other = VehicleStateTable.attach(table.name)
+        self.addCleanup(other.close)
+        self.assertEqual((other.add("Car_1"), other.add("Car_2")), (0, 1))
+        with self.assertRaises(KeyError):
+            other.add("Car_3")
+        with self.assertRaises(KeyError):
+            other.publish("Car_3", _vi(0.0))
+
+    def test_full_table_and_long_id_are_rejected(self) -> None:
+        for i in range(4):
+            self.table.add(f"Car_{i}")
+        with self.assertRaises(RuntimeError):
+            self.table.publish("Car_9", _vi(0.0))
+        with self.assertRaises(ValueError):
+            self.table.add("x" * 25)
+
+    def test_reader_never_sees_torn_rows_across_processes(self) -> None:
+        self.table.add("Car_1")
+        ctx = multiprocessing.get_context("spawn")
+        proc = ctx.Process(target=_writer, args=(self.table.name, 20000))
+        proc.start()
+        self.addCleanup(proc.join, 10)
+
+        reads = 0
+        while proc.is_alive() or reads == 0:
+            row = self.table.read("Car_1")
+            if row is None:
+                continue
+            reads += 1
+            self.assertEqual((row.y, row.yaw, row.vx), (row.x + 1, -row.x, row.x / 2))
+            self.assertEqual(row.seconds, int(row.x))
+        proc.join(10)
+        self.assertEqual(proc.exitcode, 0)
+        self.assertEqual(self.table.read("Car_1").x, 19999.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import tempfile
+import unittest
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from tools.replay_capture import bench_parsers, replay, summarize
+from tools.sim_stub import SimStub
+from transport.capture import DIR_RX, DIR_TX, CaptureReader, WireCapture
+
+
+class WireCaptureTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "session.mtcap")
+
+    def test_round_trip_and_index_select(self) -> None:
+        frames = [tcp.build_request_packet(rid, proto.MSG_TYPE_FIXED_STEP, tcp.build_fixed_step_payload(1))
+                  for rid in range(1, 4)]
+        ack = struct.pack(proto.RESULT_FMT, 0, 0)
+        clock = iter([1.0, 1.5, 2.0, 2.5]).__next__
+        with WireCapture(self.path, clock=clock) as cap:
+            for frame in frames:
+                cap.write(DIR_TX, frame)
+            cap.write(DIR_RX, tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), 2) + ack)
+
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual([bytes(r.frame) for r in reader.select(direction=DIR_TX)], frames)
+            (resp,) = reader.select(direction=DIR_RX, request_id=2)
+            self.assertEqual((resp.t, bytes(resp.payload)), (2.5, ack))
+            self.assertEqual(summarize(reader)["duration"], 1.5)
+
+    def test_missing_index_is_rebuilt_from_data(self) -> None:
+        with WireCapture(self.path) as cap:
+            cap.write(DIR_TX, tcp.build_request_packet(9, proto.MSG_TYPE_SAVE_DATA, b""))
+        os.remove(self.path + ".idx")
+        with CaptureReader(self.path) as reader:
+            self.assertEqual([(e.msg_type, e.request_id) for e in reader.index], [(proto.MSG_TYPE_SAVE_DATA, 9)])
+
+    def test_transport_tap_records_send_and_receive(self) -> None:
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        self.addCleanup(server.close)
+        tcp.enable_capture(self.path)
+        try:
+            tcp.send_fixed_step(client, 5, step_count=1)
+            ack = struct.pack(proto.RESULT_FMT, 0, 0)
+            server.sendall(tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), 5) + ack)
+            tcp.StreamReader(client).read_packet()
+        finally:
+            tcp.disable_capture()
+
+        with CaptureReader(self.path) as reader:
+            self.assertEqual([(e.direction, e.request_id) for e in reader.index], [(DIR_TX, 5), (DIR_RX, 5)])
+            self.assertEqual(bench_parsers(reader, repeat=1)[proto.MSG_TYPE_FIXED_STEP]["failed"], 0)
+
+    def test_replay_against_stub_matches_responses(self) -> None:
+        ack = struct.pack(proto.RESULT_FMT, 0, 0)
+        with WireCapture(self.path) as cap:
+            for rid in range(1, 11):
+                cap.write(DIR_TX, tcp.build_request_packet(rid, proto.MSG_TYPE_FIXED_STEP, tcp.build_fixed_step_payload(1)))
+                cap.write(DIR_RX, tcp.build_header(proto.MSG_CLASS_RESP, proto.MSG_TYPE_FIXED_STEP, len(ack), rid) + ack)
+
+        with SimStub() as stub, CaptureReader(self.path) as reader:
+            host, port = stub.address
+            result = replay(reader, host, port, speed=None)
+            self.assertEqual(stub.step_index, 10)
+        self.assertEqual((result["sent"], result["missing"]), (10, 0))
+        self.assertEqual(result["rtt_ms"]["count"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
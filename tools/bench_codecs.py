@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from transport.message_schema import (
+    get_message,
+    pack_fields,
+    pack_message_payload,
+    pack_repeated_fields,
+)
+
+
+# field 단위로 pack_value 를 호출하던 이전 경로 (비교 기준)
+def _legacy_pack(msg_type: int, values: dict, repeated_items=None) -> bytes:
+    message = get_message(msg_type)
+    payload = pack_fields(message.fields, values)
+    if message.repeat_fields:
+        payload += pack_repeated_fields(message.repeat_fields, repeated_items or [])
+    return payload
+
+
+def _cases(point_count: int) -> List[Tuple[str, Callable[[], bytes], Callable[[], bytes]]]:
+    manual = {"entity_id": "Car_1", "throttle": 0.4, "brake": 0.0, "steer_angle": 0.1}
+    transform = {
+        "entity_id": "Car_1",
+        "pos_x": 1.0, "pos_y": 2.0, "pos_z": 3.0,
+        "rot_x": 0.0, "rot_y": 0.0, "rot_z": 90.0,
+        "steer_angle": 0.1, "speed": 10.0,
+    }
+    points = [(float(i), float(i) * 0.5, 0.0, i * 0.1) for i in range(point_count)]
+    trajectory = {
+        "entity_id": "Car_1",
+        "follow_mode": 1,
+        "trajectory_name": "Route_1",
+        "point_count": len(points),
+    }
+    items = [
+        {"points[].x": x, "points[].y": y, "points[].z": z, "points[].time": t}
+        for x, y, z, t in points
+    ]
+
+    return [
+        (
+            "0x1302 ManualControlById",
+            lambda: _legacy_pack(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual),
+            lambda: tcp.build_manual_control_by_id_payload("Car_1", 0.4, 0.0, 0.1),
+        ),
+        (
+            "0x1302 pack_message_payload",
+            lambda: _legacy_pack(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual),
+            lambda: pack_message_payload(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, manual),
+        ),
+        (
+            "0x1303 TransformControlById",
+            lambda: _legacy_pack(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND, transform),
+            lambda: tcp.build_transform_control_by_id_payload("Car_1", 1.0, 2.0, 3.0, 0.0, 0.0, 90.0, 0.1, 10.0),
+        ),
+        (
+            f"0x1304 SetTrajectory ({point_count} pts)",
+            lambda: _legacy_pack(proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, trajectory, items),
+            lambda: tcp.build_set_trajectory_payload("Car_1", 1, "Route_1", points),
+        ),
+    ]
+
+
+def _best_per_call(fn: Callable[[], bytes], number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare field-walk packing with compiled message codecs.")
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs (best is reported)")
+    parser.add_argument("--points", type=int, default=1000, help="SetTrajectory point count")
+    args = parser.parse_args()
+
+    print(f"{'case':<34} {'legacy us':>10} {'codec us':>10} {'speedup':>8}")
+    for name, legacy, compiled in _cases(args.points):
+        if legacy() != compiled():
+            print(f"{name}: payload mismatch")
+            return 1
+        number = max(1, args.number // max(1, args.points // 10)) if "0x1304" in name else args.number
+        t_legacy = _best_per_call(legacy, number, args.repeat)
+        t_codec = _best_per_call(compiled, number, args.repeat)
+        print(f"{name:<34} {t_legacy * 1e6:>10.2f} {t_codec * 1e6:>10.2f} {t_legacy / t_codec:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+# tools/replay_capture.py
+#
+# MORAI_CAPTURE=<path> 로 기록한 wire capture 를 재생/분석한다.
+#
+#   info  : direction / msg_type 별 frame 수, 기록 구간
+#   send  : 캡처된 request 를 서버(또는 tools/sim_stub.py)로 재전송 — 원래 간격(--speed) 또는 --fast
+#           응답을 (request_id, msg_type) 로 매칭해 RTT p50/p95/p99 출력
+#   parse : 캡처된 response payload 를 tcp_transport parse_* 에 통과시켜 msg_type 별 us/call 측정
+#
+# 사용:
+#   python tools/replay_capture.py info  session.mtcap
+#   python tools/replay_capture.py send  session.mtcap --host 127.0.0.1 --port 20000 --fast
+#   python tools/replay_capture.py parse session.mtcap --repeat 20
+
+import argparse
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from transport.capture import DIR_RX, DIR_TX, CaptureReader
+from transport.pending import LatencyHistogram
+
+PARSERS: Dict[int, Callable] = {
+    proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS:      tcp.parse_get_status_payload,
+    proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND: tcp.parse_set_simulation_time_mode_payload,
+    proto.MSG_TYPE_CREATE_OBJECT:                   tcp.parse_create_object_payload,
+    proto.MSG_TYPE_ACTIVE_SUITE_STATUS:             tcp.parse_active_suite_status_payload,
+    proto.MSG_TYPE_SCENARIO_STATUS:                 tcp.parse_scenario_status_payload,
+}
+
+
+def summarize(reader: CaptureReader) -> Dict[str, object]:
+    counts = Counter((e.direction, e.msg_type) for e in reader.index)
+    first = last = None
+    if reader.index:
+        first = reader.record_at(reader.index[0].offset).t
+        last  = reader.record_at(reader.index[-1].offset).t
+    return {
+        "frames":   len(reader.index),
+        "duration": (last - first) if first is not None else 0.0,
+        "counts":   dict(counts),
+    }
+
+
+def replay(
+    reader: CaptureReader,
+    host: str,
+    port: int,
+    speed: Optional[float] = 1.0,
+    response_timeout: float = 2.0,
+) -> Dict[str, object]:
+    """TX frame 재전송. speed=None 이면 간격 없이 최대 속도."""
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    sent_at: Dict[tuple, float] = {}
+    hist    = LatencyHistogram()
+    lock    = threading.Lock()
+    done    = threading.Event()
+    state   = {"responses": 0, "unmatched": 0}
+
+    def _recv_loop() -> None:
+        stream = tcp.StreamReader(sock)
+        try:
+            while True:
+                msg_class, msg_type, _, rid, _, _ = stream.read_packet()
+                now = time.perf_counter()
+                with lock:
+                    t = sent_at.pop((rid, msg_type), None)
+                    state["responses"] += 1
+                    if t is None:
+                        state["unmatched"] += 1
+                    else:
+                        hist.record(now - t)
+                    if done.is_set() and not sent_at:
+                        return
+        except (ConnectionError, OSError):
+            pass
+
+    receiver = threading.Thread(target=_recv_loop, daemon=True)
+    receiver.start()
+
+    records = list(reader.select(direction=DIR_TX))
+    expects = {e.msg_type for e in reader.index if e.direction == DIR_RX}
+    t_start = time.perf_counter()
+    t_first = records[0].t if records else 0.0
+    for rec in records:
+        if speed:
+            delay = (rec.t - t_first) / speed - (time.perf_counter() - t_start)
+            if delay > 0:
+                time.sleep(delay)
+        _, _, msg_type, _, rid, _ = rec.header
+        if msg_type in expects:
+            with lock:
+                sent_at[(rid, msg_type)] = time.perf_counter()
+        sock.sendall(rec.frame)
+    t_sent = time.perf_counter()
+
+    done.set()
+    deadline = time.perf_counter() + response_timeout
+    while time.perf_counter() < deadline:
+        with lock:
+            if not sent_at:
+                break
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - t_start
+    sock.close()
+    receiver.join(timeout=1.0)
+
+    with lock:
+        missing = len(sent_at)
+    return {
+        "sent":      len(records),
+        "responses": state["responses"],
+        "unmatched": state["unmatched"],
+        "missing":   missing,
+        "send_sec":  t_sent - t_start,
+        "elapsed":   elapsed,
+        "rtt_ms":    hist.summary(),
+    }
+
+
+def bench_parsers(reader: CaptureReader, repeat: int = 10) -> Dict[int, Dict[str, float]]:
+    """captured RX payload 를 msg_type 별 parser 에 repeat 회 통과."""
+    payloads: Dict[int, list] = {}
+    for rec in reader.select(direction=DIR_RX):
+        _, msg_class, msg_type, _, _, _ = rec.header
+        if msg_class == proto.MSG_CLASS_RESP:
+            payloads.setdefault(msg_type, []).append(bytes(rec.payload))
+
+    results = {}
+    for msg_type, items in sorted(payloads.items()):
+        parse = PARSERS.get(msg_type, tcp.parse_result_code)
+        failed = sum(1 for p in items if parse(p) is None)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for p in items:
+                parse(p)
+        dt = time.perf_counter() - t0
+        results[msg_type] = {
+            "count":   len(items),
+            "failed":  failed,
+            "us_call": dt / (repeat * len(items)) * 1e6,
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay or analyze a MORAI TCP wire capture.")
+    parser.add_argument("command", choices=("info", "send", "parse"))
+    parser.add_argument("capture", help="capture file written via MORAI_CAPTURE / tcp.enable_capture()")
+    parser.add_argument("--host", default=proto.TCP_SERVER_IP)
+    parser.add_argument("--port", type=int, default=proto.TCP_SERVER_PORT)
+    parser.add_argument("--speed", type=float, default=1.0, help="pacing multiplier (2.0 = twice as fast)")
+    parser.add_argument("--fast", action="store_true", help="ignore original pacing")
+    parser.add_argument("--repeat", type=int, default=10, help="parse: passes over captured responses")
+    args = parser.parse_args()
+
+    with CaptureReader(args.capture) as reader:
+        if args.command == "info":
+            info = summarize(reader)
+            print(f"frames={info['frames']} duration={info['duration']:.3f}s")
+            for (direction, msg_type), n in sorted(info["counts"].items()):
+                print(f"  {'TX' if direction == DIR_TX else 'RX'} 0x{msg_type:04X} {n:>8}")
+
+        elif args.command == "send":
+            r = replay(reader, args.host, args.port, speed=None if args.fast else args.speed)
+            rtt = r["rtt_ms"]
+            print(f"sent={r['sent']} responses={r['responses']} unmatched={r['unmatched']} "
+                  f"missing={r['missing']} send={r['send_sec']:.3f}s elapsed={r['elapsed']:.3f}s")
+            print(f"rtt_ms n={rtt['count']} p50={rtt['p50']:.2f} p95={rtt['p95']:.2f} "
+                  f"p99={rtt['p99']:.2f} max={rtt['max']:.2f}")
+
+        else:
+            print(f"{'msg_type':<10} {'count':>8} {'failed':>7} {'us/call':>9}")
+            for msg_type, r in bench_parsers(reader, args.repeat).items():
+                print(f"0x{msg_type:04X}     {r['count']:>8} {r['failed']:>7} {r['us_call']:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+# tools/sim_stub.py
+#
+# MORAI TCP 프로토콜 stand-in 서버 — 시뮬레이터 없이 transport / AutoCaller / StepAdRunner /
+# playback 경로의 클라이언트 측 오버헤드를 측정하기 위한 용도.
+#
+#   - header/payload 는 protocol_defs / message_schema codec 그대로 사용
+#   - FixedStep / SaveData : service time + jitter 후 ACK
+#   - GetStatus / SetSimulationTimeMode / ActiveSuiteStatus / CreateObject / ScenarioStatus 응답
+#   - 그 외 request 는 result_code=0 ACK
+#   - FixedStep 마다 entity 별 kinematic bicycle model 을 진행시키고 Vehicle Info UDP 송신
+#   - drop_request() / drop_response() / --loss : request 또는 ACK 유실 재현 (재전송 경로 시험용)
+#   - stall_request() : 다음 request 처리 전에 서버 전체가 잠시 멈춤 (GetStatus 도 그 뒤에 처리)
+#
+# 사용:
+#   python tools/sim_stub.py --port 20000 --entity Car_1:9097 --entity Car_2:9098 --service-ms 5 --jitter-ms 2
+
+import argparse
+import math
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+from receivers.vehicle_info_receiver import VEHICLE_INFO_FMT
+from transport.message_schema import get_codec
+
+_VEHICLE_INFO = struct.Struct(VEHICLE_INFO_FMT)
+
+MAX_STEER_RAD = 0.5      # ManualControlById steer_angle(-1~1) → rad (step_ad_runner 와 동일)
+MAX_ACCEL     = 4.0      # m/s^2 @ throttle=1
+MAX_DECEL     = 8.0      # m/s^2 @ brake=1
+DRAG          = 0.05     # 1/s
+WHEELBASE     = 2.7      # m
+
+
+# ============================================================
+# Kinematic model
+# ============================================================
+
+class EntityState:
+    __slots__ = ("entity_id", "x", "y", "z", "yaw", "v", "accel", "yaw_rate",
+                 "throttle", "brake", "steer")
+
+    def __init__(self, entity_id: str, x: float = 0.0, y: float = 0.0, z: float = 0.0, yaw_deg: float = 0.0):
+        self.entity_id = entity_id
+        self.x, self.y, self.z = x, y, z
+        self.yaw      = math.radians(yaw_deg)
+        self.v        = 0.0
+        self.accel    = 0.0
+        self.yaw_rate = 0.0
+        self.throttle = 0.0
+        self.brake    = 0.0
+        self.steer    = 0.0
+
+    def step(self, dt: float) -> None:
+        accel = self.throttle * MAX_ACCEL - self.brake * MAX_DECEL - DRAG * self.v
+        v = max(0.0, self.v + accel * dt)
+        self.accel    = (v - self.v) / dt if dt > 0 else 0.0
+        self.v        = v
+        self.yaw_rate = v / WHEELBASE * math.tan(self.steer * MAX_STEER_RAD)
+        self.yaw     += self.yaw_rate * dt
+        self.x       += v * math.cos(self.yaw) * dt
+        self.y       += v * math.sin(self.yaw) * dt
+
+    def set_transform(self, x: float, y: float, z: float, yaw_deg: float, speed_kph: float, steer: float) -> None:
+        self.x, self.y, self.z = x, y, z
+        self.yaw   = math.radians(yaw_deg)
+        self.v     = speed_kph / 3.6
+        self.steer = steer
+
+    def pack_vehicle_info(self, seconds: int, nanos: int) -> bytes:
+        return _VEHICLE_INFO.pack(
+            seconds, nanos, self.entity_id.encode("utf-8")[:24],
+            self.x, self.y, self.z,
+            0.0, 0.0, math.degrees(self.yaw),
+            self.v, 0.0, 0.0,
+            self.accel, 0.0, 0.0,
+            0.0, 0.0, math.degrees(self.yaw_rate),
+            self.throttle, self.brake, self.steer,
+        )
+
+
+# ============================================================
+# Server
+# ============================================================
+
+_REQ_MANUAL    = get_codec(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND)
+_REQ_TRANSFORM = get_codec(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND)
+_REQ_CREATE    = get_codec(proto.MSG_TYPE_CREATE_OBJECT)
+_REQ_TIME_MODE = get_codec(proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND)
+_REQ_FIXED     = get_codec(proto.MSG_TYPE_FIXED_STEP)
+_REQ_SCENARIO  = get_codec(proto.MSG_TYPE_SCENARIO_CONTROL)
+_REQ_LOAD      = get_codec(proto.MSG_TYPE_LOAD_SUITE)
+_RESULT_OK     = struct.pack(proto.RESULT_FMT, 0, 0)
+
+
+class SimStub:
+    """단일 프로세스 MORAI stand-in. start() 후 (host, port) 로 접속."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        entities: Optional[Dict[str, Tuple[str, int]]] = None,   # entity_id -> VI (ip, port)
+        service_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        step_ms: int = 20,
+        seed: Optional[int] = None,
+        loss: float = 0.0,                  # FixedStep/SaveData request·ACK 무작위 유실 확률 (각각)
+    ):
+        self.entities: Dict[str, EntityState] = {eid: EntityState(eid) for eid in (entities or {})}
+        self.vi_targets: Dict[str, Tuple[str, int]] = dict(entities or {})
+        self.service_s  = service_ms / 1000.0
+        self.jitter_s   = jitter_ms / 1000.0
+        self.step_ms    = step_ms
+        self.rtf        = 1
+        self.step_index = 0
+        self.sim_ns     = 0
+        self.scenario_state = 3                 # 1=Play 2=Pause 3=Stop
+        self.suite_name     = "StubSuite"
+        self.scenarios      = ["Scenario_1", "Scenario_2"]
+        self.active_scenario = self.scenarios[0]
+
+        self.requests: Dict[int, int] = {}       # msg_type -> 수신 개수
+        self.loss       = loss
+        self.dropped: Dict[str, int] = {"request": 0, "response": 0}
+        self._drop_req: Dict[int, int] = {}       # msg_type -> 남은 유실 횟수
+        self._drop_resp: Dict[int, int] = {}
+        self._stall: Dict[int, float] = {}        # msg_type -> 다음 1회 처리 전 멈춤 (초)
+        self._rng       = random.Random(seed)
+        self._lock      = threading.Lock()
+        self._next_obj  = 1
+        self._running   = False
+        self._listener  = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((host, port))
+        self._udp       = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._clients: List[socket.socket] = []
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._listener.getsockname()
+
+    # ── lifecycle ─────────────────────────────────────────────
+
+    def start(self) -> "SimStub":
+        self._listener.listen(4)
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        for sock in [self._listener, *self._clients]:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._udp.close()
+
+    def __enter__(self) -> "SimStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._clients.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        reader = tcp.StreamReader(conn)
+        try:
+            while self._running:
+                msg_class, msg_type, _, request_id, _, payload = reader.read_packet()
+                if msg_class != proto.MSG_CLASS_REQ:
+                    continue
+                body = self.handle(msg_type, bytes(payload))
+                if body is not None:
+                    conn.sendall(tcp.build_header(proto.MSG_CLASS_RESP, msg_type, len(body), request_id) + body)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    # ── request handling ──────────────────────────────────────
+
+    def _service_delay(self) -> None:
+        if self.service_s <= 0.0 and self.jitter_s <= 0.0:
+            return
+        delay = self.service_s + self._rng.uniform(-self.jitter_s, self.jitter_s)
+        if delay > 0.0:
+            time.sleep(delay)
+
+    def drop_request(self, msg_type: int, count: int = 1) -> None:
+        """다음 count 개의 msg_type request 를 처리하지 않고 버림 (응답 없음)."""
+        with self._lock:
+            self._drop_req[msg_type] = self._drop_req.get(msg_type, 0) + count
+
+    def drop_response(self, msg_type: int, count: int = 1) -> None:
+        """다음 count 개의 msg_type request 는 처리하되 응답을 버림."""
+        with self._lock:
+            self._drop_resp[msg_type] = self._drop_resp.get(msg_type, 0) + count
+
+    def stall_request(self, msg_type: int, seconds: float) -> None:
+        """다음 msg_type request 를 처리하기 전에 seconds 동안 멈춤 (같은 연결의 뒤 request 도 대기)."""
+        with self._lock:
+            self._stall[msg_type] = seconds
+
+    def _take_drop(self, table: Dict[int, int], msg_type: int) -> bool:
+        n = table.get(msg_type, 0)
+        if n > 0:
+            table[msg_type] = n - 1
+            return True
+        return (self.loss > 0.0 and msg_type in (proto.MSG_TYPE_FIXED_STEP, proto.MSG_TYPE_SAVE_DATA)
+                and self._rng.random() < self.loss)
+
+    def handle(self, msg_type: int, payload: bytes) -> Optional[bytes]:
+        """request payload → response payload (None 이면 응답 없음)."""
+        with self._lock:
+            if self._take_drop(self._drop_req, msg_type):
+                self.dropped["request"] += 1
+                return None
+            self.requests[msg_type] = self.requests.get(msg_type, 0) + 1
+            stall = self._stall.pop(msg_type, 0.0)
+            if stall > 0.0:
+                time.sleep(stall)
+            body = self._handle(msg_type, payload)
+            if body is not None and self._take_drop(self._drop_resp, msg_type):
+                self.dropped["response"] += 1
+                return None
+            return body
+
+    def _handle(self, msg_type: int, payload: bytes) -> Optional[bytes]:
+        # self._lock 보유 상태에서 호출
+        if msg_type == proto.MSG_TYPE_FIXED_STEP:
+            values, _, _ = _REQ_FIXED.unpack(payload)
+            self._service_delay()
+            self._advance(max(1, values["step_count"]))
+            return _RESULT_OK
+        if msg_type == proto.MSG_TYPE_SAVE_DATA:
+            self._service_delay()
+            return _RESULT_OK
+        if msg_type == proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND:
+            values, _, _ = _REQ_MANUAL.unpack(payload)
+            ent = self._entity(values["entity_id"])
+            ent.throttle, ent.brake, ent.steer = values["throttle"], values["brake"], values["steer_angle"]
+            return _RESULT_OK
+        if msg_type == proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND:
+            values, _, _ = _REQ_TRANSFORM.unpack(payload)
+            self._entity(values["entity_id"]).set_transform(
+                values["pos_x"], values["pos_y"], values["pos_z"],
+                values["rot_z"], values["speed"], values["steer_angle"],
+            )
+            return _RESULT_OK
+        if msg_type == proto.MSG_TYPE_CREATE_OBJECT:
+            values, _, _ = _REQ_CREATE.unpack(payload)
+            object_id = f"Object_{self._next_obj}"
+            self._next_obj += 1
+            self.entities[object_id] = EntityState(
+                object_id, values["pos_x"], values["pos_y"], values["pos_z"], values["rot_z"],
+            )
+            return get_codec(msg_type, "response").pack(
+                {"result_code": 0, "detail_code": 0, "object_id": object_id})
+        if msg_type == proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS:
+            return get_codec(msg_type, "response").pack({
+                "result_code": 0, "detail_code": 0, "mode": proto.TIME_MODE_FIXED,
+                "simulation_delta_time": self.step_ms, "physics_delta_time": min(10, self.step_ms),
+                "rtf": self.rtf, "user_control": 1, "step_index": self.step_index,
+                "seconds": self.sim_ns // 1_000_000_000, "nanos": self.sim_ns % 1_000_000_000,
+            })
+        if msg_type == proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND:
+            values, _, _ = _REQ_TIME_MODE.unpack(payload)
+            if values["mode"] == proto.TIME_MODE_FIXED:
+                self.step_ms = values["simulation_delta_time"] or self.step_ms
+                self.rtf     = values["rtf"]
+            return get_codec(msg_type, "response").pack({
+                "result_code": 0, "detail_code": 0, "mode": values["mode"],
+                "fixed_delta": self.step_ms / 1000.0, "simulation_speed": 1.0,
+            })
+        if msg_type == proto.MSG_TYPE_ACTIVE_SUITE_STATUS:
+            return get_codec(msg_type, "response").pack(
+                {"result_code": 0, "detail_code": 0,
+                 "active_suite_name": self.suite_name,
+                 "active_scenario_name": self.active_scenario,
+                 "scenario_list_size": len(self.scenarios)},
+                [{"scenario_list[].name": name} for name in self.scenarios],
+            )
+        if msg_type == proto.MSG_TYPE_SCENARIO_STATUS:
+            return get_codec(msg_type, "response").pack(
+                {"result_code": 0, "detail_code": 0, "state": self.scenario_state})
+        if msg_type == proto.MSG_TYPE_SCENARIO_CONTROL:
+            values, _, _ = _REQ_SCENARIO.unpack(payload)
+            if values["command"] in (1, 2, 3):
+                self.scenario_state = values["command"]
+            if values.get("scenario_name"):
+                self.active_scenario = values["scenario_name"]
+            return _RESULT_OK
+        if msg_type == proto.MSG_TYPE_LOAD_SUITE:
+            values, _, _ = _REQ_LOAD.unpack(payload)
+            self.suite_name = Path(values["suite_path"].replace("\\", "/")).stem or self.suite_name
+            return _RESULT_OK
+        return _RESULT_OK
+
+    def _entity(self, entity_id: str) -> EntityState:
+        ent = self.entities.get(entity_id)
+        if ent is None:
+            ent = self.entities[entity_id] = EntityState(entity_id)
+        return ent
+
+    def _advance(self, step_count: int) -> None:
+        dt = self.step_ms / 1000.0
+        for _ in range(step_count):
+            for ent in self.entities.values():
+                ent.step(dt)
+        self.step_index += step_count
+        self.sim_ns     += step_count * self.step_ms * 1_000_000
+        seconds, nanos = divmod(self.sim_ns, 1_000_000_000)
+        for entity_id, addr in self.vi_targets.items():
+            try:
+                self._udp.sendto(self.entities[entity_id].pack_vehicle_info(seconds, nanos), addr)
+            except OSError:
+                pass
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _parse_entity(text: str) -> Tuple[str, Tuple[str, int]]:
+    """'Car_1:9097' 또는 'Car_1:192.168.0.10:9097'."""
+    parts = text.split(":")
+    if len(parts) == 2:
+        return parts[0], ("127.0.0.1", int(parts[1]))
+    if len(parts) == 3:
+        return parts[0], (parts[1], int(parts[2]))
+    raise argparse.ArgumentTypeError(f"invalid entity spec: {text!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline MORAI TCP/UDP stand-in for client load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=proto.TCP_SERVER_PORT)
+    parser.add_argument("--entity", action="append", type=_parse_entity, default=[],
+                        help="entity_id:vi_port or entity_id:vi_ip:vi_port (repeatable)")
+    parser.add_argument("--service-ms", type=float, default=0.0, help="FixedStep/SaveData service time")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter on service time")
+    parser.add_argument("--step-ms", type=int, default=20, help="simulation delta time per step")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--loss", type=float, default=0.0,
+                        help="FixedStep/SaveData request and ACK drop probability (each)")
+    args = parser.parse_args()
+
+    stub = SimStub(
+        host=args.host, port=args.port, entities=dict(args.entity),
+        service_ms=args.service_ms, jitter_ms=args.jitter_ms, step_ms=args.step_ms, seed=args.seed,
+        loss=args.loss,
+    ).start()
+    host, port = stub.address
+    print(f"[STUB] listening {host}:{port} entities={list(stub.vi_targets)} "
+          f"service={args.service_ms}ms jitter={args.jitter_ms}ms step={args.step_ms}ms")
+    try:
+        last_steps, last_t = 0, time.monotonic()
+        while True:
+            time.sleep(5.0)
+            now = time.monotonic()
+            steps = stub.step_index
+            sim_s = (steps - last_steps) * stub.step_ms / 1000.0
+            dropped = f" dropped={stub.dropped}" if args.loss > 0.0 else ""
+            print(f"[STUB] step={steps} rtf={sim_s / (now - last_t):.2f} requests={stub.requests}{dropped}")
+            last_steps, last_t = steps, now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
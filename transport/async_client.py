@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+# transport/async_client.py
+#
+# asyncio 기반 MORAI TCP 클라이언트.
+#   - 연결당 reader task 1개가 응답을 읽고 (request_id, msg_type) 로 Future 를 완료
+#   - 요청별 timeout, 하나의 연결에서 여러 요청 동시 in-flight
+#   - 응답은 tcp_transport 의 parse_* 결과를 그대로 반환
+#
+# 사용:
+#   async with await AsyncMoraiClient.connect("127.0.0.1", 20000) as client:
+#       status = await client.get_status()
+#       results = await asyncio.gather(*(client.fixed_step(1) for _ in range(4)))
+
+import asyncio
+import itertools
+import socket
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+import utils.event_log as elog
+
+_HEADER      = struct.Struct(proto.HEADER_FMT)
+_HEADER_SIZE = _HEADER.size
+_MAGIC_BYTE  = bytes([proto.MAGIC])
+
+
+class AsyncMoraiClient:
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        default_timeout: float = proto.AUTO_TIMEOUT_SEC,
+        request_id_start: int = 1,
+        on_unmatched: Optional[Callable[[int, int, int, bytes], None]] = None,
+    ):
+        self._reader          = reader
+        self._writer          = writer
+        self._default_timeout = default_timeout
+        self._rid_iter        = itertools.count(request_id_start)
+        self._pending: Dict[Tuple[int, int], asyncio.Future] = {}
+        self._on_unmatched    = on_unmatched   # fn(msg_class, msg_type, request_id, payload)
+        self._closed_exc: Optional[BaseException] = None
+
+        self.orphan_responses = 0   # 대기 중인 요청이 없는 응답 (timeout 이후 도착 등)
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str = proto.TCP_SERVER_IP, port: int = proto.TCP_SERVER_PORT,
+                      **kwargs: Any) -> "AsyncMoraiClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+        return cls(reader, writer, **kwargs)
+
+    async def __aenter__(self) -> "AsyncMoraiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._fail_pending(ConnectionError("client closed"))
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+
+    # ── 수신 ──────────────────────────────────────────────────
+
+    async def _read_header(self) -> Tuple[int, int, int, int, int]:
+        while True:
+            await self._reader.readuntil(_MAGIC_BYTE)
+            rest = await self._reader.readexactly(_HEADER_SIZE - 1)
+            _, msg_class, msg_type, payload_size, request_id, flag = _HEADER.unpack(_MAGIC_BYTE + rest)
+            if (msg_class in proto.VALID_MSG_CLASSES
+                    and msg_type in proto.VALID_MSG_TYPES
+                    and payload_size <= tcp.MAX_PAYLOAD_SIZE):
+                return msg_class, msg_type, payload_size, request_id, flag
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                msg_class, msg_type, payload_size, request_id, _ = await self._read_header()
+                payload = await self._reader.readexactly(payload_size) if payload_size else b""
+
+                fut = None
+                if msg_class == proto.MSG_CLASS_RESP:
+                    fut = self._pending.pop((request_id, msg_type), None)
+                if fut is not None:
+                    if not fut.done():
+                        fut.set_result(payload)
+                    continue
+
+                self.orphan_responses += 1
+                if self._on_unmatched:
+                    try:
+                        self._on_unmatched(msg_class, msg_type, request_id, payload)
+                    except Exception as e:   # callback 오류로 reader task 가 죽지 않도록
+                        elog.log(elog.WARN, "tcp.async", "[AsyncMoraiClient] on_unmatched 예외: %r", e)
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            self._fail_pending(ConnectionError(f"connection lost: {e}"))
+        except Exception as e:
+            # LimitOverrunError (MAGIC 없는 64 KiB 초과 쓰레기) 등 — reader 가 끝나면 대기 중 요청이
+            # timeout 까지 매달리므로 즉시 실패시킨다
+            exc = ConnectionError(f"reader failed: {e!r}")
+            exc.__cause__ = e
+            self._fail_pending(exc)
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        self._closed_exc = exc
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    # ── 요청 ──────────────────────────────────────────────────
+
+    def _send(self, msg_type: int, payload: bytes) -> int:
+        if self._closed_exc is not None:
+            raise self._closed_exc
+        rid = next(self._rid_iter)
+        self._writer.write(tcp.build_request_packet(rid, msg_type, payload))
+        return rid
+
+    async def request(
+        self,
+        msg_type: int,
+        payload: bytes = b"",
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """요청 전송 후 매칭되는 응답 payload 를 반환. timeout 시 asyncio.TimeoutError."""
+        if self._closed_exc is not None:
+            raise self._closed_exc
+        rid = next(self._rid_iter)
+        key = (rid, msg_type)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[key] = fut
+        try:
+            self._writer.write(tcp.build_request_packet(rid, msg_type, payload))
+            await self._writer.drain()
+            return await asyncio.wait_for(fut, self._default_timeout if timeout is None else timeout)
+        finally:
+            self._pending.pop(key, None)
+
+    async def send_nowait(self, msg_type: int, payload: bytes = b"") -> int:
+        """응답을 기다리지 않는 전송 (ManualControlById 등). request_id 반환."""
+        rid = self._send(msg_type, payload)
+        await self._writer.drain()
+        return rid
+
+    async def _result(self, msg_type: int, payload: bytes, timeout: Optional[float]) -> Optional[Tuple[int, int]]:
+        return tcp.parse_result_code(await self.request(msg_type, payload, timeout))
+
+    # ── Simulation Time ───────────────────────────────────────
+
+    async def get_status(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        payload = await self.request(proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS, b"", timeout)
+        return tcp.parse_get_status_payload(payload)
+
+    async def set_simulation_time_mode(self, mode: int, timeout: Optional[float] = None,
+                                       **kwargs: Any) -> Optional[Dict[str, Any]]:
+        payload = await self.request(
+            proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND,
+            tcp.build_simulation_time_mode_payload(mode, **kwargs),
+            timeout,
+        )
+        return tcp.parse_set_simulation_time_mode_payload(payload)
+
+    # ── Fixed Step ────────────────────────────────────────────
+
+    async def fixed_step(self, step_count: int = 1,
+                         timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        return await self._result(proto.MSG_TYPE_FIXED_STEP,
+                                  tcp.build_fixed_step_payload(step_count), timeout)
+
+    async def save_data(self, timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        return await self._result(proto.MSG_TYPE_SAVE_DATA, b"", timeout)
+
+    # ── Object Control ────────────────────────────────────────
+
+    async def create_object(self, timeout: Optional[float] = None,
+                            **kwargs: Any) -> Optional[Dict[str, Any]]:
+        payload = await self.request(proto.MSG_TYPE_CREATE_OBJECT,
+                                     tcp.build_create_object_payload(**kwargs), timeout)
+        return tcp.parse_create_object_payload(payload)
+
+    async def manual_control_by_id(self, entity_id: str, throttle: float, brake: float,
+                                   steer_angle: float, wait: bool = False,
+                                   timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """wait=False 이면 fire-and-forget (기존 runner 동작과 동일)."""
+        payload = tcp.build_manual_control_by_id_payload(entity_id, throttle, brake, steer_angle)
+        if not wait:
+            await self.send_nowait(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, payload)
+            return None
+        return await self._result(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND, payload, timeout)
+
+    async def transform_control_by_id(self, entity_id: str,
+                                      pos_x: float, pos_y: float, pos_z: float,
+                                      rot_x: float, rot_y: float, rot_z: float,
+                                      steer_angle: float, speed: float,
+                                      wait: bool = False,
+                                      timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        payload = tcp.build_transform_control_by_id_payload(
+            entity_id, pos_x, pos_y, pos_z, rot_x, rot_y, rot_z, steer_angle, speed,
+        )
+        if not wait:
+            await self.send_nowait(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND, payload)
+            return None
+        return await self._result(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND, payload, timeout)
+
+    async def set_trajectory(self, entity_id: str, follow_mode: int, trajectory_name: str,
+                             points: List[Tuple[float, float, float, float]],
+                             timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        payload = tcp.build_set_trajectory_payload(entity_id, follow_mode, trajectory_name, points)
+        return await self._result(proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, payload, timeout)
+
+    # ── Suite / Scenario ──────────────────────────────────────
+
+    async def active_suite_status(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        payload = await self.request(proto.MSG_TYPE_ACTIVE_SUITE_STATUS, b"", timeout)
+        return tcp.parse_active_suite_status_payload(payload)
+
+    async def load_suite(self, suite_path: str,
+                         timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        return await self._result(proto.MSG_TYPE_LOAD_SUITE,
+                                  tcp.build_load_suite_payload(suite_path), timeout)
+
+    async def scenario_status(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        payload = await self.request(proto.MSG_TYPE_SCENARIO_STATUS, b"", timeout)
+        return tcp.parse_scenario_status_payload(payload)
+
+    async def scenario_control(self, command: int, scenario_name: str = "",
+                               timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        return await self._result(proto.MSG_TYPE_SCENARIO_CONTROL,
+                                  tcp.build_scenario_control_payload(command, scenario_name), timeout)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+# transport/capture.py
+#
+# TCP wire capture — tcp_transport tap 이 송수신 frame 을 그대로 기록하고,
+# 재생 도구(tools/replay_capture.py)가 mmap 으로 다시 읽는다.
+#
+# capture 파일 (<path>)
+#   file header : b"MTCAP\x00\x01\x00"                     8 bytes
+#   record      : <dBI  t_mono(float64) dir(uint8) len(uint32)  13 bytes
+#                 + frame (MORAI header 16B + payload)
+#
+# index 파일 (<path>.idx) — record 당 고정 크기, msg_type / request_id 로 빠른 선택용
+#   entry       : <QBBII offset(uint64) dir(uint8) msg_class(uint8) msg_type(uint32) request_id(uint32)
+
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterator, List, NamedTuple, Optional
+
+import transport.protocol_defs as proto
+
+CAPTURE_MAGIC = b"MTCAP\x00\x01\x00"
+DIR_TX = 0   # client → server
+DIR_RX = 1   # server → client
+
+_RECORD = struct.Struct("<dBI")
+_INDEX  = struct.Struct("<QBBII")
+_HEADER = struct.Struct(proto.HEADER_FMT)
+
+
+class IndexEntry(NamedTuple):
+    offset:     int
+    direction:  int
+    msg_class:  int
+    msg_type:   int
+    request_id: int
+
+
+class CaptureRecord(NamedTuple):
+    t:         float
+    direction: int
+    frame:     memoryview     # header + payload (CaptureReader 가 열려 있는 동안만 유효)
+
+    @property
+    def header(self):
+        """(magic, msg_class, msg_type, payload_size, request_id, flag)"""
+        return _HEADER.unpack_from(self.frame)
+
+    @property
+    def payload(self) -> memoryview:
+        return self.frame[_HEADER.size:]
+
+
+# ============================================================
+# Writer
+# ============================================================
+
+class WireCapture:
+    """스레드 안전 append-only writer. tcp_transport.enable_capture() 로 설치."""
+
+    def __init__(self, path: str, clock=None):
+        self.path    = path
+        self._clock  = clock or time.monotonic
+        self._lock   = threading.Lock()
+        self._data   = open(path, "wb")
+        self._index  = open(path + ".idx", "wb")
+        self._data.write(CAPTURE_MAGIC)
+        self._offset = len(CAPTURE_MAGIC)
+        self.frames  = 0
+
+    def write(self, direction: int, frame) -> None:
+        """frame: header + payload (bytes / memoryview). header 가 깨진 frame 은 무시."""
+        if len(frame) < _HEADER.size:
+            return
+        _, msg_class, msg_type, _, request_id, _ = _HEADER.unpack_from(frame)
+        t = self._clock()
+        with self._lock:
+            if self._data.closed:
+                return
+            self._index.write(_INDEX.pack(self._offset, direction, msg_class, msg_type, request_id))
+            self._data.write(_RECORD.pack(t, direction, len(frame)))
+            self._data.write(frame)
+            self._offset += _RECORD.size + len(frame)
+            self.frames  += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._data.closed:
+                self._data.flush()
+                self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._data, self._index):
+                if not f.closed:
+                    f.close()
+
+    def __enter__(self) -> "WireCapture":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ============================================================
+# Reader
+# ============================================================
+
+class CaptureReader:
+    """capture 파일을 mmap 으로 읽는다. record.frame 은 close() 전까지만 유효."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(CAPTURE_MAGIC):
+            self._file.close()
+            raise ValueError(f"not a capture file: {path}")
+        self._mm   = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        if bytes(self._view[:len(CAPTURE_MAGIC)]) != CAPTURE_MAGIC:
+            self.close()
+            raise ValueError(f"not a capture file: {path}")
+        self.index = self._load_index(path + ".idx")
+
+    def _load_index(self, idx_path: str) -> List[IndexEntry]:
+        if not os.path.exists(idx_path):
+            # index 가 없으면 본문을 한 번 훑어서 재구성
+            entries = []
+            for offset, rec in self._scan():
+                _, msg_class, msg_type, _, request_id, _ = rec.header
+                entries.append(IndexEntry(offset, rec.direction, msg_class, msg_type, request_id))
+            return entries
+        with open(idx_path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % _INDEX.size     # 기록 중단된 마지막 entry 는 버림
+        return [IndexEntry(*e) for e in _INDEX.iter_unpack(data[:usable])]
+
+    def _scan(self) -> Iterator:
+        view, offset, end = self._view, len(CAPTURE_MAGIC), len(self._view)
+        while offset + _RECORD.size <= end:
+            t, direction, length = _RECORD.unpack_from(view, offset)
+            start = offset + _RECORD.size
+            if start + length > end:
+                break
+            yield offset, CaptureRecord(t, direction, view[start:start + length])
+            offset = start + length
+
+    def record_at(self, offset: int) -> CaptureRecord:
+        t, direction, length = _RECORD.unpack_from(self._view, offset)
+        start = offset + _RECORD.size
+        return CaptureRecord(t, direction, self._view[start:start + length])
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        for _, rec in self._scan():
+            yield rec
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def select(
+        self,
+        direction: Optional[int] = None,
+        msg_type: Optional[int] = None,
+        request_id: Optional[int] = None,
+    ) -> Iterator[CaptureRecord]:
+        """index 로 조건에 맞는 record 만 읽는다 (본문 전체 scan 없음)."""
+        for e in self.index:
+            if direction is not None and e.direction != direction:
+                continue
+            if msg_type is not None and e.msg_type != msg_type:
+                continue
+            if request_id is not None and e.request_id != request_id:
+                continue
+            yield self.record_at(e.offset)
+
+    def close(self) -> None:
+        self.index = []
+        try:
+            self._view.release()
+        except (AttributeError, BufferError):
+            pass
+        if not self._mm.closed:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass   # record.frame 이 아직 참조 중 — GC 시 해제
+        self._file.close()
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
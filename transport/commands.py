@@ -3,6 +3,7 @@ import socket
 import struct
 
 import transport.protocol_defs as proto
+import utils.event_log as elog
 
 def send_manual_udp(
     udp_sock: socket.socket,
@@ -21,9 +22,10 @@ def send_manual_udp(
         )
 
     udp_sock.sendto(payload, (proto.UDP_IP, proto.UDP_PORT))
-    print(
-        f"[SEND][UDP] ManualCommand -> {proto.UDP_IP}:{proto.UDP_PORT} "
-        f"(thr={throttle:.3f}, brk={brake:.3f}, steer={steer:.3f}) size={len(payload)}B"
+    elog.log(
+        elog.INFO, "udp.send",
+        "[SEND][UDP] ManualCommand -> %s:%d (thr=%.3f, brk=%.3f, steer=%.3f) size=%dB",
+        proto.UDP_IP, proto.UDP_PORT, throttle, brake, steer, len(payload),
     )
 
 
@@ -66,9 +68,10 @@ def send_transform_control_udp(
 
     udp_sock.sendto(payload, (proto.UDP_IP_TR, proto.UDP_PORT_TR))
 
-    print(
-        f"[SEND][UDP] TransformControl -> {proto.UDP_IP_TR}:{proto.UDP_PORT_TR} "
-        f"pos=({pos_x:.3f},{pos_y:.3f},{pos_z:.3f}) "
-        f"rot=({rot_x:.3f},{rot_y:.3f},{rot_z:.3f}) "
-        f"steer={steer_angle:.3f} size={len(payload)}B"
+    elog.log(
+        elog.INFO, "udp.send",
+        "[SEND][UDP] TransformControl -> %s:%d pos=(%.3f,%.3f,%.3f) rot=(%.3f,%.3f,%.3f) "
+        "steer=%.3f size=%dB",
+        proto.UDP_IP_TR, proto.UDP_PORT_TR, pos_x, pos_y, pos_z, rot_x, rot_y, rot_z,
+        steer_angle, len(payload),
     )
\ No newline at end of file
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+# transport/control_bus.py
+#
+# ManualControlById(0x1302) latest-wins coalescer.
+#
+# AdRunner / LaneController / file playback 가 각자 루프에서 submit() 하면
+# entity_id 별 최신 (throttle, brake, steer) 한 건만 남기고, 단일 sender 가
+#   - rate_hz 주기로 (rate_hz=0 이면 주기 flush 없음)
+#   - 또는 flush() 호출 시 (예: FixedStep 직전)
+# 전송한다. 직전에 보낸 값과 epsilon 이내로 같으면 전송을 생략한다.
+#
+# 통계
+#   submitted    : submit() 호출 수
+#   sent         : 실제 전송한 명령 수
+#   superseded   : flush 전에 더 새로운 값으로 덮여 버려진 명령 수
+#   deduplicated : 직전 전송값과 같아서 생략한 명령 수
+
+import itertools
+import threading
+from typing import Dict, Optional, Tuple
+
+import transport.tcp_transport as tcp
+
+Command = Tuple[float, float, float]   # (throttle, brake, steer_angle)
+
+
+class ControlBus(threading.Thread):
+    def __init__(
+        self,
+        tcp_sock,
+        rate_hz: float = 50.0,
+        epsilon: float = 1e-3,
+        request_id_ref=None,    # RequestIdCounter — 없으면 자체 counter
+        on_error=None,
+    ):
+        super().__init__(daemon=True, name="ControlBus")
+        self.tcp_sock  = tcp_sock
+        self.rate_hz   = float(rate_hz)
+        self.epsilon   = float(epsilon)
+        self._rid      = request_id_ref
+        self._rid_iter = itertools.count(900_000)
+        self._on_error = on_error
+
+        self._lock       = threading.Lock()       # _latest / _forced / 통계
+        self._send_lock  = threading.Lock()       # flush 직렬화 (sender 스레드 vs flush() 호출자)
+        self._latest:    Dict[str, Command] = {}
+        self._forced:    set = set()
+        self._last_sent: Dict[str, Command] = {}
+        self._wake       = threading.Event()
+        self._stop_event = threading.Event()
+
+        self.submitted    = 0
+        self.sent         = 0
+        self.superseded   = 0
+        self.deduplicated = 0
+        self.flushes      = 0
+
+    # ── 생산자 ───────────────────────────────────────────────
+
+    def submit(
+        self,
+        entity_id: str,
+        throttle: float,
+        brake: float,
+        steer_angle: float,
+        force: bool = False,
+    ) -> None:
+        """최신 명령으로 교체. force=True 이면 직전 전송값과 같아도 보낸다 (정지 명령 등)."""
+        cmd = (float(throttle), float(brake), float(steer_angle))
+        with self._lock:
+            self.submitted += 1
+            if entity_id in self._latest:
+                self.superseded += 1
+            self._latest[entity_id] = cmd
+            if force:
+                self._forced.add(entity_id)
+
+    def request_flush(self) -> None:
+        """sender 스레드를 즉시 깨운다 (호출자는 블로킹하지 않음)."""
+        self._wake.set()
+
+    # ── sender ───────────────────────────────────────────────
+
+    def flush(self) -> int:
+        """대기 중인 명령을 호출자 스레드에서 바로 전송하고 전송 건수를 반환."""
+        with self._send_lock:
+            with self._lock:
+                batch, self._latest = self._latest, {}
+                forced, self._forced = self._forced, set()
+                self.flushes += 1
+
+            sent = 0
+            for entity_id, cmd in batch.items():
+                last = self._last_sent.get(entity_id)
+                if last is not None and entity_id not in forced and self._same(last, cmd):
+                    with self._lock:
+                        self.deduplicated += 1
+                    continue
+                try:
+                    tcp.send_manual_control_by_id(
+                        self.tcp_sock, self._next_rid(),
+                        entity_id=entity_id,
+                        throttle=cmd[0], brake=cmd[1], steer_angle=cmd[2],
+                    )
+                except OSError as e:
+                    if self._on_error:
+                        self._on_error(e)
+                    continue
+                self._last_sent[entity_id] = cmd
+                sent += 1
+
+            with self._lock:
+                self.sent += sent
+            return sent
+
+    def run(self) -> None:
+        period = 1.0 / self.rate_hz if self.rate_hz > 0 else None
+        while not self._stop_event.is_set():
+            self._wake.wait(timeout=period)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                break
+            self.flush()
+        self.flush()   # 마지막 정지 명령 등 남은 것 전송
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop_event.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+
+    def forget(self, entity_id: Optional[str] = None) -> None:
+        """직전 전송값 기억 삭제 → 다음 명령은 dedup 없이 전송 (재연결·runner 재시작 시)."""
+        with self._send_lock:
+            if entity_id is None:
+                self._last_sent.clear()
+            else:
+                self._last_sent.pop(entity_id, None)
+
+    # ── 내부 ─────────────────────────────────────────────────
+
+    def _same(self, a: Command, b: Command) -> bool:
+        eps = self.epsilon
+        return abs(a[0] - b[0]) <= eps and abs(a[1] - b[1]) <= eps and abs(a[2] - b[2]) <= eps
+
+    def _next_rid(self) -> int:
+        return self._rid.next() if self._rid is not None else next(self._rid_iter)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending":      len(self._latest),
+                "submitted":    self.submitted,
+                "sent":         self.sent,
+                "superseded":   self.superseded,
+                "deduplicated": self.deduplicated,
+                "flushes":      self.flushes,
+            }
+
+    def report_lines(self):
+        s = self.stats()
+        return [
+            f"ManualControl bus: submitted={s['submitted']} sent={s['sent']} "
+            f"superseded={s['superseded']} deduplicated={s['deduplicated']} "
+            f"flushes={s['flushes']} pending={s['pending']}",
+        ]
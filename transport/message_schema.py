@@ -574,19 +574,18 @@ def pack_message_payload(
     values: Mapping[str, Any],
     repeated_items: Optional[Sequence[Mapping[str, Any]]] = None,
 ) -> bytes:
-    message = get_message(msg_type)
-    if message.variants:
-        variant = get_variant_for_values(message, values)
-        payload = pack_fields(variant.fields, values)
-    else:
-        payload = pack_fields(message.fields, values)
-    if message.repeat_fields:
-        if repeated_items is None:
-            raise ValueError(f"message 0x{msg_type:04X} requires repeated_items")
-        payload += pack_repeated_fields(message.repeat_fields, repeated_items)
-    elif repeated_items:
-        raise ValueError(f"message 0x{msg_type:04X} does not support repeated_items")
-    return payload
+    return get_codec(msg_type).pack(values, repeated_items)
+
+
+def pack_message_payload_into(
+    msg_type: int,
+    buffer: Any,
+    offset: int,
+    values: Mapping[str, Any],
+    repeated_items: Optional[Sequence[Mapping[str, Any]]] = None,
+) -> int:
+    """Pack a request payload into a caller-owned writable buffer and return the end offset."""
+    return get_codec(msg_type).pack_into(buffer, offset, values, repeated_items)
 
 
 def unpack_value(field_type: str, payload: bytes, offset: int = 0) -> Tuple[Any, int]:
@@ -638,44 +637,269 @@ def unpack_message_payload(
     direction: str = "request",
     repeated_count_field: Optional[str] = None,
 ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
-    message = get_message(msg_type) if direction == "request" else get_response_message(msg_type)
-    if message.variants:
-        selector_field = message.variants[0].selector_field
-        selector_fields = message.variants[0].fields
-        selector_offset = 0
-        selector_type = None
-        for field in selector_fields:
-            if field.name == selector_field:
-                selector_type = field.field_type
-                break
-            field_size = TYPE_SIZES[field.field_type]
-            if field_size is None:
-                raise ValueError(
-                    f"message 0x{msg_type:04X} selector_field {selector_field} "
-                    f"cannot follow variable-length field {field.name}"
-                )
-            selector_offset += field_size
-        if selector_type is None:
-            raise ValueError(f"message 0x{msg_type:04X} is missing selector_field {selector_field}")
-
-        selector_value, _ = unpack_value(selector_type, payload, selector_offset)
-        variant = next((v for v in message.variants if v.selector_value == selector_value), None)
-        if variant is None:
+    return get_codec(msg_type, direction).unpack(payload, repeated_count_field)
+
+
+# ============================================================
+# Compiled codecs
+# ============================================================
+#
+# 각 FieldSpec 시퀀스를 import 시점에 한 번만 컴파일한다.
+#   - 연속된 고정 길이 필드  → struct.Struct 하나 (run)
+#   - string_u32 필드        → uint32 length + utf-8 bytes 로 별도 처리
+# 고정 길이 필드만 있는 레이아웃은 Struct.pack / unpack_from 한 번으로 끝난다.
+
+_U32 = struct.Struct("<I")
+
+
+class FieldsCodec:
+    """Precompiled pack/unpack plan for one FieldSpec sequence."""
+
+    __slots__ = ("fields", "names", "fixed_size", "is_fixed", "_runs", "_struct")
+
+    def __init__(self, fields: Sequence[FieldSpec], endian: str = "<"):
+        self.fields = tuple(fields)
+        self.names = tuple(field.name for field in self.fields)
+
+        # run: (Struct | None, names, start, stop) — Struct 가 None 이면 string_u32 1개
+        runs: List[Tuple[Optional[struct.Struct], Tuple[str, ...], int, int]] = []
+        start = 0
+        for index, field in enumerate(self.fields):
+            if field.field_type != "string_u32":
+                continue
+            if start < index:
+                chunk = self.fields[start:index]
+                runs.append((struct.Struct(build_struct_format(chunk, endian)),
+                             tuple(f.name for f in chunk), start, index))
+            runs.append((None, (field.name,), index, index + 1))
+            start = index + 1
+        if start < len(self.fields):
+            chunk = self.fields[start:]
+            runs.append((struct.Struct(build_struct_format(chunk, endian)),
+                         tuple(f.name for f in chunk), start, len(self.fields)))
+
+        self._runs = tuple(runs)
+        self.fixed_size = sum(run.size for run, _, _, _ in runs if run is not None)
+        self.is_fixed = all(run is not None for run, _, _, _ in runs)
+        self._struct = runs[0][0] if self.is_fixed and len(runs) == 1 else None
+
+    # ── pack ───────────────────────────────────────────────────
+
+    def pack(self, values: Mapping[str, Any]) -> bytes:
+        """Pack a name → value mapping. Missing names raise ``KeyError``."""
+        if self._struct is not None:
+            return self._struct.pack(*[values[name] for name in self.names])
+        return self.pack_values([values[name] for name in self.names])
+
+    def pack_values(self, values: Sequence[Any]) -> bytes:
+        """Pack values given positionally in field order (no dict required)."""
+        if self._struct is not None:
+            return self._struct.pack(*values)
+        parts: List[bytes] = []
+        for run, _, start, stop in self._runs:
+            if run is None:
+                encoded = str(values[start]).encode("utf-8")
+                parts.append(_U32.pack(len(encoded)))
+                parts.append(encoded)
+            else:
+                parts.append(run.pack(*values[start:stop]))
+        return b"".join(parts)
+
+    def calcsize(self, values: Mapping[str, Any]) -> int:
+        size = self.fixed_size
+        for run, names, _, _ in self._runs:
+            if run is None:
+                size += 4 + len(str(values[names[0]]).encode("utf-8"))
+        return size
+
+    def pack_into(self, buffer: Any, offset: int, values: Mapping[str, Any]) -> int:
+        """Pack into a writable buffer at ``offset`` and return the end offset."""
+        if self._struct is not None:
+            end = offset + self._struct.size
+            if end > len(buffer):
+                raise ValueError(f"buffer too small: need {end} bytes, have {len(buffer)}")
+            self._struct.pack_into(buffer, offset, *[values[name] for name in self.names])
+            return end
+
+        encoded = {
+            names[0]: str(values[names[0]]).encode("utf-8")
+            for run, names, _, _ in self._runs if run is None
+        }
+        end = offset + self.fixed_size + sum(4 + len(raw) for raw in encoded.values())
+        if end > len(buffer):
+            raise ValueError(f"buffer too small: need {end} bytes, have {len(buffer)}")
+
+        view = memoryview(buffer)
+        for run, names, _, _ in self._runs:
+            if run is None:
+                raw = encoded[names[0]]
+                _U32.pack_into(buffer, offset, len(raw))
+                offset += 4
+                view[offset:offset + len(raw)] = raw
+                offset += len(raw)
+            else:
+                run.pack_into(buffer, offset, *[values[name] for name in names])
+                offset += run.size
+        return offset
+
+    # ── unpack ─────────────────────────────────────────────────
+
+    def unpack_from(self, payload: Any, offset: int = 0) -> Tuple[Dict[str, Any], int]:
+        total = len(payload)
+        if self._struct is not None:
+            if offset + self._struct.size > total:
+                raise ValueError(f"not enough bytes for {self.names[0]} at offset {offset}")
+            return dict(zip(self.names, self._struct.unpack_from(payload, offset))), offset + self._struct.size
+
+        values: Dict[str, Any] = {}
+        for run, names, _, _ in self._runs:
+            if run is None:
+                if offset + 4 > total:
+                    raise ValueError(f"not enough bytes for string length at offset {offset}")
+                (str_len,) = _U32.unpack_from(payload, offset)
+                offset += 4
+                end = offset + str_len
+                if end > total:
+                    raise ValueError(f"not enough bytes for string value at offset {offset}")
+                values[names[0]] = str(payload[offset:end], "utf-8", "replace")
+                offset = end
+            else:
+                if offset + run.size > total:
+                    raise ValueError(f"not enough bytes for {names[0]} at offset {offset}")
+                values.update(zip(names, run.unpack_from(payload, offset)))
+                offset += run.size
+        return values, offset
+
+
+class MessageCodec:
+    """Precompiled codec for a MessageSpec (fields or variants + optional repeat block)."""
+
+    __slots__ = ("message", "fields", "variants", "repeat",
+                 "selector_field", "_selector_struct", "_selector_offset")
+
+    def __init__(self, message: MessageSpec, endian: str = "<"):
+        self.message = message
+        self.fields: Optional[FieldsCodec] = None if message.variants else FieldsCodec(message.fields, endian)
+        self.variants: Dict[int, FieldsCodec] = {
+            variant.selector_value: FieldsCodec(variant.fields, endian)
+            for variant in message.variants
+        }
+        self.repeat: Optional[FieldsCodec] = (
+            FieldsCodec(message.repeat_fields, endian) if message.repeat_fields else None
+        )
+
+        self.selector_field = ""
+        self._selector_struct: Optional[struct.Struct] = None
+        self._selector_offset = 0
+        if message.variants:
+            self.selector_field = message.variants[0].selector_field
+            for field in message.variants[0].fields:
+                if field.name == self.selector_field:
+                    self._selector_struct = struct.Struct(endian + STRUCT_FORMAT_CHARS[field.field_type])
+                    break
+                field_size = TYPE_SIZES[field.field_type]
+                if field_size is None:
+                    raise ValueError(
+                        f"message 0x{message.msg_type:04X} selector_field {self.selector_field} "
+                        f"cannot follow variable-length field {field.name}"
+                    )
+                self._selector_offset += field_size
+
+    def _no_variant(self, selector_value: Any) -> ValueError:
+        return ValueError(
+            f"message 0x{self.message.msg_type:04X} does not define a variant for "
+            f"{self.selector_field or 'selector'}={selector_value}"
+        )
+
+    def fields_for_values(self, values: Mapping[str, Any]) -> FieldsCodec:
+        if self.fields is not None:
+            return self.fields
+        selector_value = values.get(self.selector_field)
+        codec = self.variants.get(selector_value)
+        if codec is None:
+            raise self._no_variant(selector_value)
+        return codec
+
+    def fields_for_payload(self, payload: Any) -> FieldsCodec:
+        if self.fields is not None:
+            return self.fields
+        if self._selector_struct is None:
             raise ValueError(
-                f"message 0x{msg_type:04X} does not define a variant for "
-                f"{selector_field}={selector_value}"
+                f"message 0x{self.message.msg_type:04X} is missing selector_field {self.selector_field}"
             )
-        values, offset = unpack_fields(variant.fields, payload, 0)
-    else:
-        values, offset = unpack_fields(message.fields, payload, 0)
+        if self._selector_offset + self._selector_struct.size > len(payload):
+            raise ValueError(f"not enough bytes for selector at offset {self._selector_offset}")
+        (selector_value,) = self._selector_struct.unpack_from(payload, self._selector_offset)
+        codec = self.variants.get(selector_value)
+        if codec is None:
+            raise self._no_variant(selector_value)
+        return codec
+
+    def _check_repeat(self, repeated_items: Optional[Sequence[Mapping[str, Any]]]) -> None:
+        if self.repeat is not None:
+            if repeated_items is None:
+                raise ValueError(f"message 0x{self.message.msg_type:04X} requires repeated_items")
+        elif repeated_items:
+            raise ValueError(f"message 0x{self.message.msg_type:04X} does not support repeated_items")
+
+    def pack(
+        self,
+        values: Mapping[str, Any],
+        repeated_items: Optional[Sequence[Mapping[str, Any]]] = None,
+    ) -> bytes:
+        self._check_repeat(repeated_items)
+        payload = self.fields_for_values(values).pack(values)
+        if self.repeat is not None:
+            pack_item = self.repeat.pack
+            payload += b"".join([pack_item(item) for item in repeated_items])
+        return payload
+
+    def pack_into(
+        self,
+        buffer: Any,
+        offset: int,
+        values: Mapping[str, Any],
+        repeated_items: Optional[Sequence[Mapping[str, Any]]] = None,
+    ) -> int:
+        self._check_repeat(repeated_items)
+        offset = self.fields_for_values(values).pack_into(buffer, offset, values)
+        if self.repeat is not None:
+            for item in repeated_items:
+                offset = self.repeat.pack_into(buffer, offset, item)
+        return offset
+
+    def unpack(
+        self,
+        payload: Any,
+        repeated_count_field: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
+        values, offset = self.fields_for_payload(payload).unpack_from(payload, 0)
+
+        repeated_items: List[Dict[str, Any]] = []
+        if self.repeat is not None:
+            msg_type = self.message.msg_type
+            if repeated_count_field is None:
+                raise ValueError(f"message 0x{msg_type:04X} requires repeated_count_field")
+            count = values.get(repeated_count_field)
+            if not isinstance(count, int):
+                raise ValueError(f"field {repeated_count_field} must be decoded before repeated fields")
+            unpack_item = self.repeat.unpack_from
+            for _ in range(count):
+                item, offset = unpack_item(payload, offset)
+                repeated_items.append(item)
+
+        return values, repeated_items, offset
+
+
+REQUEST_CODECS: Dict[int, MessageCodec] = {message.msg_type: MessageCodec(message) for message in MESSAGES}
+RESPONSE_CODECS: Dict[int, MessageCodec] = {
+    message.msg_type: MessageCodec(message) for message in RESPONSE_MESSAGES
+}
 
-    repeated_items: List[Dict[str, Any]] = []
-    if message.repeat_fields:
-        if repeated_count_field is None:
-            raise ValueError(f"message 0x{msg_type:04X} requires repeated_count_field")
-        count = values.get(repeated_count_field)
-        if not isinstance(count, int):
-            raise ValueError(f"field {repeated_count_field} must be decoded before repeated fields")
-        repeated_items, offset = unpack_repeated_fields(message.repeat_fields, payload, count, offset)
-
-    return values, repeated_items, offset
+
+def get_codec(msg_type: int, direction: str = "request") -> MessageCodec:
+    codecs = REQUEST_CODECS if direction == "request" else RESPONSE_CODECS
+    try:
+        return codecs[msg_type]
+    except KeyError:
+        raise KeyError(msg_type) from None
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+# transport/pending.py
+#
+# 요청/응답 동기화 테이블.
+#   key: (request_id, msg_type) -> (t_sent, Event)
+#
+#   add()      → 송신 전에 등록, PendingEvent 반환 (기존 pending_add)
+#   pop()      → 대기하던 쪽이 끝낼 때 호출 (기존 pending_pop). 응답 전이면 timeout 으로 기록
+#   resolve()  → Receiver 가 RESP 수신 시 호출. Event set + latency (+ payload) 기록
+#   reap()     → ttl 지난 entry 정리 (응답 없는 fire-and-forget 요청 등) — reaper 스레드가 주기 호출
+#
+# 응답 분류
+#   matched : 대기 중인 entry 와 매칭
+#   late    : 이미 timeout/reap 된 요청에 대한 응답 (최근 _LATE_WINDOW 개 key 기억)
+#   orphan  : 어떤 요청과도 매칭되지 않는 응답
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from transport.message_schema import get_message
+import utils.metrics as metrics
+import utils.tracer as tracer
+
+
+def _msg_name(msg_type: int) -> str:
+    try:
+        return get_message(msg_type).name
+    except KeyError:
+        return ""
+
+
+# ============================================================
+# Latency histogram — utils.metrics.Histogram (기존 import 경로 유지)
+# ============================================================
+
+LatencyHistogram = metrics.Histogram
+
+_M_ACK_LATENCY = "morai_tcp_ack_latency_seconds"
+_M_RESPONSES = {
+    result: metrics.counter("morai_tcp_responses_total", "TCP 응답 분류별 수", {"result": result})
+    for result in ("matched", "late", "orphan")
+}
+_M_TIMEOUTS = metrics.counter("morai_tcp_request_timeouts_total", "응답 전에 대기 측이 포기한 요청 수")
+_M_REAPED   = metrics.counter("morai_tcp_requests_reaped_total", "ttl 초과로 reaper 가 정리한 요청 수")
+
+
+# ============================================================
+# PendingTable
+# ============================================================
+
+class PendingEvent(threading.Event):
+    """resolve() 시 latency (초) 와 응답 payload 가 기록되는 Event.
+
+    set 됐는데 latency 가 None 이면 응답이 아니라 fail_all() (연결 끊김) 로 해제된 것.
+    파이프라인처럼 응답 순서와 대기 순서가 다를 때도 실제 왕복 시간을 알 수 있다.
+    payload 는 Receiver 가 넘겨준 경우에만 채워진다 (GetStatus 응답 확인 등).
+    """
+
+    latency: Optional[float] = None
+    payload: Optional[bytes] = None
+
+
+class PendingTable:
+    _LATE_WINDOW = 4096   # timeout/reap 된 key 를 기억하는 개수 (late 판정용)
+
+    def __init__(self, ttl_sec: float = 30.0, reap_interval_sec: float = 1.0):
+        self.ttl_sec           = ttl_sec
+        self.reap_interval_sec = reap_interval_sec
+
+        self._lock    = threading.Lock()
+        self._entries: Dict[Tuple[int, int], Tuple[float, PendingEvent]] = {}
+        self._expired: "OrderedDict[Tuple[int, int], None]" = OrderedDict()
+        self._hist:    Dict[int, LatencyHistogram] = {}
+        self._shared:  Dict[int, metrics.Histogram] = {}   # msg_type -> 전역 registry histogram
+
+        self.matched  = 0
+        self.timeouts = 0   # 응답 전에 pop() — 대기 측이 포기
+        self.reaped   = 0   # ttl 초과로 reaper 가 제거
+        self.late     = 0
+        self.orphans  = 0
+
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── 요청 측 ───────────────────────────────────────────────
+
+    def add(self, request_id: int, msg_type: int) -> PendingEvent:
+        ev = PendingEvent()
+        with self._lock:
+            self._entries[(request_id, msg_type)] = (time.perf_counter(), ev)
+        return ev
+
+    def pop(self, request_id: int, msg_type: int) -> None:
+        """대기 종료. 이미 resolve 됐으면 no-op, 아니면 timeout 으로 집계."""
+        key = (request_id, msg_type)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.timeouts += 1
+                self._remember_expired(key)
+                _M_TIMEOUTS.inc()
+
+    # ── 수신 측 ───────────────────────────────────────────────
+
+    def resolve(self, request_id: int, msg_type: int, payload: Optional[bytes] = None) -> bool:
+        """RESP 수신 처리. 대기 중인 요청이 있으면 Event set 후 True."""
+        now = time.perf_counter()
+        key = (request_id, msg_type)
+        with self._lock:
+            item = self._entries.pop(key, None)
+            if item is None:
+                if key in self._expired:
+                    del self._expired[key]
+                    self.late += 1
+                    _M_RESPONSES["late"].inc()
+                else:
+                    self.orphans += 1
+                    _M_RESPONSES["orphan"].inc()
+                return False
+            self.matched += 1
+            hist = self._hist.get(msg_type)
+            if hist is None:
+                hist = self._hist[msg_type] = LatencyHistogram()
+                self._shared[msg_type] = metrics.histogram(
+                    _M_ACK_LATENCY, "요청 송신 ~ 응답 수신 왕복 시간",
+                    {"msg": _msg_name(msg_type) or f"0x{msg_type:04X}"})
+            latency = now - item[0]
+            hist.record(latency)
+            self._shared[msg_type].record(latency)
+        _M_RESPONSES["matched"].inc()
+        item[1].latency = latency
+        item[1].payload = payload
+        item[1].set()
+        tracer.instant("ack", "tcp", rid=request_id, msg_type=msg_type, latency_ms=latency * 1000.0)
+        return True
+
+    def fail_all(self) -> int:
+        """연결 끊김 — 모든 대기 Event 를 즉시 해제하고 비운다."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        for _, ev in entries.values():
+            ev.set()
+        return len(entries)
+
+    # ── reaper ────────────────────────────────────────────────
+
+    def reap(self, now: Optional[float] = None) -> int:
+        deadline = (time.perf_counter() if now is None else now) - self.ttl_sec
+        with self._lock:
+            stale = [k for k, (t, _) in self._entries.items() if t < deadline]
+            for key in stale:
+                del self._entries[key]
+                self._remember_expired(key)
+            self.reaped += len(stale)
+        if stale:
+            _M_REAPED.inc(len(stale))
+        return len(stale)
+
+    def start_reaper(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        self._reaper_stop.set()
+
+    def _reap_loop(self) -> None:
+        while not self._reaper_stop.wait(self.reap_interval_sec):
+            self.reap()
+
+    def _remember_expired(self, key: Tuple[int, int]) -> None:
+        # lock 보유 상태에서 호출
+        self._expired[key] = None
+        if len(self._expired) > self._LATE_WINDOW:
+            self._expired.popitem(last=False)
+
+    # ── 통계 ──────────────────────────────────────────────────
+
+    def histogram(self, msg_type: int) -> Optional[LatencyHistogram]:
+        return self._hist.get(msg_type)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            latency = {t: h.summary() for t, h in sorted(self._hist.items())}
+            in_flight = len(self._entries)
+        return {
+            "in_flight": in_flight,
+            "matched":   self.matched,
+            "timeouts":  self.timeouts,
+            "reaped":    self.reaped,
+            "late":      self.late,
+            "orphans":   self.orphans,
+            "latency":   latency,
+        }
+
+    def report_lines(self) -> List[str]:
+        """GUI 로그 / CLI 출력용 텍스트 표."""
+        st = self.stats()
+        lines = [
+            f"pending in_flight={st['in_flight']} matched={st['matched']} "
+            f"timeouts={st['timeouts']} reaped={st['reaped']} "
+            f"late={st['late']} orphans={st['orphans']}",
+        ]
+        if not st["latency"]:
+            lines.append("  (no responses yet)")
+            return lines
+        lines.append(f"  {'msg_type':<34} {'n':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+        for msg_type, s in st["latency"].items():
+            name = f"0x{msg_type:04X} {_msg_name(msg_type)}"
+            lines.append(
+                f"  {name:<34} {s['count']:>7} {s['p50']:>8.2f} {s['p95']:>8.2f} "
+                f"{s['p99']:>8.2f} {s['max']:>8.2f}"
+            )
+        return lines
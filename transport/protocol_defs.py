@@ -240,3 +240,7 @@ ACTIVE_SUITE_STATUS_RESP_MIN_SIZE = (
 MAX_CALL_NUM              = 1000
 AUTO_TIMEOUT_SEC          = 2.0
 AUTO_DELAY_BETWEEN_CMDS_SEC = 0.0  # 필요시 0.01 등으로 조절
+AUTO_PIPELINE_DEPTH       = 1    # in-flight FixedStep+SaveData 쌍 수 (1 = ACK 마다 순차)
+FP_PIPELINE_DEPTH         = 4    # 파일 재생 in-flight 행 수 (control 은 이전 FixedStep ACK 후 송신)
+AUTO_MAX_RETRIES          = 3    # ACK timeout 시 같은 request_id 로 재전송 횟수 (0 = 첫 timeout 에 중단)
+AUTO_MIN_TIMEOUT_SEC      = 0.2  # 적응형 ACK timeout 하한 (상한 = AUTO_TIMEOUT_SEC)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+# transport/retry_policy.py
+#
+# FixedStep / SaveData ACK 대기용 적응형 timeout + 재전송.
+#
+#   RttEstimator   : msg_type 별 SRTT / RTTVAR (RFC 6298, Jacobson/Karels)
+#                    timeout = SRTT + k·RTTVAR 를 [min_timeout_sec, max_timeout_sec] 로 clamp.
+#                    timeout 이 나면 다음 대기는 2배 (backoff), 응답을 받으면 원래대로.
+#   StepRetryPolicy: wait() 가 timeout 나면
+#     ① FixedStep 이고 expected_step_index 를 알면 GetSimulationTimeStatus 로 step_index 확인
+#        - step_index >= expected → 요청은 처리됨, ACK 만 유실 → 완료로 처리 (재전송 시 이중 step)
+#        - step_index <  expected → 요청 유실 → 같은 request_id 로 재전송 (resend=False 면 계속 대기)
+#        - 확인 실패 (GetStatus 도 무응답) → 서버가 멈춘 것일 수 있으므로 재전송하지 않고 계속 대기
+#        GetStatus 는 같은 TCP 스트림에서 FixedStep 뒤에 도착하므로, 서버가 도착 순서대로 처리하면
+#        GetStatus 응답 시점의 step_index 는 앞선 FixedStep 의 처리 여부를 반영한다
+#        (서버가 단지 느린 경우엔 GetStatus 응답도 그만큼 늦고, 그 사이 원래 ACK 가 오면 그걸로 끝).
+#     ② SaveData (또는 step_index 를 모를 때) → 재전송하지 않고 계속 대기
+#        ACK 유실과 요청 유실을 구분할 수 없어 재전송하면 이중 step / 중복 저장이 될 수 있다.
+#   재전송은 step_index 가 expected 보다 작다고 확인된 경우뿐. 그 외의 timeout 은 backoff 후 다시 대기하고,
+#   max_retries 번 지나도 응답이 없으면 False — 호출 측이 기존처럼 중단.
+#   마지막 시도는 max_timeout_sec 를 다 기다리므로 max_retries=0 이면 기존 고정 timeout 과 같다.
+#
+# 재전송한 요청의 RTT 는 표본에서 제외 (Karn) — 어느 송신에 대한 ACK 인지 모호하다.
+
+import threading
+from typing import Callable, Dict, Optional
+
+import transport.protocol_defs as proto
+import transport.tcp_transport as tcp
+import utils.metrics as metrics
+
+_M_TIMEOUTS  = metrics.counter("morai_step_retry_timeouts_total", "적응형 timeout 만료 횟수")
+_M_RESENDS   = metrics.counter("morai_step_retry_resends_total", "같은 request_id 로 재전송한 횟수")
+_M_LOST_ACKS = metrics.counter("morai_step_retry_lost_acks_total", "step_index 로 처리 확인된 ACK 유실 수")
+
+
+class RttEstimator:
+    def __init__(
+        self,
+        initial_timeout_sec: float = 3.0,
+        min_timeout_sec: float = 0.2,
+        max_timeout_sec: float = 3.0,
+        alpha: float = 1 / 8,
+        beta: float = 1 / 4,
+        k: float = 4.0,
+    ):
+        self.min_timeout_sec = min_timeout_sec
+        self.max_timeout_sec = max(max_timeout_sec, min_timeout_sec)
+        self.alpha = alpha
+        self.beta  = beta
+        self.k     = k
+
+        self.srtt:   Optional[float] = None
+        self.rttvar: float = 0.0
+        self.samples = 0
+        self._rto     = min(max(initial_timeout_sec, min_timeout_sec), self.max_timeout_sec)
+        self._backoff = 1
+
+    def observe(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt   = rtt
+            self.rttvar = rtt / 2.0
+        else:
+            self.rttvar = (1.0 - self.beta) * self.rttvar + self.beta * abs(self.srtt - rtt)
+            self.srtt   = (1.0 - self.alpha) * self.srtt + self.alpha * rtt
+        self.samples += 1
+        self._rto = self.srtt + self.k * self.rttvar
+
+    def timeout(self) -> float:
+        return min(max(self._rto * self._backoff, self.min_timeout_sec), self.max_timeout_sec)
+
+    def backoff(self) -> None:
+        self._backoff = min(self._backoff * 2, 64)
+
+    def reset_backoff(self) -> None:
+        self._backoff = 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "samples":    self.samples,
+            "srtt_ms":    (self.srtt or 0.0) * 1000.0,
+            "rttvar_ms":  self.rttvar * 1000.0,
+            "timeout_ms": self.timeout() * 1000.0,
+        }
+
+
+class StepRetryPolicy:
+    def __init__(
+        self,
+        tcp_sock,
+        pending,
+        request_id_ref,
+        initial_timeout_sec: float = 3.0,
+        min_timeout_sec: float = 0.2,
+        max_timeout_sec: float = 3.0,
+        max_retries: int = 3,
+        log_fn: Optional[Callable[..., None]] = None,
+    ):
+        self.tcp_sock = tcp_sock
+        self.pending = pending                # transport.pending.PendingTable
+        self.request_id_ref = request_id_ref  # RequestIdCounter
+        self.max_retries = max(0, int(max_retries))
+        self.log_fn = log_fn or (lambda msg, level="INFO": print(f"[RETRY] {msg}"))
+        self.rtt = {
+            msg_type: RttEstimator(initial_timeout_sec, min_timeout_sec, max_timeout_sec)
+            for msg_type in (proto.MSG_TYPE_FIXED_STEP, proto.MSG_TYPE_SAVE_DATA)
+        }
+        self.max_timeout_sec = max_timeout_sec
+
+        self.timeouts  = 0
+        self.resends   = 0
+        self.lost_acks = 0
+
+    # ── step_index 조회 ───────────────────────────────────────
+
+    def query_step_index(self, timeout_sec: Optional[float] = None) -> Optional[int]:
+        """GetSimulationTimeStatus 왕복. 응답 payload 를 못 받거나 parse 실패 시 None."""
+        msg_type = proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS
+        rid = self.request_id_ref.next()
+        ev = self.pending.add(rid, msg_type)
+        try:
+            tcp.send_get_status(self.tcp_sock, rid)
+            if not ev.wait(self.max_timeout_sec if timeout_sec is None else timeout_sec):
+                return None
+        finally:
+            self.pending.pop(rid, msg_type)
+        parsed = tcp.parse_get_status_payload(ev.payload) if ev.payload is not None else None
+        return parsed["step_index"] if parsed else None
+
+    # ── ACK 대기 ──────────────────────────────────────────────
+
+    def timeout(self, msg_type: int) -> float:
+        return self.rtt[msg_type].timeout()
+
+    def wait(
+        self,
+        rid: int,
+        msg_type: int,
+        ev: threading.Event,
+        step_count: int = 1,
+        expected_step_index: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+        resend: bool = True,
+    ) -> bool:
+        """ACK 대기 (필요 시 재전송). 성공 시 True. 호출 측이 이후 pending.pop(rid, msg_type).
+
+        expected_step_index: 이 FixedStep 까지 처리됐을 때의 step_index (None → 재전송 안 함).
+        resend: False 면 step_index 로 ACK 유실만 확인하고 재전송은 하지 않는다
+                (파이프라인 — 뒤에 송신한 FixedStep 보다 늦게 도착하는 재전송은 순서를 깨뜨림).
+        """
+        est = self.rtt[msg_type]
+        name = "FixedStep" if msg_type == proto.MSG_TYPE_FIXED_STEP else "SaveData"
+        for attempt in range(self.max_retries + 1):
+            if stop_event is not None and stop_event.is_set():
+                return False
+            timeout = est.timeout() if attempt < self.max_retries else self.max_timeout_sec
+            if ev.wait(timeout):
+                latency = getattr(ev, "latency", 0.0)
+                if latency is None:             # fail_all — 연결 끊김
+                    return False
+                if attempt == 0:
+                    est.observe(latency)
+                est.reset_backoff()
+                return True
+            if attempt == self.max_retries or (stop_event is not None and stop_event.is_set()):
+                break
+
+            self.timeouts += 1
+            _M_TIMEOUTS.inc()
+            est.backoff()
+            step_index = None
+            if msg_type == proto.MSG_TYPE_FIXED_STEP and expected_step_index is not None:
+                step_index = self.query_step_index(est.timeout())
+                if ev.is_set():                 # 확인하는 동안 원래 ACK 도착
+                    continue
+                if step_index is not None and step_index >= expected_step_index:
+                    self.lost_acks += 1
+                    _M_LOST_ACKS.inc()
+                    self.log_fn(f"{name} rid={rid} ACK 유실 — step_index={step_index} 로 처리 확인", "WARN")
+                    return True
+            if step_index is None or not resend:
+                # 처리 여부 모름 (서버 멈춤 / SaveData) — 재전송하면 이중 처리될 수 있으니 더 기다린다
+                self.log_fn(f"{name} rid={rid} {timeout * 1000:.0f}ms 무응답 — 계속 대기 "
+                            f"({attempt + 1}/{self.max_retries})", "WARN")
+                continue
+            self._resend(rid, msg_type, step_count)
+            self.log_fn(f"{name} rid={rid} {timeout * 1000:.0f}ms 무응답 — 재전송 "
+                        f"({attempt + 1}/{self.max_retries}, step_index={step_index})", "WARN")
+        return False
+
+    def _resend(self, rid: int, msg_type: int, step_count: int) -> None:
+        self.resends += 1
+        _M_RESENDS.inc()
+        tcp.send_fixed_step(self.tcp_sock, rid, step_count=step_count)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "timeouts":  self.timeouts,
+            "resends":   self.resends,
+            "lost_acks": self.lost_acks,
+            "fixed_step": self.rtt[proto.MSG_TYPE_FIXED_STEP].stats(),
+            "save_data":  self.rtt[proto.MSG_TYPE_SAVE_DATA].stats(),
+        }
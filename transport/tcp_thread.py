@@ -1,11 +1,24 @@
 # tcp_thread.py
+#
+# Receiver : 수신 스레드. RESP 도착 즉시 PendingTable.resolve() 로 대기 측을 깨우고,
+#            parse + 로그는 (msg_class, msg_type) 핸들러 테이블로 넘겨 별도 스레드에서 처리.
+#            → FixedStep ACK 경로에 문자열 포맷이 끼지 않음.
+#            로그는 utils.event_log (category "tcp.recv") — 레벨 게이트도 거기서
+#            (GUI 로그 패널 연결은 app.py 의 CallbackSink).
 import socket
 import threading
+from collections import deque
 
 import transport.protocol_defs as proto
 import transport.tcp_transport as tcp
+import utils.event_log as elog
 import utils.input_helper as prompt
-import panels.log as log
+import utils.metrics as metrics
+
+_LOG_CATEGORY = "tcp.recv"
+
+_M_DEFERRED_DROPPED = metrics.counter(
+    "morai_tcp_deferred_dropped_total", "후처리 큐가 가득 차 버린 응답 수 (parse / 로그 / 핸들러 생략)")
 
 
 def result_to_string(code: int):
@@ -18,157 +31,232 @@ def time_mode_to_string(mode: int):
     return f"UNKNOWN({mode})"
 
 
+def _log(level: int, fmt: str, *args) -> None:
+    """event_log 로 전달 — level 이 꺼져 있으면 포맷하지 않음."""
+    elog.log(level, _LOG_CATEGORY, fmt, *args)
+
+
+def _enabled(level: int) -> bool:
+    return elog.enabled(level, _LOG_CATEGORY)
+
+
+# ============================================================
+# Response handlers — fn(request_id, payload)
+# ============================================================
+
+HANDLERS = {}
+
+
+def register_handler(msg_class: int, msg_type: int):
+    def deco(fn):
+        HANDLERS[(msg_class, msg_type)] = fn
+        return fn
+    return deco
+
+
+@register_handler(proto.MSG_CLASS_RESP, proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND)
+def _on_set_simulation_time_mode(request_id: int, payload: bytes) -> None:
+    parsed = tcp.parse_set_simulation_time_mode_payload(payload)
+    if not parsed:
+        _log(elog.WARN, "SetSimulationTimeMode parse_failed rid=%d", request_id)
+        return
+    if _enabled(elog.INFO):
+        _log(
+            elog.INFO, "%s",
+            f"SetSimulationTimeMode rid={request_id} "
+            f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
+            f"mode={time_mode_to_string(parsed['mode'])} "
+            f"fixed_delta={parsed['fixed_delta']:.3f}",
+        )
+
+
+@register_handler(proto.MSG_CLASS_RESP, proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS)
+def _on_get_status(request_id: int, payload: bytes) -> None:
+    parsed = tcp.parse_get_status_payload(payload)
+    if not parsed:
+        _log(elog.WARN, "GetStatus parse_failed rid=%d", request_id)
+        return
+    if not _enabled(elog.INFO):
+        return
+    if parsed["mode"] == proto.TIME_MODE_VARIABLE:
+        mode_detail = (
+            f"target_fps={parsed['target_fps']} "
+            f"physics_dt={parsed['physics_delta_time']}ms "
+            f"speed={parsed['simulation_speed']:.2f}"
+        )
+    elif parsed["mode"] == proto.TIME_MODE_FIXED:
+        mode_detail = (
+            f"sim_dt={parsed['simulation_delta_time']}ms "
+            f"physics_dt={parsed['physics_delta_time']}ms "
+            f"rtf={parsed['rtf']} user_control={parsed['user_control']}"
+        )
+    else:
+        mode_detail = ""
+    _log(
+        elog.INFO, "%s",
+        f"GetStatus rid={request_id} "
+        f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
+        f"mode={time_mode_to_string(parsed['mode'])} "
+        f"{mode_detail} "
+        f"step={parsed['step_index']} "
+        f"sim={parsed['seconds']}s {parsed['nanos']}ns",
+    )
+
+
+@register_handler(proto.MSG_CLASS_RESP, proto.MSG_TYPE_CREATE_OBJECT)
+def _on_create_object(request_id: int, payload: bytes) -> None:
+    parsed = tcp.parse_create_object_payload(payload)
+    if not parsed:
+        _log(elog.WARN, "CreateObject parse_failed rid=%d", request_id)
+        return
+    _log(elog.INFO, "CreateObject rid=%d result=%d(%s) object_id=%s",
+         request_id, parsed["result_code"], result_to_string(parsed["result_code"]),
+         parsed["object_id"])
+
+
+@register_handler(proto.MSG_CLASS_RESP, proto.MSG_TYPE_ACTIVE_SUITE_STATUS)
+def _on_active_suite_status(request_id: int, payload: bytes) -> None:
+    parsed = tcp.parse_active_suite_status_payload(payload)
+    if not parsed:
+        _log(elog.WARN, "ActiveSuiteStatus parse_failed rid=%d", request_id)
+        return
+    prompt.update_scenario_list(parsed["scenario_list"])
+    if _enabled(elog.INFO):
+        scenarios = ", ".join(parsed["scenario_list"]) or "(empty)"
+        _log(
+            elog.INFO, "%s",
+            f"ActiveSuiteStatus rid={request_id} "
+            f"suite={parsed['active_suite_name']!r} "
+            f"scenario={parsed['active_scenario_name']!r} "
+            f"list=[{scenarios}]",
+        )
+
+
+@register_handler(proto.MSG_CLASS_RESP, proto.MSG_TYPE_SCENARIO_STATUS)
+def _on_scenario_status(request_id: int, payload: bytes) -> None:
+    parsed = tcp.parse_scenario_status_payload(payload)
+    if not parsed:
+        _log(elog.WARN, "ScenarioStatus parse_failed rid=%d", request_id)
+        return
+    if _enabled(elog.INFO):
+        state_str = {1:"PLAY", 2:"PAUSE", 3:"STOP"}.get(
+            parsed["state"], f"UNKNOWN({parsed['state']})")
+        _log(
+            elog.INFO, "%s",
+            f"ScenarioStatus rid={request_id} "
+            f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
+            f"state={state_str}",
+        )
+
+
+def _on_result(msg_type: int, request_id: int, payload: bytes) -> None:
+    """등록되지 않은 RESP — result code 오류만 로그."""
+    if len(payload) < proto.RESULT_SIZE:
+        return
+    parsed = tcp.parse_result_code(payload)
+    if parsed is None:
+        _log(elog.WARN, "0x%04X rid=%d result=parse_failed", msg_type, request_id)
+        return
+    result_code, detail_code = parsed
+    if result_code != 0:
+        _log(elog.ERROR, "0x%04X rid=%d result=%d(%s) detail=%d",
+             msg_type, request_id, result_code, result_to_string(result_code), detail_code)
+
+
+# ============================================================
+# Receiver
+# ============================================================
+
 class Receiver(threading.Thread):
-    def __init__(self, sock, pending: dict, lock: threading.Lock, on_disconnect=None):
+    _DEFERRED_MAX      = 4096    # 후처리 큐 상한 — 넘치면 오래된 것부터 버리고 dropped 집계 / 로그
+    _DEFERRED_INTERVAL = 0.05    # 후처리 스레드 wake 주기 (s)
+
+    def __init__(self, sock, pending, on_disconnect=None):
         super().__init__(daemon=True)
         self.sock          = sock
-        self.pending       = pending
-        self.lock          = lock
+        self.reader        = tcp.StreamReader(sock)
+        self.pending       = pending          # transport.pending.PendingTable
         self.running       = True
         self.on_disconnect = on_disconnect
 
+        # (msg_class, msg_type, request_id, payload bytes) — parse/log 후처리 대기열
+        self._deferred     = deque()
+        self.deferred_dropped   = 0   # 수신 스레드만 갱신
+        self._dropped_reported  = 0   # 후처리 스레드만 갱신
+        self._deferred_ev  = threading.Event()
+        self._worker       = threading.Thread(target=self._deferred_loop, daemon=True)
+
+    def start(self):
+        super().start()
+        self._worker.start()
+
     def stop(self):
         self.running = False
+        self._deferred_ev.set()
+
+    def _disconnected(self):
+        self.running = False
+        self._deferred_ev.set()
+        if self.on_disconnect:
+            self.on_disconnect()
 
     def run(self):
+        resolve  = self.pending.resolve
+        deferred = self._deferred
         while self.running:
             # recv_packet만 별도 try — socket.timeout(recv 주기 만료)은 재연결 없이 continue
             try:
                 msg_class, msg_type, payload_size, request_id, flag, payload = \
-                    tcp.recv_packet(self.sock)
+                    self.reader.read_packet()
             except socket.timeout:
                 continue
             except (ConnectionError, OSError) as e:
                 err_code = getattr(e, 'errno', None) or getattr(e, 'winerror', None)
-                log.append(f"Receiver stopped: errno={err_code}", "ERROR")
-                self.running = False
-                if self.on_disconnect:
-                    self.on_disconnect()
+                _log(elog.ERROR, "Receiver stopped: errno=%s", err_code)
+                self._disconnected()
                 return
             except Exception as e:
                 import traceback
-                log.append(f"Receiver unexpected: {type(e).__name__}: {e}", "ERROR")
-                log.append(traceback.format_exc(), "ERROR")
-                self.running = False
-                if self.on_disconnect:
-                    self.on_disconnect()
+                _log(elog.ERROR, "Receiver unexpected: %s: %s", type(e).__name__, e)
+                _log(elog.ERROR, "%s", traceback.format_exc())
+                self._disconnected()
                 return
 
-            # SetSimulationTimeModeCommand (0x1102)
-            if msg_class == proto.MSG_CLASS_RESP \
-                    and msg_type == proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND:
-                parsed = tcp.parse_set_simulation_time_mode_payload(payload)
-                if parsed:
-                    log.append(
-                        f"SetSimulationTimeMode rid={request_id} "
-                        f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
-                        f"mode={time_mode_to_string(parsed['mode'])} "
-                        f"fixed_delta={parsed['fixed_delta']:.3f}",
-                        "RECV"
-                    )
-                else:
-                    log.append(f"SetSimulationTimeMode parse_failed rid={request_id}", "WARN")
-
-            # GetSimulationTimeStatus (0x1101)
-            elif msg_class == proto.MSG_CLASS_RESP \
-                    and msg_type == proto.MSG_TYPE_GET_SIMULATION_TIME_STATUS:
-                parsed = tcp.parse_get_status_payload(payload)
-                if parsed:
-                    if parsed["mode"] == proto.TIME_MODE_VARIABLE:
-                        mode_detail = (
-                            f"target_fps={parsed['target_fps']} "
-                            f"physics_dt={parsed['physics_delta_time']}ms "
-                            f"speed={parsed['simulation_speed']:.2f}"
-                        )
-                    elif parsed["mode"] == proto.TIME_MODE_FIXED:
-                        mode_detail = (
-                            f"sim_dt={parsed['simulation_delta_time']}ms "
-                            f"physics_dt={parsed['physics_delta_time']}ms "
-                            f"rtf={parsed['rtf']} user_control={parsed['user_control']}"
-                        )
-                    else:
-                        mode_detail = ""
-                    log.append(
-                        f"GetStatus rid={request_id} "
-                        f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
-                        f"mode={time_mode_to_string(parsed['mode'])} "
-                        f"{mode_detail} "
-                        f"step={parsed['step_index']} "
-                        f"sim={parsed['seconds']}s {parsed['nanos']}ns",
-                        "RECV"
-                    )
-                else:
-                    log.append(f"GetStatus parse_failed rid={request_id}", "WARN")
-
-            # CreateObject (0x1301)
-            elif msg_class == proto.MSG_CLASS_RESP \
-                    and msg_type == proto.MSG_TYPE_CREATE_OBJECT:
-                parsed = tcp.parse_create_object_payload(payload)
-                if parsed:
-                    log.append(
-                        f"CreateObject rid={request_id} "
-                        f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
-                        f"object_id={parsed['object_id']}",
-                        "RECV"
-                    )
-                else:
-                    log.append(f"CreateObject parse_failed rid={request_id}", "WARN")
-
-            # ActiveSuiteStatus (0x1401)
-            elif msg_class == proto.MSG_CLASS_RESP \
-                    and msg_type == proto.MSG_TYPE_ACTIVE_SUITE_STATUS:
-                parsed = tcp.parse_active_suite_status_payload(payload)
-                if parsed:
-                    prompt.update_scenario_list(parsed["scenario_list"])
-                    scenarios = ", ".join(parsed["scenario_list"]) or "(empty)"
-                    log.append(
-                        f"ActiveSuiteStatus rid={request_id} "
-                        f"suite={parsed['active_suite_name']!r} "
-                        f"scenario={parsed['active_scenario_name']!r} "
-                        f"list=[{scenarios}]",
-                        "RECV"
-                    )
-                else:
-                    log.append(f"ActiveSuiteStatus parse_failed rid={request_id}", "WARN")
-
-            # ScenarioStatus (0x1504)
-            elif msg_class == proto.MSG_CLASS_RESP \
-                    and msg_type == proto.MSG_TYPE_SCENARIO_STATUS:
-                parsed = tcp.parse_scenario_status_payload(payload)
-                if parsed:
-                    state_str = {1:"PLAY", 2:"PAUSE", 3:"STOP"}.get(
-                        parsed["state"], f"UNKNOWN({parsed['state']})")
-                    log.append(
-                        f"ScenarioStatus rid={request_id} "
-                        f"result={parsed['result_code']}({result_to_string(parsed['result_code'])}) "
-                        f"state={state_str}",
-                        "RECV"
-                    )
-                else:
-                    log.append(f"ScenarioStatus parse_failed rid={request_id}", "WARN")
-
-            # General RESP — 오류만 로그
-            elif msg_class == proto.MSG_CLASS_RESP:
-                if payload_size >= proto.RESULT_SIZE:
-                    parsed = tcp.parse_result_code(payload)
-                    if parsed:
-                        result_code, detail_code = parsed
-                        if result_code != 0:
-                            log.append(
-                                f"0x{msg_type:04X} rid={request_id} "
-                                f"result={result_code}({result_to_string(result_code)}) "
-                                f"detail={detail_code}",
-                                "ERROR"
-                            )
-                    else:
-                        log.append(
-                            f"0x{msg_type:04X} rid={request_id} result=parse_failed",
-                            "WARN"
-                        )
-
-            # pending event set + cleanup
+            # payload 는 다음 read 전에 복사 (대기 측 / 후처리 스레드가 공유)
+            payload = bytes(payload)
+
+            # ① 대기 측 먼저 깨움 (late / orphan 은 table 이 집계)
             if msg_class == proto.MSG_CLASS_RESP:
-                with self.lock:
-                    item = self.pending.pop((request_id, msg_type), None)
-                    if item:
-                        item["ev"].set()
+                resolve(request_id, msg_type, payload)
+
+            # ② parse + 로그는 후처리 스레드로 (가득 차면 가장 오래된 것을 버리고 집계)
+            if len(deferred) >= self._DEFERRED_MAX:
+                try:
+                    deferred.popleft()
+                except IndexError:       # 그 사이 후처리 스레드가 비움
+                    pass
+                else:
+                    self.deferred_dropped += 1
+                    _M_DEFERRED_DROPPED.inc()
+            deferred.append((msg_class, msg_type, request_id, payload))
+
+    def _deferred_loop(self):
+        deferred = self._deferred
+        while self.running or deferred:
+            self._deferred_ev.wait(self._DEFERRED_INTERVAL)
+            self._deferred_ev.clear()
+            while deferred:
+                msg_class, msg_type, request_id, payload = deferred.popleft()
+                try:
+                    handler = HANDLERS.get((msg_class, msg_type))
+                    if handler is not None:
+                        handler(request_id, payload)
+                    elif msg_class == proto.MSG_CLASS_RESP:
+                        _on_result(msg_type, request_id, payload)
+                except Exception as e:
+                    _log(elog.ERROR, "0x%04X handler error: %s: %s", msg_type, type(e).__name__, e)
+            dropped = self.deferred_dropped
+            if dropped != self._dropped_reported:
+                _log(elog.WARN, "Receiver 후처리 큐 가득 참 (%d) — 응답 %d 건 처리 생략 (누적 %d)",
+                     self._DEFERRED_MAX, dropped - self._dropped_reported, dropped)
+                self._dropped_reported = dropped
@@ -1,16 +1,62 @@
 from __future__ import annotations
 
+import itertools
 import socket
 import struct
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Optional, Tuple
 
+from transport.capture import DIR_RX, DIR_TX, WireCapture
 from transport.message_schema import (
-    get_response_message,
+    get_codec,
     pack_message_payload,
-    unpack_fields,
     unpack_message_payload,
 )
 import transport.protocol_defs as proto
+import utils.event_log as elog
+import utils.metrics as metrics
+
+
+# import 시점에 컴파일된 codec — build_* 는 dict 생성 없이 위치 인자로 pack
+_MANUAL_CONTROL_BY_ID_CODEC    = get_codec(proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND).fields
+_TRANSFORM_CONTROL_BY_ID_CODEC = get_codec(proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND).fields
+_SET_TRAJECTORY_CODEC          = get_codec(proto.MSG_TYPE_SET_TRAJECTORY_COMMAND)
+_FIXED_STEP_CODEC              = get_codec(proto.MSG_TYPE_FIXED_STEP).fields
+_RESULT_CODEC                  = get_codec(proto.MSG_TYPE_FIXED_STEP, "response").fields
+
+_HEADER = struct.Struct(proto.HEADER_FMT)
+
+MAX_PAYLOAD_SIZE = 1024 * 1024
+
+# 전역 metrics registry (utils/metrics.py)
+_M_TX_FRAMES    = metrics.counter("morai_tcp_tx_frames_total", "송신 TCP frame 수")
+_M_TX_BYTES     = metrics.counter("morai_tcp_tx_bytes_total", "송신 TCP 바이트")
+_M_RX_FRAMES    = metrics.counter("morai_tcp_rx_frames_total", "수신 TCP frame 수")
+_M_RX_BYTES     = metrics.counter("morai_tcp_rx_bytes_total", "수신 TCP 바이트 (헤더 포함)")
+_M_RX_DISCARDED = metrics.counter("morai_tcp_rx_discarded_bytes_total", "MAGIC 재동기화로 버린 바이트")
+_M_TX_BATCHES   = metrics.counter("morai_tcp_writer_batches_total", "SocketWriter sendmsg 호출 수")
+_M_TX_BATCH     = metrics.histogram("morai_tcp_writer_batch_frames", "SocketWriter batch 당 frame 수",
+                                    lo_exp=0, hi_exp=3)
+
+# opt-in wire capture tap — None 이면 송수신 경로 비용은 전역 조회 1회
+_capture: Optional[WireCapture] = None
+
+
+def enable_capture(path: str) -> WireCapture:
+    """이후 송수신되는 모든 frame 을 path (+ path.idx) 에 기록."""
+    global _capture
+    disable_capture()
+    _capture = WireCapture(path)
+    return _capture
+
+
+def disable_capture() -> None:
+    global _capture
+    cap, _capture = _capture, None
+    if cap is not None:
+        cap.close()
 
 
 # ============================================================
@@ -37,13 +83,13 @@ def recv_header_synced(sock: socket.socket) -> bytes:
         rest = recv_exact(sock, proto.HEADER_SIZE - 1)
         header_bytes = b + rest
 
-        _, msg_class, msg_type, payload_size, _, _ = struct.unpack(proto.HEADER_FMT, header_bytes)
+        _, msg_class, msg_type, payload_size, _, _ = _HEADER.unpack(header_bytes)
 
         if msg_class not in proto.VALID_MSG_CLASSES:
             continue
         if msg_type not in proto.VALID_MSG_TYPES:
             continue
-        if payload_size > 1024 * 1024:
+        if payload_size > MAX_PAYLOAD_SIZE:
             continue
 
         return header_bytes
@@ -52,16 +98,112 @@ def recv_header_synced(sock: socket.socket) -> bytes:
 def recv_packet(sock: socket.socket) -> Tuple[int, int, int, int, int, bytes]:
     """Return `(msg_class, msg_type, payload_size, request_id, flag, payload)`."""
     header_bytes = recv_header_synced(sock)
-    _, msg_class, msg_type, payload_size, request_id, flag = struct.unpack(
-        proto.HEADER_FMT, header_bytes
-    )
-    if payload_size < 0 or payload_size > 1024 * 1024:
+    _, msg_class, msg_type, payload_size, request_id, flag = _HEADER.unpack(header_bytes)
+    if payload_size < 0 or payload_size > MAX_PAYLOAD_SIZE:
         raise ValueError(f"Invalid payload_size: {payload_size}")
 
     payload = recv_exact(sock, payload_size) if payload_size > 0 else b""
+    if _capture is not None:
+        _capture.write(DIR_RX, header_bytes + payload)
+    _M_RX_FRAMES.inc()
+    _M_RX_BYTES.inc(len(header_bytes) + payload_size)
     return msg_class, msg_type, payload_size, request_id, flag, payload
 
 
+class StreamReader:
+    """Buffered TCP packet reader.
+
+    소켓 데이터를 미리 할당한 버퍼에 `recv_into` 로 채우고, 버퍼 안에서
+    MAGIC 동기화 / 헤더 검증 / payload 분리를 처리한다.
+    - 동기화가 깨져도 1바이트씩 recv 하지 않고 `bytearray.find` 로 MAGIC 탐색
+    - 헤더는 캐시된 `struct.Struct(HEADER_FMT)` 로 unpack_from
+    - payload 는 버퍼의 memoryview slice 로 반환 (복사 없음)
+
+    반환된 payload memoryview 는 다음 `read_packet()` 호출 전까지만 유효하다.
+    더 오래 보관해야 하면 `bytes(payload)` 로 복사한다.
+    recv 도중 socket.timeout 이 나도 이미 받은 바이트는 버퍼에 남아 있으므로
+    다음 호출에서 이어서 읽는다.
+    """
+
+    def __init__(self, sock: socket.socket, capacity: int = 64 * 1024):
+        self._sock  = sock
+        self._buf   = bytearray(max(capacity, proto.HEADER_SIZE))
+        self._view  = memoryview(self._buf)
+        self._start = 0   # 아직 소비하지 않은 데이터 시작
+        self._end   = 0   # 수신된 데이터 끝
+
+        self.packets         = 0
+        self.discarded_bytes = 0   # MAGIC 재동기화로 버린 바이트 수
+
+    @property
+    def buffered(self) -> int:
+        return self._end - self._start
+
+    def _make_room(self, need: int) -> None:
+        """`_start` 부터 `need` 바이트가 들어갈 수 있도록 compact 또는 grow."""
+        unread = self._end - self._start
+        if need > len(self._buf):
+            new_buf = bytearray(max(need, len(self._buf) * 2))
+            new_buf[:unread] = self._view[self._start:self._end]
+            self._buf  = new_buf
+            self._view = memoryview(new_buf)
+        elif unread:
+            self._buf[:unread] = self._buf[self._start:self._end]
+        self._start = 0
+        self._end   = unread
+
+    def _fill(self, need: int) -> None:
+        """버퍼에 최소 `need` 바이트의 미소비 데이터가 쌓일 때까지 수신."""
+        while self._end - self._start < need:
+            if self._start == self._end:
+                self._start = self._end = 0
+            if self._start + need > len(self._buf):
+                self._make_room(need)
+            n = self._sock.recv_into(self._view[self._end:])
+            if not n:
+                raise ConnectionError("Socket closed by peer")
+            self._end += n
+
+    def read_packet(self) -> Tuple[int, int, int, int, int, memoryview]:
+        """Return `(msg_class, msg_type, payload_size, request_id, flag, payload)`."""
+        while True:
+            self._fill(1)
+            idx = self._buf.find(proto.MAGIC, self._start, self._end)
+            if idx < 0:
+                self.discarded_bytes += self._end - self._start
+                _M_RX_DISCARDED.inc(self._end - self._start)
+                self._start = self._end = 0
+                continue
+            if idx > self._start:
+                self.discarded_bytes += idx - self._start
+                _M_RX_DISCARDED.inc(idx - self._start)
+            self._start = idx
+
+            self._fill(proto.HEADER_SIZE)
+            _, msg_class, msg_type, payload_size, request_id, flag = _HEADER.unpack_from(
+                self._buf, self._start
+            )
+            if (msg_class not in proto.VALID_MSG_CLASSES
+                    or msg_type not in proto.VALID_MSG_TYPES
+                    or payload_size > MAX_PAYLOAD_SIZE):
+                # 가짜 MAGIC — 1바이트 건너뛰고 다시 탐색
+                self._start += 1
+                self.discarded_bytes += 1
+                _M_RX_DISCARDED.inc()
+                continue
+
+            self._fill(proto.HEADER_SIZE + payload_size)
+            h0 = self._start
+            p0 = h0 + proto.HEADER_SIZE
+            self._start = p0 + payload_size
+            self.packets += 1
+            _M_RX_FRAMES.inc()
+            _M_RX_BYTES.inc(self._start - h0)
+            if _capture is not None:
+                _capture.write(DIR_RX, self._view[h0:self._start])
+            return msg_class, msg_type, payload_size, request_id, flag, self._view[p0:self._start]
+
+
 def build_header(
     msg_class: int,
     msg_type: int,
@@ -69,10 +211,12 @@ def build_header(
     request_id: int,
     flag: int = 0,
 ) -> bytes:
-    return struct.pack(
-        proto.HEADER_FMT,
-        proto.MAGIC, msg_class, msg_type, payload_size, request_id, flag,
-    )
+    return _HEADER.pack(proto.MAGIC, msg_class, msg_type, payload_size, request_id, flag)
+
+
+def build_request_packet(request_id: int, msg_type: int, payload: bytes) -> bytes:
+    """Header + payload 로 완성된 request frame."""
+    return build_header(proto.MSG_CLASS_REQ, msg_type, len(payload), request_id, proto.FLAG) + payload
 
 
 def _send_packet(
@@ -83,79 +227,347 @@ def _send_packet(
     log: str = "",
 ) -> None:
     """Build the header, send the packet, and emit optional send log."""
-    header = build_header(proto.MSG_CLASS_REQ, msg_type, len(payload), request_id, proto.FLAG)
-    sock.sendall(header + payload)
+    _send_frame(sock, build_request_packet(request_id, msg_type, payload), request_id, log)
+
+
+def send_frame(sock: socket.socket, frame, request_id: int, log: str = "") -> None:
+    """build_request_packet() 등으로 미리 만든 frame 전송 (capture / 송신 로그 포함)."""
+    _send_frame(sock, frame, request_id, log)
+
+
+def _send_frame(sock: socket.socket, frame, request_id: int, log: str = "") -> None:
+    if _capture is not None:
+        _capture.write(DIR_TX, frame)
+    sock.sendall(frame)
+    _M_TX_FRAMES.inc()
+    _M_TX_BYTES.inc(len(frame))
     if log:
-        print(f"[SEND][TCP] {log} rid={request_id}")
+        elog.log(elog.INFO, "tcp.send", "[SEND][TCP] %s rid=%d", log, request_id)
+
+
+# ============================================================
+# Single writer thread
+# ============================================================
+class SocketWriter(threading.Thread):
+    """공유 TCP 소켓의 단일 송신 스레드.
+
+    sendall(frame) 은 완성된 frame 을 큐에 넣고 바로 반환한다 (socket 과 같은 이름이라
+    tcp.send_* 에 소켓 대신 그대로 넘길 수 있음). 송신 스레드는 한 번 깨어날 때 쌓인
+    frame 을 모두 꺼내 sendmsg 한 번(writev)으로 내보낸다 — 예: StepAdRunner 의
+    ManualControlById N개 + FixedStep 이 syscall 1회로 나감.
+
+    stop() 전에 sendall() 이 반환한 frame 은 모두 송신된다 (running 확인과 append 를 같은
+    lock 으로 묶고, 송신 스레드는 running=False 를 본 뒤 큐를 한 번 더 비우고 종료).
+    송신 오류는 비동기 — 실패한 frame 의 sendall() 은 이미 반환했으므로 on_error 로 알리고,
+    이후 sendall() 이 ConnectionError 를 던진다 (호출 측 except OSError 는 그 다음 송신에서 걸림).
+    """
+
+    MAX_BATCH = 512   # sendmsg iovec 개수 상한 (IOV_MAX 1024 이하)
+
+    def __init__(self, sock, on_error=None):
+        super().__init__(daemon=True)
+        self.sock      = sock
+        self.on_error  = on_error          # fn(exc) — 송신 실패 시 1회 호출
+        self.running   = True
+        self.error     = None
+        self._queue    = deque()           # popleft 는 lock 없이 — append 만 running 확인과 함께 lock
+        self._lock     = threading.Lock()
+        self._wake     = threading.Event()
+        self._sendmsg  = getattr(sock, "sendmsg", None)   # Windows 에는 없음 → join + sendall
+
+        # 통계
+        self.frames_sent  = 0
+        self.batches_sent = 0
+        self.bytes_sent   = 0
+        self.last_batch   = 0
+        self.max_batch    = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth":  len(self._queue),
+            "frames_sent":  self.frames_sent,
+            "batches_sent": self.batches_sent,
+            "bytes_sent":   self.bytes_sent,
+            "last_batch":   self.last_batch,
+            "max_batch":    self.max_batch,
+            "avg_batch":    self.frames_sent / self.batches_sent if self.batches_sent else 0.0,
+        }
+
+    def sendall(self, frame: bytes) -> None:
+        with self._lock:
+            if self.error is not None:
+                raise ConnectionError(f"writer stopped: {self.error}")
+            if not self.running:
+                raise ConnectionError("writer stopped")
+            self._queue.append(frame)
+        self._wake.set()
+
+    def stop(self):
+        """큐에 남은 frame 을 내보낸 뒤 종료."""
+        with self._lock:
+            self.running = False
+        self._wake.set()
+
+    def _send_batch(self, frames: list) -> None:
+        total = sum(len(f) for f in frames)
+        if self._sendmsg is None or len(frames) == 1:
+            self.sock.sendall(frames[0] if len(frames) == 1 else b"".join(frames))
+        else:
+            bufs = [memoryview(f) for f in frames]
+            while bufs:
+                sent = self._sendmsg(bufs)
+                # 부분 전송 — 보낸 만큼 iovec 앞에서 제거
+                while bufs and sent >= len(bufs[0]):
+                    sent -= len(bufs[0])
+                    bufs.pop(0)
+                if bufs and sent:
+                    bufs[0] = bufs[0][sent:]
+        self.frames_sent  += len(frames)
+        self.batches_sent += 1
+        self.bytes_sent   += total
+        self.last_batch    = len(frames)
+        if len(frames) > self.max_batch:
+            self.max_batch = len(frames)
+        _M_TX_BATCHES.inc()
+        _M_TX_BATCH.record(len(frames))
+
+    def run(self):
+        queue  = self._queue
+        wake   = self._wake
+        frames = []
+        while True:
+            while queue:
+                while queue and len(frames) < self.MAX_BATCH:
+                    frames.append(queue.popleft())
+                try:
+                    self._send_batch(frames)
+                except (ConnectionError, OSError) as e:
+                    with self._lock:
+                        self.error   = e
+                        self.running = False
+                        queue.clear()
+                    if self.on_error:
+                        self.on_error(e)
+                    return
+                finally:
+                    frames.clear()
+            with self._lock:
+                # running=False 이후엔 append 가 없으므로 큐가 비었으면 남은 frame 없음
+                if not self.running:
+                    if not queue:
+                        return
+                    continue
+            wake.wait()
+            wake.clear()            # drain 전에 clear — 이후 append 는 다음 wait 을 깨움
 
 
 # ============================================================
 # Payload builders
 # ============================================================
 
-def build_manual_control_by_id_payload(
-    entity_id: str,
-    throttle: float,
-    brake: float,
-    steer_angle: float,
+def build_simulation_time_mode_payload(
+    mode: int,
+    target_fps: int = 60,
+    physics_delta_time: int = 10,
+    simulation_speed: float = 1.0,
+    simulation_delta_time: int = 16,
+    rtf: int = 1,
+    user_control: int = 0,
 ) -> bytes:
-    return pack_message_payload(
-        proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND,
-        {
-            "entity_id": entity_id,
-            "throttle": throttle,
-            "brake": brake,
-            "steer_angle": steer_angle,
-        },
-    )
+    """mode: 1=variable, 2=fixed."""
+    if mode == proto.TIME_MODE_VARIABLE:
+        payload_values = {
+            "mode": mode,
+            "target_fps": int(target_fps),
+            "physics_delta_time": int(physics_delta_time),
+            "simulation_speed": float(simulation_speed),
+        }
+    elif mode == proto.TIME_MODE_FIXED:
+        payload_values = {
+            "mode": mode,
+            "simulation_delta_time": int(simulation_delta_time),
+            "physics_delta_time": int(physics_delta_time),
+            "rtf": int(rtf),
+            "user_control": int(user_control),
+        }
+    else:
+        raise ValueError(f"Unsupported simulation time mode: {mode}")
+    return pack_message_payload(proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND, payload_values)
 
 
-def build_transform_control_by_id_payload(
-    entity_id: str,
+def build_fixed_step_payload(step_count: int) -> bytes:
+    return _FIXED_STEP_CODEC.pack_values((step_count,))
+
+
+def build_create_object_payload(
+    entity_type: int,
     pos_x: float, pos_y: float, pos_z: float,
     rot_x: float, rot_y: float, rot_z: float,
-    steer_angle: float,
-    speed: float,
+    driving_mode: int,
+    ground_vehicle_model: int,
 ) -> bytes:
     return pack_message_payload(
-        proto.MSG_TYPE_TRANSFORM_CONTROL_BY_ID_COMMAND,
+        proto.MSG_TYPE_CREATE_OBJECT,
         {
-            "entity_id": entity_id,
+            "entity_type": entity_type,
             "pos_x": pos_x,
             "pos_y": pos_y,
             "pos_z": pos_z,
             "rot_x": rot_x,
             "rot_y": rot_y,
             "rot_z": rot_z,
-            "steer_angle": steer_angle,
-            "speed": speed,
+            "driving_mode": driving_mode,
+            "ground_vehicle_model": ground_vehicle_model,
         },
     )
 
 
+def build_manual_control_by_id_payload(
+    entity_id: str,
+    throttle: float,
+    brake: float,
+    steer_angle: float,
+) -> bytes:
+    return _MANUAL_CONTROL_BY_ID_CODEC.pack_values((entity_id, throttle, brake, steer_angle))
+
+
+def build_manual_control_by_id_frame(
+    request_id: int,
+    entity_id: str,
+    throttle: float,
+    brake: float,
+    steer_angle: float,
+) -> bytes:
+    """Header 포함 ManualControlById frame — 파일 재생처럼 미리 만들어 두고 send_frame() 으로 전송."""
+    return build_request_packet(
+        request_id, proto.MSG_TYPE_MANUAL_CONTROL_BY_ID_COMMAND,
+        build_manual_control_by_id_payload(entity_id, throttle, brake, steer_angle),
+    )
+
+
+def build_transform_control_by_id_payload(
+    entity_id: str,
+    pos_x: float, pos_y: float, pos_z: float,
+    rot_x: float, rot_y: float, rot_z: float,
+    steer_angle: float,
+    speed: float,
+) -> bytes:
+    return _TRANSFORM_CONTROL_BY_ID_CODEC.pack_values((
+        entity_id, pos_x, pos_y, pos_z, rot_x, rot_y, rot_z, steer_angle, speed,
+    ))
+
+
+# points[] 한 개 = float64 x4 (x, y, z, time) = 32 bytes
+_TRAJECTORY_POINT_SIZE  = _SET_TRAJECTORY_CODEC.repeat.fixed_size
+_TRAJECTORY_CHUNK       = 1024
+_TRAJECTORY_CHUNK_CODEC = struct.Struct("<%dd" % (4 * _TRAJECTORY_CHUNK))
+
+
+def _trajectory_point_buffer(points) -> Optional[memoryview]:
+    """(N, 4) float64 버퍼 (numpy 배열, array('d'), memoryview 등) → byte memoryview.
+
+    list / tuple 이나 buffer protocol 이 아닌 객체는 None (point tuple 경로).
+    C-contiguous 가 아닌 numpy 배열은 한 번 복사해 연속 배열로 만든다.
+    """
+    if isinstance(points, (list, tuple)):
+        return None
+    try:
+        view = memoryview(points)
+    except TypeError:
+        return None
+    if view.format not in ("d", "<d", "=d") or not view.c_contiguous or sys.byteorder != "little":
+        try:
+            import numpy as np   # optional — 변환이 필요한 buffer 는 보통 numpy 배열
+        except ImportError:
+            raise ValueError(f"trajectory buffer must be C-contiguous float64, got format={view.format!r}")
+        view = memoryview(np.ascontiguousarray(points, dtype="<f8"))
+    if (view.ndim not in (1, 2)
+            or (view.ndim == 2 and view.shape[1] != 4)
+            or view.nbytes % _TRAJECTORY_POINT_SIZE):
+        raise ValueError(f"trajectory buffer must be (N, 4) float64, got shape={view.shape}")
+    return view.cast("B")
+
+
 def build_set_trajectory_payload(
     entity_id: str,
     follow_mode: int,
     trajectory_name: str,
-    points: List[Tuple[float, float, float, float]],
+    points,
 ) -> bytes:
+    """points: [(x, y, z, time), ...] 또는 (N, 4) float64 버퍼.
+
+    버퍼면 points[] 블록을 point 별 pack 없이 한 번의 복사로 붙인다.
+    """
+    buf = _trajectory_point_buffer(points)
+    if buf is not None:
+        header = _SET_TRAJECTORY_CODEC.fields.pack_values(
+            (entity_id, follow_mode, trajectory_name, buf.nbytes // _TRAJECTORY_POINT_SIZE)
+        )
+        return b"".join((header, buf))
+    pack_point = _SET_TRAJECTORY_CODEC.repeat.pack_values
+    return _SET_TRAJECTORY_CODEC.fields.pack_values(
+        (entity_id, follow_mode, trajectory_name, len(points))
+    ) + b"".join([pack_point(point) for point in points])
+
+
+def build_set_trajectory_payload_from_iter(
+    entity_id: str,
+    follow_mode: int,
+    trajectory_name: str,
+    points: Iterable[Tuple[float, float, float, float]],
+    point_count: int,
+    buffer: Optional[bytearray] = None,
+    offset: int = 0,
+) -> bytearray:
+    """generator 에서 point 를 받아 미리 할당한 bytearray 에 chunk 단위로 pack.
+
+    point_count 는 헤더(payload_size, point_count)에 먼저 들어가야 하므로 호출자가 알려준다.
+    buffer 를 넘기면 buffer[offset:] 에 기록 (TCP 헤더 자리를 앞에 비워둘 때).
+    """
+    header = _SET_TRAJECTORY_CODEC.fields.pack_values(
+        (entity_id, follow_mode, trajectory_name, point_count)
+    )
+    size = len(header) + point_count * _TRAJECTORY_POINT_SIZE
+    if buffer is None:
+        buffer = bytearray(offset + size)
+    buffer[offset:offset + len(header)] = header
+    pos = offset + len(header)
+    end = offset + size
+
+    it = iter(points)
+    while True:
+        chunk = list(itertools.islice(it, _TRAJECTORY_CHUNK))
+        if not chunk:
+            break
+        if pos + len(chunk) * _TRAJECTORY_POINT_SIZE > end:
+            raise ValueError(f"trajectory generator yielded more than point_count={point_count} points")
+        flat = itertools.chain.from_iterable(chunk)
+        if len(chunk) == _TRAJECTORY_CHUNK:
+            _TRAJECTORY_CHUNK_CODEC.pack_into(buffer, pos, *flat)
+        else:
+            struct.pack_into("<%dd" % (4 * len(chunk)), buffer, pos, *flat)
+        pos += len(chunk) * _TRAJECTORY_POINT_SIZE
+    if pos != end:
+        written = (pos - offset - len(header)) // _TRAJECTORY_POINT_SIZE
+        raise ValueError(f"trajectory generator yielded {written} points, expected {point_count}")
+    return buffer
+
+
+def build_load_suite_payload(suite_path: str) -> bytes:
+    return pack_message_payload(proto.MSG_TYPE_LOAD_SUITE, {"suite_path": suite_path})
+
+
+def build_scenario_control_payload(command: int, scenario_name: str = "") -> bytes:
     return pack_message_payload(
-        proto.MSG_TYPE_SET_TRAJECTORY_COMMAND,
+        proto.MSG_TYPE_SCENARIO_CONTROL,
         {
-            "entity_id": entity_id,
-            "follow_mode": follow_mode,
-            "trajectory_name": trajectory_name,
-            "point_count": len(points),
+            "command": command,
+            "scenario_name": scenario_name,
         },
-        repeated_items=[
-            {
-                "points[].x": x,
-                "points[].y": y,
-                "points[].z": z,
-                "points[].time": t,
-            }
-            for x, y, z, t in points
-        ],
     )
 
 
@@ -180,38 +592,27 @@ def send_simulation_time_mode_command(
     user_control: int = 0,
 ) -> None:
     """mode: 1=variable, 2=fixed."""
+    payload = build_simulation_time_mode_payload(
+        mode,
+        target_fps=target_fps,
+        physics_delta_time=physics_delta_time,
+        simulation_speed=simulation_speed,
+        simulation_delta_time=simulation_delta_time,
+        rtf=rtf,
+        user_control=user_control,
+    )
     if mode == proto.TIME_MODE_VARIABLE:
-        payload_values = {
-            "mode": mode,
-            "target_fps": int(target_fps),
-            "physics_delta_time": int(physics_delta_time),
-            "simulation_speed": float(simulation_speed),
-        }
         log_text = (
             "SetSimulationTimeModeCommand(0x1102) "
             f"mode={mode} target_fps={target_fps} physics_delta_time={physics_delta_time} "
             f"simulation_speed={simulation_speed}"
         )
-    elif mode == proto.TIME_MODE_FIXED:
-        payload_values = {
-            "mode": mode,
-            "simulation_delta_time": int(simulation_delta_time),
-            "physics_delta_time": int(physics_delta_time),
-            "rtf": int(rtf),
-            "user_control": int(user_control),
-        }
+    else:
         log_text = (
             "SetSimulationTimeModeCommand(0x1102) "
             f"mode={mode} simulation_delta_time={simulation_delta_time} "
             f"physics_delta_time={physics_delta_time} rtf={rtf} user_control={user_control}"
         )
-    else:
-        raise ValueError(f"Unsupported simulation time mode: {mode}")
-
-    payload = pack_message_payload(
-        proto.MSG_TYPE_SET_SIMULATION_TIME_MODE_COMMAND,
-        payload_values,
-    )
     _send_packet(
         sock,
         request_id,
@@ -222,10 +623,7 @@ def send_simulation_time_mode_command(
 
 
 def send_fixed_step(sock: socket.socket, request_id: int, step_count: int) -> None:
-    payload = pack_message_payload(
-        proto.MSG_TYPE_FIXED_STEP,
-        {"step_count": step_count},
-    )
+    payload = build_fixed_step_payload(step_count)
     _send_packet(sock, request_id, proto.MSG_TYPE_FIXED_STEP, payload)
 
 
@@ -242,19 +640,12 @@ def send_create_object(
     driving_mode: int,
     ground_vehicle_model: int,
 ) -> None:
-    payload = pack_message_payload(
-        proto.MSG_TYPE_CREATE_OBJECT,
-        {
-            "entity_type": entity_type,
-            "pos_x": pos_x,
-            "pos_y": pos_y,
-            "pos_z": pos_z,
-            "rot_x": rot_x,
-            "rot_y": rot_y,
-            "rot_z": rot_z,
-            "driving_mode": driving_mode,
-            "ground_vehicle_model": ground_vehicle_model,
-        },
+    payload = build_create_object_payload(
+        entity_type,
+        pos_x, pos_y, pos_z,
+        rot_x, rot_y, rot_z,
+        driving_mode,
+        ground_vehicle_model,
     )
     _send_packet(sock, request_id, proto.MSG_TYPE_CREATE_OBJECT, payload,
                  "CreateObject(0x1301)")
@@ -293,18 +684,54 @@ def send_set_trajectory(
     entity_id: str,
     follow_mode: int,
     trajectory_name: str,
-    points: List[Tuple[float, float, float, float]],
+    points,
 ) -> None:
-    payload = build_set_trajectory_payload(entity_id, follow_mode, trajectory_name, points)
-    _send_packet(sock, request_id, proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, payload,
-                 f"SetTrajectory(0x1304) id={entity_id} points={len(points)}")
+    """points: [(x, y, z, time), ...] 또는 (N, 4) float64 numpy 배열 / buffer."""
+    buf = _trajectory_point_buffer(points)
+    if buf is None:
+        payload = build_set_trajectory_payload(entity_id, follow_mode, trajectory_name, points)
+        _send_packet(sock, request_id, proto.MSG_TYPE_SET_TRAJECTORY_COMMAND, payload,
+                     f"SetTrajectory(0x1304) id={entity_id} points={len(points)}")
+        return
+
+    # TCP 헤더 + 필드 헤더 + points[] 를 한 번의 join 으로 frame 구성 (payload 중간 복사 없음)
+    count  = buf.nbytes // _TRAJECTORY_POINT_SIZE
+    fields = _SET_TRAJECTORY_CODEC.fields.pack_values((entity_id, follow_mode, trajectory_name, count))
+    header = build_header(proto.MSG_CLASS_REQ, proto.MSG_TYPE_SET_TRAJECTORY_COMMAND,
+                          len(fields) + buf.nbytes, request_id, proto.FLAG)
+    _send_frame(sock, b"".join((header, fields, buf)), request_id,
+                f"SetTrajectory(0x1304) id={entity_id} points={count}")
+
+
+def send_set_trajectory_stream(
+    sock: socket.socket,
+    request_id: int,
+    entity_id: str,
+    follow_mode: int,
+    trajectory_name: str,
+    points: Iterable[Tuple[float, float, float, float]],
+    point_count: int,
+) -> None:
+    """generator 로 point 를 생성하며 frame 을 채운다 (point tuple 리스트를 만들지 않음).
+
+    frame 은 하나의 sendall 로 보낸다 — SocketWriter 는 frame 단위로 다른 스레드의
+    송신과 섞이므로 부분 frame 을 나눠 보낼 수 없다.
+    """
+    fields_size  = len(_SET_TRAJECTORY_CODEC.fields.pack_values((entity_id, follow_mode, trajectory_name, 0)))
+    payload_size = fields_size + point_count * _TRAJECTORY_POINT_SIZE
+    frame = bytearray(proto.HEADER_SIZE + payload_size)
+    _HEADER.pack_into(frame, 0, proto.MAGIC, proto.MSG_CLASS_REQ, proto.MSG_TYPE_SET_TRAJECTORY_COMMAND,
+                      payload_size, request_id, proto.FLAG)
+    build_set_trajectory_payload_from_iter(
+        entity_id, follow_mode, trajectory_name, points, point_count,
+        buffer=frame, offset=proto.HEADER_SIZE,
+    )
+    _send_frame(sock, frame, request_id,
+                f"SetTrajectory(0x1304) id={entity_id} points={point_count} (stream)")
 
 
 def send_load_suite(sock: socket.socket, request_id: int, suite_path: str) -> None:
-    payload = pack_message_payload(
-        proto.MSG_TYPE_LOAD_SUITE,
-        {"suite_path": suite_path},
-    )
+    payload = build_load_suite_payload(suite_path)
     _send_packet(sock, request_id, proto.MSG_TYPE_LOAD_SUITE, payload,
                  f"LoadSuite(0x1402) suite_path={suite_path}")
 
@@ -320,13 +747,7 @@ def send_scenario_control(
     command: int,
     scenario_name: str = "",
 ) -> None:
-    payload = pack_message_payload(
-        proto.MSG_TYPE_SCENARIO_CONTROL,
-        {
-            "command": command,
-            "scenario_name": scenario_name,
-        },
-    )
+    payload = build_scenario_control_payload(command, scenario_name)
     _send_packet(sock, request_id, proto.MSG_TYPE_SCENARIO_CONTROL, payload,
                  f"ScenarioControl(0x1505) command={command} scenario_name={scenario_name!r}")
 
@@ -344,7 +765,7 @@ def parse_result_code(payload: bytes) -> Optional[Tuple[int, int]]:
     if len(payload) != proto.RESULT_SIZE:
         return None
     try:
-        values, offset = unpack_fields(get_response_message(0x1201).fields, payload)
+        values, offset = _RESULT_CODEC.unpack_from(payload)
     except ValueError:
         return None
     if offset != len(payload):
@@ -412,16 +833,15 @@ def parse_active_suite_status_payload(payload: bytes) -> Optional[Dict[str, Any]
             repeated_count_field="scenario_list_size",
         )
     except ValueError as e:
-        print(f"[PARSE][ActiveSuiteStatus] {e}")
+        elog.log(elog.WARN, "tcp.parse", "[PARSE][ActiveSuiteStatus] %s", e)
         return None
 
     if offset != len(payload):
         return None
     if values["result_code"] != 0:
-        print(
-            f"[PARSE][ActiveSuiteStatus] Server error: "
-            f"result_code={values['result_code']} detail_code={values['detail_code']}"
-        )
+        elog.log(elog.WARN, "tcp.parse",
+                 "[PARSE][ActiveSuiteStatus] Server error: result_code=%d detail_code=%d",
+                 values["result_code"], values["detail_code"])
         return None
 
     return {
@@ -438,6 +858,6 @@ def parse_scenario_status_payload(payload: bytes) -> Optional[Dict[str, Any]]:
     try:
         values, _, offset = unpack_message_payload(0x1504, payload, direction="response")
     except ValueError as e:
-        print(f"[PARSE][ScenarioStatus] {e}")
+        elog.log(elog.WARN, "tcp.parse", "[PARSE][ScenarioStatus] %s", e)
         return None
     return values if offset == len(payload) else None
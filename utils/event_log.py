@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+# utils/event_log.py
+#
+# hot path 용 비동기 로그.
+#
+#   log(level, category, fmt, *args)
+#     → level / category 게이트 통과 시에만 (t, level, category, fmt, args) 튜플을
+#       고정 크기 ring buffer 에 넣고 바로 반환 (문자열 포맷 없음)
+#   background 스레드
+#     → fmt % args 포맷 후 sink (console / panels.log / 파일) 로 전달
+#
+# ring 이 가득 차면 가장 오래된 event 를 버리고 dropped 를 센다.
+# 다음 drain 때 "[LOG] dropped N events" 를 sink 로 한 번 보고한다.
+#
+# 사용:
+#   import utils.event_log as elog
+#   elog.log(elog.INFO, "tcp.send", "[SEND][TCP] %s rid=%d", text, rid)
+#   if elog.enabled(elog.DEBUG, "lane.step"):      # 인자 계산 자체가 비쌀 때
+#       elog.log(elog.DEBUG, "lane.step", "...", expensive())
+#   elog.set_level(elog.WARN, "udp.send")          # category 별 임계값
+
+import atexit
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+DEBUG = 10
+INFO  = 20
+WARN  = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERROR"}
+
+Event = Tuple[float, int, str, str, tuple]   # (t_wall, level, category, fmt, args)
+
+
+# ============================================================
+# Sinks — sink(t, level, category, message)
+# ============================================================
+
+class ConsoleSink:
+    """stdout 에 message 만 출력 (기존 print 출력과 동일한 모양)."""
+
+    def __init__(self, min_level: int = DEBUG, stream=None):
+        self.min_level = min_level
+        self._stream   = stream
+
+    def __call__(self, t: float, level: int, category: str, message: str) -> None:
+        if level >= self.min_level:
+            print(message, file=self._stream or sys.stdout)
+
+    def flush(self) -> None:
+        (self._stream or sys.stdout).flush()
+
+
+class CallbackSink:
+    """fn(message, level_name) 호출 — panels.log.append 연결용.
+    category_levels 로 category 별 임계값 (예: {"tcp.recv": INFO} → 응답 로그는 INFO 부터)."""
+
+    def __init__(self, fn: Callable[[str, str], None], min_level: int = WARN,
+                 categories: Optional[Sequence[str]] = None,
+                 category_levels: Optional[Dict[str, int]] = None):
+        self.fn         = fn
+        self.min_level  = min_level
+        self.categories = set(categories) if categories else None
+        self.category_levels = dict(category_levels or {})
+
+    def __call__(self, t: float, level: int, category: str, message: str) -> None:
+        if level < self.category_levels.get(category, self.min_level):
+            return
+        if self.categories is not None and category not in self.categories:
+            return
+        self.fn(message, LEVEL_NAMES.get(level, "INFO"))
+
+
+class FileSink:
+    """timestamp / level / category 를 붙여 파일에 append."""
+
+    def __init__(self, path: str, min_level: int = DEBUG):
+        self.min_level = min_level
+        self._file     = open(path, "a", encoding="utf-8")
+
+    def __call__(self, t: float, level: int, category: str, message: str) -> None:
+        if level < self.min_level:
+            return
+        ts = time.strftime("%H:%M:%S", time.localtime(t)) + f".{int(t * 1000) % 1000:03d}"
+        self._file.write(f"{ts} {LEVEL_NAMES.get(level, level)} {category} {message}\n")
+
+    def flush(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ============================================================
+# EventLog
+# ============================================================
+
+class EventLog:
+    def __init__(
+        self,
+        capacity: int = 8192,
+        level: int = INFO,
+        sinks: Optional[List[Callable]] = None,
+        interval_sec: float = 0.05,
+        autostart: bool = True,        # 첫 log() 때 background 스레드 시작 (False 면 drain() 수동 호출)
+    ):
+        self.capacity  = int(capacity)
+        self.interval  = float(interval_sec)
+        self.autostart = autostart
+        self.sinks: List[Callable] = list(sinks) if sinks is not None else [ConsoleSink()]
+
+        self._level = level
+        self._category_levels: Dict[str, int] = {}
+
+        self._ring: List[Optional[Event]] = [None] * self.capacity
+        self._head  = 0     # 다음 쓰기 위치 (누적)
+        self._tail  = 0     # 다음 읽기 위치 (누적)
+        self._lock  = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._wake  = threading.Event()
+        self._stop  = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.recorded = 0
+        self.dropped  = 0
+        self.written  = 0
+        self._dropped_reported = 0
+
+    # ── 게이트 ───────────────────────────────────────────────
+
+    def set_level(self, level: int, category: Optional[str] = None) -> None:
+        """category=None 이면 기본 임계값, 아니면 해당 category 만."""
+        if category is None:
+            self._level = level
+        else:
+            self._category_levels[category] = level
+
+    def enabled(self, level: int, category: str = "") -> bool:
+        return level >= self._category_levels.get(category, self._level)
+
+    # ── 생산자 (임의 스레드) ──────────────────────────────────
+
+    def log(self, level: int, category: str, fmt: str, *args) -> None:
+        if level < self._category_levels.get(category, self._level):
+            return
+        event = (time.time(), level, category, fmt, args)
+        with self._lock:
+            if self._head - self._tail >= self.capacity:
+                self._tail    += 1          # 가장 오래된 event 덮어쓰기
+                self.dropped  += 1
+            self._ring[self._head % self.capacity] = event
+            self._head    += 1
+            self.recorded += 1
+        if self._thread is None and self.autostart:
+            self.start()
+        if level >= WARN:
+            self._wake.set()
+
+    # ── consumer ─────────────────────────────────────────────
+
+    def _take(self) -> Tuple[List[Event], int]:
+        with self._lock:
+            n = self._head - self._tail
+            if n == 0:
+                events = []
+            else:
+                cap, tail = self.capacity, self._tail
+                events = [self._ring[(tail + i) % cap] for i in range(n)]
+                self._tail = self._head
+            dropped = self.dropped - self._dropped_reported
+            self._dropped_reported = self.dropped
+        return events, dropped
+
+    def drain(self) -> int:
+        """ring 을 비우고 sink 로 전달한 event 수를 반환 (background 스레드 또는 수동 호출)."""
+        with self._drain_lock:
+            events, dropped = self._take()
+            if dropped:
+                self._emit(time.time(), WARN, "log",
+                           f"[LOG] dropped {dropped} events (ring buffer full, capacity={self.capacity})")
+            for t, level, category, fmt, args in events:
+                try:
+                    message = fmt % args if args else fmt
+                except (TypeError, ValueError) as e:
+                    message = f"{fmt!r} % {args!r} → format error: {e}"
+                self._emit(t, level, category, message)
+            if events or dropped:
+                for sink in self.sinks:
+                    flush = getattr(sink, "flush", None)
+                    if flush is not None:
+                        try:
+                            flush()
+                        except Exception:
+                            pass
+            self.written += len(events)
+            return len(events)
+
+    def _emit(self, t: float, level: int, category: str, message: str) -> None:
+        for sink in self.sinks:
+            try:
+                sink(t, level, category, message)
+            except Exception:
+                pass   # sink 오류가 로깅 스레드를 죽이지 않도록
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.interval)
+            self._wake.clear()
+            self.drain()
+        self.drain()
+
+    def start(self) -> None:
+        with self._drain_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="EventLog")
+            self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """남은 event 를 모두 sink 로 보낸 뒤 스레드 종료."""
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self.drain()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "dropped":  self.dropped,
+                "written":  self.written,
+                "backlog":  self._head - self._tail,
+                "capacity": self.capacity,
+            }
+
+
+# ============================================================
+# 모듈 기본 인스턴스
+# ============================================================
+
+_default = EventLog()
+atexit.register(_default.stop)
+
+
+def get() -> EventLog:
+    return _default
+
+
+def log(level: int, category: str, fmt: str, *args) -> None:
+    _default.log(level, category, fmt, *args)
+
+
+def enabled(level: int, category: str = "") -> bool:
+    return _default.enabled(level, category)
+
+
+def set_level(level: int, category: Optional[str] = None) -> None:
+    _default.set_level(level, category)
+
+
+def add_sink(sink: Callable) -> None:
+    _default.sinks.append(sink)
+
+
+def remove_sink(sink: Callable) -> None:
+    try:
+        _default.sinks.remove(sink)
+    except ValueError:
+        pass
+
+
+def stats() -> Dict[str, int]:
+    return _default.stats()
@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+# utils/metrics.py
+#
+# 프로세스 공용 metrics registry (counter / gauge / 로그 bucket histogram) + 로컬 exporter.
+#
+#   import utils.metrics as metrics
+#   _M_TX = metrics.counter("morai_tcp_tx_frames_total", "송신 frame 수")
+#   _M_TX.inc()
+#   metrics.histogram("morai_tcp_ack_latency_seconds", "ACK 왕복", {"msg": "FixedStep"}).record(dt)
+#   metrics.gauge("morai_ui_queue_backlog").set(n)
+#
+#   metrics.start_exporters(port=9464, jsonl_path="metrics.jsonl")   # app.py 에서 env 로 활성화
+#     - http://127.0.0.1:9464/metrics  Prometheus text format
+#     - jsonl_path                     interval_sec 마다 snapshot 1줄
+#
+# counter() / gauge() / histogram() 는 (name, labels) 기준 get-or-create 라
+# 모듈 import 시점에 한 번 받아 두고 hot path 에서는 inc / set / record 만 호출한다.
+# 모든 update 는 metric 별 lock 으로 보호 (receiver / control / GUI 스레드 동시 갱신).
+# Histogram 은 고정 bucket 배열이라 샘플 수와 무관하게 메모리 일정.
+
+import bisect
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+# ============================================================
+# Histogram
+# ============================================================
+
+_BUCKETS_PER_DECADE = 10
+_BOUNDS_CACHE: Dict[Tuple[int, int], List[float]] = {}
+
+
+def _log_bounds(lo_exp: int, hi_exp: int) -> List[float]:
+    """10**lo_exp ~ 10**hi_exp 사이 bucket 상한 (decade 당 10개). 같은 범위는 list 공유."""
+    key = (lo_exp, hi_exp)
+    bounds = _BOUNDS_CACHE.get(key)
+    if bounds is None:
+        bounds = _BOUNDS_CACHE[key] = [
+            10.0 ** (e / _BUCKETS_PER_DECADE)
+            for e in range(lo_exp * _BUCKETS_PER_DECADE, hi_exp * _BUCKETS_PER_DECADE + 1)
+        ]
+    return bounds
+
+
+class Histogram:
+    """로그 간격 bucket 히스토그램 (10 bucket/decade, 기본 10us ~ 100s — 초 단위 latency 용).
+
+    record() 는 O(log B), percentile() 은 bucket 내 선형 보간 (상대 오차 ~12% 이내).
+    값 범위가 다르면 lo_exp / hi_exp 로 지정 (예: batch 크기 1 ~ 1000 → 0, 3).
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_counts", "_bounds", "_lock")
+
+    def __init__(self, lo_exp: int = -5, hi_exp: int = 2) -> None:
+        self._bounds = _log_bounds(lo_exp, hi_exp)
+        self._lock   = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count   = 0
+            self.total   = 0.0
+            self.min     = math.inf
+            self.max     = 0.0
+            self._counts = [0] * (len(self._bounds) + 1)   # 마지막 = overflow
+
+    def record(self, value: float) -> None:
+        i = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        """q: 0~100. 샘플이 없으면 0.0."""
+        with self._lock:
+            return self._percentile(q)
+
+    def _percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        bounds = self._bounds
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            if n and seen + n >= rank:
+                lo = bounds[i - 1] if i > 0 else 0.0
+                hi = bounds[i] if i < len(bounds) else self.max
+                value = lo + (hi - lo) * ((rank - seen) / n)
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, scale: float = 1000.0) -> Dict[str, float]:
+        """요약 dict. 기본 scale=1000 → 초 입력을 ms 로 (LatencyHistogram 과 동일)."""
+        with self._lock:
+            return {
+                "count": self.count,
+                "mean":  self.mean * scale,
+                "min":   (self.min if self.count else 0.0) * scale,
+                "p50":   self._percentile(50) * scale,
+                "p95":   self._percentile(95) * scale,
+                "p99":   self._percentile(99) * scale,
+                "max":   self.max * scale,
+            }
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """[(상한, 누적 count), ...] — 모든 bucket 경계 (Prometheus 출력용, +Inf 제외).
+
+        decade 경계만 내보내면 histogram_quantile() 이 한 decade 안에서 선형 보간해
+        p99 오차가 수 배까지 커지므로 내부 해상도 (10 bucket/decade) 를 그대로 노출.
+        """
+        with self._lock:
+            counts = list(self._counts)
+        out = []
+        cum = 0
+        for bound, n in zip(self._bounds, counts):
+            cum += n
+            out.append((bound, cum))
+        return out
+
+
+# ============================================================
+# Counter / Gauge
+# ============================================================
+
+class Counter:
+    """단조 증가 값."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1) -> None:
+        with self._lock:
+            self.value += n
+
+
+class Gauge:
+    """현재 값. set_function(fn) 을 주면 읽을 때마다 fn() 호출 (queue 길이 등)."""
+
+    __slots__ = ("_value", "_fn", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, n: float = 1) -> None:
+        with self._lock:
+            self._value += n
+
+    def dec(self, n: float = 1) -> None:
+        self.inc(-n)
+
+    def set_function(self, fn: Optional[Callable[[], float]]) -> None:
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        fn = self._fn
+        if fn is not None:
+            try:
+                return fn()
+            except Exception:
+                return math.nan
+        return self._value
+
+
+# ============================================================
+# Registry
+# ============================================================
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items())) if labels else ()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Registry:
+    _KINDS = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._families: Dict[str, Tuple[str, str, Dict[LabelKey, object]]] = {}   # name -> (kind, help, children)
+
+    def _get(self, kind: str, name: str, help: str, labels: Optional[Dict[str, str]], **kwargs):
+        key = _label_key(labels)
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (kind, help, {})
+            elif family[0] != kind:
+                raise ValueError(f"metric {name!r} already registered as {family[0]}")
+            children = family[2]
+            metric = children.get(key)
+            if metric is None:
+                metric = children[key] = self._KINDS[kind](**kwargs)
+            return metric
+
+    def counter(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+        return self._get("counter", name, help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Gauge:
+        return self._get("gauge", name, help, labels)
+
+    def histogram(self, name: str, help: str = "", labels: Optional[Dict[str, str]] = None,
+                  lo_exp: int = -5, hi_exp: int = 2) -> Histogram:
+        return self._get("histogram", name, help, labels, lo_exp=lo_exp, hi_exp=hi_exp)
+
+    def collect(self) -> List[Tuple[str, str, str, List[Tuple[LabelKey, object]]]]:
+        """[(name, kind, help, [(labels, metric), ...]), ...] — 이름순."""
+        with self._lock:
+            return [(name, kind, help, sorted(children.items()))
+                    for name, (kind, help, children) in sorted(self._families.items())]
+
+    # ── 출력 ──────────────────────────────────────────────────
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        for name, kind, help, children in self.collect():
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in children:
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(metric.value)}")
+                    continue
+                for bound, cum in metric.cumulative_buckets():
+                    le = 'le="%g"' % bound
+                    lines.append(f"{name}_bucket{_format_labels(key, le)} {cum}")
+                le = 'le="+Inf"'
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {metric.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(metric.total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, object]:
+        """{'name{k="v"}': value | histogram summary(단위 그대로)} — JSONL dump 용."""
+        out: Dict[str, object] = {}
+        for name, kind, _, children in self.collect():
+            for key, metric in children:
+                label = name + _format_labels(key)
+                if kind == "histogram":
+                    out[label] = metric.summary(scale=1.0)
+                else:
+                    value = metric.value
+                    out[label] = None if isinstance(value, float) and math.isnan(value) else value
+        return out
+
+
+# ============================================================
+# Exporters
+# ============================================================
+
+class PrometheusServer:
+    """GET /metrics → registry.render_prometheus(). 기본 localhost 만 bind. port=0 → 임의 포트."""
+
+    def __init__(self, registry: Optional[Registry] = None, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry or REGISTRY
+        reg = self.registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = reg.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):   # 접근 로그 출력 안 함
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "PrometheusServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+
+class JsonlDumper(threading.Thread):
+    """interval_sec 마다 {"t": wall time, "metrics": snapshot} 한 줄을 path 에 append. stop() 시 마지막 1줄."""
+
+    def __init__(self, path: str, registry: Optional[Registry] = None, interval_sec: float = 10.0):
+        super().__init__(name="metrics-jsonl", daemon=True)
+        self.path         = path
+        self.registry     = registry or REGISTRY
+        self.interval_sec = interval_sec
+        self._stop_event  = threading.Event()
+        self.lines        = 0
+
+    def dump_once(self) -> None:
+        line = json.dumps({"t": time.time(), "metrics": self.registry.snapshot()}, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        self.lines += 1
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_sec):
+            self._dump_safe()
+
+    def stop(self) -> None:
+        if not self._stop_event.is_set():
+            self._stop_event.set()
+            self._dump_safe()
+
+    def _dump_safe(self) -> None:
+        try:
+            self.dump_once()
+        except OSError as e:
+            print(f"[metrics] JSONL dump 실패: {e}")
+
+
+# ============================================================
+# 모듈 전역 registry
+# ============================================================
+
+REGISTRY = Registry()
+_exporters: list = []
+
+
+def counter(name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+    return REGISTRY.counter(name, help, labels)
+
+
+def gauge(name: str, help: str = "", labels: Optional[Dict[str, str]] = None) -> Gauge:
+    return REGISTRY.gauge(name, help, labels)
+
+
+def histogram(name: str, help: str = "", labels: Optional[Dict[str, str]] = None,
+              lo_exp: int = -5, hi_exp: int = 2) -> Histogram:
+    return REGISTRY.histogram(name, help, labels, lo_exp, hi_exp)
+
+
+def start_exporters(port: Optional[int] = None, jsonl_path: Optional[str] = None,
+                    interval_sec: float = 10.0) -> list:
+    """전역 registry 용 exporter 시작 (port / jsonl_path 중 준 것만). 시작한 exporter 목록 반환."""
+    started = []
+    if port is not None:
+        started.append(PrometheusServer(REGISTRY, port=port).start())
+    if jsonl_path:
+        dumper = JsonlDumper(jsonl_path, REGISTRY, interval_sec)
+        dumper.start()
+        started.append(dumper)
+    _exporters.extend(started)
+    return started
+
+
+def stop_exporters() -> None:
+    while _exporters:
+        _exporters.pop().stop()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+# utils/tracer.py
+#
+# fixed-step 실행용 per-step timeline tracer → Chrome trace-event JSON (Perfetto / chrome://tracing).
+#
+#   tracer.install(Tracer())                    # 활성화 (모듈 전역 1개)
+#   with tracer.span("fixed_step.send", "step", step=n):
+#       ...
+#   tracer.instant("vi.recv", "udp", step=n, entity="Car_1")
+#   tracer.complete("ack_wait", "step", t0_ns, t1_ns, step=n)   # 이미 잰 구간
+#   tracer.uninstall().export_chrome("run.trace.json")
+#
+# 기록 경로에는 lock 이 없다: 스레드마다 자기 deque(maxlen) 에만 append 하고
+# (GIL 하에서 atomic), 스레드별 buffer 등록 시 한 번만 lock 을 잡는다.
+# buffer 가 가득 차면 가장 오래된 event 부터 버린다 (stats 의 dropped).
+# install 되지 않았으면 모든 함수가 전역 변수 검사 한 번으로 끝난다.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# (ph, name, cat, ts_ns, dur_ns, step, args)
+_Event = tuple
+
+
+class _ThreadBuffer:
+    __slots__ = ("tid", "name", "events", "appended")
+
+    def __init__(self, tid: int, name: str, capacity: int):
+        self.tid      = tid
+        self.name     = name
+        self.events   = deque(maxlen=capacity)
+        self.appended = 0
+
+
+class Tracer:
+    def __init__(self, capacity_per_thread: int = 262144):
+        self.capacity  = int(capacity_per_thread)
+        self.t0_ns     = time.perf_counter_ns()
+        self.wall_t0   = time.time()
+        self._local    = threading.local()
+        self._buffers: List[_ThreadBuffer] = []
+        self._reg_lock = threading.Lock()
+
+    # ── 기록 (임의 스레드) ────────────────────────────────────
+
+    def _buffer(self) -> _ThreadBuffer:
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            t = threading.current_thread()
+            buf = _ThreadBuffer(threading.get_ident(), t.name, self.capacity)
+            with self._reg_lock:
+                self._buffers.append(buf)
+            self._local.buf = buf
+        return buf
+
+    def record(self, ph: str, name: str, cat: str, ts_ns: int, dur_ns: int = 0,
+               step: Optional[int] = None, args: Optional[dict] = None) -> None:
+        buf = self._buffer()
+        buf.events.append((ph, name, cat, ts_ns, dur_ns, step, args))
+        buf.appended += 1
+
+    # ── 내보내기 ──────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, int]:
+        with self._reg_lock:
+            buffers = list(self._buffers)
+        recorded = sum(b.appended for b in buffers)
+        kept     = sum(len(b.events) for b in buffers)
+        return {"threads": len(buffers), "recorded": recorded, "dropped": recorded - kept}
+
+    def chrome_events(self) -> List[dict]:
+        """Chrome trace-event 형식 dict 목록 (ts/dur 는 us, tracer 생성 시점 기준)."""
+        pid = os.getpid()
+        with self._reg_lock:
+            buffers = list(self._buffers)
+        out: List[dict] = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                            "args": {"name": "MORAI client"}}]
+        for buf in buffers:
+            out.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": buf.tid,
+                        "args": {"name": buf.name}})
+            for ph, name, cat, ts_ns, dur_ns, step, args in list(buf.events):
+                ev = {"ph": ph, "name": name, "cat": cat or "default", "pid": pid, "tid": buf.tid,
+                      "ts": (ts_ns - self.t0_ns) / 1000.0}
+                if ph == "X":
+                    ev["dur"] = dur_ns / 1000.0
+                elif ph == "i":
+                    ev["s"] = "t"
+                if step is not None or args:
+                    ev["args"] = dict(args or ())
+                    if step is not None:
+                        ev["args"]["step"] = step
+                out.append(ev)
+        return out
+
+    def export_chrome(self, path: str) -> int:
+        """Chrome trace JSON 파일로 저장. 기록된 event 수 반환."""
+        events = self.chrome_events()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"wall_t0": self.wall_t0, **self.stats()}}, f)
+        return sum(1 for e in events if e["ph"] != "M")
+
+
+# ============================================================
+# 모듈 전역 tracer (install 전에는 no-op)
+# ============================================================
+
+_active: Optional[Tracer] = None
+
+
+def install(tracer: Tracer) -> Tracer:
+    global _active
+    _active = tracer
+    return tracer
+
+
+def uninstall() -> Optional[Tracer]:
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    return _active
+
+
+def now_ns() -> int:
+    return time.perf_counter_ns()
+
+
+def instant(name: str, cat: str = "", step: Optional[int] = None, **args) -> None:
+    tracer = _active
+    if tracer is not None:
+        tracer.record("i", name, cat, time.perf_counter_ns(), 0, step, args)
+
+
+def complete(name: str, cat: str, t0_ns: int, t1_ns: int,
+             step: Optional[int] = None, **args) -> None:
+    """이미 측정한 [t0_ns, t1_ns] 구간을 span 으로 기록."""
+    tracer = _active
+    if tracer is not None:
+        tracer.record("X", name, cat, t0_ns, t1_ns - t0_ns, step, args)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "step", "args", "t0")
+
+    def __init__(self, tracer, name, cat, step, args):
+        self.tracer = tracer
+        self.name   = name
+        self.cat    = cat
+        self.step   = step
+        self.args   = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        self.tracer.record("X", self.name, self.cat, self.t0, t1 - self.t0, self.step, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = "", step: Optional[int] = None, **args):
+    """with 블록 구간을 complete event ("X") 로 기록. 비활성 시 공용 no-op 객체."""
+    tracer = _active
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, step, args)
@@ -10,6 +10,8 @@ import queue
 import time
 from typing import Callable
 
+import utils.metrics as metrics
+
 _q: queue.Queue[Callable] = queue.Queue()
 
 
@@ -22,11 +24,17 @@ _DRAIN_CAP       = 200    # 한 프레임당 최대 처리 항목 수
 _WARN_BACKLOG    = 50     # 이 이상 쌓이면 경고
 _WARN_ITEM_MS    = 50.0   # 단일 항목이 이 시간 초과 시 경고
 
+_M_BACKLOG = metrics.gauge("morai_ui_queue_backlog", "drain 시작 시 ui_queue 에 쌓인 항목 수")
+_M_ITEMS   = metrics.counter("morai_ui_queue_items_total", "ui_queue 에서 실행한 항목 수")
+_M_SLOW    = metrics.counter("morai_ui_queue_slow_items_total", f"{_WARN_ITEM_MS:.0f}ms 넘게 걸린 항목 수")
+_M_ERRORS  = metrics.counter("morai_ui_queue_errors_total", "실행 중 예외가 난 항목 수")
+
 
 def drain() -> int:
     """DPG render loop에서 매 프레임 호출 — 큐에 쌓인 UI 업데이트를 소비.
     처리한 항목 수를 반환."""
     backlog = _q.qsize()
+    _M_BACKLOG.set(backlog)
     if backlog > _WARN_BACKLOG:
         print(f"[ui_queue] backlog={backlog}")
 
@@ -41,7 +49,11 @@ def drain() -> int:
             fn()
             ms = (time.perf_counter() - t0) * 1000.0
             if ms > _WARN_ITEM_MS:
+                _M_SLOW.inc()
                 print(f"[ui_queue] slow item {ms:.1f}ms: {fn}")
         except Exception as e:
+            _M_ERRORS.inc()
             print(f"[ui_queue] drain error: {e}")
+    if count:
+        _M_ITEMS.inc(count)
     return count
\ No newline at end of file
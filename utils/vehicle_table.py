@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+# utils/vehicle_table.py
+#
+# VehicleStateTable — 프로세스 간 공유 차량 상태 표 (multiprocessing.shared_memory, 고정 layout).
+#   충돌 모드 chaser 가 target 위치를 읽는 용도. runner 들이 서로 다른 프로세스에 있어도 된다.
+#
+#   layout (little-endian)
+#     header 16B : magic "MVST", version u16, row_size u16, capacity u32, generation u32
+#     row   128B : seq u32, pad, entity_id char[24],
+#                  seconds i64, nanos i32, pad, x y z roll pitch yaw vx vy vz (f64), updated (time.time(), f64)
+#
+#   seqlock: 행마다 writer 는 한 명 (그 차량의 VI 수신 callback)
+#     writer : seq += 1 (홀수) → 데이터 → seq += 1 (짝수)
+#     reader : seq 읽기 → 행 전체 → seq 다시 읽기. 홀수이거나 둘이 다르면 재시도 — lock 없음
+#     (CPython 의 struct.pack_into / unpack_from 은 앞에서부터 memcpy 하고 x86 은 store/load 순서를
+#      보존하므로 seq 와 데이터의 순서가 지켜진다)
+#
+#   행 배정: entity_id 열은 표를 만든 프로세스 (owner) 만 쓴다 — add() / 첫 publish() 가 owner 안의
+#   lock 아래에서 빈 행을 배정하므로 프로세스 간에도 두 entity 가 같은 행을 갖는 일이 없다.
+#   attach 한 프로세스는 배정된 행을 찾기만 하고, 없으면 KeyError
+#   → 여러 프로세스 구성에서는 owner 가 runner 프로세스를 띄우기 전에 모든 entity 를 add() 해 둔다.
+#   clear() (owner 전용) 는 generation 을 올려 각 프로세스의 entity→행 캐시를 무효화한다.
+#
+#   segment 수명: owner 가 close() 에서 unlink, owner 가 죽으면 resource_tracker 가 정리.
+#
+# 기본 인스턴스: default_table()
+#   MORAI_VEHICLE_TABLE 가 있으면 그 이름의 표에 붙고 (없으면 그 이름으로 생성),
+#   없으면 새로 만들고 이름을 환경변수에 넣는다 → 이후 띄운 자식 프로세스가 같은 표를 쓴다.
+
+import atexit
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+ENV_NAME = "MORAI_VEHICLE_TABLE"
+
+_MAGIC   = b"MVST"
+_VERSION = 1
+_HEADER  = struct.Struct("<4sHHII")            # magic, version, row_size, capacity, generation
+_GEN     = struct.Struct("<I")
+_GEN_OFF = 12
+_SEQ     = struct.Struct("<I")
+_ID      = struct.Struct("<24s")
+_ID_OFF  = 8
+_DATA    = struct.Struct("<qi4x10d")
+_DATA_OFF = 32
+_ROW     = struct.Struct("<I4x24sqi4x10d")     # 읽기용 — seq + id + data 한 번에
+_ROW_SIZE = 128
+assert _ROW.size <= _ROW_SIZE
+
+DEFAULT_CAPACITY = 64
+_READ_SPINS = 100
+
+_created_here: Set[str] = set()                # 이 프로세스가 만든 segment 이름
+
+
+class VehicleRow(NamedTuple):
+    entity_id: str
+    seconds:   int
+    nanos:     int
+    x:         float
+    y:         float
+    z:         float
+    roll:      float
+    pitch:     float
+    yaw:       float             # deg
+    vx:        float
+    vy:        float
+    vz:        float
+    updated:   float             # 기록 시각 (time.time())
+
+    @property
+    def speed_kph(self) -> float:
+        return abs(self.vx) * 3.6
+
+
+def _encode_id(entity_id: str) -> bytes:
+    raw = entity_id.encode("utf-8")
+    if len(raw) > 24:
+        raise ValueError(f"entity_id 가 24 byte 를 넘음: {entity_id!r}")
+    return raw.ljust(24, b"\x00")
+
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    """기존 segment 에 붙기. 3.13 전의 POSIX SharedMemory 는 붙기만 해도 resource_tracker 에 등록해
+    그 tracker 가 끝날 때 owner 의 segment 를 unlink 하므로, owner 와 tracker 를 공유하지 않는
+    경우에만 등록을 취소한다 (같은 프로세스 / multiprocessing 자식은 owner 의 tracker 를 공유 —
+    취소하면 owner 의 등록까지 지워진다)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)          # 3.13+
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if (os.name == "posix" and shm.name not in _created_here
+            and multiprocessing.parent_process() is None):
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class VehicleStateTable:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm   = shm
+        self._buf   = shm.buf
+        self.owner  = owner                          # True 면 close() 시 unlink
+        magic, version, row_size, capacity, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION or row_size != _ROW_SIZE:
+            raise ValueError(f"vehicle table layout 불일치: {shm.name} ({magic!r} v{version} row={row_size})")
+        self.capacity = capacity
+        self._lock  = threading.Lock()               # 행 배정 (프로세스 내부)
+        self._rows: Dict[str, int] = {}              # entity_id → 행 index 캐시
+        self._rows_gen = -1
+
+    # ── 생성 / 연결 ───────────────────────────────────────────
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+               entities: Iterable[str] = ()) -> VehicleStateTable:
+        """새 표 (이 프로세스가 owner). entities 는 바로 행 배정."""
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + capacity * _ROW_SIZE)
+        _created_here.add(shm.name)
+        shm.buf[:shm.size] = bytes(shm.size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, _ROW_SIZE, capacity, 0)
+        table = cls(shm, owner=True)
+        for entity_id in entities:
+            table.add(entity_id)
+        return table
+
+    @classmethod
+    def attach(cls, name: str) -> VehicleStateTable:
+        return cls(_attach_shm(name), owner=False)
+
+    @classmethod
+    def open(cls, name: str, capacity: int = DEFAULT_CAPACITY) -> VehicleStateTable:
+        """있으면 attach, 없으면 create."""
+        try:
+            return cls.attach(name)
+        except FileNotFoundError:
+            pass
+        try:
+            return cls.create(name, capacity)
+        except FileExistsError:                      # 다른 프로세스가 먼저 만듦
+            return cls.attach(name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self, unlink: Optional[bool] = None) -> None:
+        self._buf = None
+        try:
+            self._shm.close()
+        except BufferError:                          # 밖에서 memoryview 를 잡고 있음
+            return
+        if self.owner if unlink is None else unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ── 행 배정 ───────────────────────────────────────────────
+
+    def _generation(self) -> int:
+        return _GEN.unpack_from(self._buf, _GEN_OFF)[0]
+
+    @staticmethod
+    def _offset(index: int) -> int:
+        return _HEADER.size + index * _ROW_SIZE
+
+    def _find(self, raw_id: bytes) -> Optional[int]:
+        gen = self._generation()
+        if gen != self._rows_gen:
+            self._rows.clear()
+            self._rows_gen = gen
+        for i in range(self.capacity):
+            if _ID.unpack_from(self._buf, self._offset(i) + _ID_OFF)[0] == raw_id:
+                return i
+        return None
+
+    def _row_index(self, entity_id: str, claim: bool) -> Optional[int]:
+        idx = self._rows.get(entity_id)
+        if idx is not None and self._rows_gen == self._generation():
+            return idx
+        raw_id = _encode_id(entity_id)
+        with self._lock:
+            idx = self._find(raw_id)
+            if idx is None and claim:
+                if not self.owner:
+                    raise KeyError(f"vehicle table 에 {entity_id!r} 행 없음 — "
+                                   "표를 만든 프로세스가 runner 를 띄우기 전에 add() 해야 함")
+                idx = self._find(bytes(24))
+                if idx is None:
+                    raise RuntimeError(f"vehicle table 가득 참 (capacity={self.capacity})")
+                off = self._offset(idx)
+                seq = _SEQ.unpack_from(self._buf, off)[0]
+                _SEQ.pack_into(self._buf, off, (seq + 1) & 0xFFFFFFFF)
+                _ID.pack_into(self._buf, off + _ID_OFF, raw_id)
+                _SEQ.pack_into(self._buf, off, (seq + 2) & 0xFFFFFFFF)
+            if idx is not None:
+                self._rows[entity_id] = idx
+            return idx
+
+    def add(self, entity_id: str) -> int:
+        """entity 의 행 index. owner 면 없을 때 배정, attach 한 쪽은 없으면 KeyError."""
+        return self._row_index(entity_id, claim=True)
+
+    def clear(self) -> None:
+        """모든 행 비우기 (배정 포함) — 새 세션 시작 시 owner 가 호출."""
+        if not self.owner:
+            raise RuntimeError("vehicle table clear() 는 표를 만든 프로세스만 가능")
+        with self._lock:
+            for i in range(self.capacity):
+                off = self._offset(i)
+                seq = _SEQ.unpack_from(self._buf, off)[0]
+                _SEQ.pack_into(self._buf, off, (seq + 1) & 0xFFFFFFFF)
+                self._buf[off + _ID_OFF:off + _ROW_SIZE] = bytes(_ROW_SIZE - _ID_OFF)
+                _SEQ.pack_into(self._buf, off, (seq + 2) & 0xFFFFFFFF)
+            _GEN.pack_into(self._buf, _GEN_OFF, (self._generation() + 1) & 0xFFFFFFFF)
+            self._rows.clear()
+
+    # ── 쓰기 (행마다 writer 하나) ─────────────────────────────
+
+    def publish(self, entity_id: str, vi) -> None:
+        """vi: seconds / nanos / x..yaw / vx..vz 속성을 가진 객체 (receivers.vehicle_info_receiver.VehicleInfo)."""
+        off = self._offset(self._row_index(entity_id, claim=True))
+        buf = self._buf
+        seq = _SEQ.unpack_from(buf, off)[0]
+        _SEQ.pack_into(buf, off, (seq + 1) & 0xFFFFFFFF)
+        _DATA.pack_into(buf, off + _DATA_OFF, vi.seconds, vi.nanos,
+                        vi.x, vi.y, vi.z, vi.roll, vi.pitch, vi.yaw, vi.vx, vi.vy, vi.vz, time.time())
+        _SEQ.pack_into(buf, off, (seq + 2) & 0xFFFFFFFF)
+
+    # ── 읽기 (lock 없음) ──────────────────────────────────────
+
+    def read(self, entity_id: str) -> Optional[VehicleRow]:
+        """entity 의 최신 행. 행이 없거나, 아직 publish 전이거나, 계속 쓰는 중이면 None."""
+        idx = self._row_index(entity_id, claim=False)
+        if idx is None:
+            return None
+        row = self._read_row(idx)
+        if row is None or row.entity_id != entity_id:   # clear 후 재배정 — 캐시 무효
+            self._rows.pop(entity_id, None)
+            return None
+        return row if row.updated else None
+
+    def _read_row(self, index: int) -> Optional[VehicleRow]:
+        off = self._offset(index)
+        buf = self._buf
+        for spin in range(_READ_SPINS):
+            seq, raw_id, *values = _ROW.unpack_from(buf, off)
+            if not seq & 1 and _SEQ.unpack_from(buf, off)[0] == seq:
+                return VehicleRow(raw_id.split(b"\x00", 1)[0].decode("utf-8", errors="ignore"), *values)
+            if spin >= 10:
+                time.sleep(0)                        # writer 가 선점됐을 수 있음 — 양보
+        return None
+
+    def rows(self) -> Tuple[VehicleRow, ...]:
+        """배정된 모든 행 (디버그 / 모니터링)."""
+        out = []
+        for i in range(self.capacity):
+            row = self._read_row(i)
+            if row is not None and row.entity_id:
+                out.append(row)
+        return tuple(out)
+
+
+# ── 기본 인스턴스 ─────────────────────────────────────────────
+
+_default: Optional[VehicleStateTable] = None
+_default_lock = threading.Lock()
+
+
+def default_table() -> VehicleStateTable:
+    global _default
+    with _default_lock:
+        if _default is None:
+            name = os.environ.get(ENV_NAME)
+            _default = VehicleStateTable.open(name) if name else VehicleStateTable.create()
+            os.environ[ENV_NAME] = _default.name     # 자식 프로세스가 같은 표에 붙도록
+            atexit.register(_default.close)
+        return _default